@@ -2,7 +2,7 @@
 Flask application factory.
 Creates and configures the Flask application with all blueprints.
 """
-from flask import Flask
+from flask import Flask, g
 from config import get_config
 
 
@@ -27,16 +27,218 @@ def create_app(config_name=None):
     else:
         app.config.from_object(get_config())
     
+    # Fast JSON serialization with native date/datetime/Decimal support
+    from utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    app.json.sort_keys = app.config.get('JSON_SORT_KEYS', False)
+    
     # Validate DATABASE_URL is set
     if not app.config.get('DATABASE_URL'):
         raise ValueError("DATABASE_URL environment variable is not set")
     
+    # Configure the per-process connection pool (created lazily on first query)
+    from repositories.base_repository import BaseRepository
+    BaseRepository.configure_pool(
+        min_size=app.config['DB_POOL_MIN_SIZE'],
+        max_size=app.config['DB_POOL_MAX_SIZE'],
+        max_lifetime=app.config['DB_POOL_MAX_LIFETIME'],
+        health_check_after=app.config['DB_POOL_HEALTH_CHECK_AFTER'],
+        timeout=app.config['DB_POOL_TIMEOUT'],
+    )
+    
+    # Size the in-process service catalog cache
+    from repositories.service_repository import ServiceRepository
+    ServiceRepository.catalog_cache.configure(
+        maxsize=app.config['CATALOG_CACHE_MAXSIZE'],
+        ttl=app.config['CATALOG_CACHE_TTL'],
+    )
+    
+    from services.catalog_service import CatalogService
+    CatalogService.booking_horizon_days = app.config['BOOKING_HORIZON_DAYS']
+    
+    # Worker processes for large multi-report financial exports
+    from services.financial_export_service import FinancialExportService
+    FinancialExportService.processes = app.config['FINANCIAL_EXPORT_PROCESSES']
+    
+    # Public warranty lookup cache and rate limit
+    from services.warranty_service import WarrantyService
+    WarrantyService.lookup_cache.configure(
+        maxsize=app.config['WARRANTY_LOOKUP_CACHE_MAXSIZE'],
+        ttl=app.config['WARRANTY_LOOKUP_CACHE_TTL'],
+    )
+    WarrantyService.lookup_negative_ttl = app.config['WARRANTY_LOOKUP_NEGATIVE_TTL']
+    WarrantyService.lookup_limiter.configure(
+        rate=app.config['WARRANTY_LOOKUP_RATE'],
+        burst=app.config['WARRANTY_LOOKUP_BURST'],
+    )
+    WarrantyService.details_limiter.configure(
+        rate=app.config['WARRANTY_DETAILS_RATE'],
+        burst=app.config['WARRANTY_DETAILS_BURST'],
+    )
+    WarrantyService.expiring_days = app.config['WARRANTY_EXPIRING_DAYS']
+    
+    # Expire warranties in the background (one worker at a time sweeps)
+    if app.config['WARRANTY_SWEEP_INTERVAL'] > 0:
+        register_warranty_sweep(app.config['WARRANTY_SWEEP_INTERVAL'])
+    
+    # Outbound email through the background job queue
+    register_job_workers(app.config)
+    
+    # Live dashboard event streams
+    from services.event_service import EventService
+    EventService.broker.configure(
+        max_subscribers=app.config['EVENTS_MAX_STREAMS'],
+        queue_size=app.config['EVENTS_QUEUE_SIZE'],
+    )
+    EventService.heartbeat_interval = app.config['EVENTS_HEARTBEAT_INTERVAL']
+    
+    # Evict cached rows and push assignment events when any worker (or host) changes them
+    if app.config['CHANGE_FEED_ENABLED']:
+        register_change_feed()
+    
+    # One transaction (and at most one pooled connection) per HTTP request
+    register_unit_of_work(app)
+    
     # Register blueprints
-    from routes import api_bp, workorder_bp, warranty_bp, page_bp
+    from routes import api_bp, workorder_bp, warranty_bp, page_bp, admin_bp, dispatch_bp, availability_bp, employee_bp, events_bp
     
     app.register_blueprint(page_bp)      # Frontend pages (must be first for / route)
     app.register_blueprint(api_bp)
     app.register_blueprint(workorder_bp)
     app.register_blueprint(warranty_bp)
+    app.register_blueprint(admin_bp)
+    app.register_blueprint(dispatch_bp)
+    app.register_blueprint(availability_bp)
+    app.register_blueprint(employee_bp)
+    app.register_blueprint(events_bp)
+    
+    # CLI commands (flask db upgrade, ...)
+    from cli import register_commands
+    register_commands(app)
     
     return app
+
+
+def register_unit_of_work(app):
+    """
+    Wrap every request in a repository unit of work.
+
+    Repository calls made while handling a request share one connection and
+    one transaction. The transaction commits before the response is sent so
+    a failed commit can still be reported to the client; server errors and
+    unhandled exceptions roll it back.
+    
+    Args:
+        app (Flask): Application to register the request hooks on
+    """
+    from repositories.base_repository import BaseRepository
+    
+    @app.before_request
+    def begin_unit_of_work():
+        g.unit_of_work_token = BaseRepository.begin_unit_of_work()
+    
+    @app.after_request
+    def commit_unit_of_work(response):
+        unit = BaseRepository.current_unit_of_work()
+        if unit is None:
+            return response
+        if response.status_code >= 500 or unit.rollback_only:
+            unit.rollback()
+            return response
+        try:
+            unit.commit()
+        except Exception as e:
+            unit.rollback_only = True
+            response = app.json.response({"ok": False, "error": f"Database commit failed: {str(e)}"})
+            response.status_code = 500
+        return response
+    
+    @app.teardown_request
+    def end_unit_of_work(exc):
+        token = g.pop('unit_of_work_token', None)
+        if token is not None:
+            BaseRepository.end_unit_of_work(token, commit=False)
+
+
+def register_change_feed():
+    """
+    Subscribe cache invalidation and live dashboard events to table change
+    notifications and start this process's listener thread.
+    """
+    from utils.change_feed import ChangeFeed
+    from repositories.service_repository import ServiceRepository
+    from services.warranty_service import WarrantyService
+    from services.event_service import EventService
+    
+    def evict_service(event):
+        service_id = event.get('id')
+        ServiceRepository.invalidate_catalog(int(service_id) if service_id else None)
+    
+    ChangeFeed.subscribe('services', evict_service)
+    ChangeFeed.subscribe('service_types', lambda event: ServiceRepository.invalidate_catalog())
+    # Lookups are keyed by contact details, not IDs, so any change clears them
+    ChangeFeed.subscribe('warranties', lambda event: WarrantyService.lookup_cache.clear())
+    ChangeFeed.subscribe('user', lambda event: WarrantyService.lookup_cache.clear())
+    ChangeFeed.subscribe('work_assignments', EventService.handle_change)
+    ChangeFeed.start()
+
+
+_warranty_sweep = None
+
+
+def register_warranty_sweep(interval):
+    """
+    Start this process's periodic warranty sweep.
+    
+    Args:
+        interval (float): Seconds between sweeps
+    """
+    global _warranty_sweep
+    from utils.periodic import PeriodicTask
+    from services.warranty_service import WarrantyService
+    
+    if _warranty_sweep is None:
+        # First sweep shortly after startup, not during short-lived CLI commands
+        _warranty_sweep = PeriodicTask('warranty-sweep', interval, WarrantyService.sweep_warranties,
+                                       initial_delay=min(interval, 60))
+    _warranty_sweep.interval = interval
+    _warranty_sweep.start()
+
+
+def register_job_workers(config):
+    """
+    Configure the job queue and mail transport.
+    
+    Worker threads are not started here; see start_job_workers().
+    
+    Args:
+        config (dict): App config
+    """
+    from services.job_service import JobService
+    from services.notification_service import NotificationService
+    from utils.mail import create_transport
+    
+    JobService.batch_size = config['JOBS_BATCH_SIZE']
+    JobService.poll_interval = config['JOBS_POLL_INTERVAL']
+    JobService.max_attempts = config['JOBS_MAX_ATTEMPTS']
+    JobService.retry_base = config['JOBS_RETRY_BASE']
+    JobService.retry_max = config['JOBS_RETRY_MAX']
+    JobService.lease_seconds = config['JOBS_LEASE']
+    NotificationService.configure(create_transport(config))
+
+
+def start_job_workers(app):
+    """
+    Start this process's job worker threads if JOBS_WORKERS > 0.
+    
+    Called by the server entry point (main.py) only, so CLI commands such as
+    `python cli.py db upgrade` never run jobs, e.g. against a database whose
+    jobs table doesn't exist yet. `python cli.py jobs work` starts its own.
+    
+    Args:
+        app (Flask): Application created by create_app()
+    """
+    from services.job_service import JobService
+    
+    if app.config['JOBS_WORKERS'] > 0:
+        JobService.start_workers(app.config['JOBS_WORKERS'])
@@ -0,0 +1,150 @@
+"""
+Flask CLI commands.
+Run from the app directory, e.g. `python cli.py db upgrade`.
+"""
+import sys
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from repositories.migration_repository import MigrationRepository
+from repositories.idempotency_repository import IdempotencyRepository
+from repositories.job_repository import JobRepository
+from services.export_service import ExportService
+from services.job_service import JobService
+from services.financial_service import FinancialService
+from services.warranty_service import WarrantyService
+
+db_cli = AppGroup('db', help='Database schema commands.')
+export_cli = AppGroup('export', help='Bulk data exports.')
+warranties_cli = AppGroup('warranties', help='Warranty maintenance jobs.')
+jobs_cli = AppGroup('jobs', help='Background job queue.')
+mail_cli = AppGroup('mail', help='Outbound email tools.')
+financial_cli = AppGroup('financial', help='Financial report maintenance.')
+
+
+@db_cli.command('upgrade')
+def db_upgrade():
+    """Apply pending SQL migrations in order."""
+    pending = MigrationRepository.pending()
+    if not pending:
+        click.echo("Database is up to date.")
+        return
+    for version in pending:
+        click.echo(f"Applying {version} ...")
+        MigrationRepository.apply(version)
+    click.echo(f"Applied {len(pending)} migration(s).")
+
+
+@db_cli.command('purge-idempotency-keys')
+def db_purge_idempotency_keys():
+    """Delete Idempotency-Key records older than IDEMPOTENCY_KEY_TTL."""
+    deleted = IdempotencyRepository.purge_expired(current_app.config['IDEMPOTENCY_KEY_TTL'])
+    click.echo(f"Deleted {deleted} expired idempotency key(s).")
+
+
+@export_cli.command('dump')
+@click.argument('dataset', type=click.Choice(list(ExportService.DATASETS)))
+@click.option('--format', 'fmt', type=click.Choice(list(ExportService.FORMATS)), default='csv',
+              help='Output format.')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True),
+              help='File to write (default: stdout).')
+def export_dump(dataset, fmt, output):
+    """Stream DATASET (workorders or servicerequests) as CSV or NDJSON."""
+    out = open(output, 'w', encoding='utf-8', newline='') if output else sys.stdout
+    try:
+        for chunk in ExportService.stream(dataset, fmt):
+            out.write(chunk)
+    finally:
+        if output:
+            out.close()
+
+
+@warranties_cli.command('sweep')
+@click.option('--days', type=int, default=None,
+              help='List warranties expiring within this many days (default WARRANTY_EXPIRING_DAYS).')
+def warranties_sweep(days):
+    """Expire/activate warranties whose dates have passed and list those expiring soon."""
+    result = WarrantyService.sweep_warranties(days)
+    if result is None:
+        click.echo("Another warranty sweep is running; skipped.")
+        return
+    click.echo(f"Expired: {len(result['expired'])}, activated: {len(result['activated'])}")
+    for warranty in result['expiring']:
+        click.echo(f"  expiring {warranty['endDate']}: #{warranty['id']} {warranty['serviceName']} "
+                   f"- {warranty['customerName']} <{warranty['customerEmail']}>")
+
+
+@jobs_cli.command('work')
+@click.option('--once', is_flag=True, help='Run the ready jobs and exit instead of polling.')
+def jobs_work(once):
+    """Run queued jobs (use with JOBS_WORKERS=0 to keep delivery out of web workers)."""
+    if once:
+        total = {'done': 0, 'retried': 0, 'failed': 0}
+        while True:
+            result = JobService.run_once()
+            if not any(result.values()):
+                break
+            for key, count in result.items():
+                total[key] += count
+        click.echo(f"Done: {total['done']}, retried: {total['retried']}, failed: {total['failed']}")
+        return
+    
+    workers = current_app.config['JOBS_WORKERS'] or 1
+    JobService.start_workers(workers)
+    click.echo(f"Running {workers} job worker(s); press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        JobService.stop_workers()
+
+
+@jobs_cli.command('status')
+def jobs_status():
+    """Show how many jobs are in each state."""
+    for status, count in JobRepository.count_by_status().items():
+        click.echo(f"{status}: {count}")
+
+
+@jobs_cli.command('purge')
+@click.option('--days', type=int, default=7, help='Delete finished jobs older than this many days.')
+def jobs_purge(days):
+    """Delete done and failed jobs older than --days."""
+    deleted = JobRepository.purge_finished(days * 86400)
+    click.echo(f"Deleted {deleted} finished job(s).")
+
+
+@mail_cli.command('stub')
+@click.option('--port', type=int, default=1025, help='Port to listen on.')
+def mail_stub(port):
+    """Run a local SMTP server that prints received messages (MAIL_TRANSPORT=smtp)."""
+    from utils.smtp_stub import SMTPStub
+    click.echo(f"SMTP stub listening on localhost:{port}; press Ctrl+C to stop.")
+    try:
+        SMTPStub('localhost', port).serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+@financial_cli.command('rebuild')
+def financial_rebuild():
+    """Recompute the financial rollups from workorders."""
+    count = FinancialService.rebuild()
+    click.echo(f"Rebuilt financial rollups from {count} completed workorder(s).")
+
+
+def register_commands(app):
+    """Attach all CLI command groups to the app."""
+    app.cli.add_command(db_cli)
+    app.cli.add_command(export_cli)
+    app.cli.add_command(warranties_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(mail_cli)
+    app.cli.add_command(financial_cli)
+
+
+if __name__ == '__main__':
+    from flask.cli import FlaskGroup
+    from __init__ import create_app
+    FlaskGroup(create_app=create_app)()
@@ -20,6 +20,70 @@ class Config:
     # Database settings
     DATABASE_URL = os.getenv('DATABASE_URL')
     
+    # Connection pool settings (per worker process)
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+    DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '3600'))  # seconds
+    DB_POOL_HEALTH_CHECK_AFTER = float(os.getenv('DB_POOL_HEALTH_CHECK_AFTER', '30'))  # idle seconds
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))  # seconds to wait for a connection
+    
+    # Service catalog cache (services and service types)
+    CATALOG_CACHE_TTL = float(os.getenv('CATALOG_CACHE_TTL', '300'))  # seconds
+    CATALOG_CACHE_MAXSIZE = int(os.getenv('CATALOG_CACHE_MAXSIZE', '256'))  # entries
+    CATALOG_HTTP_MAX_AGE = int(os.getenv('CATALOG_HTTP_MAX_AGE', '0'))  # browser freshness, seconds
+    
+    # Appointment form booking window
+    BOOKING_HORIZON_DAYS = int(os.getenv('BOOKING_HORIZON_DAYS', '90'))
+    
+    # Cross-worker cache invalidation over LISTEN/NOTIFY (one extra connection per worker)
+    CHANGE_FEED_ENABLED = os.getenv('CHANGE_FEED_ENABLED', 'True').lower() in ('true', '1', 't')
+    
+    # Public warranty lookup: result cache and per-client token bucket
+    WARRANTY_LOOKUP_CACHE_TTL = float(os.getenv('WARRANTY_LOOKUP_CACHE_TTL', '300'))  # seconds, found
+    WARRANTY_LOOKUP_NEGATIVE_TTL = float(os.getenv('WARRANTY_LOOKUP_NEGATIVE_TTL', '30'))  # seconds, not found
+    WARRANTY_LOOKUP_CACHE_MAXSIZE = int(os.getenv('WARRANTY_LOOKUP_CACHE_MAXSIZE', '10000'))  # entries
+    WARRANTY_LOOKUP_RATE = float(os.getenv('WARRANTY_LOOKUP_RATE', '0.2'))  # requests/second per client, > 0 (RATE_LIMIT_ENABLED turns limits off)
+    WARRANTY_LOOKUP_BURST = int(os.getenv('WARRANTY_LOOKUP_BURST', '10'))  # requests at once per client
+    WARRANTY_DETAILS_RATE = float(os.getenv('WARRANTY_DETAILS_RATE', '0.002'))  # detail emails/second per client and warranty
+    WARRANTY_DETAILS_BURST = int(os.getenv('WARRANTY_DETAILS_BURST', '3'))  # detail emails at once per client and warranty
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True').lower() in ('true', '1', 't')
+    
+    # Warranty expiry sweep and "expiring soon" window
+    WARRANTY_SWEEP_INTERVAL = float(os.getenv('WARRANTY_SWEEP_INTERVAL', '3600'))  # seconds, 0 disables
+    WARRANTY_EXPIRING_DAYS = int(os.getenv('WARRANTY_EXPIRING_DAYS', '30'))
+    
+    # How long Idempotency-Key responses are kept for replay
+    IDEMPOTENCY_KEY_TTL = float(os.getenv('IDEMPOTENCY_KEY_TTL', '86400'))  # seconds
+    
+    # Background job queue (worker threads per server process, not CLI commands; 0 = run `cli.py jobs work` instead)
+    JOBS_WORKERS = int(os.getenv('JOBS_WORKERS', '2'))
+    JOBS_BATCH_SIZE = int(os.getenv('JOBS_BATCH_SIZE', '50'))
+    JOBS_POLL_INTERVAL = float(os.getenv('JOBS_POLL_INTERVAL', '2'))  # seconds
+    JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', '5'))
+    JOBS_RETRY_BASE = float(os.getenv('JOBS_RETRY_BASE', '30'))  # seconds, doubled per attempt
+    JOBS_RETRY_MAX = float(os.getenv('JOBS_RETRY_MAX', '3600'))  # seconds
+    JOBS_LEASE = float(os.getenv('JOBS_LEASE', '300'))  # seconds before a stuck job is re-queued
+    
+    # Outbound email ('console' prints messages, 'smtp' sends them)
+    MAIL_TRANSPORT = os.getenv('MAIL_TRANSPORT', 'console')
+    MAIL_SERVER = os.getenv('MAIL_SERVER', 'localhost')
+    MAIL_PORT = int(os.getenv('MAIL_PORT', '1025'))
+    MAIL_USERNAME = os.getenv('MAIL_USERNAME')
+    MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
+    MAIL_USE_TLS = os.getenv('MAIL_USE_TLS', 'False').lower() in ('true', '1', 't')
+    MAIL_USE_SSL = os.getenv('MAIL_USE_SSL', 'False').lower() in ('true', '1', 't')
+    MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER', 'Vargas Home Services <no-reply@vargashomeservices.com>')
+    
+    # Worker processes for multi-report financial CSV exports (0 = render in the request)
+    FINANCIAL_EXPORT_PROCESSES = int(os.getenv('FINANCIAL_EXPORT_PROCESSES', '0'))
+    
+    # Live dashboard events (Server-Sent Events, fed by the change feed)
+    # Open streams per worker process. Each holds a request thread while open, so
+    # keep this below the server's threads per process (e.g. gunicorn --threads)
+    EVENTS_MAX_STREAMS = int(os.getenv('EVENTS_MAX_STREAMS', '50'))
+    EVENTS_QUEUE_SIZE = int(os.getenv('EVENTS_QUEUE_SIZE', '100'))  # pending events per stream before resync
+    EVENTS_HEARTBEAT_INTERVAL = float(os.getenv('EVENTS_HEARTBEAT_INTERVAL', '15'))  # seconds
+    
     # Application settings
     JSON_SORT_KEYS = False  # Preserve key order in JSON responses
     
@@ -38,6 +102,9 @@ class TestConfig(Config):
     """Test configuration."""
     TESTING = True
     DEBUG = True
+    CHANGE_FEED_ENABLED = False
+    WARRANTY_SWEEP_INTERVAL = 0
+    JOBS_WORKERS = 0
 
 
 # Configuration dictionary
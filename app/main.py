@@ -2,11 +2,22 @@
 Main entry point for the Flask application.
 Imports and runs the Flask app created by the application factory.
 """
-from __init__ import create_app
+import os
+from __init__ import create_app, start_job_workers
 
-# Create the Flask application using the factory
-app = create_app()
+# The app is only created when this module is run or served as main:app.
+# Spawned helper processes (e.g. financial export workers) re-import the
+# entry script as __mp_main__ and must not start the change feed, the
+# warranty sweep or job workers.
 
 # --- Main ---
 if __name__ == '__main__':
+    app = create_app()
+    # With the reloader, only the child process that serves requests runs jobs
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_job_workers(app)
     app.run(debug=True)
+elif __name__ == 'main':
+    # Imported by a WSGI server (e.g. main:app)
+    app = create_app()
+    start_job_workers(app)
@@ -0,0 +1,53 @@
+-- Change feed: publish row changes on cached tables over NOTIFY.
+-- Each worker LISTENs on "table_changes" and evicts matching cache entries.
+-- Payload: {"table": "<table>", "op": "INSERT|UPDATE|DELETE", "id": "<primary key>"}
+
+CREATE OR REPLACE FUNCTION public.notify_table_change() RETURNS trigger AS $$
+DECLARE
+  -- TG_ARGV[0] is the primary key column of the table the trigger is on
+  row_id text;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    row_id := to_jsonb(OLD) ->> TG_ARGV[0];
+  ELSE
+    row_id := to_jsonb(NEW) ->> TG_ARGV[0];
+  END IF;
+
+  PERFORM pg_notify('table_changes', json_build_object(
+    'table', TG_TABLE_NAME,
+    'op', TG_OP,
+    'id', row_id
+  )::text);
+
+  -- An UPDATE that changes the key is also a change to the old row
+  IF TG_OP = 'UPDATE' AND (to_jsonb(OLD) ->> TG_ARGV[0]) IS DISTINCT FROM row_id THEN
+    PERFORM pg_notify('table_changes', json_build_object(
+      'table', TG_TABLE_NAME,
+      'op', TG_OP,
+      'id', to_jsonb(OLD) ->> TG_ARGV[0]
+    )::text);
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS services_notify_change ON public.services;
+CREATE TRIGGER services_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.services
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change('service_id');
+
+DROP TRIGGER IF EXISTS service_types_notify_change ON public.service_types;
+CREATE TRIGGER service_types_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.service_types
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change('service_type_id');
+
+DROP TRIGGER IF EXISTS workorders_notify_change ON public.workorders;
+CREATE TRIGGER workorders_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.workorders
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change('workorderid');
+
+DROP TRIGGER IF EXISTS warranties_notify_change ON public.warranties;
+CREATE TRIGGER warranties_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.warranties
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change('id');
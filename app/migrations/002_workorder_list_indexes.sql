@@ -0,0 +1,12 @@
+-- Indexes for keyset pagination of GET /workorders.
+-- Every list query orders by workorderid DESC and seeks past the cursor
+-- (workorderid < last seen), so each filter column is paired with it.
+
+CREATE INDEX IF NOT EXISTS workorders_iscompleted_workorderid_idx
+  ON public.workorders (iscompleted, workorderid DESC);
+
+CREATE INDEX IF NOT EXISTS workorders_customerid_workorderid_idx
+  ON public.workorders (customerid, workorderid DESC);
+
+CREATE INDEX IF NOT EXISTS workorders_scheduleddate_workorderid_idx
+  ON public.workorders (scheduleddate, workorderid DESC);
@@ -0,0 +1,83 @@
+-- Per-technician, per-day job counts used by auto-assignment.
+-- Replaces counting every historical work_assignments/servicerequests row on
+-- each booking with a primary-key lookup per employee.
+-- The day of a job is the date of its service request's preferred_datetime.
+
+CREATE TABLE IF NOT EXISTS public.technician_daily_load (
+  employeeid INTEGER NOT NULL REFERENCES public.employee (employeeid) ON DELETE CASCADE,
+  work_date  DATE    NOT NULL,
+  job_count  INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (employeeid, work_date)
+);
+
+CREATE OR REPLACE FUNCTION public.adjust_technician_load(p_employeeid INTEGER, p_requestid INTEGER, p_delta INTEGER)
+RETURNS void AS $$
+BEGIN
+  IF p_employeeid IS NULL OR p_requestid IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO public.technician_daily_load AS l (employeeid, work_date, job_count)
+  SELECT p_employeeid, sr.preferred_datetime::date, GREATEST(p_delta, 0)
+  FROM public.servicerequests sr
+  WHERE sr.requestid = p_requestid
+    AND sr.preferred_datetime IS NOT NULL
+  ON CONFLICT (employeeid, work_date)
+  DO UPDATE SET job_count = GREATEST(l.job_count + p_delta, 0);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Assignment created, removed (cancelled) or moved to another technician/request
+CREATE OR REPLACE FUNCTION public.work_assignments_track_load() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.adjust_technician_load(OLD.employeeid, OLD.requestid, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.adjust_technician_load(NEW.employeeid, NEW.requestid, 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS work_assignments_track_load ON public.work_assignments;
+CREATE TRIGGER work_assignments_track_load
+  AFTER INSERT OR DELETE OR UPDATE OF employeeid, requestid ON public.work_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.work_assignments_track_load();
+
+-- A rescheduled request moves its assignments' load to the new day
+CREATE OR REPLACE FUNCTION public.servicerequests_track_load() RETURNS trigger AS $$
+DECLARE
+  emp INTEGER;
+BEGIN
+  IF OLD.preferred_datetime::date IS NOT DISTINCT FROM NEW.preferred_datetime::date THEN
+    RETURN NULL;
+  END IF;
+
+  FOR emp IN SELECT wa.employeeid FROM public.work_assignments wa WHERE wa.requestid = NEW.requestid LOOP
+    IF OLD.preferred_datetime IS NOT NULL THEN
+      UPDATE public.technician_daily_load
+      SET job_count = GREATEST(job_count - 1, 0)
+      WHERE employeeid = emp AND work_date = OLD.preferred_datetime::date;
+    END IF;
+    PERFORM public.adjust_technician_load(emp, NEW.requestid, 1);
+  END LOOP;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS servicerequests_track_load ON public.servicerequests;
+CREATE TRIGGER servicerequests_track_load
+  AFTER UPDATE OF preferred_datetime ON public.servicerequests
+  FOR EACH ROW EXECUTE FUNCTION public.servicerequests_track_load();
+
+-- Backfill from existing history
+INSERT INTO public.technician_daily_load (employeeid, work_date, job_count)
+SELECT wa.employeeid, sr.preferred_datetime::date, COUNT(*)
+FROM public.work_assignments wa
+JOIN public.servicerequests sr ON sr.requestid = wa.requestid
+WHERE wa.employeeid IS NOT NULL
+  AND sr.preferred_datetime IS NOT NULL
+GROUP BY wa.employeeid, sr.preferred_datetime::date
+ON CONFLICT (employeeid, work_date)
+DO UPDATE SET job_count = EXCLUDED.job_count;
@@ -0,0 +1,37 @@
+-- Time-interval index of technician bookings for duration-aware assignment.
+-- Each row reserves [start, start + service duration) for one technician.
+-- The exclusion constraint makes overlapping bookings for the same
+-- technician impossible, and its GiST index answers "is this technician
+-- free for this interval?" without scanning their history.
+--
+-- employee_span is a single-element int4range so the constraint and the
+-- probes can use core GiST range operators without the btree_gist extension.
+
+CREATE TABLE IF NOT EXISTS public.technician_schedule (
+  schedule_id   SERIAL PRIMARY KEY,
+  employeeid    INTEGER   NOT NULL REFERENCES public.employee (employeeid) ON DELETE CASCADE,
+  requestid     INTEGER   NOT NULL REFERENCES public.servicerequests (requestid) ON DELETE CASCADE,
+  slot          TSTZRANGE NOT NULL,
+  employee_span INT4RANGE GENERATED ALWAYS AS (int4range(employeeid, employeeid, '[]')) STORED,
+  created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  CONSTRAINT technician_schedule_no_overlap
+    EXCLUDE USING gist (employee_span WITH &&, slot WITH &&)
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS technician_schedule_requestid_key
+  ON public.technician_schedule (requestid);
+
+-- Backfill from existing assignments; overlapping history is skipped
+INSERT INTO public.technician_schedule (employeeid, requestid, slot)
+SELECT DISTINCT ON (wa.requestid)
+       wa.employeeid,
+       wa.requestid,
+       tstzrange(sr.preferred_datetime,
+                 sr.preferred_datetime + make_interval(mins => (COALESCE(s.duration_hours, 1) * 60)::int))
+FROM public.work_assignments wa
+JOIN public.servicerequests sr ON sr.requestid = wa.requestid
+LEFT JOIN public.services s ON s.service_id = sr.service_id
+WHERE wa.employeeid IS NOT NULL
+  AND sr.preferred_datetime IS NOT NULL
+ORDER BY wa.requestid, wa.assignment_id DESC
+ON CONFLICT DO NOTHING;
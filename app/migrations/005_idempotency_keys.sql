@@ -0,0 +1,20 @@
+-- Idempotency-Key store for retried POSTs (booking and warranty service requests).
+-- A key is claimed in the same transaction as the work it protects, so a
+-- request that rolls back leaves no key behind and a concurrent retry waits
+-- on the claim instead of running the work twice.
+-- Keys are stored as a SHA-256 digest together with a digest of the request
+-- body. The original JSON response is kept byte-for-byte for replay.
+-- Rows older than IDEMPOTENCY_KEY_TTL are reclaimed or purged.
+
+CREATE TABLE IF NOT EXISTS public.idempotency_keys (
+  scope         TEXT        NOT NULL,
+  key_hash      BYTEA       NOT NULL,
+  request_hash  BYTEA       NOT NULL,
+  status_code   SMALLINT,
+  body          BYTEA,
+  created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (scope, key_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idempotency_keys_created_at_idx
+  ON public.idempotency_keys (created_at);
@@ -0,0 +1,79 @@
+-- One customer per email (case-insensitive) and one addressbook row per
+-- customer and physical address, so bookings can upsert with ON CONFLICT
+-- instead of look-up-then-insert (which races) and repeat bookings reuse
+-- their address instead of adding a row every time.
+
+-- Normalized form of one address component: lower case, punctuation
+-- dropped, whitespace collapsed, common street abbreviations unified.
+CREATE OR REPLACE FUNCTION public.normalize_address_part(p_value TEXT)
+RETURNS TEXT AS $$
+  SELECT btrim(
+    regexp_replace(regexp_replace(regexp_replace(regexp_replace(
+    regexp_replace(regexp_replace(regexp_replace(regexp_replace(
+      regexp_replace(lower(coalesce(p_value, '')), '[^a-z0-9]+', ' ', 'g'),
+      '\mstreet\M', 'st', 'g'),
+      '\mavenue\M', 'ave', 'g'),
+      '\mroad\M', 'rd', 'g'),
+      '\mdrive\M', 'dr', 'g'),
+      '\mboulevard\M', 'blvd', 'g'),
+      '\mlane\M', 'ln', 'g'),
+      '\mapartment\M', 'apt', 'g'),
+      '\msuite\M', 'ste', 'g'));
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Fingerprint of a full address; ZIP codes compare on their first five digits
+CREATE OR REPLACE FUNCTION public.address_fingerprint(p_address TEXT, p_city TEXT, p_state TEXT, p_zip TEXT)
+RETURNS TEXT AS $$
+  SELECT md5(concat_ws('|',
+    public.normalize_address_part(p_address),
+    public.normalize_address_part(p_city),
+    public.normalize_address_part(p_state),
+    left(regexp_replace(coalesce(p_zip, ''), '[^0-9]', '', 'g'), 5)));
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Merge customers that differ only in email case into the oldest row
+CREATE TEMP TABLE customer_merge ON COMMIT DROP AS
+SELECT c.customerid AS old_id, k.keep_id
+FROM public.customer c
+JOIN (
+  SELECT lower(email) AS email_key, MIN(customerid) AS keep_id
+  FROM public.customer
+  WHERE email IS NOT NULL
+  GROUP BY lower(email)
+  HAVING COUNT(*) > 1
+) k ON lower(c.email) = k.email_key
+WHERE c.customerid <> k.keep_id;
+
+UPDATE public.servicerequests t SET customerid = m.keep_id
+FROM customer_merge m WHERE t.customerid = m.old_id;
+UPDATE public.workorders t SET customerid = m.keep_id
+FROM customer_merge m WHERE t.customerid = m.old_id;
+UPDATE public.addressbook t SET customer_id = m.keep_id
+FROM customer_merge m WHERE t.customer_id = m.old_id;
+DELETE FROM public.customer c USING customer_merge m WHERE c.customerid = m.old_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS customer_email_lower_key
+  ON public.customer (lower(email));
+
+-- Address fingerprint, then merge duplicate addresses per customer
+ALTER TABLE public.addressbook
+  ADD COLUMN IF NOT EXISTS address_fp TEXT
+  GENERATED ALWAYS AS (public.address_fingerprint(address, city, state, zip_code)) STORED;
+
+CREATE TEMP TABLE address_merge ON COMMIT DROP AS
+SELECT a.address_id AS old_id, k.keep_id
+FROM public.addressbook a
+JOIN (
+  SELECT customer_id, address_fp, MIN(address_id) AS keep_id
+  FROM public.addressbook
+  GROUP BY customer_id, address_fp
+  HAVING COUNT(*) > 1
+) k ON k.customer_id = a.customer_id AND k.address_fp = a.address_fp
+WHERE a.address_id <> k.keep_id;
+
+UPDATE public.servicerequests t SET addressid = m.keep_id
+FROM address_merge m WHERE t.addressid = m.old_id;
+DELETE FROM public.addressbook a USING address_merge m WHERE a.address_id = m.old_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS addressbook_customer_address_fp_key
+  ON public.addressbook (customer_id, address_fp);
@@ -0,0 +1,34 @@
+-- Normalized contact keys for warranty lookup.
+-- Lookups compare these generated columns instead of the raw strings, so
+-- "(555) 123-4567" and "555-123-4567" (or "Jo@Ex.com" and "jo@ex.com") match
+-- and each search is a single index probe on "user".
+-- Keep in sync with utils/contact_keys.py, which normalizes the search input.
+
+-- Trimmed, lower-cased email; NULL when empty
+CREATE OR REPLACE FUNCTION public.normalize_email(p_email TEXT)
+RETURNS TEXT AS $$
+  SELECT NULLIF(lower(btrim(p_email)), '');
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- E.164 form ("+" and digits). Ten-digit numbers are taken as North American
+-- and get country code 1; NULL when there are fewer than 7 digits
+CREATE OR REPLACE FUNCTION public.normalize_phone(p_phone TEXT)
+RETURNS TEXT AS $$
+  SELECT CASE
+           WHEN length(d) < 7 THEN NULL
+           WHEN length(d) = 10 THEN '+1' || d
+           ELSE '+' || d
+         END
+  FROM (SELECT regexp_replace(coalesce(p_phone, ''), '[^0-9]', '', 'g') AS d) digits;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+ALTER TABLE public."user"
+  ADD COLUMN IF NOT EXISTS email_key TEXT GENERATED ALWAYS AS (public.normalize_email(email)) STORED,
+  ADD COLUMN IF NOT EXISTS phone_key TEXT GENERATED ALWAYS AS (public.normalize_phone(phoneNumber)) STORED;
+
+CREATE INDEX IF NOT EXISTS user_email_key_idx ON public."user" (email_key);
+CREATE INDEX IF NOT EXISTS user_phone_key_idx ON public."user" (phone_key);
+
+-- Warranties of the matched user, newest first
+CREATE INDEX IF NOT EXISTS warranties_user_id_start_date_idx
+  ON public.warranties (user_id, start_date DESC);
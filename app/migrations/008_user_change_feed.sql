@@ -0,0 +1,7 @@
+-- Publish "user" changes on the change feed, so cached warranty lookups
+-- (keyed by contact details) are dropped when an email or phone changes.
+
+DROP TRIGGER IF EXISTS user_notify_change ON public."user";
+CREATE TRIGGER user_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public."user"
+  FOR EACH ROW EXECUTE FUNCTION public.notify_table_change('id');
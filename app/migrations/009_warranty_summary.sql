@@ -0,0 +1,145 @@
+-- Maintained warranty summary for the admin warranty page.
+-- One row per warranty with its customer contact details, latest service
+-- request and a stored status, kept current by triggers on warranties,
+-- "user" and service_requests. Status moves with the calendar, so the
+-- warranty sweep (python cli.py warranties sweep) re-evaluates it daily;
+-- admin list/filter endpoints read this table only.
+
+CREATE OR REPLACE FUNCTION public.warranty_status(p_start DATE, p_end DATE, p_today DATE)
+RETURNS TEXT AS $$
+  SELECT CASE
+           WHEN p_end IS NOT NULL AND p_end < p_today THEN 'expired'
+           WHEN p_start IS NOT NULL AND p_start > p_today THEN 'pending'
+           ELSE 'active'
+         END;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE TABLE IF NOT EXISTS public.warranty_summary (
+  warranty_id           INTEGER PRIMARY KEY REFERENCES public.warranties (id) ON DELETE CASCADE,
+  user_id               INTEGER,
+  work_order_id         INTEGER,
+  customer_name         TEXT,
+  customer_email        TEXT,
+  customer_phone        TEXT,
+  service_name          TEXT,
+  service_type          TEXT,
+  start_date            DATE,
+  end_date              DATE,
+  coverage              TEXT,
+  notes                 TEXT,
+  status                TEXT NOT NULL,
+  request_id            INTEGER,
+  request_issue_type    TEXT,
+  request_urgency       TEXT,
+  request_description   TEXT,
+  request_created_at    TIMESTAMP,
+  updated_at            TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS warranty_summary_status_id_idx
+  ON public.warranty_summary (status, warranty_id DESC);
+CREATE INDEX IF NOT EXISTS warranty_summary_user_work_order_idx
+  ON public.warranty_summary (user_id, work_order_id);
+CREATE INDEX IF NOT EXISTS warranty_summary_end_date_idx
+  ON public.warranty_summary (end_date) WHERE status <> 'expired';
+CREATE INDEX IF NOT EXISTS warranty_summary_start_date_idx
+  ON public.warranty_summary (start_date) WHERE status = 'pending';
+
+-- Rebuild one warranty's summary row from its sources
+CREATE OR REPLACE FUNCTION public.refresh_warranty_summary(p_warranty_id INTEGER)
+RETURNS void AS $$
+BEGIN
+  INSERT INTO public.warranty_summary AS s (
+    warranty_id, user_id, work_order_id, customer_name, customer_email, customer_phone,
+    service_name, service_type, start_date, end_date, coverage, notes, status,
+    request_id, request_issue_type, request_urgency, request_description, request_created_at,
+    updated_at)
+  SELECT w.id, w.user_id, w.work_order_id, u.name, u.email, u.phoneNumber,
+         w.service_name, w.service_type, w.start_date, w.end_date, w.coverage, w.notes,
+         public.warranty_status(w.start_date, w.end_date, CURRENT_DATE),
+         r.id, r.issue_type, r.urgency, r.problem_description, r.created_at,
+         NOW()
+  FROM public.warranties w
+  LEFT JOIN public."user" u ON u.id = w.user_id
+  LEFT JOIN LATERAL (
+    SELECT sr.id, sr.issue_type, sr.urgency, sr.problem_description, sr.created_at
+    FROM public.service_requests sr
+    WHERE sr.warranty_id = w.id
+    ORDER BY sr.id DESC
+    LIMIT 1
+  ) r ON TRUE
+  WHERE w.id = p_warranty_id
+  ON CONFLICT (warranty_id) DO UPDATE SET
+    user_id = EXCLUDED.user_id,
+    work_order_id = EXCLUDED.work_order_id,
+    customer_name = EXCLUDED.customer_name,
+    customer_email = EXCLUDED.customer_email,
+    customer_phone = EXCLUDED.customer_phone,
+    service_name = EXCLUDED.service_name,
+    service_type = EXCLUDED.service_type,
+    start_date = EXCLUDED.start_date,
+    end_date = EXCLUDED.end_date,
+    coverage = EXCLUDED.coverage,
+    notes = EXCLUDED.notes,
+    status = EXCLUDED.status,
+    request_id = EXCLUDED.request_id,
+    request_issue_type = EXCLUDED.request_issue_type,
+    request_urgency = EXCLUDED.request_urgency,
+    request_description = EXCLUDED.request_description,
+    request_created_at = EXCLUDED.request_created_at,
+    updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Warranty created or edited (deletes cascade)
+CREATE OR REPLACE FUNCTION public.warranties_track_summary() RETURNS trigger AS $$
+BEGIN
+  PERFORM public.refresh_warranty_summary(NEW.id);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS warranties_track_summary ON public.warranties;
+CREATE TRIGGER warranties_track_summary
+  AFTER INSERT OR UPDATE ON public.warranties
+  FOR EACH ROW EXECUTE FUNCTION public.warranties_track_summary();
+
+-- Customer contact details changed
+CREATE OR REPLACE FUNCTION public.user_track_warranty_summary() RETURNS trigger AS $$
+BEGIN
+  UPDATE public.warranty_summary
+  SET customer_name = NEW.name,
+      customer_email = NEW.email,
+      customer_phone = NEW.phoneNumber,
+      updated_at = NOW()
+  WHERE user_id = NEW.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_track_warranty_summary ON public."user";
+CREATE TRIGGER user_track_warranty_summary
+  AFTER UPDATE OF name, email, phoneNumber ON public."user"
+  FOR EACH ROW EXECUTE FUNCTION public.user_track_warranty_summary();
+
+-- Warranty service request filed, edited or removed
+CREATE OR REPLACE FUNCTION public.service_requests_track_warranty_summary() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.warranty_id IS NOT NULL THEN
+    PERFORM public.refresh_warranty_summary(OLD.warranty_id);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.warranty_id IS NOT NULL
+     AND (TG_OP = 'INSERT' OR NEW.warranty_id IS DISTINCT FROM OLD.warranty_id) THEN
+    PERFORM public.refresh_warranty_summary(NEW.warranty_id);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS service_requests_track_warranty_summary ON public.service_requests;
+CREATE TRIGGER service_requests_track_warranty_summary
+  AFTER INSERT OR UPDATE OR DELETE ON public.service_requests
+  FOR EACH ROW EXECUTE FUNCTION public.service_requests_track_warranty_summary();
+
+-- Backfill
+SELECT public.refresh_warranty_summary(id) FROM public.warranties;
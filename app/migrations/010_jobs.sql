@@ -0,0 +1,30 @@
+-- Background job queue (outbound notifications, ...).
+-- Jobs are enqueued inside the request's transaction, so they only exist if
+-- the booking/request that produced them committed. Workers claim ready
+-- jobs in batches with FOR UPDATE SKIP LOCKED, so any number of workers can
+-- poll without blocking each other or double-delivering. A claimed job holds
+-- a lease (locked_until); if its worker dies the job is re-queued when the
+-- lease runs out. Failed attempts are retried with exponential backoff.
+
+CREATE TABLE IF NOT EXISTS public.jobs (
+  job_id        BIGSERIAL   PRIMARY KEY,
+  kind          TEXT        NOT NULL,
+  payload       JSONB       NOT NULL,
+  status        TEXT        NOT NULL DEFAULT 'queued'
+                CHECK (status IN ('queued', 'running', 'done', 'failed')),
+  attempts      INTEGER     NOT NULL DEFAULT 0,
+  max_attempts  INTEGER     NOT NULL DEFAULT 5,
+  run_at        TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  locked_until  TIMESTAMPTZ,
+  last_error    TEXT,
+  created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  finished_at   TIMESTAMPTZ
+);
+
+-- Ready-to-run probe and lease expiry only touch unfinished jobs
+CREATE INDEX IF NOT EXISTS jobs_queued_run_at_idx
+  ON public.jobs (run_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS jobs_running_locked_until_idx
+  ON public.jobs (locked_until) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS jobs_finished_at_idx
+  ON public.jobs (finished_at) WHERE status IN ('done', 'failed');
@@ -0,0 +1,41 @@
+-- Dispatch queue for warranty service requests.
+-- Pending requests are served most urgent first, then oldest first. The
+-- rank is a stored generated column so the queue order is an index scan on
+-- (status, urgency_rank, created_at) instead of a sort over every pending
+-- row. Dispatchers claim requests with FOR UPDATE SKIP LOCKED, so several
+-- of them can pull from the head of the queue at once without waiting on
+-- each other or claiming the same request.
+-- Keep the ranks in sync with DispatchService.URGENCY_RANKS.
+
+-- 0 = emergency ... 3 = low; unknown or missing urgency sorts last
+CREATE OR REPLACE FUNCTION public.urgency_rank(p_urgency TEXT)
+RETURNS SMALLINT AS $$
+  SELECT (CASE lower(btrim(p_urgency))
+    WHEN 'emergency' THEN 0
+    WHEN 'urgent'    THEN 0
+    WHEN 'high'      THEN 1
+    WHEN 'medium'    THEN 2
+    WHEN 'normal'    THEN 2
+    WHEN 'low'       THEN 3
+    ELSE 4
+  END)::SMALLINT;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+ALTER TABLE public.service_requests
+  ADD COLUMN IF NOT EXISTS urgency_rank SMALLINT
+    GENERATED ALWAYS AS (public.urgency_rank(urgency)) STORED,
+  ADD COLUMN IF NOT EXISTS dispatched_by TEXT,
+  ADD COLUMN IF NOT EXISTS dispatched_at TIMESTAMP,
+  ADD COLUMN IF NOT EXISTS resolved_at   TIMESTAMP;
+
+-- Rows written before status/created_at were always set still need a place in the queue
+UPDATE public.service_requests SET status = 'pending' WHERE status IS NULL;
+UPDATE public.service_requests SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE public.service_requests
+  ALTER COLUMN status SET DEFAULT 'pending',
+  ALTER COLUMN status SET NOT NULL,
+  ALTER COLUMN created_at SET DEFAULT NOW(),
+  ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS service_requests_dispatch_idx
+  ON public.service_requests (status, urgency_rank, created_at, id);
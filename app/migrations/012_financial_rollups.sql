@@ -0,0 +1,240 @@
+-- Financial reporting rollups for the admin financial page.
+-- When a workorder is completed, its revenue (the service price), labor
+-- (booked hours x the technician's hourly rate) and material cost are
+-- recorded once in financial_workorder_facts. Triggers on that table add
+-- the amounts to per-day rollups by service type and by technician, so a
+-- date-range report sums a few rows per day instead of joining every
+-- historical workorder to services. Amounts are captured at completion;
+-- later price or rate changes don't rewrite past reports.
+-- Un-completing, rescheduling or deleting a workorder moves or removes its
+-- fact, and the rollups follow.
+
+ALTER TABLE public.employee
+  ADD COLUMN IF NOT EXISTS hourly_rate NUMERIC(8,2) NOT NULL DEFAULT 0;
+
+ALTER TABLE public.workorders
+  ADD COLUMN IF NOT EXISTS material_cost NUMERIC(10,2) NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS public.financial_workorder_facts (
+  workorderid     INTEGER       PRIMARY KEY,
+  work_date       DATE          NOT NULL,
+  requestid       INTEGER,
+  customerid      INTEGER,
+  service_id      INTEGER,
+  service_type_id INTEGER,
+  employeeid      INTEGER,
+  revenue         NUMERIC(12,2) NOT NULL DEFAULT 0,
+  labor_hours     NUMERIC(8,2)  NOT NULL DEFAULT 0,
+  labor_cost      NUMERIC(12,2) NOT NULL DEFAULT 0,
+  material_cost   NUMERIC(12,2) NOT NULL DEFAULT 0
+);
+
+-- Detail reports page through one date range, newest first
+CREATE INDEX IF NOT EXISTS financial_workorder_facts_date_idx
+  ON public.financial_workorder_facts (work_date DESC, workorderid DESC);
+
+CREATE TABLE IF NOT EXISTS public.financial_daily_service_type (
+  work_date       DATE          NOT NULL,
+  service_type_id INTEGER       NOT NULL,
+  orders          INTEGER       NOT NULL DEFAULT 0,
+  revenue         NUMERIC(14,2) NOT NULL DEFAULT 0,
+  labor_hours     NUMERIC(12,2) NOT NULL DEFAULT 0,
+  labor_cost      NUMERIC(14,2) NOT NULL DEFAULT 0,
+  material_cost   NUMERIC(14,2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (work_date, service_type_id)
+);
+
+-- Only assigned workorders; unassigned ones count in the service type rollup only
+CREATE TABLE IF NOT EXISTS public.financial_daily_technician (
+  work_date       DATE          NOT NULL,
+  employeeid      INTEGER       NOT NULL,
+  orders          INTEGER       NOT NULL DEFAULT 0,
+  revenue         NUMERIC(14,2) NOT NULL DEFAULT 0,
+  labor_hours     NUMERIC(12,2) NOT NULL DEFAULT 0,
+  labor_cost      NUMERIC(14,2) NOT NULL DEFAULT 0,
+  material_cost   NUMERIC(14,2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (work_date, employeeid)
+);
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one fact from the daily rollups
+CREATE OR REPLACE FUNCTION public.add_financial_fact(f public.financial_workorder_facts, p_sign INTEGER)
+RETURNS void AS $$
+BEGIN
+  IF f.service_type_id IS NOT NULL THEN
+    INSERT INTO public.financial_daily_service_type AS r
+      (work_date, service_type_id, orders, revenue, labor_hours, labor_cost, material_cost)
+    VALUES (f.work_date, f.service_type_id, p_sign, p_sign * f.revenue, p_sign * f.labor_hours,
+            p_sign * f.labor_cost, p_sign * f.material_cost)
+    ON CONFLICT (work_date, service_type_id) DO UPDATE SET
+      orders        = r.orders + EXCLUDED.orders,
+      revenue       = r.revenue + EXCLUDED.revenue,
+      labor_hours   = r.labor_hours + EXCLUDED.labor_hours,
+      labor_cost    = r.labor_cost + EXCLUDED.labor_cost,
+      material_cost = r.material_cost + EXCLUDED.material_cost;
+
+    DELETE FROM public.financial_daily_service_type
+    WHERE work_date = f.work_date AND service_type_id = f.service_type_id AND orders = 0;
+  END IF;
+
+  IF f.employeeid IS NOT NULL THEN
+    INSERT INTO public.financial_daily_technician AS r
+      (work_date, employeeid, orders, revenue, labor_hours, labor_cost, material_cost)
+    VALUES (f.work_date, f.employeeid, p_sign, p_sign * f.revenue, p_sign * f.labor_hours,
+            p_sign * f.labor_cost, p_sign * f.material_cost)
+    ON CONFLICT (work_date, employeeid) DO UPDATE SET
+      orders        = r.orders + EXCLUDED.orders,
+      revenue       = r.revenue + EXCLUDED.revenue,
+      labor_hours   = r.labor_hours + EXCLUDED.labor_hours,
+      labor_cost    = r.labor_cost + EXCLUDED.labor_cost,
+      material_cost = r.material_cost + EXCLUDED.material_cost;
+
+    DELETE FROM public.financial_daily_technician
+    WHERE work_date = f.work_date AND employeeid = f.employeeid AND orders = 0;
+  END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.financial_facts_track_rollups() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.add_financial_fact(OLD, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.add_financial_fact(NEW, 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS financial_facts_track_rollups ON public.financial_workorder_facts;
+CREATE TRIGGER financial_facts_track_rollups
+  AFTER INSERT OR UPDATE OR DELETE ON public.financial_workorder_facts
+  FOR EACH ROW EXECUTE FUNCTION public.financial_facts_track_rollups();
+
+-- (Re)record the fact for one workorder: present only while it is completed.
+-- Hours come from the booked technician slot, falling back to the service's
+-- estimated duration.
+CREATE OR REPLACE FUNCTION public.record_workorder_fact(p_workorderid INTEGER)
+RETURNS void AS $$
+BEGIN
+  DELETE FROM public.financial_workorder_facts WHERE workorderid = p_workorderid;
+
+  INSERT INTO public.financial_workorder_facts
+    (workorderid, work_date, requestid, customerid, service_id, service_type_id, employeeid,
+     revenue, labor_hours, labor_cost, material_cost)
+  SELECT w.workorderid, w.scheduleddate, w.requestid, w.customerid, s.service_id, s.service_type_id,
+         COALESCE(ts.employeeid, wa.employeeid),
+         COALESCE(s.service_price, 0),
+         h.hours,
+         h.hours * COALESCE(e.hourly_rate, 0),
+         w.material_cost
+  FROM public.workorders w
+  LEFT JOIN public.servicerequests sr ON sr.requestid = w.requestid
+  LEFT JOIN public.services s ON s.service_id = sr.service_id
+  LEFT JOIN LATERAL (
+    SELECT t.employeeid, EXTRACT(EPOCH FROM upper(t.slot) - lower(t.slot)) / 3600 AS hours
+    FROM public.technician_schedule t
+    WHERE t.requestid = w.requestid
+    ORDER BY lower(t.slot)
+    LIMIT 1
+  ) ts ON TRUE
+  LEFT JOIN LATERAL (
+    SELECT a.employeeid
+    FROM public.work_assignments a
+    WHERE a.requestid = w.requestid
+    ORDER BY a.employeeid
+    LIMIT 1
+  ) wa ON ts.employeeid IS NULL
+  LEFT JOIN public.employee e ON e.employeeid = COALESCE(ts.employeeid, wa.employeeid)
+  CROSS JOIN LATERAL (
+    SELECT COALESCE(ts.hours, s.duration_hours, 0)::NUMERIC(8,2) AS hours
+  ) h
+  WHERE w.workorderid = p_workorderid
+    AND w.iscompleted
+    AND w.scheduleddate IS NOT NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.workorders_track_financials() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    IF TG_OP = 'DELETE' OR OLD.workorderid <> NEW.workorderid THEN
+      DELETE FROM public.financial_workorder_facts WHERE workorderid = OLD.workorderid;
+    END IF;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    IF NEW.iscompleted THEN
+      PERFORM public.record_workorder_fact(NEW.workorderid);
+    ELSIF TG_OP = 'UPDATE' THEN
+      DELETE FROM public.financial_workorder_facts WHERE workorderid = NEW.workorderid;
+    END IF;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS workorders_track_financials ON public.workorders;
+CREATE TRIGGER workorders_track_financials
+  AFTER INSERT OR DELETE
+     OR UPDATE OF workorderid, iscompleted, scheduleddate, requestid, customerid, material_cost
+  ON public.workorders
+  FOR EACH ROW EXECUTE FUNCTION public.workorders_track_financials();
+
+-- A completed workorder whose technician is assigned or changed afterwards
+-- moves its amounts to the new technician
+CREATE INDEX IF NOT EXISTS workorders_requestid_idx ON public.workorders (requestid);
+
+CREATE OR REPLACE FUNCTION public.work_assignments_track_financials() RETURNS trigger AS $$
+BEGIN
+  PERFORM public.record_workorder_fact(w.workorderid)
+  FROM public.workorders w
+  WHERE w.iscompleted
+    AND w.requestid IN (
+      CASE WHEN TG_OP <> 'INSERT' THEN OLD.requestid END,
+      CASE WHEN TG_OP <> 'DELETE' THEN NEW.requestid END
+    );
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS work_assignments_track_financials ON public.work_assignments;
+CREATE TRIGGER work_assignments_track_financials
+  AFTER INSERT OR DELETE OR UPDATE OF employeeid, requestid ON public.work_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.work_assignments_track_financials();
+
+-- Rebuild everything from workorders (backfill, or repair after bulk edits
+-- made with triggers disabled)
+CREATE OR REPLACE FUNCTION public.rebuild_financial_rollups()
+RETURNS INTEGER AS $$
+DECLARE
+  n INTEGER;
+BEGIN
+  ALTER TABLE public.financial_workorder_facts DISABLE TRIGGER financial_facts_track_rollups;
+  TRUNCATE public.financial_workorder_facts, public.financial_daily_service_type,
+           public.financial_daily_technician;
+
+  PERFORM public.record_workorder_fact(w.workorderid)
+  FROM public.workorders w
+  WHERE w.iscompleted;
+  GET DIAGNOSTICS n = ROW_COUNT;
+
+  INSERT INTO public.financial_daily_service_type
+    (work_date, service_type_id, orders, revenue, labor_hours, labor_cost, material_cost)
+  SELECT work_date, service_type_id, COUNT(*), SUM(revenue), SUM(labor_hours), SUM(labor_cost), SUM(material_cost)
+  FROM public.financial_workorder_facts
+  WHERE service_type_id IS NOT NULL
+  GROUP BY work_date, service_type_id;
+
+  INSERT INTO public.financial_daily_technician
+    (work_date, employeeid, orders, revenue, labor_hours, labor_cost, material_cost)
+  SELECT work_date, employeeid, COUNT(*), SUM(revenue), SUM(labor_hours), SUM(labor_cost), SUM(material_cost)
+  FROM public.financial_workorder_facts
+  WHERE employeeid IS NOT NULL
+  GROUP BY work_date, employeeid;
+
+  ALTER TABLE public.financial_workorder_facts ENABLE TRIGGER financial_facts_track_rollups;
+  RETURN n;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT public.rebuild_financial_rollups();
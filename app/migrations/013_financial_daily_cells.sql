@@ -0,0 +1,108 @@
+-- Finest-grained financial rollup for the analytics report engine.
+-- One row per (day, technician, service type) with the summed amounts of the
+-- completed workorders in it. Any grouping of technician, service type and
+-- day/week/month is a re-aggregation of these cells, so the report engine
+-- loads a few rows per day instead of every workorder in a multi-year range.
+-- employeeid / service_type_id 0 stand for "unassigned" / "unknown".
+
+CREATE TABLE IF NOT EXISTS public.financial_daily_cell (
+  work_date       DATE          NOT NULL,
+  employeeid      INTEGER       NOT NULL,
+  service_type_id INTEGER       NOT NULL,
+  orders          INTEGER       NOT NULL DEFAULT 0,
+  revenue         NUMERIC(14,2) NOT NULL DEFAULT 0,
+  labor_hours     NUMERIC(12,2) NOT NULL DEFAULT 0,
+  labor_cost      NUMERIC(14,2) NOT NULL DEFAULT 0,
+  material_cost   NUMERIC(14,2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (work_date, employeeid, service_type_id)
+);
+
+CREATE OR REPLACE FUNCTION public.add_financial_cell(f public.financial_workorder_facts, p_sign INTEGER)
+RETURNS void AS $$
+BEGIN
+  INSERT INTO public.financial_daily_cell AS r
+    (work_date, employeeid, service_type_id, orders, revenue, labor_hours, labor_cost, material_cost)
+  VALUES (f.work_date, COALESCE(f.employeeid, 0), COALESCE(f.service_type_id, 0), p_sign,
+          p_sign * f.revenue, p_sign * f.labor_hours, p_sign * f.labor_cost, p_sign * f.material_cost)
+  ON CONFLICT (work_date, employeeid, service_type_id) DO UPDATE SET
+    orders        = r.orders + EXCLUDED.orders,
+    revenue       = r.revenue + EXCLUDED.revenue,
+    labor_hours   = r.labor_hours + EXCLUDED.labor_hours,
+    labor_cost    = r.labor_cost + EXCLUDED.labor_cost,
+    material_cost = r.material_cost + EXCLUDED.material_cost;
+
+  DELETE FROM public.financial_daily_cell
+  WHERE work_date = f.work_date
+    AND employeeid = COALESCE(f.employeeid, 0)
+    AND service_type_id = COALESCE(f.service_type_id, 0)
+    AND orders = 0;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.financial_facts_track_cells() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.add_financial_cell(OLD, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.add_financial_cell(NEW, 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS financial_facts_track_cells ON public.financial_workorder_facts;
+CREATE TRIGGER financial_facts_track_cells
+  AFTER INSERT OR UPDATE OR DELETE ON public.financial_workorder_facts
+  FOR EACH ROW EXECUTE FUNCTION public.financial_facts_track_cells();
+
+-- Rebuild now covers the cells too
+CREATE OR REPLACE FUNCTION public.rebuild_financial_rollups()
+RETURNS INTEGER AS $$
+DECLARE
+  n INTEGER;
+BEGIN
+  ALTER TABLE public.financial_workorder_facts DISABLE TRIGGER financial_facts_track_rollups;
+  ALTER TABLE public.financial_workorder_facts DISABLE TRIGGER financial_facts_track_cells;
+  TRUNCATE public.financial_workorder_facts, public.financial_daily_service_type,
+           public.financial_daily_technician, public.financial_daily_cell;
+
+  PERFORM public.record_workorder_fact(w.workorderid)
+  FROM public.workorders w
+  WHERE w.iscompleted;
+  GET DIAGNOSTICS n = ROW_COUNT;
+
+  INSERT INTO public.financial_daily_service_type
+    (work_date, service_type_id, orders, revenue, labor_hours, labor_cost, material_cost)
+  SELECT work_date, service_type_id, COUNT(*), SUM(revenue), SUM(labor_hours), SUM(labor_cost), SUM(material_cost)
+  FROM public.financial_workorder_facts
+  WHERE service_type_id IS NOT NULL
+  GROUP BY work_date, service_type_id;
+
+  INSERT INTO public.financial_daily_technician
+    (work_date, employeeid, orders, revenue, labor_hours, labor_cost, material_cost)
+  SELECT work_date, employeeid, COUNT(*), SUM(revenue), SUM(labor_hours), SUM(labor_cost), SUM(material_cost)
+  FROM public.financial_workorder_facts
+  WHERE employeeid IS NOT NULL
+  GROUP BY work_date, employeeid;
+
+  INSERT INTO public.financial_daily_cell
+    (work_date, employeeid, service_type_id, orders, revenue, labor_hours, labor_cost, material_cost)
+  SELECT work_date, COALESCE(employeeid, 0), COALESCE(service_type_id, 0),
+         COUNT(*), SUM(revenue), SUM(labor_hours), SUM(labor_cost), SUM(material_cost)
+  FROM public.financial_workorder_facts
+  GROUP BY 1, 2, 3;
+
+  ALTER TABLE public.financial_workorder_facts ENABLE TRIGGER financial_facts_track_rollups;
+  ALTER TABLE public.financial_workorder_facts ENABLE TRIGGER financial_facts_track_cells;
+  RETURN n;
+END;
+$$ LANGUAGE plpgsql;
+
+INSERT INTO public.financial_daily_cell
+  (work_date, employeeid, service_type_id, orders, revenue, labor_hours, labor_cost, material_cost)
+SELECT work_date, COALESCE(employeeid, 0), COALESCE(service_type_id, 0),
+       COUNT(*), SUM(revenue), SUM(labor_hours), SUM(labor_cost), SUM(material_cost)
+FROM public.financial_workorder_facts
+GROUP BY 1, 2, 3
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,51 @@
+-- Technician availability and time off as indexed time ranges.
+-- technician_availability holds the hours a technician offered to work
+-- (kind 'available') and approved time off (kind 'unavailable'). Calendar
+-- views ask for the periods overlapping the visible window, which the GiST
+-- index answers without reading anyone's history outside it.
+-- Time-off requests wait in availability_requests until an admin approves
+-- them; approval copies their periods into technician_availability.
+--
+-- employee_span is a single-element int4range, as in technician_schedule,
+-- so technician filters use core GiST range operators without btree_gist.
+
+CREATE TABLE IF NOT EXISTS public.availability_requests (
+  request_id    SERIAL PRIMARY KEY,
+  employeeid    INTEGER     NOT NULL REFERENCES public.employee (employeeid) ON DELETE CASCADE,
+  request_type  TEXT        NOT NULL,
+  reason        TEXT,
+  full_day      BOOLEAN     NOT NULL DEFAULT TRUE,
+  periods       TSTZRANGE[] NOT NULL,
+  status        TEXT        NOT NULL DEFAULT 'pending'
+                CHECK (status IN ('pending', 'approved', 'rejected')),
+  requested_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  reviewed_by   TEXT,
+  reviewed_at   TIMESTAMPTZ,
+  review_note   TEXT
+);
+
+CREATE INDEX IF NOT EXISTS availability_requests_status_idx
+  ON public.availability_requests (status, requested_at, request_id);
+
+CREATE TABLE IF NOT EXISTS public.technician_availability (
+  availability_id SERIAL PRIMARY KEY,
+  employeeid      INTEGER   NOT NULL REFERENCES public.employee (employeeid) ON DELETE CASCADE,
+  kind            TEXT      NOT NULL CHECK (kind IN ('available', 'unavailable')),
+  period          TSTZRANGE NOT NULL CHECK (NOT isempty(period)),
+  employee_span   INT4RANGE GENERATED ALWAYS AS (int4range(employeeid, employeeid, '[]')) STORED,
+  request_id      INTEGER   REFERENCES public.availability_requests (request_id) ON DELETE CASCADE,
+  label           TEXT,
+  notes           TEXT,
+  created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  -- Offered hours never overlap; submitting new hours for a day replaces the old ones
+  CONSTRAINT technician_availability_no_overlap
+    EXCLUDE USING gist (employee_span WITH &&, period WITH &&) WHERE (kind = 'available')
+);
+
+-- Window queries: period first, optionally narrowed to one technician
+CREATE INDEX IF NOT EXISTS technician_availability_period_idx
+  ON public.technician_availability USING gist (period, employee_span);
+
+-- Calendar windows over bookings for every technician at once
+CREATE INDEX IF NOT EXISTS technician_schedule_slot_idx
+  ON public.technician_schedule USING gist (slot);
@@ -0,0 +1,159 @@
+-- Technician job status, notes and an incremental sync feed.
+-- work_assignments gains the technician's status and notes, plus
+-- change_xid: the transaction that last changed the job as the technician
+-- sees it. Touch triggers on the request, its booking, its workorders and
+-- its customer bump it too. A phone that synced with token T asks for rows
+-- with change_xid >= T, and one index range scan returns only the delta.
+--
+-- The token handed out is the xmin of the reading transaction's snapshot,
+-- not the highest change seen. Every transaction the reader could not see
+-- has an xid >= xmin, so one that commits late is picked up next time
+-- instead of being skipped. A few rows may come back twice; clients upsert.
+--
+-- Assignments that leave a technician (deleted or moved to someone else)
+-- are recorded in work_assignment_removals so the old owner's phone drops them.
+
+ALTER TABLE public.work_assignments
+  ADD COLUMN IF NOT EXISTS status TEXT NOT NULL DEFAULT 'pending'
+    CHECK (status IN ('pending', 'in-progress', 'completed', 'cancelled')),
+  ADD COLUMN IF NOT EXISTS notes TEXT,
+  ADD COLUMN IF NOT EXISTS cancel_reason TEXT,
+  ADD COLUMN IF NOT EXISTS cancel_description TEXT,
+  ADD COLUMN IF NOT EXISTS cancelled_at TIMESTAMPTZ,
+  ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  ADD COLUMN IF NOT EXISTS change_xid XID8 NOT NULL DEFAULT pg_current_xact_id();
+
+CREATE INDEX IF NOT EXISTS work_assignments_sync_idx
+  ON public.work_assignments (employeeid, change_xid);
+
+CREATE INDEX IF NOT EXISTS work_assignments_requestid_idx
+  ON public.work_assignments (requestid);
+
+CREATE TABLE IF NOT EXISTS public.work_assignment_removals (
+  assignment_id INTEGER     NOT NULL,
+  employeeid    INTEGER     NOT NULL,
+  change_xid    XID8        NOT NULL DEFAULT pg_current_xact_id(),
+  removed_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS work_assignment_removals_sync_idx
+  ON public.work_assignment_removals (employeeid, change_xid);
+
+-- Any update stamps the row, so "touching" an assignment is UPDATE ... SET updated_at = NOW()
+CREATE OR REPLACE FUNCTION public.work_assignments_stamp_change() RETURNS trigger AS $$
+BEGIN
+  NEW.change_xid := pg_current_xact_id();
+  NEW.updated_at := NOW();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS work_assignments_stamp_change ON public.work_assignments;
+CREATE TRIGGER work_assignments_stamp_change
+  BEFORE UPDATE ON public.work_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.work_assignments_stamp_change();
+
+CREATE OR REPLACE FUNCTION public.work_assignments_track_removal() RETURNS trigger AS $$
+BEGIN
+  IF OLD.employeeid IS NOT NULL
+     AND (TG_OP = 'DELETE' OR OLD.employeeid IS DISTINCT FROM NEW.employeeid) THEN
+    INSERT INTO public.work_assignment_removals (assignment_id, employeeid)
+    VALUES (OLD.assignment_id, OLD.employeeid);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS work_assignments_track_removal ON public.work_assignments;
+CREATE TRIGGER work_assignments_track_removal
+  AFTER DELETE OR UPDATE OF employeeid ON public.work_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.work_assignments_track_removal();
+
+-- Changes to what a job shows (time, description, workorder, customer) touch its assignments
+CREATE OR REPLACE FUNCTION public.touch_work_assignments() RETURNS trigger AS $$
+BEGIN
+  -- TG_ARGV[0] is the column holding the service request ID
+  UPDATE public.work_assignments
+  SET updated_at = NOW()
+  WHERE requestid IN (
+    (CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) ->> TG_ARGV[0] END)::int,
+    (CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) ->> TG_ARGV[0] END)::int
+  );
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS servicerequests_touch_assignments ON public.servicerequests;
+CREATE TRIGGER servicerequests_touch_assignments
+  AFTER UPDATE ON public.servicerequests
+  FOR EACH ROW EXECUTE FUNCTION public.touch_work_assignments('requestid');
+
+DROP TRIGGER IF EXISTS technician_schedule_touch_assignments ON public.technician_schedule;
+CREATE TRIGGER technician_schedule_touch_assignments
+  AFTER UPDATE OR DELETE ON public.technician_schedule
+  FOR EACH ROW EXECUTE FUNCTION public.touch_work_assignments('requestid');
+
+DROP TRIGGER IF EXISTS workorders_touch_assignments ON public.workorders;
+CREATE TRIGGER workorders_touch_assignments
+  AFTER INSERT OR UPDATE OR DELETE ON public.workorders
+  FOR EACH ROW EXECUTE FUNCTION public.touch_work_assignments('requestid');
+
+CREATE OR REPLACE FUNCTION public.customer_touch_assignments() RETURNS trigger AS $$
+BEGIN
+  UPDATE public.work_assignments wa
+  SET updated_at = NOW()
+  FROM public.servicerequests sr
+  WHERE sr.customerid = NEW.customerid
+    AND wa.requestid = sr.requestid;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS customer_touch_assignments ON public.customer;
+CREATE TRIGGER customer_touch_assignments
+  AFTER UPDATE OF firstname, lastname, phone, email ON public.customer
+  FOR EACH ROW EXECUTE FUNCTION public.customer_touch_assignments();
+
+-- Cancelled assignments no longer count toward a technician's daily load
+-- (replaces the functions from 003_technician_daily_load.sql)
+CREATE OR REPLACE FUNCTION public.work_assignments_track_load() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status <> 'cancelled' THEN
+    PERFORM public.adjust_technician_load(OLD.employeeid, OLD.requestid, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status <> 'cancelled' THEN
+    PERFORM public.adjust_technician_load(NEW.employeeid, NEW.requestid, 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS work_assignments_track_load ON public.work_assignments;
+CREATE TRIGGER work_assignments_track_load
+  AFTER INSERT OR DELETE OR UPDATE OF employeeid, requestid, status ON public.work_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.work_assignments_track_load();
+
+CREATE OR REPLACE FUNCTION public.servicerequests_track_load() RETURNS trigger AS $$
+DECLARE
+  emp INTEGER;
+BEGIN
+  IF OLD.preferred_datetime::date IS NOT DISTINCT FROM NEW.preferred_datetime::date THEN
+    RETURN NULL;
+  END IF;
+
+  FOR emp IN
+    SELECT wa.employeeid
+    FROM public.work_assignments wa
+    WHERE wa.requestid = NEW.requestid
+      AND wa.status <> 'cancelled'
+  LOOP
+    IF OLD.preferred_datetime IS NOT NULL THEN
+      UPDATE public.technician_daily_load
+      SET job_count = GREATEST(job_count - 1, 0)
+      WHERE employeeid = emp AND work_date = OLD.preferred_datetime::date;
+    END IF;
+    PERFORM public.adjust_technician_load(emp, NEW.requestid, 1);
+  END LOOP;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
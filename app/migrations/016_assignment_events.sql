@@ -0,0 +1,37 @@
+-- Publish work assignment changes on the change feed for live dashboards.
+-- Unlike notify_table_change, the payload carries who the assignment belongs
+-- to and its status, so each worker can route the event to the right
+-- technician and admin streams without querying the database:
+-- {"table": "work_assignments", "op": "INSERT|UPDATE|DELETE", "id": "<assignment_id>",
+--  "requestid": ..., "employeeid": ..., "old_employeeid": ..., "status": ..., "old_status": ...}
+-- NOTIFY is delivered on commit, so rolled-back bookings never reach a browser.
+
+CREATE OR REPLACE FUNCTION public.work_assignments_notify_change() RETURNS trigger AS $$
+DECLARE
+  cur RECORD;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    cur := OLD;
+  ELSE
+    cur := NEW;
+  END IF;
+
+  PERFORM pg_notify('table_changes', json_build_object(
+    'table', TG_TABLE_NAME,
+    'op', TG_OP,
+    'id', cur.assignment_id::text,
+    'requestid', cur.requestid,
+    'employeeid', CASE WHEN TG_OP <> 'DELETE' THEN NEW.employeeid END,
+    'old_employeeid', CASE WHEN TG_OP <> 'INSERT' THEN OLD.employeeid END,
+    'status', CASE WHEN TG_OP <> 'DELETE' THEN NEW.status END,
+    'old_status', CASE WHEN TG_OP <> 'INSERT' THEN OLD.status END
+  )::text);
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS work_assignments_notify_change ON public.work_assignments;
+CREATE TRIGGER work_assignments_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.work_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.work_assignments_notify_change();
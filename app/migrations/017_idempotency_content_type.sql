@@ -0,0 +1,8 @@
+-- Keep the Content-Type of stored idempotent responses, so responses that
+-- aren't JSON (e.g. an HTML error page from abort()) are replayed as sent
+-- instead of being left without a status code, which made every retry
+-- answer 409 until the key expired.
+-- NULL means application/json (rows stored before this migration).
+
+ALTER TABLE public.idempotency_keys
+  ADD COLUMN IF NOT EXISTS content_type TEXT;
@@ -0,0 +1,8 @@
+-- Index the admin warranty search. The search matches the start of the
+-- customer's email or name (case-insensitive), which these indexes serve;
+-- a substring match had to scan the whole summary table.
+
+CREATE INDEX IF NOT EXISTS warranty_summary_email_search_idx
+  ON public.warranty_summary (lower(customer_email) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS warranty_summary_name_search_idx
+  ON public.warranty_summary (lower(customer_name) text_pattern_ops);
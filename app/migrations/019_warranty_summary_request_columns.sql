@@ -0,0 +1,10 @@
+-- Refresh the warranty summary only when a service request column it shows
+-- changes. The trigger fired on every UPDATE of service_requests, so each
+-- dispatch claim, release and resolve (status and dispatch columns only)
+-- rebuilt the warranty's summary row for nothing.
+
+DROP TRIGGER IF EXISTS service_requests_track_warranty_summary ON public.service_requests;
+CREATE TRIGGER service_requests_track_warranty_summary
+  AFTER INSERT OR DELETE OR UPDATE OF warranty_id, issue_type, urgency, problem_description, created_at
+  ON public.service_requests
+  FOR EACH ROW EXECUTE FUNCTION public.service_requests_track_warranty_summary();
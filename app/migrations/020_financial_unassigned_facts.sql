@@ -0,0 +1,63 @@
+-- Financial reports: unassigned work and the current assignee.
+-- Workorders without a technician, or whose service has no type, are in
+-- financial_workorder_facts but not in the matching daily rollup. Reports
+-- read them straight from the facts; these partial indexes keep that to
+-- the few rows in the date range.
+-- A completed workorder without a booked slot was credited to the lowest
+-- employeeid among all its assignments, including cancelled and replaced
+-- ones. It now goes to the current assignment: the latest one that isn't
+-- cancelled (or the latest cancelled one if that's all there is).
+
+CREATE INDEX IF NOT EXISTS financial_workorder_facts_unassigned_idx
+  ON public.financial_workorder_facts (work_date) WHERE employeeid IS NULL;
+CREATE INDEX IF NOT EXISTS financial_workorder_facts_untyped_idx
+  ON public.financial_workorder_facts (work_date) WHERE service_type_id IS NULL;
+
+CREATE OR REPLACE FUNCTION public.record_workorder_fact(p_workorderid INTEGER)
+RETURNS void AS $$
+BEGIN
+  DELETE FROM public.financial_workorder_facts WHERE workorderid = p_workorderid;
+
+  INSERT INTO public.financial_workorder_facts
+    (workorderid, work_date, requestid, customerid, service_id, service_type_id, employeeid,
+     revenue, labor_hours, labor_cost, material_cost)
+  SELECT w.workorderid, w.scheduleddate, w.requestid, w.customerid, s.service_id, s.service_type_id,
+         COALESCE(ts.employeeid, wa.employeeid),
+         COALESCE(s.service_price, 0),
+         h.hours,
+         h.hours * COALESCE(e.hourly_rate, 0),
+         w.material_cost
+  FROM public.workorders w
+  LEFT JOIN public.servicerequests sr ON sr.requestid = w.requestid
+  LEFT JOIN public.services s ON s.service_id = sr.service_id
+  LEFT JOIN LATERAL (
+    SELECT t.employeeid, EXTRACT(EPOCH FROM upper(t.slot) - lower(t.slot)) / 3600 AS hours
+    FROM public.technician_schedule t
+    WHERE t.requestid = w.requestid
+    ORDER BY lower(t.slot)
+    LIMIT 1
+  ) ts ON TRUE
+  LEFT JOIN LATERAL (
+    SELECT a.employeeid
+    FROM public.work_assignments a
+    WHERE a.requestid = w.requestid
+    ORDER BY a.status = 'cancelled', a.assignment_id DESC
+    LIMIT 1
+  ) wa ON ts.employeeid IS NULL
+  LEFT JOIN public.employee e ON e.employeeid = COALESCE(ts.employeeid, wa.employeeid)
+  CROSS JOIN LATERAL (
+    SELECT COALESCE(ts.hours, s.duration_hours, 0)::NUMERIC(8,2) AS hours
+  ) h
+  WHERE w.workorderid = p_workorderid
+    AND w.iscompleted
+    AND w.scheduleddate IS NOT NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Cancelling an assignment can change who the current assignee is
+DROP TRIGGER IF EXISTS work_assignments_track_financials ON public.work_assignments;
+CREATE TRIGGER work_assignments_track_financials
+  AFTER INSERT OR DELETE OR UPDATE OF employeeid, requestid, status ON public.work_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.work_assignments_track_financials();
+
+SELECT public.rebuild_financial_rollups();
@@ -5,5 +5,13 @@ from .base_repository import BaseRepository
 from .workorder_repository import WorkorderRepository
 from .warranty_repository import WarrantyRepository
 from .service_repository import ServiceRepository
+from .migration_repository import MigrationRepository
+from .schedule_repository import ScheduleRepository
+from .idempotency_repository import IdempotencyRepository
+from .job_repository import JobRepository
+from .dispatch_repository import DispatchRepository
+from .financial_repository import FinancialRepository
+from .availability_repository import AvailabilityRepository
+from .employee_job_repository import EmployeeJobRepository
 
-__all__ = ['BaseRepository', 'WorkorderRepository', 'WarrantyRepository', 'ServiceRepository']
+__all__ = ['BaseRepository', 'WorkorderRepository', 'WarrantyRepository', 'ServiceRepository', 'MigrationRepository', 'ScheduleRepository', 'IdempotencyRepository', 'JobRepository', 'DispatchRepository', 'FinancialRepository', 'AvailabilityRepository', 'EmployeeJobRepository']
@@ -0,0 +1,255 @@
+"""
+Repository for technician availability data access.
+Handles offered hours, time off and time-off requests as time ranges in
+technician_availability and availability_requests using raw SQL.
+"""
+from .base_repository import BaseRepository
+from .schedule_repository import ScheduleRepository
+
+
+class AvailabilityRepository(BaseRepository):
+    """Repository for technician availability, time off and bookings by time window."""
+    
+    _REQUEST_COLUMNS = """
+        r.request_id, r.employeeid, e.firstname, e.lastname, r.request_type, r.reason,
+        r.full_day, r.status, r.requested_at, r.reviewed_by, r.reviewed_at, r.review_note,
+        ARRAY(
+            SELECT ARRAY[lower(p)::timestamp, upper(p)::timestamp]
+            FROM unnest(r.periods) AS p
+            ORDER BY lower(p)
+        ) AS periods
+    """
+    
+    @staticmethod
+    def list_technicians():
+        """
+        List every technician.
+        
+        Returns:
+            list[dict]: employeeid, firstname, lastname
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute("""
+                SELECT employeeid, firstname, lastname
+                FROM employee
+                ORDER BY firstname, lastname, employeeid;
+            """)
+            return cur.fetchall()
+    
+    @staticmethod
+    def list_periods(start, end, employee_id=None, kinds=('available', 'unavailable')):
+        """
+        List availability periods overlapping [start, end).
+        
+        Args:
+            start (datetime): Start of the window
+            end (datetime): End of the window
+            employee_id (int, optional): Only this technician
+            kinds (tuple): 'available' and/or 'unavailable'
+        
+        Returns:
+            list[dict]: availability_id, employeeid, firstname, lastname, kind,
+            period_start, period_end, label, notes
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute("""
+                SELECT a.availability_id, a.employeeid, e.firstname, e.lastname, a.kind,
+                       lower(a.period)::timestamp AS period_start,
+                       upper(a.period)::timestamp AS period_end,
+                       a.label, a.notes
+                FROM technician_availability a
+                JOIN employee e ON e.employeeid = a.employeeid
+                WHERE a.period && tstzrange(%(start)s, %(end)s)
+                  AND (%(employee_id)s::int IS NULL OR a.employee_span @> %(employee_id)s::int)
+                  AND a.kind = ANY(%(kinds)s)
+                ORDER BY lower(a.period), a.employeeid;
+            """, {'start': start, 'end': end, 'employee_id': employee_id, 'kinds': list(kinds)})
+            return cur.fetchall()
+    
+    @staticmethod
+    def list_bookings(start, end, employee_id=None):
+        """
+        List booked jobs overlapping [start, end).
+        
+        Args:
+            start (datetime): Start of the window
+            end (datetime): End of the window
+            employee_id (int, optional): Only this technician
+        
+        Returns:
+            list[dict]: schedule_id, employeeid, firstname, lastname, requestid,
+            slot_start, slot_end, workorderid, customer_firstname,
+            customer_lastname, service_name
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute("""
+                SELECT ts.schedule_id, ts.employeeid, e.firstname, e.lastname, ts.requestid,
+                       lower(ts.slot)::timestamp AS slot_start,
+                       upper(ts.slot)::timestamp AS slot_end,
+                       w.workorderid, c.firstname AS customer_firstname,
+                       c.lastname AS customer_lastname, s.job_name AS service_name
+                FROM technician_schedule ts
+                JOIN employee e ON e.employeeid = ts.employeeid
+                JOIN servicerequests sr ON sr.requestid = ts.requestid
+                LEFT JOIN customer c ON c.customerid = sr.customerid
+                LEFT JOIN services s ON s.service_id = sr.service_id
+                LEFT JOIN LATERAL (
+                    SELECT wo.workorderid
+                    FROM workorders wo
+                    WHERE wo.requestid = ts.requestid
+                    ORDER BY wo.workorderid
+                    LIMIT 1
+                ) w ON TRUE
+                WHERE ts.slot && tstzrange(%(start)s, %(end)s)
+                  AND (%(employee_id)s::int IS NULL OR ts.employee_span @> %(employee_id)s::int)
+                ORDER BY lower(ts.slot), ts.employeeid;
+            """, {'start': start, 'end': end, 'employee_id': employee_id})
+            return cur.fetchall()
+    
+    @staticmethod
+    def add_periods(employee_id, kind, periods, request_id=None, label=None, notes=None):
+        """
+        Record availability periods for a technician.
+        
+        Offered hours ('available') replace any offered hours on the same
+        days, so resubmitting a day updates it instead of conflicting. Time
+        off ('unavailable') is added under the technician's calendar lock, so
+        a booking running at the same time either sees it or commits first.
+        
+        Args:
+            employee_id (int): Technician
+            kind (str): 'available' or 'unavailable'
+            periods (list[tuple]): (start, end) datetimes
+            request_id (int, optional): Approved request the periods came from
+            label (str, optional): Kind of time off, e.g. 'Sick Leave'
+            notes (str, optional): Free-text notes
+        
+        Returns:
+            list[int]: New availability IDs
+        """
+        with BaseRepository.get_cursor() as cur:
+            if kind == 'unavailable':
+                cur.execute(ScheduleRepository.LOCK_CALENDARS, ([employee_id],))
+            if kind == 'available':
+                cur.execute("""
+                    DELETE FROM technician_availability a
+                    USING unnest(%s::timestamp[]) AS d(day)
+                    WHERE a.employee_span @> %s::int
+                      AND a.kind = 'available'
+                      AND a.period && tstzrange(d.day::date, d.day::date + 1);
+                """, ([start for start, _ in periods], employee_id))
+            
+            cur.execute("""
+                INSERT INTO technician_availability (employeeid, kind, period, request_id, label, notes)
+                SELECT %s, %s, tstzrange(p.period_start, p.period_end), %s, %s, %s
+                FROM unnest(%s::timestamp[], %s::timestamp[]) AS p(period_start, period_end)
+                RETURNING availability_id;
+            """, (employee_id, kind, request_id, label, notes,
+                  [start for start, _ in periods], [end for _, end in periods]))
+            return [row[0] for row in cur.fetchall()]
+    
+    @staticmethod
+    def create_request(employee_id, request_type, reason, full_day, periods):
+        """
+        Record a pending time-off or availability change request.
+        
+        Args:
+            employee_id (int): Requesting technician
+            request_type (str): e.g. 'time-off', 'sick-leave'
+            reason (str): Why the technician asks
+            full_day (bool): Whether the periods cover whole days
+            periods (list[tuple]): (start, end) datetimes
+        
+        Returns:
+            dict: The request, as from get_request
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                INSERT INTO availability_requests (employeeid, request_type, reason, full_day, periods)
+                SELECT %s, %s, %s, %s, array_agg(tstzrange(p.period_start, p.period_end) ORDER BY p.period_start)
+                FROM unnest(%s::timestamp[], %s::timestamp[]) AS p(period_start, period_end)
+                RETURNING request_id;
+            """, (employee_id, request_type, reason, full_day,
+                  [start for start, _ in periods], [end for _, end in periods]))
+            request_id = cur.fetchone()[0]
+        return AvailabilityRepository.get_request(request_id)
+    
+    @staticmethod
+    def get_request(request_id):
+        """
+        Get one availability request.
+        
+        Args:
+            request_id (int): Request ID
+        
+        Returns:
+            dict or None: request_id, employeeid, firstname, lastname,
+            request_type, reason, full_day, status, requested_at, reviewed_by,
+            reviewed_at, review_note and periods ([start, end] pairs)
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {AvailabilityRepository._REQUEST_COLUMNS}
+                FROM availability_requests r
+                JOIN employee e ON e.employeeid = r.employeeid
+                WHERE r.request_id = %s;
+            """, (request_id,))
+            return cur.fetchone()
+    
+    @staticmethod
+    def list_requests(status='pending', employee_id=None, limit=50):
+        """
+        List availability requests, oldest first.
+        
+        Args:
+            status (str, optional): 'pending', 'approved' or 'rejected'; None for all
+            employee_id (int, optional): Only this technician's requests
+            limit (int): Maximum number of requests
+        
+        Returns:
+            list[dict]: Requests, as from get_request
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {AvailabilityRepository._REQUEST_COLUMNS}
+                FROM availability_requests r
+                JOIN employee e ON e.employeeid = r.employeeid
+                WHERE (%(status)s::text IS NULL OR r.status = %(status)s)
+                  AND (%(employee_id)s::int IS NULL OR r.employeeid = %(employee_id)s)
+                ORDER BY r.requested_at, r.request_id
+                LIMIT %(limit)s;
+            """, {'status': status, 'employee_id': employee_id, 'limit': limit})
+            return cur.fetchall()
+    
+    @staticmethod
+    def review(request_id, status, reviewed_by, note=None):
+        """
+        Approve or reject a pending request.
+        
+        Only pending requests change, so two admins reviewing the same
+        request at once can't both succeed.
+        
+        Args:
+            request_id (int): Request ID
+            status (str): 'approved' or 'rejected'
+            reviewed_by (str): Who reviewed it
+            note (str, optional): Reviewer's note, e.g. a rejection reason
+        
+        Returns:
+            dict or None: employeeid, request_type, full_day and periods
+            ([start, end] pairs), or None if the request isn't pending
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute("""
+                UPDATE availability_requests r
+                SET status = %s, reviewed_by = %s, reviewed_at = NOW(), review_note = %s
+                WHERE r.request_id = %s
+                  AND r.status = 'pending'
+                RETURNING r.employeeid, r.request_type, r.reason, r.full_day,
+                          ARRAY(
+                              SELECT ARRAY[lower(p)::timestamp, upper(p)::timestamp]
+                              FROM unnest(r.periods) AS p
+                              ORDER BY lower(p)
+                          ) AS periods;
+            """, (status, reviewed_by, note, request_id))
+            return cur.fetchone()
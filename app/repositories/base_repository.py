@@ -3,35 +3,359 @@ Base repository class with database connection management.
 Provides common functionality for all repositories.
 """
 import os
+import uuid
+import threading
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
+from contextvars import ContextVar
+from .connection_pool import ConnectionPool
+
+
+class UnitOfWork:
+    """
+    A transaction shared by every repository call made while it is active.
+
+    The connection is borrowed lazily on first use, so a unit of work that
+    never touches the database costs nothing. Repository calls made inside it
+    reuse the same connection and are committed (or rolled back) together.
+
+    A failing repository call rolls the unit back and marks it rollback-only,
+    so nothing written before it is committed. Code that means to recover
+    from a failure wraps those calls in a nested unit_of_work(), which runs
+    under a savepoint: an error there undoes only that block.
+    """
+
+    def __init__(self):
+        self.conn = None
+        self.rollback_only = False
+        self._after_commit = []
+        self._savepoints = 0
+        self._depth = 0
+
+    def connection(self):
+        """Get the unit's connection, borrowing one from the pool on first use."""
+        if self.conn is None:
+            self.conn = BaseRepository.get_pool().getconn()
+        return self.conn
+
+    @contextmanager
+    def savepoint(self):
+        """
+        Run a block whose statements are rolled back on their own if it raises.
+
+        Nothing is set up while the transaction is still empty; an error then
+        simply rolls the whole (empty) transaction back. If the savepoint
+        can't be restored (e.g. the connection dropped) the unit is marked
+        rollback-only.
+
+        Yields:
+            connection: The unit's connection
+        """
+        conn = self.connection()
+        callbacks = len(self._after_commit)
+        name = None
+        if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            self._savepoints += 1
+            name = f"uow_{self._savepoints}"
+            with conn.cursor() as cur:
+                cur.execute(f"SAVEPOINT {name}")
+        self._depth += 1
+        try:
+            yield conn
+        except Exception:
+            del self._after_commit[callbacks:]
+            try:
+                if name is None:
+                    conn.rollback()
+                else:
+                    with conn.cursor() as cur:
+                        cur.execute(f"ROLLBACK TO SAVEPOINT {name}; RELEASE SAVEPOINT {name}")
+            except psycopg2.Error:
+                self.rollback_only = True
+            raise
+        finally:
+            self._depth -= 1
+        if name is not None:
+            with conn.cursor() as cur:
+                cur.execute(f"RELEASE SAVEPOINT {name}")
+
+    def fail(self):
+        """
+        Handle an error raised by a repository call.
+
+        Inside a savepoint the savepoint undoes the block when the error
+        leaves it. Otherwise the transaction is rolled back now and the unit
+        marked rollback-only, so later calls can't commit half its work.
+        """
+        if self._depth:
+            return
+        self.rollback_only = True
+        if self.conn is not None and not self.conn.closed:
+            self.conn.rollback()
+
+    def after_commit(self, callback):
+        """Register a callable to run once the transaction has committed."""
+        self._after_commit.append(callback)
+
+    def commit(self):
+        """Commit pending work and run after-commit callbacks."""
+        self._savepoints = 0
+        if self.conn is not None:
+            self.conn.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        """Discard pending work and after-commit callbacks."""
+        self._after_commit = []
+        self._savepoints = 0
+        if self.conn is not None and not self.conn.closed:
+            self.conn.rollback()
+
+    def finish(self, commit):
+        """
+        End the unit of work and return its connection to the pool.
+
+        Args:
+            commit (bool): Commit if True and nothing marked the unit rollback-only
+        """
+        discard = False
+        try:
+            if commit and not self.rollback_only:
+                self.commit()
+            else:
+                self.rollback()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        finally:
+            if self.conn is not None:
+                BaseRepository.get_pool().putconn(self.conn, discard=discard or self.conn.closed)
+                self.conn = None
+
+
+_current_unit = ContextVar('unit_of_work', default=None)
 
 
 class BaseRepository:
     """Base class for all repositories with database connection utilities."""
-    
+
+    _pool = None
+    _pool_settings = {}
+    _pool_lock = threading.Lock()
+
     @staticmethod
-    def get_db_connection():
-        """Get a database connection using DATABASE_URL from environment."""
+    def get_database_url():
+        """Get DATABASE_URL from environment."""
         database_url = os.getenv('DATABASE_URL')
         if not database_url:
             raise ValueError("DATABASE_URL environment variable is not set")
-        return psycopg2.connect(database_url)
-    
+        return database_url
+
+    @staticmethod
+    def get_db_connection():
+        """
+        Open a new, unpooled database connection.
+
+        Prefer get_connection()/get_cursor(), which reuse pooled connections.
+        The caller is responsible for closing the returned connection.
+        """
+        return psycopg2.connect(BaseRepository.get_database_url())
+
+    @staticmethod
+    def configure_pool(min_size=None, max_size=None, max_lifetime=None,
+                       health_check_after=None, timeout=None):
+        """
+        Set connection pool options. Takes effect the next time the pool is created.
+
+        Args:
+            min_size (int, optional): Connections kept open while idle
+            max_size (int, optional): Maximum open connections per process
+            max_lifetime (float, optional): Seconds before a connection is recycled
+            health_check_after (float, optional): Idle seconds before a connection is probed
+            timeout (float, optional): Seconds to wait for a free connection
+        """
+        settings = {
+            'min_size': min_size,
+            'max_size': max_size,
+            'max_lifetime': max_lifetime,
+            'health_check_after': health_check_after,
+            'timeout': timeout,
+        }
+        with BaseRepository._pool_lock:
+            BaseRepository._pool_settings = {k: v for k, v in settings.items() if v is not None}
+            if BaseRepository._pool is not None:
+                BaseRepository._pool.closeall()
+                BaseRepository._pool = None
+
+    @staticmethod
+    def get_pool():
+        """Get the process-wide connection pool, creating it on first use."""
+        pool = BaseRepository._pool
+        if pool is None:
+            with BaseRepository._pool_lock:
+                pool = BaseRepository._pool
+                if pool is None:
+                    pool = ConnectionPool(BaseRepository.get_database_url(),
+                                          **BaseRepository._pool_settings)
+                    BaseRepository._pool = pool
+        return pool
+
+    @staticmethod
+    def close_pool():
+        """Close all pooled connections (e.g. on shutdown)."""
+        with BaseRepository._pool_lock:
+            if BaseRepository._pool is not None:
+                BaseRepository._pool.closeall()
+                BaseRepository._pool = None
+
+    @staticmethod
+    def current_unit_of_work():
+        """Get the active UnitOfWork, or None outside of one."""
+        return _current_unit.get()
+
+    @staticmethod
+    def begin_unit_of_work():
+        """
+        Start a unit of work for the current context (e.g. an HTTP request).
+
+        Returns:
+            Token to pass to end_unit_of_work()
+        """
+        return _current_unit.set(UnitOfWork())
+
+    @staticmethod
+    def end_unit_of_work(token, commit=True):
+        """
+        Finish the unit of work started with begin_unit_of_work().
+
+        Args:
+            token: Token returned by begin_unit_of_work()
+            commit (bool): Commit pending work; otherwise roll it back
+        """
+        unit = _current_unit.get()
+        try:
+            if unit is not None:
+                unit.finish(commit)
+        finally:
+            _current_unit.reset(token)
+
+    @staticmethod
+    @contextmanager
+    def unit_of_work():
+        """
+        Run a block of repository calls in one transaction on one connection.
+
+        Joins the active unit of work if there is one, under a savepoint so an
+        error undoes the block's calls together; otherwise starts a new one
+        that commits when the block exits cleanly and rolls back on error.
+
+        Usage:
+            with BaseRepository.unit_of_work():
+                type_id = ServiceRepository.get_service_type_id_by_name(name)
+                ServiceRepository.create_service(...)
+        """
+        unit = _current_unit.get()
+        if unit is not None:
+            with unit.savepoint():
+                yield unit
+            return
+
+        token = BaseRepository.begin_unit_of_work()
+        try:
+            yield _current_unit.get()
+        except Exception:
+            BaseRepository.end_unit_of_work(token, commit=False)
+            raise
+        BaseRepository.end_unit_of_work(token, commit=True)
+
+    @staticmethod
+    def set_rollback_only():
+        """Make the active unit of work roll back instead of committing."""
+        unit = _current_unit.get()
+        if unit is not None:
+            unit.rollback_only = True
+
+    @staticmethod
+    def on_commit(callback):
+        """
+        Run callback after the active unit of work commits.
+
+        Outside a unit of work every get_cursor() block commits on its own,
+        so the callback runs immediately.
+        """
+        unit = _current_unit.get()
+        if unit is not None:
+            unit.after_commit(callback)
+        else:
+            callback()
+
+    @staticmethod
+    @contextmanager
+    def get_connection():
+        """
+        Context manager that borrows a pooled connection.
+
+        Inside a unit of work this yields the unit's shared connection, and
+        transaction control is left to the unit. Otherwise the connection is
+        returned to the pool on exit; broken connections are discarded
+        instead of being reused.
+
+        Usage:
+            with BaseRepository.get_connection() as conn:
+                with conn:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+        """
+        unit = _current_unit.get()
+        if unit is not None:
+            yield unit.connection()
+            return
+
+        pool = BaseRepository.get_pool()
+        conn = pool.getconn()
+        discard = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        finally:
+            pool.putconn(conn, discard=discard or conn.closed)
+
     @staticmethod
     @contextmanager
     def get_cursor(cursor_factory=None):
         """
         Context manager for database cursor with automatic connection cleanup.
-        
+
+        Outside a unit of work the block commits on exit. Inside one, the
+        unit decides when to commit; an error rolls back the whole unit and
+        marks it rollback-only so nothing written before it is committed,
+        unless a nested unit_of_work() around the call catches it (see
+        UnitOfWork.fail()).
+
         Usage:
             with BaseRepository.get_cursor() as cur:
                 cur.execute("SELECT * FROM table")
                 results = cur.fetchall()
         """
-        conn = BaseRepository.get_db_connection()
-        try:
+        unit = _current_unit.get()
+        if unit is not None:
+            conn = unit.connection()
+            cursor = conn.cursor(cursor_factory=cursor_factory) if cursor_factory else conn.cursor()
+            try:
+                yield cursor
+            except Exception:
+                unit.fail()
+                raise
+            finally:
+                cursor.close()
+            return
+
+        with BaseRepository.get_connection() as conn:
             if cursor_factory:
                 cursor = conn.cursor(cursor_factory=cursor_factory)
             else:
@@ -44,9 +368,45 @@ class BaseRepository:
                 raise
             finally:
                 cursor.close()
+
+    @staticmethod
+    def stream_query(query, params=None, itersize=2000):
+        """
+        Stream a large result set through a server-side (named) cursor.
+
+        Rows are fetched itersize at a time, so memory stays flat no matter
+        how many rows the query returns. The generator borrows its own pooled
+        connection (not the request's unit of work) because it is usually
+        consumed after the request handler has returned, e.g. by a streamed
+        HTTP response. The connection goes back to the pool when the
+        generator is exhausted or closed.
+
+        Args:
+            query (str): SELECT statement
+            params (tuple, optional): Query parameters
+            itersize (int): Rows per network round trip
+
+        Yields:
+            tuple: Column names first, then one tuple per row
+        """
+        pool = BaseRepository.get_pool()
+        conn = pool.getconn()
+        discard = False
+        try:
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cur:
+                cur.itersize = itersize
+                cur.execute(query, params)
+                rows = cur.fetchmany(itersize)
+                yield tuple(col.name for col in cur.description)
+                while rows:
+                    yield from rows
+                    rows = cur.fetchmany(itersize)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
         finally:
-            conn.close()
-    
+            pool.putconn(conn, discard=discard or conn.closed)
+
     @staticmethod
     @contextmanager
     def get_dict_cursor():
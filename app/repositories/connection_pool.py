@@ -0,0 +1,257 @@
+"""
+Process-local PostgreSQL connection pool.
+Keeps a bounded set of open psycopg2 connections so repositories do not pay
+a full connect (TCP + auth + backend startup) on every query.
+"""
+import os
+import time
+import threading
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolError(psycopg2.Error):
+    """Raised when a connection cannot be obtained from the pool."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe connection pool with health checks and lifetime recycling.
+
+    Connections are handed out LIFO so the warmest connections are reused and
+    surplus idle ones age out. Each connection records when it was opened and
+    when it was last returned:
+
+    - connections older than ``max_lifetime`` seconds are closed instead of reused
+    - connections idle longer than ``health_check_after`` seconds are probed with
+      ``SELECT 1`` before being handed out
+    - broken or closed connections are discarded and replaced on demand
+
+    The pool is fork-aware: a pool created in a parent process is never shared
+    with a forked child (e.g. gunicorn pre-fork workers). The child silently
+    abandons the inherited sockets and opens its own connections.
+    """
+
+    def __init__(self, dsn, min_size=1, max_size=10, max_lifetime=3600,
+                 health_check_after=30, timeout=10):
+        """
+        Args:
+            dsn (str): PostgreSQL connection string
+            min_size (int): Connections opened eagerly and kept idle
+            max_size (int): Upper bound on open connections (idle + in use)
+            max_lifetime (float): Seconds after which a connection is recycled
+            health_check_after (float): Idle seconds after which a connection is probed
+            timeout (float): Seconds to wait for a free connection before failing
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size: require 0 <= min_size <= max_size and max_size >= 1")
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        self._idle = []          # stack of (conn, created_at, returned_at)
+        self._created = {}       # id(conn) -> created_at for every open connection
+        self._closed = False
+
+        self._fill_min()
+
+    # ---------------------------------------------------------------- public
+
+    def getconn(self):
+        """
+        Check out a healthy connection, waiting up to ``timeout`` seconds.
+
+        Returns:
+            psycopg2.extensions.connection: An idle connection with no open transaction
+
+        Raises:
+            PoolError: If the pool is closed or exhausted for longer than ``timeout``
+        """
+        self._check_fork()
+        deadline = time.monotonic() + self.timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+
+                while self._idle:
+                    conn, created_at, returned_at = self._idle.pop()
+                    if self._usable(conn, created_at, returned_at):
+                        return conn
+                    self._discard(conn)
+
+                if len(self._created) < self.max_size:
+                    # Reserve the slot before connecting outside the lock
+                    placeholder = object()
+                    self._created[id(placeholder)] = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolError(
+                        f"Timed out after {self.timeout}s waiting for a database connection "
+                        f"(max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._created.pop(id(placeholder), None)
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._created.pop(id(placeholder), None)
+            self._created[id(conn)] = time.monotonic()
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """
+        Return a connection to the pool.
+
+        Any open transaction is rolled back. Connections that are broken, past
+        their lifetime, or explicitly discarded are closed instead of reused.
+
+        Args:
+            conn: Connection previously obtained from ``getconn``
+            discard (bool): Close the connection instead of returning it
+        """
+        if os.getpid() != self._pid:
+            # Connection belongs to the parent process; never touch its socket
+            return
+
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        with self._cond:
+            created_at = self._created.get(id(conn))
+            if created_at is None:
+                # Unknown connection (pool was reset); just close it
+                self._close_quietly(conn)
+                return
+
+            expired = time.monotonic() - created_at > self.max_lifetime
+            if discard or conn.closed or expired or self._closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+        if expired and not self._closed:
+            self._fill_min()
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _, _ = self._idle.pop()
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        Get a snapshot of pool usage.
+
+        Returns:
+            dict: open, idle and in-use connection counts plus configured bounds
+        """
+        with self._cond:
+            open_count = len(self._created)
+            idle_count = len(self._idle)
+        return {
+            'open': open_count,
+            'idle': idle_count,
+            'in_use': open_count - idle_count,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+        }
+
+    # --------------------------------------------------------------- private
+
+    def _connect(self):
+        return psycopg2.connect(self.dsn)
+
+    def _fill_min(self):
+        """Open connections until ``min_size`` are available."""
+        while True:
+            with self._cond:
+                if self._closed or len(self._created) >= self.min_size:
+                    return
+                placeholder = object()
+                self._created[id(placeholder)] = None
+            try:
+                conn = self._connect()
+            except psycopg2.Error:
+                with self._cond:
+                    self._created.pop(id(placeholder), None)
+                # The database may be briefly unavailable; connect lazily later
+                return
+            now = time.monotonic()
+            with self._cond:
+                self._created.pop(id(placeholder), None)
+                self._created[id(conn)] = now
+                self._idle.append((conn, now, now))
+                self._cond.notify()
+
+    def _usable(self, conn, created_at, returned_at):
+        """Check lifetime and, for long-idle connections, liveness."""
+        if conn.closed:
+            return False
+        now = time.monotonic()
+        if now - created_at > self.max_lifetime:
+            return False
+        if now - returned_at > self.health_check_after:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1;")
+                conn.rollback()
+            except psycopg2.Error:
+                return False
+        return True
+
+    def _discard(self, conn):
+        """Forget and close a connection. Caller must hold the lock."""
+        self._created.pop(id(conn), None)
+        self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _check_fork(self):
+        """Drop connections inherited from a parent process."""
+        if os.getpid() == self._pid:
+            return
+        with self._cond:
+            if os.getpid() == self._pid:
+                return
+            # Keep references to the parent's connections so they are never
+            # garbage collected (and closed) from the child, which would send
+            # a Terminate message over the parent's sockets.
+            _abandoned.extend(conn for conn, _, _ in self._idle)
+            self._pid = os.getpid()
+            self._cond = threading.Condition()
+            self._idle = []
+            self._created = {}
+        self._fill_min()
+
+
+# Connections inherited across fork() that must never be closed by the child
+_abandoned = []
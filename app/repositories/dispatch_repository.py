@@ -0,0 +1,162 @@
+"""
+Repository for the warranty service request dispatch queue.
+Handles claiming and releasing service_requests using raw SQL.
+"""
+from .base_repository import BaseRepository
+
+
+class DispatchRepository(BaseRepository):
+    """Repository for dispatching pending service requests by urgency, then age."""
+    
+    # Queue order; matches the service_requests_dispatch_idx index
+    _QUEUE_ORDER = "urgency_rank, created_at, id"
+    
+    _REQUEST_COLUMNS = """
+        r.id, r.warranty_id, r.work_order_id, r.customer_email, r.customer_phone,
+        r.issue_type, r.urgency, r.urgency_rank, r.problem_description, r.status,
+        r.created_at, r.dispatched_by, r.dispatched_at, r.resolved_at,
+        ws.customer_name, ws.service_name
+    """
+    
+    @staticmethod
+    def _format_request(row):
+        """Convert a service request row to the dispatch API's shape."""
+        return {
+            'id': row['id'],
+            'warrantyId': row['warranty_id'],
+            'workOrderId': row['work_order_id'],
+            'customerName': row['customer_name'],
+            'customerEmail': row['customer_email'],
+            'customerPhone': row['customer_phone'],
+            'serviceName': row['service_name'],
+            'issueType': row['issue_type'],
+            'urgency': row['urgency'],
+            'urgencyRank': row['urgency_rank'],
+            'problemDescription': row['problem_description'],
+            'status': row['status'],
+            'createdAt': row['created_at'],
+            'dispatchedBy': row['dispatched_by'],
+            'dispatchedAt': row['dispatched_at'],
+            'resolvedAt': row['resolved_at']
+        }
+    
+    @staticmethod
+    def peek(limit=50):
+        """
+        List the head of the pending queue without claiming anything.
+        
+        Args:
+            limit (int): Maximum number of requests
+            
+        Returns:
+            list[dict]: Pending requests in dispatch order
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {DispatchRepository._REQUEST_COLUMNS}
+                FROM (
+                    SELECT *
+                    FROM service_requests
+                    WHERE status = 'pending'
+                    ORDER BY {DispatchRepository._QUEUE_ORDER}
+                    LIMIT %s
+                ) r
+                LEFT JOIN warranty_summary ws ON ws.warranty_id = r.warranty_id
+                ORDER BY r.urgency_rank, r.created_at, r.id;
+            """, (limit,))
+            return [DispatchRepository._format_request(row) for row in cur.fetchall()]
+    
+    @staticmethod
+    def claim_next(limit, dispatcher):
+        """
+        Claim the next pending requests for a dispatcher.
+        
+        Rows another dispatcher is claiming at the same moment are skipped
+        rather than waited for, so concurrent claims never block each other
+        or return the same request.
+        
+        Args:
+            limit (int): Maximum number of requests to claim
+            dispatcher (str): Who is claiming them
+            
+        Returns:
+            list[dict]: Claimed requests in dispatch order (fewer than limit
+            when the queue runs short)
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                WITH next AS (
+                    SELECT id
+                    FROM service_requests
+                    WHERE status = 'pending'
+                    ORDER BY {DispatchRepository._QUEUE_ORDER}
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                ), r AS (
+                    UPDATE service_requests sr
+                    SET status = 'dispatched', dispatched_by = %s, dispatched_at = NOW()
+                    FROM next
+                    WHERE sr.id = next.id
+                    RETURNING sr.*
+                )
+                SELECT {DispatchRepository._REQUEST_COLUMNS}
+                FROM r
+                LEFT JOIN warranty_summary ws ON ws.warranty_id = r.warranty_id
+                ORDER BY r.urgency_rank, r.created_at, r.id;
+            """, (limit, dispatcher))
+            return [DispatchRepository._format_request(row) for row in cur.fetchall()]
+    
+    @staticmethod
+    def release(request_id):
+        """
+        Put a dispatched request back in the pending queue at its original position.
+        
+        Args:
+            request_id (int): Service request ID
+            
+        Returns:
+            bool: True if released, False if it wasn't dispatched
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE service_requests
+                SET status = 'pending', dispatched_by = NULL, dispatched_at = NULL
+                WHERE id = %s AND status = 'dispatched';
+            """, (request_id,))
+            return cur.rowcount == 1
+    
+    @staticmethod
+    def resolve(request_id):
+        """
+        Mark a dispatched request as resolved.
+        
+        Args:
+            request_id (int): Service request ID
+            
+        Returns:
+            bool: True if resolved, False if it wasn't dispatched
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE service_requests
+                SET status = 'resolved', resolved_at = NOW()
+                WHERE id = %s AND status = 'dispatched';
+            """, (request_id,))
+            return cur.rowcount == 1
+    
+    @staticmethod
+    def count_pending_by_urgency():
+        """
+        Count pending requests per urgency rank.
+        
+        Returns:
+            dict: {urgency_rank: count}
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                SELECT urgency_rank, COUNT(*)
+                FROM service_requests
+                WHERE status = 'pending'
+                GROUP BY urgency_rank;
+            """)
+            return dict(cur.fetchall())
@@ -0,0 +1,239 @@
+"""
+Repository for technician job data access.
+Handles a technician's work assignments, their status and notes, and the
+incremental sync feed (see migrations/015_technician_job_sync.sql) using raw SQL.
+"""
+from .base_repository import BaseRepository
+
+
+class EmployeeJobRepository(BaseRepository):
+    """Repository for the jobs assigned to a technician."""
+    
+    _JOB_COLUMNS = """
+        wa.assignment_id, wa.requestid, wa.status, wa.notes, wa.cancel_reason,
+        wa.cancel_description, wa.cancelled_at, wa.updated_at,
+        COALESCE(lower(ts.slot)::timestamp, sr.preferred_datetime) AS job_start,
+        COALESCE(upper(ts.slot)::timestamp,
+                 sr.preferred_datetime + make_interval(mins => (COALESCE(s.duration_hours, 1) * 60)::int)
+        ) AS job_end,
+        sr.description, s.job_name AS service_name, s.service_price,
+        c.firstname AS customer_firstname, c.lastname AS customer_lastname,
+        c.phone AS customer_phone, c.email AS customer_email,
+        a.address, a.city, a.state, a.zip_code, w.workorderid
+    """
+    
+    _JOB_JOINS = """
+        JOIN servicerequests sr ON sr.requestid = wa.requestid
+        LEFT JOIN technician_schedule ts
+          ON ts.requestid = wa.requestid AND ts.employeeid = wa.employeeid
+        LEFT JOIN services s ON s.service_id = sr.service_id
+        LEFT JOIN customer c ON c.customerid = sr.customerid
+        LEFT JOIN addressbook a ON a.address_id = sr.addressid
+        LEFT JOIN LATERAL (
+            SELECT wo.workorderid
+            FROM workorders wo
+            WHERE wo.requestid = wa.requestid
+            ORDER BY wo.workorderid
+            LIMIT 1
+        ) w ON TRUE
+    """
+    
+    @staticmethod
+    def sync_position():
+        """
+        Get the sync token range of the current snapshot.
+        
+        Take it before reading changes: any transaction the reads can't see
+        has an ID at or above xmin, so xmin is a safe token for the next sync.
+        
+        Returns:
+            tuple: (xmin, xmax) transaction IDs as ints
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                SELECT pg_snapshot_xmin(s)::text::bigint, pg_snapshot_xmax(s)::text::bigint
+                FROM pg_current_snapshot() AS s;
+            """)
+            return cur.fetchone()
+    
+    @staticmethod
+    def list_jobs(employee_id, since=None, history_start=None):
+        """
+        List a technician's jobs, either all current ones or those changed since a token.
+        
+        Args:
+            employee_id (int): Technician
+            since (int, optional): Token from sync_position(); only jobs
+                changed at or after it are returned, cancelled ones included
+            history_start (datetime, optional): Without since, skip jobs that
+                started before this (undated jobs are always included)
+        
+        Returns:
+            list[dict]: Jobs with assignment, schedule, service, customer and address fields
+        """
+        if since is None:
+            job_filter = """
+                AND wa.status <> 'cancelled'
+                AND (%(history_start)s::timestamp IS NULL
+                     OR COALESCE(lower(ts.slot)::timestamp, sr.preferred_datetime) IS NULL
+                     OR COALESCE(lower(ts.slot)::timestamp, sr.preferred_datetime) >= %(history_start)s)
+            """
+        else:
+            job_filter = "AND wa.change_xid >= %(since)s::text::xid8"
+        
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {EmployeeJobRepository._JOB_COLUMNS}
+                FROM work_assignments wa
+                {EmployeeJobRepository._JOB_JOINS}
+                WHERE wa.employeeid = %(employee_id)s
+                  {job_filter}
+                ORDER BY job_start, wa.assignment_id;
+            """, {'employee_id': employee_id, 'since': since, 'history_start': history_start})
+            return cur.fetchall()
+    
+    @staticmethod
+    def list_removed(employee_id, since):
+        """
+        List assignments taken away from a technician since a token.
+        
+        Args:
+            employee_id (int): Technician
+            since (int): Token from sync_position()
+        
+        Returns:
+            list[int]: Assignment IDs that were deleted or reassigned
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                SELECT DISTINCT assignment_id
+                FROM work_assignment_removals
+                WHERE employeeid = %s
+                  AND change_xid >= %s::text::xid8
+                ORDER BY assignment_id;
+            """, (employee_id, since))
+            return [row[0] for row in cur.fetchall()]
+    
+    @staticmethod
+    def get_job(assignment_id, employee_id):
+        """
+        Get one of a technician's jobs.
+        
+        Args:
+            assignment_id (int): Assignment ID
+            employee_id (int): Technician the job must belong to
+        
+        Returns:
+            dict or None: The job, as from list_jobs
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {EmployeeJobRepository._JOB_COLUMNS}
+                FROM work_assignments wa
+                {EmployeeJobRepository._JOB_JOINS}
+                WHERE wa.assignment_id = %s
+                  AND wa.employeeid = %s;
+            """, (assignment_id, employee_id))
+            return cur.fetchone()
+    
+    @staticmethod
+    def set_status(assignment_id, employee_id, status):
+        """
+        Move an open job to pending, in-progress or completed.
+        
+        Completing a job also marks its workorder completed, which records
+        it in the financial reports.
+        
+        Args:
+            assignment_id (int): Assignment ID
+            employee_id (int): Technician the job must belong to
+            status (str): 'pending', 'in-progress' or 'completed'
+        
+        Returns:
+            bool: False if the job doesn't exist, isn't this technician's or
+            is already completed or cancelled
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE work_assignments
+                SET status = %s
+                WHERE assignment_id = %s
+                  AND employeeid = %s
+                  AND status IN ('pending', 'in-progress')
+                RETURNING requestid;
+            """, (status, assignment_id, employee_id))
+            row = cur.fetchone()
+            if row is None:
+                return False
+            
+            if status == 'completed':
+                cur.execute("""
+                    UPDATE workorders
+                    SET iscompleted = TRUE
+                    WHERE requestid = %s
+                      AND iscompleted IS NOT TRUE;
+                """, (row[0],))
+            return True
+    
+    @staticmethod
+    def save_notes(assignment_id, employee_id, notes):
+        """
+        Replace the technician's work notes on a job that isn't cancelled.
+        
+        Args:
+            assignment_id (int): Assignment ID
+            employee_id (int): Technician the job must belong to
+            notes (str): New notes
+        
+        Returns:
+            bool: False if the job doesn't exist, isn't this technician's or is cancelled
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE work_assignments
+                SET notes = %s
+                WHERE assignment_id = %s
+                  AND employeeid = %s
+                  AND status <> 'cancelled';
+            """, (notes, assignment_id, employee_id))
+            return cur.rowcount > 0
+    
+    @staticmethod
+    def cancel(assignment_id, employee_id, reason, description):
+        """
+        Cancel an open job and free the technician's booked slot.
+        
+        The assignment stops counting toward the technician's daily load
+        (see work_assignments_track_load), so both the slot and the day are
+        open to auto-assignment again.
+        
+        Args:
+            assignment_id (int): Assignment ID
+            employee_id (int): Technician the job must belong to
+            reason (str): Cancellation reason
+            description (str): What happened
+        
+        Returns:
+            bool: False if the job doesn't exist, isn't this technician's or
+            is already completed or cancelled
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE work_assignments
+                SET status = 'cancelled', cancel_reason = %s, cancel_description = %s,
+                    cancelled_at = NOW()
+                WHERE assignment_id = %s
+                  AND employeeid = %s
+                  AND status IN ('pending', 'in-progress')
+                RETURNING requestid;
+            """, (reason, description, assignment_id, employee_id))
+            row = cur.fetchone()
+            if row is None:
+                return False
+            
+            cur.execute("""
+                DELETE FROM technician_schedule
+                WHERE requestid = %s
+                  AND employeeid = %s;
+            """, (row[0], employee_id))
+            return True
@@ -0,0 +1,299 @@
+"""
+Repository for financial report data access.
+Reads the daily rollups and per-workorder facts maintained by triggers
+(see migrations/012_financial_rollups.sql and 013_financial_daily_cells.sql).
+"""
+import numpy as np
+from .base_repository import BaseRepository
+
+
+class FinancialRepository(BaseRepository):
+    """Repository for revenue, labor and work-order reports."""
+    
+    _TOTALS = """
+        COALESCE(SUM(r.orders), 0) AS orders,
+        COALESCE(SUM(r.revenue), 0) AS revenue,
+        COALESCE(SUM(r.labor_hours), 0) AS labor_hours,
+        COALESCE(SUM(r.labor_cost), 0) AS labor_cost,
+        COALESCE(SUM(r.material_cost), 0) AS material_cost
+    """
+    
+    # The same totals straight from financial_workorder_facts, for workorders
+    # the rollups leave out (no technician, or a service without a type)
+    _FACT_TOTALS = """
+        COUNT(*) AS orders,
+        COALESCE(SUM(f.revenue), 0) AS revenue,
+        COALESCE(SUM(f.labor_hours), 0) AS labor_hours,
+        COALESCE(SUM(f.labor_cost), 0) AS labor_cost,
+        COALESCE(SUM(f.material_cost), 0) AS material_cost
+    """
+    
+    @staticmethod
+    def get_totals(start, end):
+        """
+        Sum every completed workorder scheduled in [start, end].
+        
+        Each fact is in exactly one of the technician rollup and the
+        unassigned facts, so together they cover workorders of every
+        service, typed or not.
+        
+        Args:
+            start (date): First day
+            end (date): Last day (inclusive)
+        
+        Returns:
+            dict: orders, revenue, labor_hours, labor_cost, material_cost
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {FinancialRepository._TOTALS}
+                FROM (
+                    SELECT {FinancialRepository._TOTALS}
+                    FROM financial_daily_technician r
+                    WHERE r.work_date BETWEEN %(start)s AND %(end)s
+                    UNION ALL
+                    SELECT {FinancialRepository._FACT_TOTALS}
+                    FROM financial_workorder_facts f
+                    WHERE f.employeeid IS NULL
+                      AND f.work_date BETWEEN %(start)s AND %(end)s
+                ) r;
+            """, {'start': start, 'end': end})
+            return cur.fetchone()
+    
+    @staticmethod
+    def totals_unassigned(start, end):
+        """
+        Sum completed workorders in [start, end] that have no technician.
+        
+        Args:
+            start (date): First day
+            end (date): Last day (inclusive)
+        
+        Returns:
+            dict: orders, revenue, labor_hours, labor_cost, material_cost
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {FinancialRepository._FACT_TOTALS}
+                FROM financial_workorder_facts f
+                WHERE f.employeeid IS NULL
+                  AND f.work_date BETWEEN %s AND %s;
+            """, (start, end))
+            return cur.fetchone()
+    
+    @staticmethod
+    def totals_by_service_type(start, end):
+        """
+        Sum completed workorders in [start, end] per service type, highest revenue first.
+        
+        Args:
+            start (date): First day
+            end (date): Last day (inclusive)
+        
+        Returns:
+            list[dict]: service_type_id, service_type_name and the totals;
+            workorders whose service has no type are one row with both None
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT r.service_type_id, st.service_type_name, {FinancialRepository._TOTALS}
+                FROM financial_daily_service_type r
+                LEFT JOIN service_types st ON st.service_type_id = r.service_type_id
+                WHERE r.work_date BETWEEN %(start)s AND %(end)s
+                GROUP BY r.service_type_id, st.service_type_name
+                UNION ALL
+                SELECT NULL, NULL, {FinancialRepository._FACT_TOTALS}
+                FROM financial_workorder_facts f
+                WHERE f.service_type_id IS NULL
+                  AND f.work_date BETWEEN %(start)s AND %(end)s
+                HAVING COUNT(*) > 0
+                ORDER BY revenue DESC, service_type_name;
+            """, {'start': start, 'end': end})
+            return cur.fetchall()
+    
+    @staticmethod
+    def totals_by_technician(start, end):
+        """
+        Sum completed workorders in [start, end] per assigned technician, highest revenue first.
+        
+        Args:
+            start (date): First day
+            end (date): Last day (inclusive)
+        
+        Returns:
+            list[dict]: employeeid, firstname, lastname and the totals
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT r.employeeid, e.firstname, e.lastname, {FinancialRepository._TOTALS}
+                FROM financial_daily_technician r
+                LEFT JOIN employee e ON e.employeeid = r.employeeid
+                WHERE r.work_date BETWEEN %s AND %s
+                GROUP BY r.employeeid, e.firstname, e.lastname
+                ORDER BY revenue DESC, r.employeeid;
+            """, (start, end))
+            return cur.fetchall()
+    
+    @staticmethod
+    def list_workorders(start, end, limit=100, after=None):
+        """
+        List completed workorders in [start, end] with their amounts, newest first.
+        
+        Args:
+            start (date): First day
+            end (date): Last day (inclusive)
+            limit (int): Maximum number of records
+            after (tuple, optional): Cursor (work_date, workorderid) of the
+                previous page's last row
+        
+        Returns:
+            list[dict]: workorderid, work_date, customer, service, technician and amounts
+        """
+        cursor_filter = ""
+        params = [start, end]
+        if after is not None:
+            cursor_filter = "AND (f.work_date, f.workorderid) < (%s, %s)"
+            params.extend(after)
+        params.append(limit)
+        
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT f.workorderid, f.work_date, f.revenue, f.labor_hours, f.labor_cost, f.material_cost,
+                       c.firstname AS customer_firstname, c.lastname AS customer_lastname,
+                       s.job_name AS service_name, st.service_type_name,
+                       e.firstname AS technician_firstname, e.lastname AS technician_lastname
+                FROM financial_workorder_facts f
+                LEFT JOIN customer c ON c.customerid = f.customerid
+                LEFT JOIN services s ON s.service_id = f.service_id
+                LEFT JOIN service_types st ON st.service_type_id = f.service_type_id
+                LEFT JOIN employee e ON e.employeeid = f.employeeid
+                WHERE f.work_date BETWEEN %s AND %s
+                  {cursor_filter}
+                ORDER BY f.work_date DESC, f.workorderid DESC
+                LIMIT %s;
+            """, params)
+            return cur.fetchall()
+    
+    @staticmethod
+    def stream_workorders(start, end, itersize=2000):
+        """
+        Stream completed workorders in [start, end] through a server-side cursor, oldest first.
+        
+        Args:
+            start (date): First day
+            end (date): Last day (inclusive)
+            itersize (int): Rows fetched per round trip
+        
+        Yields:
+            tuple: Column names first, then (workorderid, work_date, customer,
+            service, revenue, labor_hours, labor_cost, material_cost) per workorder
+        """
+        return BaseRepository.stream_query("""
+            SELECT f.workorderid, f.work_date,
+                   concat_ws(' ', c.firstname, c.lastname) AS customer,
+                   COALESCE(s.job_name, st.service_type_name, 'Unknown') AS service,
+                   f.revenue, f.labor_hours, f.labor_cost, f.material_cost
+            FROM financial_workorder_facts f
+            LEFT JOIN customer c ON c.customerid = f.customerid
+            LEFT JOIN services s ON s.service_id = f.service_id
+            LEFT JOIN service_types st ON st.service_type_id = f.service_type_id
+            WHERE f.work_date BETWEEN %s AND %s
+            ORDER BY f.work_date, f.workorderid;
+        """, (start, end), itersize=itersize)
+    
+    # Columns of load_cell_columns: (name, SQL expression, element type)
+    _CELL_COLUMNS = (
+        ('day', "c.work_date - DATE '1970-01-01'", 'int4'),
+        ('employee_id', "c.employeeid", 'int4'),
+        ('service_type_id', "c.service_type_id", 'int4'),
+        ('orders', "c.orders", 'int4'),
+        ('revenue', "c.revenue::float8", 'float8'),
+        ('labor_hours', "c.labor_hours::float8", 'float8'),
+        ('labor_cost', "c.labor_cost::float8", 'float8'),
+        ('material_cost', "c.material_cost::float8", 'float8'),
+    )
+    
+    # Binary array elements: 4-byte length prefix, then the big-endian value
+    _ELEMENT_DTYPES = {
+        'int4': np.dtype([('len', '>i4'), ('value', '>i4')]),
+        'float8': np.dtype([('len', '>i4'), ('value', '>f8')]),
+    }
+    
+    @staticmethod
+    def _decode_array(data, element_type):
+        """
+        Decode a one-dimensional, NULL-free array in PostgreSQL binary format.
+        
+        The header is 12 bytes plus 8 per dimension; elements follow as
+        (length, value) pairs, which map directly onto a NumPy record dtype.
+        """
+        data = bytes(data)
+        dtype = np.int64 if element_type == 'int4' else np.float64
+        ndim = int.from_bytes(data[0:4], 'big')
+        if ndim == 0:
+            return np.empty(0, dtype=dtype)
+        values = np.frombuffer(data, dtype=FinancialRepository._ELEMENT_DTYPES[element_type],
+                               offset=12 + 8 * ndim)['value']
+        return values.astype(dtype)
+    
+    @staticmethod
+    def load_cell_columns(start, end):
+        """
+        Load the (day, technician, service type) cells in [start, end] as NumPy columns.
+        
+        Each column is aggregated into one array and shipped in binary form
+        (array_send), so a multi-year range costs one round trip and no
+        per-row Python objects.
+        
+        Args:
+            start (date): First day
+            end (date): Last day (inclusive)
+            
+        Returns:
+            dict: {column: np.ndarray} with day (days since 1970-01-01),
+            employee_id and service_type_id (0 when unassigned/unknown),
+            orders, revenue, labor_hours, labor_cost and material_cost
+        """
+        columns = FinancialRepository._CELL_COLUMNS
+        select = ",\n".join(
+            f"array_send(COALESCE(array_agg({expr}), '{{}}'::{element_type}[]))"
+            for _, expr, element_type in columns
+        )
+        with BaseRepository.get_cursor() as cur:
+            cur.execute(f"""
+                SELECT {select}
+                FROM financial_daily_cell c
+                WHERE c.work_date BETWEEN %s AND %s;
+            """, (start, end))
+            row = cur.fetchone()
+        return {
+            name: FinancialRepository._decode_array(data, element_type)
+            for (name, _, element_type), data in zip(columns, row)
+        }
+    
+    @staticmethod
+    def get_dimension_labels():
+        """
+        Get display names for report dimensions.
+        
+        Returns:
+            tuple: ({employeeid: name}, {service_type_id: name})
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("SELECT employeeid, concat_ws(' ', firstname, lastname) FROM employee;")
+            technicians = dict(cur.fetchall())
+            cur.execute("SELECT service_type_id, service_type_name FROM service_types;")
+            service_types = dict(cur.fetchall())
+            return technicians, service_types
+    
+    @staticmethod
+    def rebuild():
+        """
+        Recompute all facts and rollups from workorders.
+        
+        Returns:
+            int: Number of completed workorders processed
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("SELECT rebuild_financial_rollups();")
+            return cur.fetchone()[0]
@@ -0,0 +1,130 @@
+"""
+Repository for idempotency key data access.
+Stores the outcome of retried POST requests in idempotency_keys using raw SQL.
+"""
+import psycopg2
+from .base_repository import BaseRepository
+
+
+class IdempotencyRepository(BaseRepository):
+    """Repository for claiming idempotency keys and storing their responses."""
+    
+    @staticmethod
+    def claim(scope, key_hash, request_hash, ttl):
+        """
+        Claim a key for the current transaction.
+        
+        A new key is inserted; a key older than ttl is taken over. If another
+        transaction holds an uncommitted claim on the key, this blocks until
+        it commits or rolls back.
+        
+        Args:
+            scope (str): Endpoint the key belongs to
+            key_hash (bytes): Digest of the Idempotency-Key header
+            request_hash (bytes): Digest of the request body
+            ttl (float): Seconds after which a stored key expires
+            
+        Returns:
+            bool: True if claimed, False if a live key already exists
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                INSERT INTO idempotency_keys (scope, key_hash, request_hash)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (scope, key_hash) DO UPDATE
+                  SET request_hash = EXCLUDED.request_hash,
+                      status_code = NULL,
+                      body = NULL,
+                      content_type = NULL,
+                      created_at = NOW()
+                  WHERE idempotency_keys.created_at < NOW() - make_interval(secs => %s)
+                RETURNING 1;
+            """, (scope, psycopg2.Binary(key_hash), psycopg2.Binary(request_hash), ttl))
+            return cur.fetchone() is not None
+    
+    @staticmethod
+    def get(scope, key_hash):
+        """
+        Get a stored key.
+        
+        Args:
+            scope (str): Endpoint the key belongs to
+            key_hash (bytes): Digest of the Idempotency-Key header
+            
+        Returns:
+            dict or None: request_hash (bytes), status_code (None while the
+            claiming transaction has not completed), body (bytes),
+            content_type (str)
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                SELECT request_hash, status_code, body, content_type
+                FROM idempotency_keys
+                WHERE scope = %s AND key_hash = %s;
+            """, (scope, psycopg2.Binary(key_hash)))
+            row = cur.fetchone()
+            if not row:
+                return None
+            return {
+                'request_hash': bytes(row[0]),
+                'status_code': row[1],
+                'body': bytes(row[2]) if row[2] is not None else None,
+                'content_type': row[3] or 'application/json'
+            }
+    
+    @staticmethod
+    def complete(scope, key_hash, status_code, body, content_type):
+        """
+        Record the response for a claimed key.
+        
+        Args:
+            scope (str): Endpoint the key belongs to
+            key_hash (bytes): Digest of the Idempotency-Key header
+            status_code (int): HTTP status of the original response
+            body (bytes): Body of the original response
+            content_type (str): Content-Type of the original response
+            
+        Returns:
+            bool: False if the claim was lost (its transaction rolled back)
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE idempotency_keys
+                SET status_code = %s, body = %s, content_type = %s
+                WHERE scope = %s AND key_hash = %s;
+            """, (status_code, psycopg2.Binary(body), content_type, scope, psycopg2.Binary(key_hash)))
+            return cur.rowcount == 1
+    
+    @staticmethod
+    def release(scope, key_hash):
+        """
+        Drop a claimed key whose response can't be stored, so a retry runs again.
+        
+        Args:
+            scope (str): Endpoint the key belongs to
+            key_hash (bytes): Digest of the Idempotency-Key header
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                DELETE FROM idempotency_keys
+                WHERE scope = %s AND key_hash = %s;
+            """, (scope, psycopg2.Binary(key_hash)))
+    
+    @staticmethod
+    def purge_expired(ttl):
+        """
+        Delete keys older than ttl.
+        
+        Args:
+            ttl (float): Seconds a key is kept
+            
+        Returns:
+            int: Number of keys deleted
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                DELETE FROM idempotency_keys
+                WHERE created_at < NOW() - make_interval(secs => %s);
+            """, (ttl,))
+            return cur.rowcount
+
@@ -0,0 +1,187 @@
+"""
+Repository for background job data access.
+Handles the jobs queue table using raw SQL.
+"""
+from psycopg2.extras import Json, execute_values
+from utils.json_provider import dumps as json_dumps
+from .base_repository import BaseRepository
+
+
+class JobRepository(BaseRepository):
+    """Repository for enqueuing, claiming and completing background jobs."""
+    
+    @staticmethod
+    def enqueue(kind, payload, max_attempts=5, delay_seconds=0):
+        """
+        Add a job. Inside a unit of work it commits (and becomes visible to
+        workers) together with the rest of the request.
+        
+        Args:
+            kind (str): Job type, e.g. 'email'
+            payload (dict): JSON-serializable job data
+            max_attempts (int): Attempts before the job is marked failed
+            delay_seconds (float): Seconds before the job may run
+            
+        Returns:
+            int: The new job ID
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                INSERT INTO jobs (kind, payload, max_attempts, run_at)
+                VALUES (%s, %s, %s, NOW() + make_interval(secs => %s))
+                RETURNING job_id;
+            """, (kind, Json(payload, dumps=json_dumps), max_attempts, delay_seconds))
+            return cur.fetchone()[0]
+    
+    @staticmethod
+    def enqueue_many(kind, payloads, max_attempts=5):
+        """
+        Add many jobs of one kind in a single statement.
+        
+        Args:
+            kind (str): Job type, e.g. 'email'
+            payloads (list[dict]): JSON-serializable job data, one per job
+            max_attempts (int): Attempts before a job is marked failed
+            
+        Returns:
+            int: Number of jobs added
+        """
+        if not payloads:
+            return 0
+        with BaseRepository.get_cursor() as cur:
+            execute_values(cur, """
+                INSERT INTO jobs (kind, payload, max_attempts)
+                VALUES %s;
+            """, [(kind, Json(payload, dumps=json_dumps), max_attempts) for payload in payloads],
+                page_size=len(payloads))
+            return len(payloads)
+    
+    @staticmethod
+    def claim_batch(limit, lease_seconds):
+        """
+        Claim up to limit ready jobs, oldest first, skipping jobs other
+        workers hold.
+        
+        Args:
+            limit (int): Maximum number of jobs
+            lease_seconds (float): How long the claim lasts before the job is re-queued
+            
+        Returns:
+            list[dict]: job_id, kind, payload, attempts (including this one), max_attempts
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute("""
+                UPDATE jobs j
+                SET status = 'running',
+                    attempts = j.attempts + 1,
+                    locked_until = NOW() + make_interval(secs => %s)
+                FROM (
+                    SELECT job_id
+                    FROM jobs
+                    WHERE status = 'queued' AND run_at <= NOW()
+                    ORDER BY run_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                ) ready
+                WHERE j.job_id = ready.job_id
+                RETURNING j.job_id, j.kind, j.payload, j.attempts, j.max_attempts;
+            """, (lease_seconds, limit))
+            return cur.fetchall()
+    
+    @staticmethod
+    def mark_done(job_ids):
+        """
+        Mark jobs as delivered.
+        
+        Args:
+            job_ids (list[int]): Completed jobs
+        """
+        if not job_ids:
+            return
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE jobs
+                SET status = 'done', locked_until = NULL, last_error = NULL, finished_at = NOW()
+                WHERE job_id = ANY(%s);
+            """, (list(job_ids),))
+    
+    @staticmethod
+    def mark_retry(job_id, error, delay_seconds):
+        """
+        Re-queue a failed attempt to run again after a delay.
+        
+        Args:
+            job_id (int): Job ID
+            error (str): Why the attempt failed
+            delay_seconds (float): Backoff before the next attempt
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE jobs
+                SET status = 'queued', locked_until = NULL, last_error = %s,
+                    run_at = NOW() + make_interval(secs => %s)
+                WHERE job_id = %s;
+            """, (error, delay_seconds, job_id))
+    
+    @staticmethod
+    def mark_failed(job_id, error):
+        """
+        Give up on a job after its last attempt.
+        
+        Args:
+            job_id (int): Job ID
+            error (str): Why the last attempt failed
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE jobs
+                SET status = 'failed', locked_until = NULL, last_error = %s, finished_at = NOW()
+                WHERE job_id = %s;
+            """, (error, job_id))
+    
+    @staticmethod
+    def requeue_expired():
+        """
+        Re-queue jobs whose worker's lease ran out (e.g. the worker died).
+        
+        Returns:
+            int: Number of jobs re-queued
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                UPDATE jobs
+                SET status = 'queued', locked_until = NULL,
+                    last_error = COALESCE(last_error, 'lease expired')
+                WHERE status = 'running' AND locked_until < NOW();
+            """)
+            return cur.rowcount
+    
+    @staticmethod
+    def purge_finished(older_than_seconds):
+        """
+        Delete done and failed jobs finished more than older_than_seconds ago.
+        
+        Returns:
+            int: Number of jobs deleted
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                DELETE FROM jobs
+                WHERE status IN ('done', 'failed')
+                  AND finished_at < NOW() - make_interval(secs => %s);
+            """, (older_than_seconds,))
+            return cur.rowcount
+    
+    @staticmethod
+    def count_by_status():
+        """
+        Count jobs per status.
+        
+        Returns:
+            dict: {'queued': n, 'running': n, 'done': n, 'failed': n}
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status;")
+            counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+            counts.update(dict(cur.fetchall()))
+            return counts
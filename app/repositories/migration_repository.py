@@ -0,0 +1,63 @@
+"""
+Repository for schema migrations.
+Applies the numbered SQL files in app/migrations and records what ran.
+"""
+import os
+from .base_repository import BaseRepository
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+class MigrationRepository(BaseRepository):
+    """Repository for applying SQL migrations in order."""
+    
+    @staticmethod
+    def ensure_table():
+        """Create the schema_migrations bookkeeping table if needed."""
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version TEXT PRIMARY KEY,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                );
+            """)
+    
+    @staticmethod
+    def applied_versions():
+        """
+        Get the versions that have already been applied.
+        
+        Returns:
+            set[str]: Applied migration file names
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("SELECT version FROM schema_migrations;")
+            return {row[0] for row in cur.fetchall()}
+    
+    @staticmethod
+    def pending():
+        """
+        List migration files that have not been applied yet, in order.
+        
+        Returns:
+            list[str]: File names such as '001_change_feed.sql'
+        """
+        MigrationRepository.ensure_table()
+        applied = MigrationRepository.applied_versions()
+        files = sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith('.sql'))
+        return [f for f in files if f not in applied]
+    
+    @staticmethod
+    def apply(version):
+        """
+        Run one migration file and record it, in a single transaction.
+        
+        Args:
+            version (str): Migration file name
+        """
+        with open(os.path.join(MIGRATIONS_DIR, version), encoding='utf-8') as f:
+            sql = f.read()
+        
+        with BaseRepository.get_cursor() as cur:
+            cur.execute(sql)
+            cur.execute("INSERT INTO schema_migrations (version) VALUES (%s);", (version,))
@@ -0,0 +1,240 @@
+"""
+Repository for technician schedule data access.
+Handles interval reservations in technician_schedule using raw SQL.
+"""
+from psycopg2.extras import execute_values
+from .base_repository import BaseRepository
+
+
+class ScheduleRepository(BaseRepository):
+    """Repository for technician time-slot reservations."""
+    
+    # Per-technician advisory lock between bookings and time-off approvals.
+    # Time off isn't covered by the booking exclusion constraint, so a
+    # booking takes the lock shared and re-checks time off in its INSERT,
+    # and an approval takes it exclusively while it adds the time off.
+    # Either the booking sees the approved time off or the approval waits
+    # for the booking to commit. Bookings never block each other.
+    LOCK_CALENDARS_SHARED = """
+        SELECT pg_advisory_xact_lock_shared(hashtext('technician_calendar'), s.employeeid)
+        FROM (SELECT DISTINCT unnest(%s::int[]) AS employeeid ORDER BY 1) s;
+    """
+    LOCK_CALENDARS = """
+        SELECT pg_advisory_xact_lock(hashtext('technician_calendar'), s.employeeid)
+        FROM (SELECT DISTINCT unnest(%s::int[]) AS employeeid ORDER BY 1) s;
+    """
+    
+    @staticmethod
+    def find_free_technicians(start, end, limit=5):
+        """
+        Find technicians with no booking or approved time off overlapping [start, end), least loaded first.
+        
+        Each candidate costs one GiST probe on technician_schedule and one on
+        technician_availability, so the lookup is O(employees * log bookings).
+        
+        Args:
+            start (datetime): Start of the job
+            end (datetime): End of the job
+            limit (int): Maximum number of candidates
+            
+        Returns:
+            list[dict]: employeeid, firstname, lastname, phone, email, job_count
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute("""
+                SELECT e.employeeid, e.firstname, e.lastname, e.phone, e.email,
+                       COALESCE(l.job_count, 0) AS job_count
+                FROM employee e
+                LEFT JOIN technician_daily_load l
+                  ON l.employeeid = e.employeeid
+                 AND l.work_date = %(start)s::date
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM technician_schedule ts
+                    WHERE ts.employee_span @> e.employeeid
+                      AND ts.slot && tstzrange(%(start)s, %(end)s)
+                )
+                  AND NOT EXISTS (
+                    SELECT 1
+                    FROM technician_availability ta
+                    WHERE ta.employee_span @> e.employeeid
+                      AND ta.period && tstzrange(%(start)s, %(end)s)
+                      AND ta.kind = 'unavailable'
+                )
+                ORDER BY COALESCE(l.job_count, 0) ASC, e.employeeid ASC
+                LIMIT %(limit)s;
+            """, {'start': start, 'end': end, 'limit': limit})
+            return cur.fetchall()
+    
+    @staticmethod
+    def reserve(employee_id, request_id, start, end):
+        """
+        Book [start, end) for a technician and record the work assignment.
+        
+        Args:
+            employee_id (int): Technician to book
+            request_id (int): Service request the booking is for
+            start (datetime): Start of the job
+            end (datetime): End of the job
+            
+        Returns:
+            bool: True if booked, False if the slot was taken or became time
+            off concurrently
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute(ScheduleRepository.LOCK_CALENDARS_SHARED, ([employee_id],))
+            # Waits for a concurrent overlapping booking to commit, then skips
+            cur.execute("""
+                INSERT INTO technician_schedule (employeeid, requestid, slot)
+                SELECT %(employee_id)s, %(request_id)s, tstzrange(%(start)s, %(end)s)
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM technician_availability ta
+                    WHERE ta.employee_span @> %(employee_id)s::int
+                      AND ta.period && tstzrange(%(start)s, %(end)s)
+                      AND ta.kind = 'unavailable'
+                )
+                ON CONFLICT DO NOTHING
+                RETURNING schedule_id;
+            """, {'employee_id': employee_id, 'request_id': request_id, 'start': start, 'end': end})
+            if cur.fetchone() is None:
+                return False
+            
+            cur.execute("""
+                INSERT INTO work_assignments (requestid, employeeid)
+                VALUES (%s, %s);
+            """, (request_id, employee_id))
+            return True
+    
+    @staticmethod
+    def get_planning_snapshot(start, end):
+        """
+        Load everything needed to plan many bookings at once.
+        
+        Args:
+            start (datetime): Earliest job start in the batch
+            end (datetime): Latest job end in the batch
+            
+        Returns:
+            tuple: (technicians, bookings, loads) where technicians is a list of
+            employee dicts, bookings a list of (employeeid, slot_start, slot_end)
+            busy intervals (bookings and approved time off) overlapping
+            [start, end), and loads a dict {(employeeid, date): job_count}
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute("""
+                SELECT employeeid, firstname, lastname, phone, email
+                FROM employee
+                ORDER BY employeeid;
+            """)
+            technicians = cur.fetchall()
+            
+            # Approved time off blocks a technician like a booking does
+            cur.execute("""
+                SELECT employeeid, lower(slot)::timestamp AS slot_start, upper(slot)::timestamp AS slot_end
+                FROM technician_schedule
+                WHERE slot && tstzrange(%(start)s, %(end)s)
+                UNION ALL
+                SELECT employeeid, lower(period)::timestamp, upper(period)::timestamp
+                FROM technician_availability
+                WHERE period && tstzrange(%(start)s, %(end)s)
+                  AND kind = 'unavailable';
+            """, {'start': start, 'end': end})
+            bookings = [(r['employeeid'], r['slot_start'], r['slot_end']) for r in cur.fetchall()]
+            
+            cur.execute("""
+                SELECT employeeid, work_date, job_count
+                FROM technician_daily_load
+                WHERE work_date BETWEEN %s::date AND %s::date;
+            """, (start, end))
+            loads = {(r['employeeid'], r['work_date']): r['job_count'] for r in cur.fetchall()}
+            
+        return technicians, bookings, loads
+    
+    @staticmethod
+    def reserve_many(bookings):
+        """
+        Book many slots and record their work assignments in two statements.
+        
+        Args:
+            bookings (list[tuple]): (employee_id, request_id, start, end)
+            
+        Returns:
+            set: Request IDs that were booked; the others lost their slot to
+            a concurrent booking or time-off approval
+        """
+        if not bookings:
+            return set()
+        
+        with BaseRepository.get_cursor() as cur:
+            cur.execute(ScheduleRepository.LOCK_CALENDARS_SHARED,
+                        ([employee_id for employee_id, _, _, _ in bookings],))
+            rows = execute_values(cur, """
+                INSERT INTO technician_schedule (employeeid, requestid, slot)
+                SELECT v.employeeid, v.requestid, tstzrange(v.slot_start, v.slot_end)
+                FROM (VALUES %s) AS v(employeeid, requestid, slot_start, slot_end)
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM technician_availability ta
+                    WHERE ta.employee_span @> v.employeeid
+                      AND ta.period && tstzrange(v.slot_start, v.slot_end)
+                      AND ta.kind = 'unavailable'
+                )
+                ON CONFLICT DO NOTHING
+                RETURNING employeeid, requestid;
+            """, bookings, template="(%s, %s, %s::timestamp, %s::timestamp)",
+                page_size=len(bookings), fetch=True)
+            
+            if rows:
+                execute_values(cur, """
+                    INSERT INTO work_assignments (requestid, employeeid)
+                    VALUES %s;
+                """, [(request_id, employee_id) for employee_id, request_id in rows],
+                    page_size=len(rows))
+            return {request_id for _, request_id in rows}
+    
+    @staticmethod
+    def find_available_slots(candidate_starts, duration_minutes, limit=20):
+        """
+        Count free technicians for each candidate start time.
+        
+        Args:
+            candidate_starts (list[datetime]): Start times to check, in order
+            duration_minutes (int): Job length
+            limit (int): Maximum number of slots to return
+            
+        Returns:
+            list[dict]: slot_start, slot_end, technicians (free technician count)
+            for candidate starts with at least one free technician
+        """
+        if not candidate_starts:
+            return []
+        
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute("""
+                WITH candidates AS (
+                    SELECT c.slot_start,
+                           c.slot_start + make_interval(mins => %(minutes)s) AS slot_end
+                    FROM unnest(%(starts)s::timestamp[]) AS c(slot_start)
+                )
+                SELECT c.slot_start, c.slot_end, COUNT(e.employeeid) AS technicians
+                FROM candidates c
+                CROSS JOIN employee e
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM technician_schedule ts
+                    WHERE ts.employee_span @> e.employeeid
+                      AND ts.slot && tstzrange(c.slot_start, c.slot_end)
+                )
+                  AND NOT EXISTS (
+                    SELECT 1
+                    FROM technician_availability ta
+                    WHERE ta.employee_span @> e.employeeid
+                      AND ta.period && tstzrange(c.slot_start, c.slot_end)
+                      AND ta.kind = 'unavailable'
+                )
+                GROUP BY c.slot_start, c.slot_end
+                ORDER BY c.slot_start
+                LIMIT %(limit)s;
+            """, {'starts': list(candidate_starts), 'minutes': duration_minutes, 'limit': limit})
+            return cur.fetchall()
@@ -2,13 +2,25 @@
 Repository for services data access.
 Handles all database operations for services using raw SQL.
 """
+import json
+import hashlib
 import psycopg2
 from datetime import datetime, date
+from utils.cache import TTLCache
 from .base_repository import BaseRepository
 
 
 class ServiceRepository(BaseRepository):
-    """Repository for services-related database operations."""
+    """
+    Repository for services-related database operations.
+    
+    Catalog reads are served from an in-process cache, filled only once the
+    reading transaction commits. Writes through this repository invalidate
+    the affected entries once they commit.
+    """
+    
+    # Keys: ('all',), ('types',), ('by_type', name), ('by_id', service_id)
+    catalog_cache = TTLCache('service_catalog', maxsize=256, ttl=300)
     
     @staticmethod
     def get_all_services():
@@ -16,6 +28,84 @@ class ServiceRepository(BaseRepository):
         Get all services with their category information.
         Returns services ordered by category and job name.
         """
+        return ServiceRepository.get_catalog_entry('all')[0]
+    
+    @staticmethod
+    def get_service_types():
+        """Get all service types for dropdown options."""
+        return ServiceRepository.get_catalog_entry('types')[0]
+    
+    @staticmethod
+    def get_services_by_type(service_type_name):
+        """Get all services for a specific service type."""
+        return ServiceRepository.get_catalog_entry('by_type', service_type_name)[0]
+    
+    @staticmethod
+    def get_service_by_id(service_id):
+        """Get a specific service by ID with its category."""
+        return ServiceRepository.get_catalog_entry('by_id', service_id)[0]
+    
+    @staticmethod
+    def get_catalog_entry(kind, arg=None):
+        """
+        Get cached catalog data together with its content fingerprint.
+        
+        The fingerprint is a hash of the data computed once when the entry is
+        loaded, so it is identical across workers for identical data and can
+        serve as a strong HTTP ETag without re-serializing on every request.
+        
+        Args:
+            kind (str): 'all', 'types', 'by_type' or 'by_id'
+            arg: Service type name for 'by_type', service ID for 'by_id'
+            
+        Returns:
+            tuple: (data, fingerprint) where data is a list, a dict or None
+        """
+        loaders = {
+            'all': ServiceRepository._query_all_services,
+            'types': ServiceRepository._query_service_types,
+            'by_type': lambda: ServiceRepository._query_services_by_type(arg),
+            'by_id': lambda: ServiceRepository._query_service_by_id(arg),
+        }
+        load = loaders[kind]
+        key = (kind,) if arg is None else (kind, arg)
+        
+        def load_entry():
+            data = load()
+            return data, ServiceRepository._fingerprint(data)
+        
+        return ServiceRepository.catalog_cache.get_or_set(key, load_entry, defer=BaseRepository.on_commit)
+    
+    @staticmethod
+    def _fingerprint(data):
+        """Stable content hash of query results."""
+        payload = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+    
+    @staticmethod
+    def invalidate_catalog(service_id=None):
+        """
+        Drop cached catalog entries.
+        
+        Args:
+            service_id (int, optional): Only drop list entries and this service's
+                entry. Drops everything when omitted.
+        """
+        if service_id is None:
+            ServiceRepository.catalog_cache.clear()
+        else:
+            ServiceRepository.catalog_cache.invalidate_where(
+                lambda key: key[0] != 'by_id' or key[1] == service_id)
+    
+    @staticmethod
+    def _invalidate_after_write(service_id):
+        """Invalidate now, and again once the current transaction commits."""
+        ServiceRepository.invalidate_catalog(service_id)
+        BaseRepository.on_commit(lambda: ServiceRepository.invalidate_catalog(service_id))
+    
+    @staticmethod
+    def _query_all_services():
+        """Load all services from the database (uncached)."""
         query = """
         SELECT 
             s.service_id,
@@ -35,8 +125,8 @@ class ServiceRepository(BaseRepository):
             return cur.fetchall()
     
     @staticmethod
-    def get_service_types():
-        """Get all service types for dropdown options."""
+    def _query_service_types():
+        """Load all service types from the database (uncached)."""
         query = """
         SELECT service_type_id, service_type_name 
         FROM service_types 
@@ -48,8 +138,8 @@ class ServiceRepository(BaseRepository):
             return cur.fetchall()
     
     @staticmethod
-    def get_services_by_type(service_type_name):
-        """Get all services for a specific service type."""
+    def _query_services_by_type(service_type_name):
+        """Load services of one type from the database (uncached)."""
         query = """
         SELECT 
             s.service_id,
@@ -69,8 +159,8 @@ class ServiceRepository(BaseRepository):
             return cur.fetchall()
     
     @staticmethod
-    def get_service_by_id(service_id):
-        """Get a specific service by ID with its category."""
+    def _query_service_by_id(service_id):
+        """Load one service from the database (uncached)."""
         query = """
         SELECT 
             s.service_id,
@@ -106,54 +196,112 @@ class ServiceRepository(BaseRepository):
     
     @staticmethod
     def create_service(job_name, service_type_name, service_price, duration_hours=None, job_desc=None):
-        """Create a new service."""
-        # First, get the service_type_id from the service_type_name
-        service_type_id = ServiceRepository.get_service_type_id_by_name(service_type_name)
+        """
+        Create a new service.
         
-        if not service_type_id:
-            raise ValueError(f"Service type '{service_type_name}' not found")
+        Resolves the service type and inserts in a single statement, returning
+        the created row so callers don't need a follow-up SELECT.
         
+        Returns:
+            dict: The created service in the same shape as get_service_by_id()
+            
+        Raises:
+            ValueError: If the service type does not exist
+        """
         query = """
-        INSERT INTO services (service_type_id, job_name, job_desc, service_price, duration_hours)
-        VALUES (%s, %s, %s, %s, %s)
-        RETURNING service_id;
+        WITH ins AS (
+            INSERT INTO services (service_type_id, job_name, job_desc, service_price, duration_hours)
+            SELECT st.service_type_id, %s, %s, %s, %s
+            FROM service_types st
+            WHERE st.service_type_name = %s
+            RETURNING service_id, service_type_id, job_name, job_desc, service_price, duration_hours
+        )
+        SELECT 
+            ins.service_id,
+            st.service_type_name AS category,
+            ins.job_name,
+            ins.job_desc,
+            ins.service_price,
+            ins.duration_hours,
+            ins.service_type_id
+        FROM ins
+        JOIN service_types st 
+            ON ins.service_type_id = st.service_type_id;
         """
         
-        with BaseRepository.get_cursor() as cur:
-            cur.execute(query, (service_type_id, job_name, job_desc, service_price, duration_hours))
-            return cur.fetchone()[0]
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(query, (job_name, job_desc, service_price, duration_hours, service_type_name))
+            service = cur.fetchone()
+        
+        if not service:
+            raise ValueError(f"Service type '{service_type_name}' not found")
+        ServiceRepository._invalidate_after_write(service['service_id'])
+        return service
     
     @staticmethod
     def update_service(service_id, job_name, service_type_name, service_price, duration_hours=None, job_desc=None):
-        """Update an existing service."""
-        # Get the service_type_id from the service_type_name
-        service_type_id = ServiceRepository.get_service_type_id_by_name(service_type_name)
-        
-        if not service_type_id:
-            raise ValueError(f"Service type '{service_type_name}' not found")
-        
-        query = """
-        UPDATE services 
-        SET service_type_id = %s, 
-            job_name = %s, 
-            job_desc = %s, 
-            service_price = %s, 
-            duration_hours = %s
-        WHERE service_id = %s;
         """
+        Update an existing service.
         
-        with BaseRepository.get_cursor() as cur:
-            cur.execute(query, (service_type_id, job_name, job_desc, service_price, duration_hours, service_id))
-            return cur.rowcount > 0
+        Returns:
+            dict or None: The updated service in the same shape as
+            get_service_by_id(), or None if the service does not exist
+            
+        Raises:
+            ValueError: If the service type does not exist
+        """
+        with BaseRepository.unit_of_work():
+            # Get the service_type_id from the service_type_name
+            service_type_id = ServiceRepository.get_service_type_id_by_name(service_type_name)
+            
+            if not service_type_id:
+                raise ValueError(f"Service type '{service_type_name}' not found")
+            
+            query = """
+            UPDATE services s
+            SET service_type_id = st.service_type_id, 
+                job_name = %s, 
+                job_desc = %s, 
+                service_price = %s, 
+                duration_hours = %s
+            FROM service_types st
+            WHERE s.service_id = %s
+              AND st.service_type_id = %s
+            RETURNING 
+                s.service_id,
+                st.service_type_name AS category,
+                s.job_name,
+                s.job_desc,
+                s.service_price,
+                s.duration_hours,
+                s.service_type_id;
+            """
+            
+            with BaseRepository.get_dict_cursor() as cur:
+                cur.execute(query, (job_name, job_desc, service_price, duration_hours, service_id, service_type_id))
+                service = cur.fetchone()
+            
+            if service:
+                ServiceRepository._invalidate_after_write(service_id)
+            return service
     
     @staticmethod
     def delete_service(service_id):
-        """Delete a service."""
+        """
+        Delete a service.
+        
+        Returns:
+            bool: True if deleted, False if not found
+        """
         query = "DELETE FROM services WHERE service_id = %s;"
         
         with BaseRepository.get_cursor() as cur:
             cur.execute(query, (service_id,))
-            return cur.rowcount > 0
+            deleted = cur.rowcount > 0
+        
+        if deleted:
+            ServiceRepository._invalidate_after_write(service_id)
+        return deleted
     
     @staticmethod
     def list_all():
@@ -3,51 +3,64 @@ Repository for warranty data access.
 Handles all database operations for warranties using raw SQL.
 """
 import psycopg2
-from datetime import datetime, date
 from .base_repository import BaseRepository
 
 
 class WarrantyRepository(BaseRepository):
     """Repository for warranty-related database operations."""
     
+    # One query shape per search, each matching an index on "user"
+    _LOOKUP_SELECT = """
+        SELECT 
+            w.id,
+            w.service_name,
+            w.service_type,
+            w.work_order_id,
+            w.start_date,
+            w.end_date,
+            w.coverage,
+            w.notes
+        FROM "user" u
+        INNER JOIN warranties w ON w.user_id = u.id
+    """
+    _LOOKUP_BY_EMAIL = _LOOKUP_SELECT + """
+        WHERE u.email_key = %s
+        ORDER BY w.start_date DESC;
+    """
+    _LOOKUP_BY_PHONE = _LOOKUP_SELECT + """
+        WHERE u.phone_key = %s
+        ORDER BY w.start_date DESC;
+    """
+    _LOOKUP_BY_EMAIL_AND_PHONE = _LOOKUP_SELECT + """
+        WHERE u.email_key = %s AND u.phone_key = %s
+        ORDER BY w.start_date DESC;
+    """
+    
     @staticmethod
-    def lookup_by_email_or_phone(email=None, phone=None):
+    def lookup_by_email_or_phone(email_key=None, phone_key=None):
         """
-        Look up warranties by customer email or phone number.
+        Look up warranties by normalized customer email and/or phone.
+        
+        When both are given, the user must match both.
         
         Args:
-            email (str, optional): Customer email
-            phone (str, optional): Customer phone number
+            email_key (str, optional): Email from utils.normalize_email
+            phone_key (str, optional): E.164 phone from utils.normalize_phone
             
         Returns:
             list[dict]: List of warranty records with details
         """
-        if not email and not phone:
+        if email_key and phone_key:
+            query, params = WarrantyRepository._LOOKUP_BY_EMAIL_AND_PHONE, (email_key, phone_key)
+        elif email_key:
+            query, params = WarrantyRepository._LOOKUP_BY_EMAIL, (email_key,)
+        elif phone_key:
+            query, params = WarrantyRepository._LOOKUP_BY_PHONE, (phone_key,)
+        else:
             return []
         
         with BaseRepository.get_cursor() as cur:
-            query = """
-                SELECT 
-                    w.id,
-                    w.service_name,
-                    w.service_type,
-                    w.work_order_id,
-                    w.start_date,
-                    w.end_date,
-                    w.coverage,
-                    w.notes
-                FROM warranties w
-                INNER JOIN "user" u ON w.user_id = u.id
-                WHERE 
-                    (u.email = %s OR %s = '') AND
-                    (u.phoneNumber = %s OR %s = '')
-                ORDER BY w.start_date DESC;
-            """
-            
-            email_param = email or ''
-            phone_param = phone or ''
-            
-            cur.execute(query, (email_param, email_param, phone_param, phone_param))
+            cur.execute(query, params)
             rows = cur.fetchall()
             
             # Format warranty data
@@ -58,8 +71,8 @@ class WarrantyRepository(BaseRepository):
                     'serviceName': row[1],
                     'serviceType': row[2],
                     'workOrderId': row[3],
-                    'startDate': row[4].isoformat() if row[4] else None,
-                    'endDate': row[5].isoformat() if row[5] else None,
+                    'startDate': row[4],
+                    'endDate': row[5],
                     'coverage': row[6],
                     'notes': row[7]
                 })
@@ -100,8 +113,8 @@ class WarrantyRepository(BaseRepository):
                     'serviceName': row[1],
                     'serviceType': row[2],
                     'workOrderId': row[3],
-                    'startDate': row[4].isoformat() if row[4] else None,
-                    'endDate': row[5].isoformat() if row[5] else None,
+                    'startDate': row[4],
+                    'endDate': row[5],
                     'coverage': row[6],
                     'notes': row[7],
                     'userId': row[8]
@@ -144,3 +157,208 @@ class WarrantyRepository(BaseRepository):
             ))
             request_id = cur.fetchone()[0]
             return request_id
+    
+    # ---------------------------------------------------------- admin summary
+    
+    _SUMMARY_COLUMNS = """
+        warranty_id, user_id, work_order_id, customer_name, customer_email, customer_phone,
+        service_name, service_type, start_date, end_date, coverage, notes, status,
+        request_id, request_issue_type, request_urgency, request_description, request_created_at
+    """
+    
+    @staticmethod
+    def _format_summary(row):
+        """Convert a warranty_summary row to the admin page's shape."""
+        return {
+            'id': row['warranty_id'],
+            'customerId': row['user_id'],
+            'customerName': row['customer_name'],
+            'customerEmail': row['customer_email'],
+            'customerPhone': row['customer_phone'],
+            'serviceName': row['service_name'],
+            'serviceType': row['service_type'],
+            'workOrderId': row['work_order_id'],
+            'startDate': row['start_date'],
+            'endDate': row['end_date'],
+            'coverage': row['coverage'],
+            'notes': row['notes'],
+            'status': row['status'],
+            'serviceRequest': {
+                'id': row['request_id'],
+                'issueType': row['request_issue_type'],
+                'urgency': row['request_urgency'],
+                'description': row['request_description'],
+                'requestDate': row['request_created_at']
+            } if row['request_id'] is not None else None
+        }
+    
+    @staticmethod
+    def _escape_like(text):
+        """Escape LIKE wildcards so user input matches literally."""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    @staticmethod
+    def list_summaries(status=None, search=None, has_request=None, limit=50, after=None):
+        """
+        List warranties from warranty_summary, newest first, with keyset pagination.
+        
+        Args:
+            status (str, optional): 'pending', 'active' or 'expired'
+            search (str, optional): Start of the customer's name or email,
+                case-insensitive
+            has_request (bool, optional): Only warranties with (or without) a service request
+            limit (int): Maximum number of records
+            after (int, optional): Cursor - only warranties with a lower ID
+            
+        Returns:
+            list[dict]: Warranty summaries (see _format_summary)
+        """
+        conditions = []
+        params = []
+        if status is not None:
+            conditions.append("status = %s")
+            params.append(status)
+        if search:
+            # Prefix match, served by the lower(...) text_pattern_ops indexes
+            conditions.append("(lower(customer_email) LIKE %s OR lower(customer_name) LIKE %s)")
+            pattern = WarrantyRepository._escape_like(search.lower()) + '%'
+            params.extend([pattern, pattern])
+        if has_request is not None:
+            conditions.append("request_id IS NOT NULL" if has_request else "request_id IS NULL")
+        if after is not None:
+            conditions.append("warranty_id < %s")
+            params.append(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {WarrantyRepository._SUMMARY_COLUMNS}
+                FROM warranty_summary
+                {where}
+                ORDER BY warranty_id DESC
+                LIMIT %s;
+            """, params)
+            return [WarrantyRepository._format_summary(row) for row in cur.fetchall()]
+    
+    @staticmethod
+    def get_summary(warranty_id):
+        """
+        Get one warranty from warranty_summary.
+        
+        Args:
+            warranty_id (int): Warranty ID
+            
+        Returns:
+            dict: Warranty summary (see _format_summary) or None if not found
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {WarrantyRepository._SUMMARY_COLUMNS}
+                FROM warranty_summary
+                WHERE warranty_id = %s;
+            """, (warranty_id,))
+            row = cur.fetchone()
+            return WarrantyRepository._format_summary(row) if row else None
+    
+    @staticmethod
+    def count_summaries_by_status():
+        """
+        Count warranties per status.
+        
+        Returns:
+            dict: {'pending': n, 'active': n, 'expired': n, 'withRequest': n}
+        """
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                SELECT status, COUNT(*), COUNT(request_id)
+                FROM warranty_summary
+                GROUP BY status;
+            """)
+            counts = {'pending': 0, 'active': 0, 'expired': 0, 'withRequest': 0}
+            for status, total, with_request in cur.fetchall():
+                counts[status] = total
+                counts['withRequest'] += with_request
+            return counts
+    
+    @staticmethod
+    def list_expiring(today, days, limit=200):
+        """
+        List active warranties whose end date falls within the next days.
+        
+        Matches the "expiring" list of sweep_summaries(): warranties that
+        haven't started yet are left out.
+        
+        Args:
+            today (date): Reference date
+            days (int): Window length
+            limit (int): Maximum number of records
+            
+        Returns:
+            list[dict]: Warranty summaries ordered by end date
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute(f"""
+                SELECT {WarrantyRepository._SUMMARY_COLUMNS}
+                FROM warranty_summary
+                WHERE status <> 'expired'
+                  AND end_date BETWEEN %(today)s AND %(today)s + %(days)s
+                  AND COALESCE(start_date, %(today)s) <= %(today)s
+                ORDER BY end_date, warranty_id
+                LIMIT %(limit)s;
+            """, {'today': today, 'days': days, 'limit': limit})
+            return [WarrantyRepository._format_summary(row) for row in cur.fetchall()]
+    
+    @staticmethod
+    def sweep_summaries(today, days):
+        """
+        Move warranties whose dates have been reached to their new status and
+        list the ones expiring within days, in one statement.
+        
+        Guarded by a transaction-level advisory lock so only one worker or
+        cron job sweeps at a time.
+        
+        Args:
+            today (date): Reference date
+            days (int): "Expiring soon" window length
+            
+        Returns:
+            dict or None: {'expired': [...], 'activated': [...], 'expiring': [...]}
+            of warranty summaries, or None if another sweep is running
+        """
+        with BaseRepository.get_dict_cursor() as cur:
+            cur.execute("SELECT pg_try_advisory_xact_lock(hashtext('warranty_sweep')) AS locked;")
+            if not cur.fetchone()['locked']:
+                return None
+            
+            # Both partial indexes cover the candidates; nothing else is read
+            cur.execute(f"""
+                WITH swept AS (
+                    UPDATE warranty_summary s
+                    SET status = public.warranty_status(s.start_date, s.end_date, %(today)s),
+                        updated_at = NOW()
+                    WHERE ((s.status <> 'expired' AND s.end_date < %(today)s)
+                        OR (s.status = 'pending' AND s.start_date <= %(today)s))
+                      AND s.status <> public.warranty_status(s.start_date, s.end_date, %(today)s)
+                    RETURNING {WarrantyRepository._SUMMARY_COLUMNS}
+                )
+                SELECT 'swept' AS kind, {WarrantyRepository._SUMMARY_COLUMNS} FROM swept
+                UNION ALL
+                SELECT 'expiring' AS kind, {WarrantyRepository._SUMMARY_COLUMNS}
+                FROM warranty_summary
+                WHERE status <> 'expired'
+                  AND end_date BETWEEN %(today)s AND %(today)s + %(days)s
+                  AND COALESCE(start_date, %(today)s) <= %(today)s
+                ORDER BY kind, end_date, warranty_id;
+            """, {'today': today, 'days': days})
+            
+            result = {'expired': [], 'activated': [], 'expiring': []}
+            for row in cur.fetchall():
+                summary = WarrantyRepository._format_summary(row)
+                if row['kind'] == 'expiring':
+                    result['expiring'].append(summary)
+                elif summary['status'] == 'expired':
+                    result['expired'].append(summary)
+                else:
+                    result['activated'].append(summary)
+            return result
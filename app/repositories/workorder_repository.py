@@ -3,7 +3,7 @@ Repository for workorder data access.
 Handles all database operations for workorders using raw SQL.
 """
 import psycopg2
-from datetime import datetime, date
+from psycopg2.extras import execute_values
 from .base_repository import BaseRepository
 
 
@@ -41,9 +41,11 @@ class WorkorderRepository(BaseRepository):
     @staticmethod
     def create_with_expanded_data(customer_data, address_data, service_data, request_data, workorder_data):
         """
-        Create a new service request with all related data and auto-assign technician.
-        Uses existing customer if email exists, otherwise creates new customer.
-        Creates address, service request and automatically assigns technician if available.
+        Create a new service request with all related data.
+        Upserts the customer by case-insensitive email and the address by its
+        normalized fingerprint, so repeat bookings reuse both rows. Creates the
+        service request; technician assignment is done by SchedulingService in
+        the same transaction.
         
         Args:
             customer_data (dict): Customer info with keys: firstname, lastname, phone, email
@@ -53,194 +55,274 @@ class WorkorderRepository(BaseRepository):
             workorder_data (dict): Not used in this implementation (for future workorder creation)
             
         Returns:
-            dict: Dictionary with created IDs and technician info {request_id, customer_id, address_id, service_id, technician}
+            dict: Dictionary with created IDs {request_id, customer_id, address_id, service_id, preferred_datetime}
             
         Raises:
             psycopg2.Error: For any database errors during the transaction
         """
-        conn = BaseRepository.get_db_connection()
-        try:
-            with conn:
-                with conn.cursor() as cur:
-                    # Execute the enhanced query with technician auto-assignment and fallback logic
-                    cur.execute("""
-                        WITH existing_c AS (
-                          SELECT c.customerid
-                          FROM public.customer c
-                          WHERE c.email = %s
-                          LIMIT 1
-                        ),
-                        ins_c AS (
-                          INSERT INTO public.customer (firstname, lastname, phone, email)
-                          SELECT %s, %s, %s, %s
-                          WHERE NOT EXISTS (SELECT 1 FROM existing_c)
-                          RETURNING customerid
-                        ),
-                        cust AS (
-                          SELECT customerid FROM ins_c
-                          UNION ALL
-                          SELECT customerid FROM existing_c
-                          LIMIT 1
-                        ),
-                        addr AS (
-                          INSERT INTO public.addressbook (customer_id, address, city, state, zip_code)
-                          SELECT customerid, %s, %s, %s, %s
-                          FROM cust
-                          RETURNING address_id
-                        ),
-                        req AS (
-                          INSERT INTO public.servicerequests
-                            (customerid, addressid, service_id, description, preferred_datetime)
-                          SELECT c.customerid,
-                                 a.address_id,
-                                 %s,   -- service_id
-                                 %s,   -- description
-                                 %s    -- preferred_datetime
-                          FROM cust c
-                          CROSS JOIN addr a
-                          RETURNING requestid, customerid, addressid, service_id, preferred_datetime
-                        ),
-                        -- lấy assignment mới nhất (nếu đã có) cho request vừa tạo
-                        latest_assign AS (
-                          SELECT DISTINCT ON (wa.requestid)
-                                 wa.requestid, wa.employeeid
-                          FROM work_assignments wa
-                          JOIN req r ON r.requestid = wa.requestid
-                          ORDER BY wa.requestid, wa.assignment_id DESC
-                        ),
-                        
-                        -- Fallback chọn 1 nhân viên nếu chưa được assign
-                        -- Đếm số job của mỗi nhân viên trong CÙNG NGÀY với preferred_datetime của request mới
-                        fallback_candidates AS (
-                          SELECT
-                            e.employeeid, e.firstname, e.lastname, e.phone, e.email,
-                            r.requestid, r.preferred_datetime,
-                            COALESCE(
-                              COUNT(*) FILTER (
-                                WHERE date_trunc('day', sr.preferred_datetime) = date_trunc('day', r.preferred_datetime)
-                              ), 0
-                            ) AS same_day_jobs
-                          FROM employee e
-                          -- tham chiếu toàn bộ assignment hiện có để đếm việc theo ngày
-                          LEFT JOIN work_assignments wa ON wa.employeeid = e.employeeid
-                          LEFT JOIN servicerequests sr ON sr.requestid = wa.requestid
-                          -- CROSS JOIN req để biết ngày của request mới
-                          CROSS JOIN req r
-                          GROUP BY e.employeeid, e.firstname, e.lastname, e.phone, e.email, r.requestid, r.preferred_datetime
-                        ),
-                        -- Chọn 1 người "ít việc nhất trong ngày", nếu hòa thì employeeid nhỏ hơn
-                        fallback_pick AS (
-                          SELECT fc.requestid, fc.employeeid, fc.firstname, fc.lastname, fc.phone, fc.email
-                          FROM fallback_candidates fc
-                          ORDER BY fc.same_day_jobs ASC, fc.employeeid ASC
-                          LIMIT 1
-                        ),
-                        -- Hợp nhất: nếu đã có assignment thì dùng nó; nếu chưa thì dùng fallback
-                        chosen_emp AS (
-                          -- case ĐÃ có assignment
-                          SELECT la.requestid, e.employeeid, e.firstname, e.lastname, e.phone, e.email
-                          FROM latest_assign la
-                          JOIN employee e ON e.employeeid = la.employeeid
-
-                          UNION ALL
-
-                          -- case CHƯA có assignment => dùng fallback_pick
-                          SELECT r.requestid, fp.employeeid, fp.firstname, fp.lastname, fp.phone, fp.email
-                          FROM req r
-                          LEFT JOIN latest_assign la ON la.requestid = r.requestid
-                          JOIN fallback_pick fp ON la.requestid IS NULL
-                        )
-                        
-                        SELECT
-                          r.requestid,
-                          r.customerid,
-                          r.addressid,
-                          r.service_id,
-                          ce.employeeid,
-                          ce.firstname,
-                          ce.lastname,
-                          ce.phone,
-                          ce.email
-                        FROM req r
-                        JOIN chosen_emp ce
-                          ON ce.requestid = r.requestid;
-                    """, (
-                        customer_data['email'],           # %s - email for lookup
-                        customer_data['firstname'],       # %s - first_name
-                        customer_data['lastname'],        # %s - last_name
-                        customer_data['phone'],           # %s - phone
-                        customer_data['email'],           # %s - email for insert
-                        address_data['address'],          # %s - address
-                        address_data['city'],             # %s - city
-                        address_data['state'],            # %s - state
-                        address_data['zip_code'],         # %s - zip_code
-                        service_data['service_id'],       # %s - service_id
-                        request_data['description'],      # %s - description
-                        request_data['preferred_datetime'], # %s - preferred_datetime
-                    ))
-                    
-                    result = cur.fetchone()
-                    if not result:
-                        raise ValueError("Failed to create service request")
-                    
-                    # Debug output for technician assignment
-                    if result[4]:  # employeeid exists
-                        print(f"DEBUG: Technician auto-assigned - {result[5]} {result[6]} (ID: {result[4]})")
-                    else:
-                        print("DEBUG: No technician assigned")
-                    
-                    # Build response with technician info
-                    response = {
-                        'request_id': result[0],
-                        'customer_id': result[1],
-                        'address_id': result[2],
-                        'service_id': result[3]
-                    }
-                    
-                    # Include technician data if assigned
-                    if result[4]:  # employeeid exists
-                        response['technician'] = {
-                            'employee_id': result[4],
-                            'firstname': result[5],
-                            'lastname': result[6],
-                            'phone': result[7],
-                            'email': result[8]
-                        }
-                    else:
-                        response['technician'] = None
-                    
-                    return response
-        finally:
-            conn.close()
+        with BaseRepository.get_cursor() as cur:
+            cur.execute("""
+                WITH cust AS (
+                  -- Upsert by case-insensitive email; an existing customer is kept as-is
+                  INSERT INTO public.customer AS c (firstname, lastname, phone, email)
+                  VALUES (%s, %s, %s, %s)
+                  ON CONFLICT ((lower(email))) DO UPDATE SET email = c.email
+                  RETURNING customerid
+                ),
+                addr AS (
+                  -- Reuse the customer's address if it normalizes to the same fingerprint
+                  INSERT INTO public.addressbook AS a (customer_id, address, city, state, zip_code)
+                  SELECT customerid, %s, %s, %s, %s
+                  FROM cust
+                  ON CONFLICT (customer_id, address_fp) DO UPDATE SET customer_id = a.customer_id
+                  RETURNING address_id
+                ),
+                req AS (
+                  INSERT INTO public.servicerequests
+                    (customerid, addressid, service_id, description, preferred_datetime)
+                  SELECT c.customerid,
+                         a.address_id,
+                         %s,   -- service_id
+                         %s,   -- description
+                         %s    -- preferred_datetime
+                  FROM cust c
+                  CROSS JOIN addr a
+                  RETURNING requestid, customerid, addressid, service_id, preferred_datetime
+                )
+                SELECT
+                  r.requestid,
+                  r.customerid,
+                  r.addressid,
+                  r.service_id,
+                  r.preferred_datetime
+                FROM req r;
+            """, (
+                customer_data['firstname'],       # %s - first_name
+                customer_data['lastname'],        # %s - last_name
+                customer_data['phone'],           # %s - phone
+                customer_data['email'],           # %s - email
+                address_data['address'],          # %s - address
+                address_data['city'],             # %s - city
+                address_data['state'],            # %s - state
+                address_data['zip_code'],         # %s - zip_code
+                service_data['service_id'],       # %s - service_id
+                request_data['description'],      # %s - description
+                request_data['preferred_datetime'], # %s - preferred_datetime
+            ))
+            
+            result = cur.fetchone()
+            if not result:
+                raise ValueError("Failed to create service request")
+            
+            return {
+                'request_id': result[0],
+                'customer_id': result[1],
+                'address_id': result[2],
+                'service_id': result[3],
+                'preferred_datetime': result[4]
+            }
     
     @staticmethod
-    def list_all(limit=100):
+    def create_many_with_expanded_data(items):
+        """
+        Create many service requests with their customers and addresses
+        using a fixed number of set-based statements.
+        
+        Customers are upserted by case-insensitive email (existing rows are
+        reused, the first item wins for new ones) and addresses by customer
+        and normalized fingerprint, so repeats within the batch or against
+        earlier bookings share rows. Request IDs are reserved from their
+        sequence up front so each inserted row can be paired with its input
+        item without relying on RETURNING order.
+        
+        Args:
+            items (list[dict]): Prepared items with customer_data, address_data,
+                service_data and request_data (see create_with_expanded_data)
+            
+        Returns:
+            list[dict]: One {request_id, customer_id, address_id, service_id,
+            preferred_datetime} per item, in input order
+            
+        Raises:
+            psycopg2.Error: For any database errors during the transaction
         """
-        List all workorders ordered by ID descending.
+        if not items:
+            return []
+        count = len(items)
+        
+        with BaseRepository.get_cursor() as cur:
+            # 1. Customers: one upsert keyed by lower(email); first item wins for new ones
+            new_customers = {}
+            for item in items:
+                customer = item['customer_data']
+                new_customers.setdefault(customer['email'].lower(), (
+                    customer['firstname'], customer['lastname'],
+                    customer['phone'], customer['email']
+                ))
+            rows = execute_values(cur, """
+                INSERT INTO public.customer AS c (firstname, lastname, phone, email)
+                VALUES %s
+                ON CONFLICT ((lower(email))) DO UPDATE SET email = c.email
+                RETURNING lower(email), customerid;
+            """, list(new_customers.values()), page_size=len(new_customers), fetch=True)
+            customer_ids = dict(rows)
+            
+            # 2. Addresses: fingerprint in SQL, upsert each distinct (customer, address) once
+            item_customers = [customer_ids[item['customer_data']['email'].lower()] for item in items]
+            fingerprints = dict(execute_values(cur, """
+                SELECT v.ord, public.address_fingerprint(v.address, v.city, v.state, v.zip_code)
+                FROM (VALUES %s) AS v(ord, address, city, state, zip_code);
+            """, [
+                (ord_, item['address_data']['address'], item['address_data']['city'],
+                 item['address_data']['state'], item['address_data']['zip_code'])
+                for ord_, item in enumerate(items)
+            ], template="(%s, %s::text, %s::text, %s::text, %s::text)", page_size=count, fetch=True))
+            
+            new_addresses = {}
+            for ord_, item in enumerate(items):
+                address = item['address_data']
+                new_addresses.setdefault((item_customers[ord_], fingerprints[ord_]), (
+                    item_customers[ord_], address['address'], address['city'],
+                    address['state'], address['zip_code']
+                ))
+            rows = execute_values(cur, """
+                INSERT INTO public.addressbook AS a (customer_id, address, city, state, zip_code)
+                VALUES %s
+                ON CONFLICT (customer_id, address_fp) DO UPDATE SET customer_id = a.customer_id
+                RETURNING customer_id, address_fp, address_id;
+            """, list(new_addresses.values()), page_size=len(new_addresses), fetch=True)
+            address_ids = {(customer_id, fp): address_id for customer_id, fp, address_id in rows}
+            
+            # 3. Reserve request IDs so rows pair with items regardless of RETURNING order
+            cur.execute("""
+                SELECT nextval(pg_get_serial_sequence('public.servicerequests', 'requestid'))
+                FROM generate_series(1, %s);
+            """, (count,))
+            request_ids = [row[0] for row in cur.fetchall()]
+            
+            # 4. Requests, one statement
+            request_rows = []
+            created = []
+            for ord_, (item, request_id) in enumerate(zip(items, request_ids)):
+                customer_id = item_customers[ord_]
+                address_id = address_ids[(customer_id, fingerprints[ord_])]
+                req = item['request_data']
+                service_id = item['service_data']['service_id']
+                request_rows.append((request_id, customer_id, address_id, service_id,
+                                     req['description'], req['preferred_datetime']))
+                created.append({
+                    'request_id': request_id,
+                    'customer_id': customer_id,
+                    'address_id': address_id,
+                    'service_id': service_id,
+                    'preferred_datetime': req['preferred_datetime']
+                })
+            
+            execute_values(cur, """
+                INSERT INTO public.servicerequests
+                  (requestid, customerid, addressid, service_id, description, preferred_datetime)
+                VALUES %s;
+            """, request_rows, template="(%s, %s, %s, %s, %s, %s::timestamp)", page_size=count)
+            
+            return created
+    
+    @staticmethod
+    def list_page(limit=100, after=None, is_completed=None, customer_id=None,
+                  scheduled_from=None, scheduled_to=None):
+        """
+        List workorders newest first using keyset pagination.
+        
+        Seeks past the cursor with workorderid < after instead of OFFSET, so
+        every page costs the same regardless of how deep it is.
         
         Args:
             limit (int): Maximum number of records to return
+            after (int, optional): Cursor - only return workorders with a lower ID
+            is_completed (bool, optional): Filter by completion status
+            customer_id (int, optional): Filter by customer
+            scheduled_from (date, optional): Earliest scheduled date (inclusive)
+            scheduled_to (date, optional): Latest scheduled date (inclusive)
             
         Returns:
-            list[dict]: List of workorder dictionaries
+            list[dict]: Up to limit workorder dictionaries, ordered by ID descending
         """
+        conditions = []
+        params = []
+        if after is not None:
+            conditions.append("workorderid < %s")
+            params.append(after)
+        if is_completed is not None:
+            conditions.append("iscompleted = %s")
+            params.append(is_completed)
+        if customer_id is not None:
+            conditions.append("customerid = %s")
+            params.append(customer_id)
+        if scheduled_from is not None:
+            conditions.append("scheduleddate >= %s")
+            params.append(scheduled_from)
+        if scheduled_to is not None:
+            conditions.append("scheduleddate <= %s")
+            params.append(scheduled_to)
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        
         with BaseRepository.get_dict_cursor() as cur:
-            cur.execute("""
+            cur.execute(f"""
                 SELECT workorderid, requestid, customerid, scheduleddate, iscompleted
                 FROM workorders
+                {where_clause}
                 ORDER BY workorderid DESC
                 LIMIT %s;
-            """, (limit,))
-            rows = cur.fetchall()
+            """, params)
+            return cur.fetchall()
+    
+    @staticmethod
+    def list_all(limit=100):
+        """
+        List the most recent workorders ordered by ID descending.
+        
+        Args:
+            limit (int): Maximum number of records to return
             
-            # Convert date objects to ISO format strings
-            for row in rows:
-                if row.get("scheduleddate"):
-                    val = row["scheduleddate"]
-                    if isinstance(val, (datetime, date)):
-                        row["scheduleddate"] = val.isoformat()
+        Returns:
+            list[dict]: List of workorder dictionaries
+        """
+        return WorkorderRepository.list_page(limit=limit)
+    
+    @staticmethod
+    def stream_workorders(itersize=2000):
+        """
+        Stream every workorder through a server-side cursor.
+        
+        Args:
+            itersize (int): Rows fetched per round trip
+            
+        Yields:
+            tuple: Column names first, then one tuple per workorder
+        """
+        return BaseRepository.stream_query("""
+            SELECT workorderid, requestid, customerid, scheduleddate, iscompleted
+            FROM workorders
+            ORDER BY workorderid;
+        """, itersize=itersize)
+    
+    @staticmethod
+    def stream_service_requests(itersize=2000):
+        """
+        Stream every service request through a server-side cursor.
+        
+        Args:
+            itersize (int): Rows fetched per round trip
             
-            return rows
+        Yields:
+            tuple: Column names first, then one tuple per service request
+        """
+        return BaseRepository.stream_query("""
+            SELECT requestid, customerid, addressid, service_id, description, preferred_datetime
+            FROM servicerequests
+            ORDER BY requestid;
+        """, itersize=itersize)
     
     @staticmethod
     def get_by_id(workorder_id):
@@ -259,14 +341,7 @@ class WorkorderRepository(BaseRepository):
                 FROM workorders
                 WHERE workorderid = %s;
             """, (workorder_id,))
-            row = cur.fetchone()
-            
-            if row and row.get("scheduleddate"):
-                val = row["scheduleddate"]
-                if isinstance(val, (datetime, date)):
-                    row["scheduleddate"] = val.isoformat()
-            
-            return row
+            return cur.fetchone()
     
     @staticmethod
     def update(workorder_id, **kwargs):
@@ -5,5 +5,10 @@ from .workorder_routes import workorder_bp
 from .warranty_routes import warranty_bp
 from .api_routes import api_bp
 from .page_routes import page_bp
+from .admin_routes import admin_bp
+from .dispatch_routes import dispatch_bp
+from .availability_routes import availability_bp
+from .employee_routes import employee_bp
+from .event_routes import events_bp
 
-__all__ = ['workorder_bp', 'warranty_bp', 'api_bp', 'page_bp']
+__all__ = ['workorder_bp', 'warranty_bp', 'api_bp', 'page_bp', 'admin_bp', 'dispatch_bp', 'availability_bp', 'employee_bp', 'events_bp']
@@ -0,0 +1,160 @@
+"""
+Routes for admin dashboard endpoints.
+Handles HTTP requests and delegates to service layer.
+"""
+from flask import Blueprint, Response, request
+from services.warranty_service import WarrantyService
+from services.job_service import JobService
+from services.financial_service import FinancialService
+from services.financial_export_service import FinancialExportService
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+
+
+@admin_bp.get('/warranties')
+def list_warranties():
+    """
+    List warranties for the admin warranty page, newest first.
+    
+    Query parameters:
+      status      all (default), pending, active or expired
+      q           search customer name or email
+      hasRequest  true/false - only warranties with/without a service request
+      limit       page size, 1-200 (default 50)
+      after       cursor from the previous page's nextCursor
+    """
+    response, status_code = WarrantyService.list_admin_warranties(request.args)
+    return response, status_code
+
+
+@admin_bp.get('/warranties/counts')
+def warranty_counts():
+    """Count warranties per status (for the filter tabs)."""
+    response, status_code = WarrantyService.get_admin_warranty_counts()
+    return response, status_code
+
+
+@admin_bp.get('/warranties/expiring')
+def expiring_warranties():
+    """
+    List unexpired warranties ending soon.
+    
+    Query parameters:
+      days  window length, 1-365 (default 30)
+    """
+    response, status_code = WarrantyService.list_expiring_warranties(request.args)
+    return response, status_code
+
+
+@admin_bp.post('/warranties/sweep')
+def sweep_warranties():
+    """
+    Run the warranty expiry sweep now.
+    
+    Optional JSON: {"days": 30}  # "expiring soon" window
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        days = int(data.get('days', WarrantyService.expiring_days))
+    except (ValueError, TypeError):
+        return {'error': 'days must be an integer', 'success': False}, 400
+    
+    result = WarrantyService.sweep_warranties(days)
+    if result is None:
+        return {'error': 'A warranty sweep is already running', 'success': False}, 409
+    return {
+        'success': True,
+        'expired': len(result['expired']),
+        'activated': len(result['activated']),
+        'expiring': result['expiring']
+    }, 200
+
+
+@admin_bp.get('/jobs')
+def job_counts():
+    """Count background jobs per status (queued, running, done, failed)."""
+    response, status_code = JobService.get_counts()
+    return response, status_code
+
+
+@admin_bp.get('/financial/summary')
+def financial_summary():
+    """
+    Revenue, labor, profit and completed orders for a date range, with the
+    change from the period of equal length before it.
+    
+    Query parameters:
+      from  first day, YYYY-MM-DD (default: first day of this month)
+      to    last day, YYYY-MM-DD (default: last day of this month)
+    """
+    response, status_code = FinancialService.get_summary(request.args)
+    return response, status_code
+
+
+@admin_bp.get('/financial/by-service-type')
+def financial_by_service_type():
+    """Totals per service type for a date range (from, to as above)."""
+    response, status_code = FinancialService.get_by_service_type(request.args)
+    return response, status_code
+
+
+@admin_bp.get('/financial/by-technician')
+def financial_by_technician():
+    """Totals per technician for a date range (from, to as above)."""
+    response, status_code = FinancialService.get_by_technician(request.args)
+    return response, status_code
+
+
+@admin_bp.get('/financial/report')
+def financial_report():
+    """
+    Revenue and labor analytics grouped by one or more dimensions.
+    
+    Query parameters:
+      from, to  date range as above
+      groupBy   comma-separated: technician, serviceType, week, month, day
+                (default technician), e.g. groupBy=technician,week
+    """
+    response, status_code = FinancialService.get_report(request.args)
+    return response, status_code
+
+
+@admin_bp.get('/financial/workorders')
+def financial_workorders():
+    """
+    Completed workorders with revenue and costs, newest first.
+    
+    Query parameters:
+      from, to  date range as above
+      limit     page size, 1-1000 (default 100)
+      after     cursor from the previous page's nextCursor
+    """
+    response, status_code = FinancialService.list_workorders(request.args)
+    return response, status_code
+
+
+@admin_bp.get('/financial/export')
+def financial_export():
+    """
+    Stream financial reports as a chunked CSV download.
+    
+    Query parameters:
+      from, to  date range as above
+      type      summary (default), revenue, labor, work-orders, a
+                comma-separated list of them, or all. More than one report
+                downloads as a zip archive with one CSV per report.
+    
+    Rows are read from the rollups and through a server-side cursor, so
+    memory use stays flat however long the range is.
+    """
+    export, error = FinancialExportService.validate(request.args)
+    if error:
+        return {'error': error, 'success': False}, 400
+    
+    reports, start, end = export
+    filename = FinancialExportService.filename(reports, start, end)
+    return Response(
+        FinancialExportService.stream(reports, start, end),
+        mimetype=FinancialExportService.mimetype(reports),
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
@@ -4,6 +4,10 @@ Utility API routes (health check, database check, etc.).
 from flask import Blueprint, request, jsonify
 from repositories.base_repository import BaseRepository
 from repositories.service_repository import ServiceRepository
+from services.catalog_service import CatalogService
+from utils.cache import cache_stats
+from utils.rate_limit import rate_limit_stats
+from utils.http_cache import conditional_json
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
@@ -21,11 +25,20 @@ def db_check():
         with BaseRepository.get_cursor() as cur:
             cur.execute("SELECT current_database(), current_user, current_schema;")
             db, user, schema = cur.fetchone()
-        return {"ok": True, "db": db, "user": user, "schema": schema}, 200
+        return {
+            "ok": True, "db": db, "user": user, "schema": schema,
+            "pool": BaseRepository.get_pool().stats()
+        }, 200
     except Exception as e:
         return {"ok": False, "error": str(e)}, 500
 
 
+@api_bp.get("/cache/stats")
+def get_cache_stats():
+    """Report hit/miss counters for the in-process caches and rate limiters of this worker."""
+    return {"ok": True, "caches": cache_stats(), "rateLimits": rate_limit_stats()}, 200
+
+
 @api_bp.post("/login")
 def login():
     """Basic login endpoint for authentication."""
@@ -57,8 +70,8 @@ def login():
 def get_services():
     """Get all services with their categories."""
     try:
-        services = ServiceRepository.get_all_services()
-        return {"success": True, "data": services}, 200
+        services, etag = ServiceRepository.get_catalog_entry('all')
+        return conditional_json(etag, lambda: {"success": True, "data": services})
     except Exception as e:
         return {"success": False, "error": str(e)}, 500
 
@@ -67,9 +80,9 @@ def get_services():
 def get_service(service_id):
     """Get a specific service by ID."""
     try:
-        service = ServiceRepository.get_service_by_id(service_id)
+        service, etag = ServiceRepository.get_catalog_entry('by_id', service_id)
         if service:
-            return {"success": True, "data": service}, 200
+            return conditional_json(etag, lambda: {"success": True, "data": service})
         else:
             return {"success": False, "error": "Service not found"}, 404
     except Exception as e:
@@ -90,17 +103,14 @@ def create_service():
             if field not in data or not data[field]:
                 return {"success": False, "error": f"Missing required field: {field}"}, 400
         
-        # Create service
-        service_id = ServiceRepository.create_service(
+        # Create service (returns the created row)
+        service = ServiceRepository.create_service(
             job_name=data['name'],
             service_type_name=data['category'],
             service_price=float(data['price']),
             duration_hours=float(data['duration']) if data.get('duration') else None,
             job_desc=data.get('description')
         )
-        
-        # Return the created service
-        service = ServiceRepository.get_service_by_id(service_id)
         return {"success": True, "data": service, "message": "Service created successfully"}, 201
         
     except ValueError as e:
@@ -117,19 +127,14 @@ def update_service(service_id):
         if not data:
             return {"success": False, "error": "No data provided"}, 400
         
-        # Check if service exists
-        existing_service = ServiceRepository.get_service_by_id(service_id)
-        if not existing_service:
-            return {"success": False, "error": "Service not found"}, 404
-        
         # Validate required fields
         required_fields = ['name', 'category', 'price']
         for field in required_fields:
             if field not in data or not data[field]:
                 return {"success": False, "error": f"Missing required field: {field}"}, 400
         
-        # Update service
-        success = ServiceRepository.update_service(
+        # Update service (returns the updated row, or None if it doesn't exist)
+        service = ServiceRepository.update_service(
             service_id=service_id,
             job_name=data['name'],
             service_type_name=data['category'],
@@ -138,12 +143,10 @@ def update_service(service_id):
             job_desc=data.get('description')
         )
         
-        if success:
-            # Return updated service
-            service = ServiceRepository.get_service_by_id(service_id)
+        if service:
             return {"success": True, "data": service, "message": "Service updated successfully"}, 200
         else:
-            return {"success": False, "error": "Failed to update service"}, 500
+            return {"success": False, "error": "Service not found"}, 404
             
     except ValueError as e:
         return {"success": False, "error": str(e)}, 400
@@ -155,17 +158,12 @@ def update_service(service_id):
 def delete_service(service_id):
     """Delete a service."""
     try:
-        # Check if service exists
-        existing_service = ServiceRepository.get_service_by_id(service_id)
-        if not existing_service:
-            return {"success": False, "error": "Service not found"}, 404
-        
         # Delete service
         success = ServiceRepository.delete_service(service_id)
         if success:
             return {"success": True, "message": "Service deleted successfully"}, 200
         else:
-            return {"success": False, "error": "Failed to delete service"}, 500
+            return {"success": False, "error": "Service not found"}, 404
             
     except Exception as e:
         return {"success": False, "error": str(e)}, 500
@@ -175,8 +173,8 @@ def delete_service(service_id):
 def get_service_types():
     """Get all service types for dropdown options."""
     try:
-        service_types = ServiceRepository.get_service_types()
-        return {"success": True, "data": service_types}, 200
+        service_types, etag = ServiceRepository.get_catalog_entry('types')
+        return conditional_json(etag, lambda: {"success": True, "data": service_types})
     except Exception as e:
         return {"success": False, "error": str(e)}, 500
 
@@ -185,7 +183,20 @@ def get_service_types():
 def get_services_by_type(service_type_name):
     """Get all services for a specific service type."""
     try:
-        services = ServiceRepository.get_services_by_type(service_type_name)
-        return {"success": True, "data": services}, 200
+        services, etag = ServiceRepository.get_catalog_entry('by_type', service_type_name)
+        return conditional_json(etag, lambda: {"success": True, "data": services})
+    except Exception as e:
+        return {"success": False, "error": str(e)}, 500
+
+
+@api_bp.get("/appointment/bootstrap")
+def get_appointment_bootstrap():
+    """
+    Get service types, services grouped by category and the bookable date
+    range for the appointment form in a single cacheable response.
+    """
+    try:
+        payload, etag = CatalogService.get_appointment_bootstrap()
+        return conditional_json(etag, lambda: {"success": True, "data": payload})
     except Exception as e:
         return {"success": False, "error": str(e)}, 500
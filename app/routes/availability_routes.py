@@ -0,0 +1,103 @@
+"""
+Routes for technician availability, time-off requests and timesheet calendars.
+Handles HTTP requests and delegates to service layer.
+"""
+from flask import Blueprint, request
+from services.availability_service import AvailabilityService
+
+availability_bp = Blueprint('availability', __name__, url_prefix='/api')
+
+
+@availability_bp.get('/employee-availability')
+def get_availability_events():
+    """
+    Calendar events overlapping the visible window.
+    
+    Query parameters:
+      start, end  window, YYYY-MM-DD or ISO datetime (end exclusive, at most 62 days)
+      employeeId  only this technician (default all)
+      status      comma-separated: available, assigned, unavailable (default all)
+    """
+    response, status_code = AvailabilityService.get_events(request.args)
+    return response, status_code
+
+
+@availability_bp.post('/employee-availability')
+def submit_availability():
+    """
+    Record the hours a technician offers to work.
+    
+    Required JSON:
+    {
+      "employeeId": 1,
+      "selectedDates": ["2026-10-20", "2026-10-21"],
+      "startTime": "09:00",
+      "endTime": "17:00",
+      "notes": "..."          # optional
+    }
+    """
+    response, status_code = AvailabilityService.submit_availability(request.get_json(silent=True))
+    return response, status_code
+
+
+@availability_bp.get('/technicians')
+def list_technicians():
+    """List technicians (id, name) for calendar filters."""
+    response, status_code = AvailabilityService.list_technicians()
+    return response, status_code
+
+
+@availability_bp.get('/availability-requests')
+def list_availability_requests():
+    """
+    List time-off and availability change requests, oldest first.
+    
+    Query parameters:
+      status      pending (default), approved, rejected or all
+      employeeId  only this technician's requests
+      limit       1-200 (default 50)
+    """
+    response, status_code = AvailabilityService.list_requests(request.args)
+    return response, status_code
+
+
+@availability_bp.post('/availability-requests')
+def create_availability_request():
+    """
+    Submit a request for admin review.
+    
+    Required JSON:
+    {
+      "employeeId": 1,
+      "requestType": "time-off",       # sick-leave, personal-day, availability-change, other
+      "selectedDates": ["2026-11-05"],
+      "fullDay": false,                 # optional, default true
+      "startTime": "08:00",             # required unless fullDay
+      "endTime": "12:00",
+      "reason": "..."
+    }
+    """
+    response, status_code = AvailabilityService.create_request(request.get_json(silent=True))
+    return response, status_code
+
+
+@availability_bp.post('/availability-requests/approve')
+def approve_availability_request():
+    """
+    Approve a pending request.
+    
+    Required JSON: {"requestId": 1, "reviewedBy": "Admin"}
+    """
+    response, status_code = AvailabilityService.approve(request.get_json(silent=True))
+    return response, status_code
+
+
+@availability_bp.post('/availability-requests/reject')
+def reject_availability_request():
+    """
+    Reject a pending request.
+    
+    Required JSON: {"requestId": 1, "reviewedBy": "Admin", "reason": "..."}
+    """
+    response, status_code = AvailabilityService.reject(request.get_json(silent=True))
+    return response, status_code
@@ -0,0 +1,51 @@
+"""
+Routes for the warranty service request dispatch queue.
+Handles HTTP requests and delegates to service layer.
+"""
+from flask import Blueprint, request
+from services.dispatch_service import DispatchService
+
+dispatch_bp = Blueprint('dispatch', __name__, url_prefix='/api/dispatch')
+
+
+@dispatch_bp.get('/queue')
+def get_queue():
+    """
+    Show pending service requests in dispatch order (most urgent, then oldest).
+    
+    Query parameters:
+      limit  requests to show, 1-200 (default 50)
+    """
+    response, status_code = DispatchService.get_queue(request.args)
+    return response, status_code
+
+
+@dispatch_bp.post('/claim')
+def claim_requests():
+    """
+    Claim the next pending service requests.
+    
+    Required JSON:
+    {
+      "dispatcher": "maria",
+      "count": 5            # optional, 1-50 (default 1)
+    }
+    
+    Concurrent claims never return the same request.
+    """
+    response, status_code = DispatchService.claim(request.get_json(silent=True))
+    return response, status_code
+
+
+@dispatch_bp.post('/requests/<int:request_id>/release')
+def release_request(request_id):
+    """Put a claimed service request back in the queue."""
+    response, status_code = DispatchService.release(request_id)
+    return response, status_code
+
+
+@dispatch_bp.post('/requests/<int:request_id>/resolve')
+def resolve_request(request_id):
+    """Mark a claimed service request as resolved."""
+    response, status_code = DispatchService.resolve(request_id)
+    return response, status_code
@@ -0,0 +1,57 @@
+"""
+Routes for the technician job view.
+Handles HTTP requests and delegates to service layer.
+"""
+from flask import Blueprint, request
+from services.employee_job_service import EmployeeJobService
+
+employee_bp = Blueprint('employee', __name__, url_prefix='/api/employee')
+
+
+@employee_bp.get('/jobs')
+def sync_jobs():
+    """
+    A technician's jobs, in full or as changes since the last sync.
+    
+    Query parameters:
+      employeeId  technician (required)
+      since       token from the previous response; omit for a full load
+    
+    Apply removed (drop those job IDs) before jobs (add or replace by id),
+    then keep token for the next call.
+    """
+    response, status_code = EmployeeJobService.sync(request.args)
+    return response, status_code
+
+
+@employee_bp.put('/jobs/<int:job_id>/status')
+def update_job_status(job_id):
+    """
+    Update a job's status.
+    
+    Required JSON: {"employeeId": 1, "status": "in-progress"}   # pending, in-progress, completed
+    """
+    response, status_code = EmployeeJobService.update_status(job_id, request.get_json(silent=True))
+    return response, status_code
+
+
+@employee_bp.put('/jobs/<int:job_id>/notes')
+def save_job_notes(job_id):
+    """
+    Replace a job's work notes.
+    
+    Required JSON: {"employeeId": 1, "notes": "..."}
+    """
+    response, status_code = EmployeeJobService.save_notes(job_id, request.get_json(silent=True))
+    return response, status_code
+
+
+@employee_bp.post('/jobs/<int:job_id>/cancel')
+def cancel_job(job_id):
+    """
+    Cancel a pending or in-progress job.
+    
+    Required JSON: {"employeeId": 1, "reason": "...", "description": "..."}
+    """
+    response, status_code = EmployeeJobService.cancel(job_id, request.get_json(silent=True))
+    return response, status_code
@@ -0,0 +1,48 @@
+"""
+Routes for live dashboard events (Server-Sent Events).
+Handles HTTP requests and delegates to service layer.
+"""
+from flask import Blueprint, Response, request
+from services.event_service import EventService
+
+events_bp = Blueprint('events', __name__, url_prefix='/api')
+
+
+@events_bp.get('/events')
+def stream_events():
+    """
+    Push assignment and status changes as they happen (text/event-stream).
+    
+    Query parameters:
+      employeeId  one technician's jobs
+      view=admin  every technician's jobs
+    
+    Each event names what changed (jobId, status, ...); reload details from
+    the job or calendar APIs. On a resync event, or after the browser
+    reconnects, reload everything. Idle streams get a comment line every
+    EVENTS_HEARTBEAT_INTERVAL seconds.
+    
+    Each stream occupies a request thread while open. At most
+    EVENTS_MAX_STREAMS streams are open per worker process, so regular
+    requests keep threads to run on; beyond that the stream gets a 503.
+    """
+    topics, error = EventService.validate(request.args)
+    if error:
+        return {'error': error, 'success': False}, 400
+    
+    subscription = EventService.subscribe(topics)
+    if subscription is None:
+        return ({'error': 'Too many open event streams, try again later', 'success': False}, 503,
+                {'Retry-After': str(EventService.retry_ms // 1000)})
+    
+    response = Response(EventService.stream(subscription), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Also ends the subscription if the client leaves before the first chunk
+    response.call_on_close(subscription.close)
+    return response
+
+
+@events_bp.get('/events/stats')
+def get_event_stats():
+    """Report open streams and event counters for this worker."""
+    return {'success': True, 'events': EventService.stats()}, 200
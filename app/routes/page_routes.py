@@ -3,6 +3,10 @@ Routes for serving HTML pages (frontend views).
 These routes render templates for the user interface.
 """
 from flask import Blueprint, render_template, request, session
+from services.catalog_service import CatalogService
+import logging
+
+logger = logging.getLogger(__name__)
 
 page_bp = Blueprint('pages', __name__)
 
@@ -84,8 +88,14 @@ def employee_view():
 
 @page_bp.get("/appointment")
 def appointment():
-    """Appointment form page."""
-    return render_template("customer/appointmentForm.html")
+    """Appointment form page with the catalog inlined to skip the bootstrap request."""
+    try:
+        bootstrap, _ = CatalogService.get_appointment_bootstrap()
+    except Exception:
+        # The form falls back to fetching /api/appointment/bootstrap
+        logger.warning("Appointment bootstrap unavailable", exc_info=True)
+        bootstrap = None
+    return render_template("customer/appointmentForm.html", bootstrap=bootstrap)
 
 
 @page_bp.route("/confirmation", methods=["GET", "POST"])
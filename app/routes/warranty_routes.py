@@ -4,15 +4,21 @@ Handles HTTP requests and delegates to service layer.
 """
 from flask import Blueprint, request, jsonify
 from services.warranty_service import WarrantyService
+from utils.idempotency import idempotent
+from utils.rate_limit import rate_limited, client_address
 
 warranty_bp = Blueprint('warranty', __name__, url_prefix='/api/warranty')
 
 
 @warranty_bp.post('/lookup')
+@rate_limited(WarrantyService.lookup_limiter)
 def lookup_warranty():
     """
     Look up warranties by email or phone number.
     
+    Public endpoint: rate limited per client (429 with Retry-After) and
+    served from a short-lived cache.
+    
     Required JSON:
     {
       "email": "customer@example.com",  # optional
@@ -24,11 +30,20 @@ def lookup_warranty():
     return jsonify(response), status_code
 
 
+def _client_and_warranty():
+    """Rate limit key for detail emails: the caller and the warranty asked about."""
+    data = request.get_json(silent=True) or {}
+    return f"{client_address()}:{data.get('warrantyId')}"
+
+
 @warranty_bp.post('/request-details')
+@rate_limited(WarrantyService.details_limiter, key_func=_client_and_warranty)
 def request_warranty_details():
     """
     Send warranty details to customer via email.
     
+    Rate limited per client and warranty, since each call emails the customer.
+    
     Required JSON:
     {
       "warrantyId": 1,
@@ -43,6 +58,7 @@ def request_warranty_details():
 
 
 @warranty_bp.post('/request-service')
+@idempotent('warranty.request-service')
 def request_warranty_service():
     """
     Create a service request for an active warranty.
@@ -57,6 +73,9 @@ def request_warranty_service():
       "urgency": "high",
       "problemDescription": "Description of the issue"
     }
+    
+    Supports the Idempotency-Key header; retries with the same key replay
+    the original response instead of creating another request.
     """
     data = request.get_json()
     response, status_code = WarrantyService.request_warranty_service(data)
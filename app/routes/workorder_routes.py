@@ -2,8 +2,11 @@
 Routes for workorder endpoints.
 Handles HTTP requests and delegates to service layer.
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from services.workorder_service import WorkorderService
+from services.export_service import ExportService
+from services.scheduling_service import SchedulingService
+from utils.idempotency import idempotent
 
 workorder_bp = Blueprint('workorder', __name__, url_prefix='/workorders')
 
@@ -29,8 +32,60 @@ def create_workorder():
 
 @workorder_bp.get("")
 def list_workorders():
-    """List recent work orders."""
-    response, status_code = WorkorderService.list_workorders()
+    """
+    List work orders newest first with keyset pagination.
+    
+    Query parameters (all optional):
+      limit          page size, 1-500 (default 100)
+      after          nextCursor from the previous page
+      isCompleted    true/false
+      customerId     customer ID
+      scheduledFrom  YYYY-MM-DD (inclusive)
+      scheduledTo    YYYY-MM-DD (inclusive)
+    """
+    response, status_code = WorkorderService.list_workorders(request.args)
+    return response, status_code
+
+
+@workorder_bp.get("/export")
+def export_workorders():
+    """
+    Stream a full export as a chunked download.
+    
+    Query parameters:
+      dataset  workorders (default) or servicerequests
+      format   csv (default) or ndjson
+    
+    Rows are read through a server-side cursor, so memory use stays flat
+    regardless of table size.
+    """
+    dataset = request.args.get("dataset", "workorders")
+    fmt = request.args.get("format", "csv")
+    error = ExportService.validate(dataset, fmt)
+    if error:
+        return {"ok": False, "error": error}, 400
+    
+    extension = "csv" if fmt == "csv" else "ndjson"
+    return Response(
+        ExportService.stream(dataset, fmt),
+        mimetype=ExportService.FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={dataset}.{extension}"}
+    )
+
+
+@workorder_bp.get("/available-slots")
+def available_slots():
+    """
+    List start times at which at least one technician is free for the
+    full duration of a service.
+    
+    Query parameters:
+      serviceId  service to book (required)
+      from       first day to search, YYYY-MM-DD (default today)
+      days       number of days to search, 1-31 (default 7)
+      limit      maximum slots returned, 1-100 (default 20)
+    """
+    response, status_code = SchedulingService.available_slots(request.args)
     return response, status_code
 
 
@@ -42,6 +97,7 @@ def get_workorder(workorder_id):
 
 
 @workorder_bp.post("/expanded")
+@idempotent("workorders.expanded")
 def create_workorder_with_expanded_data():
     """
     Create a service request with all related data (customer, address, service request).
@@ -73,7 +129,28 @@ def create_workorder_with_expanded_data():
     }
     
     Returns service request ID and related IDs for confirmation.
+    
+    Send an Idempotency-Key header to make retries safe: a repeated request
+    with the same key returns the original response without booking again.
     """
     data = request.get_json(silent=True) or {}
     response, status_code = WorkorderService.create_workorder_with_expanded_data(data)
     return response, status_code
+
+
+@workorder_bp.post("/expanded/batch")
+def create_workorders_with_expanded_data_batch():
+    """
+    Create many service requests in one call (call center and partner imports).
+    
+    JSON body: an array of /workorders/expanded payloads, or {"items": [...]}.
+    At most WorkorderService.MAX_BATCH_SIZE items per call.
+    
+    Returns 201 when every item was created, 207 with per-item results when
+    some items failed validation, and 400 when none were valid.
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get("items")
+    response, status_code = WorkorderService.create_workorders_with_expanded_data_batch(data)
+    return response, status_code
@@ -3,5 +3,8 @@ Make services package importable.
 """
 from .workorder_service import WorkorderService
 from .warranty_service import WarrantyService
+from .catalog_service import CatalogService
+from .export_service import ExportService
+from .scheduling_service import SchedulingService
 
-__all__ = ['WorkorderService', 'WarrantyService']
+__all__ = ['WorkorderService', 'WarrantyService', 'CatalogService', 'ExportService', 'SchedulingService']
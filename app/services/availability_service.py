@@ -0,0 +1,469 @@
+"""
+Service layer for technician availability, time off and timesheet calendars.
+Handles validation and orchestrates repository calls.
+"""
+from datetime import datetime, time, timedelta
+from repositories.availability_repository import AvailabilityRepository
+from repositories.base_repository import BaseRepository
+import psycopg2
+
+
+class AvailabilityService:
+    """
+    Service for technician availability and time-off requests.
+    
+    Offered hours, approved time off and booked jobs are stored as time
+    ranges, so a calendar loads only the events overlapping its visible
+    window no matter how much history exists.
+    """
+    
+    REQUEST_TYPES = {
+        'time-off': 'Time Off / Vacation',
+        'sick-leave': 'Sick Leave',
+        'personal-day': 'Personal Day',
+        'availability-change': 'Availability Change',
+        'other': 'Other',
+    }
+    
+    # Calendar event statuses
+    STATUSES = ('available', 'assigned', 'unavailable')
+    
+    # A month view with its leading and trailing weeks spans 42 days
+    MAX_WINDOW_DAYS = 62
+    MAX_DATES = 62
+    DEFAULT_REQUEST_LIMIT = 50
+    MAX_REQUEST_LIMIT = 200
+    
+    @staticmethod
+    def _parse_datetime(value):
+        """
+        Parse YYYY-MM-DD or an ISO datetime.
+        
+        A UTC offset (or Z) is kept, so the range columns compare the exact
+        instant; values without one are taken in the database's time zone.
+        """
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    
+    @staticmethod
+    def _parse_employee_id(value, required=False):
+        """
+        Read an employee ID.
+        
+        Returns:
+            tuple: (employee_id or None, error_message or None)
+        """
+        if value in (None, '', 'all'):
+            return None, 'employeeId is required' if required else None
+        try:
+            return int(value), None
+        except (TypeError, ValueError):
+            return None, 'employeeId must be an integer'
+    
+    @staticmethod
+    def _build_periods(data, full_day):
+        """
+        Turn selected dates plus a daily time range into (start, end) periods.
+        
+        Args:
+            data (dict): selectedDates (list of YYYY-MM-DD) and, unless
+                full_day, startTime and endTime (HH:MM)
+            full_day (bool): Cover each whole day
+        
+        Returns:
+            tuple: (periods, None) or (None, error_message)
+        """
+        selected = data.get('selectedDates')
+        if not selected and data.get('startDate'):
+            selected = [data.get('startDate')]
+        if not isinstance(selected, list) or not selected:
+            return None, 'selectedDates must be a non-empty list of dates'
+        if len(selected) > AvailabilityService.MAX_DATES:
+            return None, f'At most {AvailabilityService.MAX_DATES} dates can be submitted at once'
+        
+        try:
+            days = sorted({datetime.strptime(str(d), '%Y-%m-%d').date() for d in selected})
+        except ValueError:
+            return None, "selectedDates must be in 'YYYY-MM-DD' format"
+        
+        if full_day:
+            return [(datetime.combine(d, time.min), datetime.combine(d + timedelta(days=1), time.min))
+                    for d in days], None
+        
+        try:
+            start_time = datetime.strptime(str(data.get('startTime')), '%H:%M').time()
+            end_time = datetime.strptime(str(data.get('endTime')), '%H:%M').time()
+        except ValueError:
+            return None, "startTime and endTime are required in 'HH:MM' format"
+        if end_time <= start_time:
+            return None, 'endTime must be after startTime'
+        return [(datetime.combine(d, start_time), datetime.combine(d, end_time)) for d in days], None
+    
+    @staticmethod
+    def parse_window(params):
+        """
+        Read the visible calendar window from query parameters.
+        
+        Args:
+            params (dict): start and end (YYYY-MM-DD or ISO datetime, end exclusive)
+        
+        Returns:
+            tuple: ((start, end), None) or (None, error_message)
+        """
+        if not params.get('start') or not params.get('end'):
+            return None, 'start and end are required'
+        try:
+            start = AvailabilityService._parse_datetime(params['start'])
+            end = AvailabilityService._parse_datetime(params['end'])
+        except ValueError:
+            return None, 'start and end must be ISO dates or datetimes'
+        if (start.tzinfo is None) != (end.tzinfo is None):
+            return None, 'start and end must both have a UTC offset or both have none'
+        if end <= start:
+            return None, 'end must be after start'
+        if end - start > timedelta(days=AvailabilityService.MAX_WINDOW_DAYS):
+            return None, f'The window can span at most {AvailabilityService.MAX_WINDOW_DAYS} days'
+        return (start, end), None
+    
+    @staticmethod
+    def _is_full_day(start, end):
+        return start.time() == time.min and end.time() == time.min and end > start
+    
+    @staticmethod
+    def _name(firstname, lastname):
+        return f"{firstname or ''} {lastname or ''}".strip()
+    
+    @staticmethod
+    def get_events(params=None):
+        """
+        Calendar events overlapping a window: offered hours, booked jobs and approved time off.
+        
+        Args:
+            params (dict, optional): Query parameters:
+                - start, end (str): Visible window (end exclusive, at most 62 days)
+                - employeeId (int): Only this technician
+                - status (str): Comma-separated: available, assigned, unavailable (default all)
+        
+        Returns:
+            tuple: (response_dict, status_code). events are ordered by start.
+        """
+        params = params or {}
+        window, error = AvailabilityService.parse_window(params)
+        if error:
+            return {'error': error, 'success': False}, 400
+        start, end = window
+        
+        employee_id, error = AvailabilityService._parse_employee_id(params.get('employeeId'))
+        if error:
+            return {'error': error, 'success': False}, 400
+        
+        status = params.get('status') or 'all'
+        statuses = AvailabilityService.STATUSES if status == 'all' else [
+            s.strip() for s in status.split(',') if s.strip()
+        ]
+        if not statuses or any(s not in AvailabilityService.STATUSES for s in statuses):
+            return {
+                'error': f"status must be all or a comma-separated list of: {', '.join(AvailabilityService.STATUSES)}",
+                'success': False
+            }, 400
+        
+        try:
+            kinds = tuple(s for s in statuses if s != 'assigned')
+            periods = AvailabilityRepository.list_periods(start, end, employee_id, kinds) if kinds else []
+            bookings = AvailabilityRepository.list_bookings(start, end, employee_id) if 'assigned' in statuses else []
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        events = []
+        for row in periods:
+            event = {
+                'id': f"{row['kind']}-{row['availability_id']}",
+                'status': row['kind'],
+                'technicianId': row['employeeid'],
+                'technicianName': AvailabilityService._name(row['firstname'], row['lastname']),
+                'start': row['period_start'],
+                'end': row['period_end'],
+                'allDay': AvailabilityService._is_full_day(row['period_start'], row['period_end']),
+                'notes': row['notes']
+            }
+            if row['kind'] == 'unavailable':
+                event['unavailableType'] = row['label']
+                event['reason'] = row['notes']
+            events.append(event)
+        
+        for row in bookings:
+            events.append({
+                'id': f"assigned-{row['schedule_id']}",
+                'status': 'assigned',
+                'technicianId': row['employeeid'],
+                'technicianName': AvailabilityService._name(row['firstname'], row['lastname']),
+                'start': row['slot_start'],
+                'end': row['slot_end'],
+                'allDay': False,
+                'requestId': row['requestid'],
+                'workOrderId': row['workorderid'],
+                'customer': AvailabilityService._name(row['customer_firstname'], row['customer_lastname']),
+                'service': row['service_name']
+            })
+        
+        events.sort(key=lambda e: (e['start'], e['technicianId']))
+        return {
+            'success': True,
+            'start': start,
+            'end': end,
+            'count': len(events),
+            'events': events
+        }, 200
+    
+    @staticmethod
+    def list_technicians():
+        """
+        List technicians for calendar filters.
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        try:
+            rows = AvailabilityRepository.list_technicians()
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        return {
+            'success': True,
+            'technicians': [
+                {'id': row['employeeid'], 'name': AvailabilityService._name(row['firstname'], row['lastname'])}
+                for row in rows
+            ]
+        }, 200
+    
+    @staticmethod
+    def submit_availability(data):
+        """
+        Record the hours a technician offers to work on selected dates.
+        
+        Hours submitted for a date replace that date's previous hours.
+        
+        Args:
+            data (dict): Request data containing:
+                - employeeId (int): Technician
+                - selectedDates (list): YYYY-MM-DD dates
+                - startTime, endTime (str): HH:MM, the same on every date
+                - notes (str, optional)
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        if not data:
+            return {'error': 'No data provided', 'success': False}, 400
+        
+        employee_id, error = AvailabilityService._parse_employee_id(data.get('employeeId'), required=True)
+        if error:
+            return {'error': error, 'success': False}, 400
+        periods, error = AvailabilityService._build_periods(data, full_day=False)
+        if error:
+            return {'error': error, 'success': False}, 400
+        
+        try:
+            ids = AvailabilityRepository.add_periods(
+                employee_id, 'available', periods, notes=(data.get('notes') or '').strip() or None
+            )
+        except psycopg2.errors.ForeignKeyViolation:
+            return {'error': 'Employee not found', 'success': False}, 404
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        return {
+            'success': True,
+            'message': f'Availability saved for {len(ids)} date(s)',
+            'availabilityIds': ids
+        }, 201
+    
+    @staticmethod
+    def _format_request(row):
+        """Convert an availability request row to the API's shape."""
+        return {
+            'id': row['request_id'],
+            'employeeId': row['employeeid'],
+            'employeeName': AvailabilityService._name(row['firstname'], row['lastname']),
+            'requestType': row['request_type'],
+            'requestTypeLabel': AvailabilityService.REQUEST_TYPES.get(row['request_type'], row['request_type']),
+            'reason': row['reason'],
+            'fullDay': row['full_day'],
+            'periods': [{'start': start, 'end': end} for start, end in row['periods']],
+            'status': row['status'],
+            'requestDate': row['requested_at'],
+            'reviewedBy': row['reviewed_by'],
+            'reviewedDate': row['reviewed_at'],
+            'reviewNote': row['review_note']
+        }
+    
+    @staticmethod
+    def create_request(data):
+        """
+        Submit a time-off or availability change request for admin review.
+        
+        Args:
+            data (dict): Request data containing:
+                - employeeId (int): Technician
+                - requestType (str): time-off, sick-leave, personal-day,
+                  availability-change or other
+                - selectedDates (list): YYYY-MM-DD dates
+                - fullDay (bool): Whole days (default true); otherwise
+                  startTime and endTime (HH:MM) apply to every date
+                - reason (str)
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        if not data:
+            return {'error': 'No data provided', 'success': False}, 400
+        
+        employee_id, error = AvailabilityService._parse_employee_id(data.get('employeeId'), required=True)
+        if error:
+            return {'error': error, 'success': False}, 400
+        
+        request_type = data.get('requestType')
+        if request_type not in AvailabilityService.REQUEST_TYPES:
+            return {
+                'error': f"requestType must be one of: {', '.join(AvailabilityService.REQUEST_TYPES)}",
+                'success': False
+            }, 400
+        
+        reason = str(data.get('reason') or '').strip()
+        if not reason:
+            return {'error': 'reason is required', 'success': False}, 400
+        
+        full_day = data.get('fullDay', True) is not False
+        periods, error = AvailabilityService._build_periods(data, full_day)
+        if error:
+            return {'error': error, 'success': False}, 400
+        
+        try:
+            row = AvailabilityRepository.create_request(employee_id, request_type, reason, full_day, periods)
+        except psycopg2.errors.ForeignKeyViolation:
+            return {'error': 'Employee not found', 'success': False}, 404
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        return {'success': True, 'request': AvailabilityService._format_request(row)}, 201
+    
+    @staticmethod
+    def list_requests(params=None):
+        """
+        List availability requests, oldest first.
+        
+        Args:
+            params (dict, optional): Query parameters:
+                - status (str): pending (default), approved, rejected or all
+                - employeeId (int): Only this technician's requests
+                - limit (int): 1-200 (default 50)
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        params = params or {}
+        status = params.get('status') or 'pending'
+        if status not in ('pending', 'approved', 'rejected', 'all'):
+            return {'error': 'status must be pending, approved, rejected or all', 'success': False}, 400
+        
+        employee_id, error = AvailabilityService._parse_employee_id(params.get('employeeId'))
+        if error:
+            return {'error': error, 'success': False}, 400
+        
+        try:
+            limit = int(params.get('limit', AvailabilityService.DEFAULT_REQUEST_LIMIT))
+        except (TypeError, ValueError):
+            return {'error': 'limit must be an integer', 'success': False}, 400
+        if not 1 <= limit <= AvailabilityService.MAX_REQUEST_LIMIT:
+            return {
+                'error': f'limit must be between 1 and {AvailabilityService.MAX_REQUEST_LIMIT}',
+                'success': False
+            }, 400
+        
+        try:
+            rows = AvailabilityRepository.list_requests(
+                None if status == 'all' else status, employee_id, limit
+            )
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        return {
+            'success': True,
+            'count': len(rows),
+            'requests': [AvailabilityService._format_request(row) for row in rows]
+        }, 200
+    
+    @staticmethod
+    def _review(data, status):
+        """Validate a review payload and apply it; see approve() and reject()."""
+        if not data:
+            return {'error': 'No data provided', 'success': False}, 400
+        try:
+            request_id = int(data.get('requestId'))
+        except (TypeError, ValueError):
+            return {'error': 'requestId must be an integer', 'success': False}, 400
+        reviewed_by = str(data.get('reviewedBy') or '').strip() or 'Admin'
+        note = str(data.get('reason') or '').strip() or None
+        
+        try:
+            with BaseRepository.unit_of_work():
+                reviewed = AvailabilityRepository.review(request_id, status, reviewed_by, note)
+                if reviewed is None:
+                    existing = AvailabilityRepository.get_request(request_id)
+                    if existing is None:
+                        return {'error': 'Availability request not found', 'success': False}, 404
+                    return {
+                        'error': f"Availability request is already {existing['status']}",
+                        'success': False
+                    }, 409
+                
+                if status == 'approved':
+                    # A changed-hours request replaces offered hours; anything else is time off
+                    request_type = reviewed['request_type']
+                    kind = 'available' if request_type == 'availability-change' else 'unavailable'
+                    AvailabilityRepository.add_periods(
+                        reviewed['employeeid'], kind,
+                        [tuple(period) for period in reviewed['periods']],
+                        request_id=request_id,
+                        label=AvailabilityService.REQUEST_TYPES.get(request_type, request_type),
+                        notes=reviewed['reason']
+                    )
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        return {
+            'success': True,
+            'request': AvailabilityService._format_request(AvailabilityRepository.get_request(request_id))
+        }, 200
+    
+    @staticmethod
+    def approve(data):
+        """
+        Approve a pending request and apply its periods to the technician's calendar.
+        
+        Approved time off also keeps the technician from being auto-assigned
+        jobs during it.
+        
+        Args:
+            data (dict): Request data containing:
+                - requestId (int)
+                - reviewedBy (str, optional): Default 'Admin'
+        
+        Returns:
+            tuple: (response_dict, status_code). 409 if the request was already reviewed.
+        """
+        return AvailabilityService._review(data, 'approved')
+    
+    @staticmethod
+    def reject(data):
+        """
+        Reject a pending request.
+        
+        Args:
+            data (dict): Request data containing:
+                - requestId (int)
+                - reviewedBy (str, optional): Default 'Admin'
+                - reason (str, optional): Why it was rejected
+        
+        Returns:
+            tuple: (response_dict, status_code). 409 if the request was already reviewed.
+        """
+        return AvailabilityService._review(data, 'rejected')
@@ -0,0 +1,66 @@
+"""
+Service layer for the public service catalog.
+Assembles catalog data for customer-facing pages.
+"""
+import hashlib
+from datetime import date, timedelta
+from repositories.service_repository import ServiceRepository
+from utils.cache import TTLCache
+
+
+class CatalogService:
+    """Service for catalog payloads built on top of the cached catalog."""
+    
+    # Booking window shown on the appointment form
+    booking_horizon_days = 90
+    day_start = "09:00"
+    day_end = "18:00"
+    slot_minutes = 30
+    
+    # Built payloads keyed by their ETag; stale versions simply age out
+    bootstrap_cache = TTLCache('appointment_bootstrap', maxsize=8, ttl=3600)
+    
+    @staticmethod
+    def get_appointment_bootstrap(today=None):
+        """
+        Get everything the appointment form needs in one payload.
+        
+        The ETag is derived from the fingerprints of the cached service and
+        service type lists plus the booking window, so no query runs and
+        nothing is rebuilt while the catalog is unchanged.
+        
+        Args:
+            today (date, optional): First bookable date (defaults to today)
+            
+        Returns:
+            tuple: (payload_dict, etag) where payload contains:
+                - serviceTypes (list[dict]): service_type_id, service_type_name
+                - servicesByCategory (dict): category name -> list of services
+                - booking (dict): firstDate, lastDate, dayStart, dayEnd, slotMinutes
+        """
+        today = today or date.today()
+        services, services_etag = ServiceRepository.get_catalog_entry('all')
+        service_types, types_etag = ServiceRepository.get_catalog_entry('types')
+        
+        booking = {
+            'firstDate': today.isoformat(),
+            'lastDate': (today + timedelta(days=CatalogService.booking_horizon_days)).isoformat(),
+            'dayStart': CatalogService.day_start,
+            'dayEnd': CatalogService.day_end,
+            'slotMinutes': CatalogService.slot_minutes,
+        }
+        
+        version = f"{services_etag}:{types_etag}:{booking['firstDate']}:{booking['lastDate']}"
+        etag = hashlib.sha256(version.encode('utf-8')).hexdigest()[:32]
+        
+        def build():
+            services_by_category = {}
+            for service in services:
+                services_by_category.setdefault(service['category'], []).append(service)
+            return {
+                'serviceTypes': service_types,
+                'servicesByCategory': services_by_category,
+                'booking': booking,
+            }
+        
+        return CatalogService.bootstrap_cache.get_or_set(etag, build), etag
@@ -0,0 +1,126 @@
+"""
+Service layer for dispatching warranty service requests.
+Handles validation and orchestrates repository calls.
+"""
+from repositories.dispatch_repository import DispatchRepository
+
+
+class DispatchService:
+    """
+    Service for the warranty service request dispatch queue.
+    
+    Pending requests are handed out most urgent first, then oldest first.
+    """
+    
+    # Names for the ranks urgency_rank() gives (migrations/011_service_request_dispatch.sql)
+    URGENCY_LABELS = {0: 'emergency', 1: 'high', 2: 'medium', 3: 'low', 4: 'unspecified'}
+    
+    DEFAULT_QUEUE_SIZE = 50
+    MAX_QUEUE_SIZE = 200
+    MAX_CLAIM = 50
+    
+    @staticmethod
+    def get_queue(params=None):
+        """
+        Show the head of the pending queue and how many requests wait at each urgency.
+        
+        Args:
+            params (dict, optional): Query parameters:
+                - limit (int): Requests to show (default 50, max 200)
+                
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        params = params or {}
+        try:
+            limit = int(params.get('limit', DispatchService.DEFAULT_QUEUE_SIZE))
+        except (TypeError, ValueError):
+            return {'error': 'limit must be an integer', 'success': False}, 400
+        if not 1 <= limit <= DispatchService.MAX_QUEUE_SIZE:
+            return {
+                'error': f'limit must be between 1 and {DispatchService.MAX_QUEUE_SIZE}',
+                'success': False
+            }, 400
+        
+        try:
+            counts = DispatchRepository.count_pending_by_urgency()
+            return {
+                'success': True,
+                'pending': sum(counts.values()),
+                'byUrgency': {
+                    label: counts.get(rank, 0) for rank, label in DispatchService.URGENCY_LABELS.items()
+                },
+                'requests': DispatchRepository.peek(limit)
+            }, 200
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}', 'success': False}, 500
+    
+    @staticmethod
+    def claim(data):
+        """
+        Claim the next pending requests for a dispatcher.
+        
+        Args:
+            data (dict): Request data containing:
+                - dispatcher (str): Who is claiming
+                - count (int, optional): How many to claim (default 1, max 50)
+                
+        Returns:
+            tuple: (response_dict, status_code). requests is empty when the queue is empty.
+        """
+        data = data or {}
+        dispatcher = str(data.get('dispatcher') or '').strip()
+        if not dispatcher:
+            return {'error': 'dispatcher is required', 'success': False}, 400
+        
+        try:
+            count = int(data.get('count', 1))
+        except (TypeError, ValueError):
+            return {'error': 'count must be an integer', 'success': False}, 400
+        if not 1 <= count <= DispatchService.MAX_CLAIM:
+            return {
+                'error': f'count must be between 1 and {DispatchService.MAX_CLAIM}',
+                'success': False
+            }, 400
+        
+        try:
+            requests = DispatchRepository.claim_next(count, dispatcher)
+            return {'success': True, 'count': len(requests), 'requests': requests}, 200
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}', 'success': False}, 500
+    
+    @staticmethod
+    def release(request_id):
+        """
+        Return a dispatched request to the queue.
+        
+        Args:
+            request_id (int): Service request ID
+            
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        try:
+            if not DispatchRepository.release(request_id):
+                return {'error': 'Service request is not dispatched', 'success': False}, 409
+            return {'success': True, 'message': 'Service request returned to the queue'}, 200
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}', 'success': False}, 500
+    
+    @staticmethod
+    def resolve(request_id):
+        """
+        Close a dispatched request.
+        
+        Args:
+            request_id (int): Service request ID
+            
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        try:
+            if not DispatchRepository.resolve(request_id):
+                return {'error': 'Service request is not dispatched', 'success': False}, 409
+            return {'success': True, 'message': 'Service request resolved'}, 200
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}', 'success': False}, 500
@@ -0,0 +1,259 @@
+"""
+Service layer for the technician job view.
+Handles validation and orchestrates repository calls.
+"""
+from datetime import datetime, timedelta
+from repositories.employee_job_repository import EmployeeJobRepository
+from repositories.base_repository import BaseRepository
+import psycopg2
+
+
+class EmployeeJobService:
+    """
+    Service for a technician's jobs and their incremental sync.
+    
+    The first load returns the technician's current jobs and a sync token;
+    later loads pass the token back and get only the jobs that changed
+    since, plus the IDs of jobs that went away.
+    """
+    
+    # Statuses a technician can set directly; cancelling has its own endpoint
+    STATUSES = ('pending', 'in-progress', 'completed')
+    
+    # How far back the first load reaches
+    HISTORY_DAYS = 30
+    
+    MAX_NOTES_LENGTH = 5000
+    
+    @staticmethod
+    def _parse_employee_id(value):
+        """
+        Read the required employee ID.
+        
+        Returns:
+            tuple: (employee_id or None, error_message or None)
+        """
+        if value in (None, ''):
+            return None, 'employeeId is required'
+        try:
+            return int(value), None
+        except (TypeError, ValueError):
+            return None, 'employeeId must be an integer'
+    
+    @staticmethod
+    def _format_job(row):
+        """Convert a job row to the shape the technician view uses."""
+        start, end = row['job_start'], row['job_end']
+        customer = f"{row['customer_firstname'] or ''} {row['customer_lastname'] or ''}".strip()
+        address = ', '.join(part for part in (row['address'], row['city'],
+                                              f"{row['state'] or ''} {row['zip_code'] or ''}".strip()) if part)
+        return {
+            'id': row['assignment_id'],
+            'requestId': row['requestid'],
+            'workOrderId': row['workorderid'],
+            'title': row['service_name'] or 'Service Request',
+            'customer': customer or None,
+            'customerPhone': row['customer_phone'],
+            'customerEmail': row['customer_email'],
+            'address': address or None,
+            'date': start.date().isoformat() if start else None,
+            'startTime': start.strftime('%H:%M') if start else None,
+            'endTime': end.strftime('%H:%M') if end else None,
+            'status': row['status'],
+            'description': row['description'],
+            'estimatedCost': float(row['service_price']) if row['service_price'] is not None else None,
+            'notes': row['notes'] or '',
+            'cancellationReason': row['cancel_reason'],
+            'cancellationDescription': row['cancel_description'],
+            'cancelledDate': row['cancelled_at'],
+            'updatedAt': row['updated_at']
+        }
+    
+    @staticmethod
+    def sync(params=None):
+        """
+        A technician's jobs: everything current, or only what changed since a token.
+        
+        Args:
+            params (dict, optional): Query parameters:
+                - employeeId (int): Technician (required)
+                - since (str): token from a previous response
+        
+        Returns:
+            tuple: (response_dict, status_code). The response has full (whether
+            jobs replace the client's copy), jobs, removed (job IDs to drop,
+            including cancelled jobs) and the token for the next sync.
+        """
+        params = params or {}
+        employee_id, error = EmployeeJobService._parse_employee_id(params.get('employeeId'))
+        if error:
+            return {'error': error, 'success': False}, 400
+        
+        since = params.get('since') or None
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return {'error': 'Invalid sync token', 'success': False}, 400
+            if since < 0:
+                return {'error': 'Invalid sync token', 'success': False}, 400
+        
+        try:
+            token, newest = EmployeeJobRepository.sync_position()
+            # A token from the future (e.g. after a database restore) can't be trusted
+            if since is not None and since > newest:
+                since = None
+            
+            if since is None:
+                history_start = datetime.now() - timedelta(days=EmployeeJobService.HISTORY_DAYS)
+                rows = EmployeeJobRepository.list_jobs(employee_id, history_start=history_start)
+                removed = []
+            else:
+                rows = EmployeeJobRepository.list_jobs(employee_id, since=since)
+                removed = EmployeeJobRepository.list_removed(employee_id, since)
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        jobs = []
+        for row in rows:
+            if row['status'] == 'cancelled':
+                removed.append(row['assignment_id'])
+            else:
+                jobs.append(EmployeeJobService._format_job(row))
+        
+        return {
+            'success': True,
+            'employeeId': employee_id,
+            'full': since is None,
+            'token': str(token),
+            'jobs': jobs,
+            'removed': sorted(set(removed))
+        }, 200
+    
+    @staticmethod
+    def _apply(job_id, employee_id, change):
+        """
+        Run a job update and return the updated job.
+        
+        Args:
+            job_id (int): Assignment ID
+            employee_id (int): Technician the job must belong to
+            change (callable): Repository call returning False when the job
+                can't be changed
+        
+        Returns:
+            tuple: (response_dict, status_code). 404 if the job isn't this
+            technician's, 409 if its status doesn't allow the change.
+        """
+        try:
+            with BaseRepository.unit_of_work():
+                if not change():
+                    existing = EmployeeJobRepository.get_job(job_id, employee_id)
+                    if existing is None:
+                        return {'error': 'Job not found', 'success': False}, 404
+                    return {'error': f"Job is already {existing['status']}", 'success': False}, 409
+                row = EmployeeJobRepository.get_job(job_id, employee_id)
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        return {'success': True, 'job': EmployeeJobService._format_job(row)}, 200
+    
+    @staticmethod
+    def update_status(job_id, data):
+        """
+        Set the status of an open job.
+        
+        Args:
+            job_id (int): Assignment ID
+            data (dict): Request data containing:
+                - employeeId (int): Technician the job belongs to
+                - status (str): pending, in-progress or completed
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        if not data:
+            return {'error': 'No data provided', 'success': False}, 400
+        
+        employee_id, error = EmployeeJobService._parse_employee_id(data.get('employeeId'))
+        if error:
+            return {'error': error, 'success': False}, 400
+        
+        status = data.get('status')
+        if status not in EmployeeJobService.STATUSES:
+            return {
+                'error': f"status must be one of: {', '.join(EmployeeJobService.STATUSES)}",
+                'success': False
+            }, 400
+        
+        return EmployeeJobService._apply(
+            job_id, employee_id,
+            lambda: EmployeeJobRepository.set_status(job_id, employee_id, status)
+        )
+    
+    @staticmethod
+    def save_notes(job_id, data):
+        """
+        Replace the work notes on a job.
+        
+        Args:
+            job_id (int): Assignment ID
+            data (dict): Request data containing:
+                - employeeId (int): Technician the job belongs to
+                - notes (str)
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        if not data:
+            return {'error': 'No data provided', 'success': False}, 400
+        
+        employee_id, error = EmployeeJobService._parse_employee_id(data.get('employeeId'))
+        if error:
+            return {'error': error, 'success': False}, 400
+        
+        notes = data.get('notes')
+        if not isinstance(notes, str):
+            return {'error': 'notes must be a string', 'success': False}, 400
+        if len(notes) > EmployeeJobService.MAX_NOTES_LENGTH:
+            return {
+                'error': f'notes must be at most {EmployeeJobService.MAX_NOTES_LENGTH} characters',
+                'success': False
+            }, 400
+        
+        return EmployeeJobService._apply(
+            job_id, employee_id,
+            lambda: EmployeeJobRepository.save_notes(job_id, employee_id, notes)
+        )
+    
+    @staticmethod
+    def cancel(job_id, data):
+        """
+        Cancel an open job, freeing the technician's slot for other bookings.
+        
+        Args:
+            job_id (int): Assignment ID
+            data (dict): Request data containing:
+                - employeeId (int): Technician the job belongs to
+                - reason (str)
+                - description (str)
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        if not data:
+            return {'error': 'No data provided', 'success': False}, 400
+        
+        employee_id, error = EmployeeJobService._parse_employee_id(data.get('employeeId'))
+        if error:
+            return {'error': error, 'success': False}, 400
+        
+        reason = str(data.get('reason') or '').strip()
+        description = str(data.get('description') or '').strip()
+        if not reason or not description:
+            return {'error': 'reason and description are required', 'success': False}, 400
+        
+        return EmployeeJobService._apply(
+            job_id, employee_id,
+            lambda: EmployeeJobRepository.cancel(job_id, employee_id, reason, description)
+        )
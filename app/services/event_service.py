@@ -0,0 +1,160 @@
+"""
+Service layer for live dashboard events.
+Turns work assignment change notifications into Server-Sent Events for
+technician and admin views.
+"""
+from utils.event_broker import EventBroker
+from utils.change_feed import RESYNC
+from utils.json_provider import dumps as json_dumps
+
+
+class EventService:
+    """
+    Pushes assignment and status changes to open dashboards.
+    
+    Assignment changes arrive from the change feed (see
+    migrations/016_assignment_events.sql) in every worker process and are
+    fanned out by an in-process broker to the streams that asked for them:
+    a technician's own jobs, or everything for the admin view. Events only
+    say what changed; clients fetch the details through the regular APIs,
+    so a missed or duplicated event never leaves stale data behind.
+    """
+    
+    ADMIN_TOPIC = 'admin'
+    
+    # Sent when notifications may have been missed (listener reconnected,
+    # or the client fell too far behind): reload instead of patching
+    RESYNC_EVENT = {'type': 'resync'}
+    
+    broker = EventBroker(overflow_event=RESYNC_EVENT)
+    
+    # Comment line sent on idle streams so proxies keep them open and
+    # disconnected clients are noticed
+    heartbeat_interval = 15.0
+    
+    # Browser reconnect delay after a dropped stream, milliseconds
+    retry_ms = 5000
+    
+    @staticmethod
+    def technician_topic(employee_id):
+        """Topic carrying one technician's assignment events."""
+        return f'technician:{employee_id}'
+    
+    @staticmethod
+    def handle_change(event):
+        """
+        Change feed handler for work_assignments notifications.
+        
+        Event types:
+            assignment.created     a job was assigned
+            assignment.reassigned  a job moved to another technician
+            assignment.status      a job's status changed (including cancelled)
+            assignment.updated     anything else about the job changed
+            assignment.removed     the assignment was deleted
+            resync                 reload everything
+        """
+        if event.get('op') == RESYNC:
+            EventService.broker.publish_all(EventService.RESYNC_EVENT)
+            return
+        
+        op = event.get('op')
+        employee_id = event.get('employeeid')
+        previous_employee_id = event.get('old_employeeid')
+        status = event.get('status')
+        previous_status = event.get('old_status')
+        
+        if op == 'INSERT':
+            kind = 'assignment.created'
+        elif op == 'DELETE':
+            kind = 'assignment.removed'
+        elif employee_id != previous_employee_id:
+            kind = 'assignment.reassigned'
+        elif status != previous_status:
+            kind = 'assignment.status'
+        else:
+            kind = 'assignment.updated'
+        
+        topics = [EventService.ADMIN_TOPIC]
+        topics.extend(EventService.technician_topic(emp)
+                      for emp in {employee_id, previous_employee_id} if emp is not None)
+        
+        EventService.broker.publish(topics, {
+            'type': kind,
+            'jobId': int(event['id']) if event.get('id') else None,
+            'requestId': event.get('requestid'),
+            'employeeId': employee_id,
+            'previousEmployeeId': previous_employee_id,
+            'status': status,
+            'previousStatus': previous_status
+        })
+    
+    @staticmethod
+    def validate(params):
+        """
+        Read which events a stream wants.
+        
+        Args:
+            params (dict): view=admin for every assignment, or employeeId
+                for one technician's
+        
+        Returns:
+            tuple: (topics, None) or (None, error_message)
+        """
+        if params.get('view') == 'admin':
+            return [EventService.ADMIN_TOPIC], None
+        
+        employee_id = params.get('employeeId')
+        if employee_id in (None, ''):
+            return None, 'employeeId or view=admin is required'
+        try:
+            employee_id = int(employee_id)
+        except ValueError:
+            return None, 'employeeId must be an integer'
+        return [EventService.technician_topic(employee_id)], None
+    
+    @staticmethod
+    def subscribe(topics):
+        """
+        Start collecting events for a new stream.
+        
+        Returns:
+            Subscription or None: None if this worker already serves the
+            maximum number of streams
+        """
+        return EventService.broker.subscribe(topics)
+    
+    @staticmethod
+    def _format(event):
+        return f"event: {event['type']}\ndata: {json_dumps(event)}\n\n"
+    
+    @staticmethod
+    def stream(subscription):
+        """
+        Yield a subscription's events in text/event-stream format until it closes.
+        
+        The stream holds no database connection. Between events it waits on
+        the subscription and writes a heartbeat every heartbeat_interval
+        seconds; the write to a closed connection ends the generator and
+        the subscription with it.
+        
+        Args:
+            subscription (Subscription): From subscribe()
+        
+        Yields:
+            str: SSE frames
+        """
+        try:
+            yield f"retry: {EventService.retry_ms}\n\n"
+            while not subscription.closed:
+                events = subscription.get(timeout=EventService.heartbeat_interval)
+                if events:
+                    yield ''.join(EventService._format(event) for event in events)
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            subscription.close()
+    
+    @staticmethod
+    def stats():
+        """Report stream and event counters for this worker."""
+        return EventService.broker.stats()
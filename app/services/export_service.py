@@ -0,0 +1,103 @@
+"""
+Service layer for bulk data exports.
+Turns streamed repository rows into CSV or NDJSON text chunks.
+"""
+import io
+import csv
+from repositories.workorder_repository import WorkorderRepository
+from utils.json_provider import dumps as json_dumps
+
+
+class ExportService:
+    """Service for streaming exports with flat memory use."""
+    
+    DATASETS = {
+        'workorders': WorkorderRepository.stream_workorders,
+        'servicerequests': WorkorderRepository.stream_service_requests,
+    }
+    
+    FORMATS = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+    
+    # Flush a chunk to the client once this many characters are buffered
+    CHUNK_SIZE = 64 * 1024
+    
+    @staticmethod
+    def validate(dataset, fmt):
+        """
+        Check export parameters.
+        
+        Args:
+            dataset (str): 'workorders' or 'servicerequests'
+            fmt (str): 'csv' or 'ndjson'
+            
+        Returns:
+            str or None: Error message, or None if valid
+        """
+        if dataset not in ExportService.DATASETS:
+            return f"dataset must be one of: {', '.join(ExportService.DATASETS)}"
+        if fmt not in ExportService.FORMATS:
+            return f"format must be one of: {', '.join(ExportService.FORMATS)}"
+        return None
+    
+    @staticmethod
+    def stream(dataset, fmt):
+        """
+        Stream a dataset as text chunks.
+        
+        Nothing is queried until the generator is first iterated.
+        
+        Args:
+            dataset (str): 'workorders' or 'servicerequests'
+            fmt (str): 'csv' or 'ndjson'
+            
+        Yields:
+            str: Chunks of roughly CHUNK_SIZE characters
+        """
+        rows = ExportService.DATASETS[dataset]()
+        if fmt == 'csv':
+            return ExportService.csv_chunks(rows)
+        return ExportService._ndjson_chunks(rows)
+    
+    @staticmethod
+    def csv_chunks(rows):
+        """
+        Write rows as CSV text chunks.
+        
+        Args:
+            rows (iterable): Header first, then one sequence per row
+        
+        Yields:
+            str: Chunks of roughly CHUNK_SIZE characters
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # First item is the header
+            writer.writerow(row)
+            if buffer.tell() >= ExportService.CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    @staticmethod
+    def _ndjson_chunks(rows):
+        columns = next(rows, None)
+        if columns is None:
+            return
+        parts = []
+        size = 0
+        for row in rows:
+            line = json_dumps(dict(zip(columns, row)))
+            parts.append(line)
+            size += len(line) + 1
+            if size >= ExportService.CHUNK_SIZE:
+                yield '\n'.join(parts) + '\n'
+                parts = []
+                size = 0
+        if parts:
+            yield '\n'.join(parts) + '\n'
@@ -0,0 +1,302 @@
+"""
+Service layer for the admin financial CSV exports.
+Streams the summary, revenue, labor and work-order reports straight from the
+rollups and a server-side cursor, so a full fiscal year is never built in
+memory on the server or in the browser.
+"""
+import io
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+import multiprocessing
+from decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor
+from repositories.base_repository import BaseRepository
+from repositories.financial_repository import FinancialRepository
+from services.export_service import ExportService
+from services.financial_service import FinancialService
+
+
+class _ZipBuffer(io.RawIOBase):
+    """Write-only, unseekable sink that collects zip output until drained."""
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _init_worker():
+    """
+    Set up an export worker process: a small connection pool and nothing else.
+    
+    Workers render one report at a time, so one connection is enough; the
+    app itself (change feed, periodic tasks, job workers) is never created.
+    """
+    BaseRepository.configure_pool(min_size=0, max_size=1)
+
+
+def _render_report(report, start, end, path):
+    """Write one report CSV to path. Runs in an export worker process."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for chunk in FinancialExportService.stream_report(report, start, end):
+            f.write(chunk)
+    return path
+
+
+class FinancialExportService:
+    """
+    Service for streaming financial reports as CSV downloads.
+    
+    One report streams as a CSV file. Several reports stream as one zip
+    archive with a CSV per report, rendered one after another or, when
+    processes > 0, in parallel worker processes.
+    """
+    
+    REPORTS = ('summary', 'revenue', 'labor', 'work-orders')
+    
+    # Worker processes for multi-report exports (0 renders them in the request)
+    processes = 0
+    _executor = None
+    _executor_lock = threading.Lock()
+    
+    # Bytes read at a time when copying a rendered report into the archive
+    FILE_CHUNK_SIZE = 64 * 1024
+    
+    @staticmethod
+    def validate(params):
+        """
+        Read export parameters.
+        
+        Args:
+            params (dict): Query parameters:
+                - type (str): Comma-separated reports: summary, revenue,
+                  labor, work-orders, or all (default summary)
+                - from, to (str): YYYY-MM-DD; both default to the current month
+        
+        Returns:
+            tuple: ((reports, start, end), None) or (None, error_message)
+        """
+        date_range, error = FinancialService.parse_range(params)
+        if error:
+            return None, error
+        
+        requested = params.get('type') or 'summary'
+        if requested == 'all':
+            reports = list(FinancialExportService.REPORTS)
+        else:
+            reports = list(dict.fromkeys(r.strip() for r in requested.split(',') if r.strip()))
+        if not reports or any(r not in FinancialExportService.REPORTS for r in reports):
+            return None, f"type must be all or a comma-separated list of: {', '.join(FinancialExportService.REPORTS)}"
+        return (reports, *date_range), None
+    
+    @staticmethod
+    def filename(reports, start, end):
+        """
+        Name the download for a set of reports.
+        
+        Returns:
+            str: e.g. labor_report_2026-01-01_2026-12-31.csv, or
+            financial_reports_2026-01-01_2026-12-31.zip for several reports
+        """
+        if len(reports) == 1:
+            return f"{reports[0].replace('-', '_')}_report_{start}_{end}.csv"
+        return f"financial_reports_{start}_{end}.zip"
+    
+    @staticmethod
+    def mimetype(reports):
+        """Content type of the download for a set of reports."""
+        return 'text/csv' if len(reports) == 1 else 'application/zip'
+    
+    @staticmethod
+    def stream(reports, start, end):
+        """
+        Stream one report as CSV, or several as a zip archive.
+        
+        Nothing is queried until the generator is first iterated.
+        
+        Args:
+            reports (list): Report names from validate()
+            start (date): First day
+            end (date): Last day (inclusive)
+        
+        Yields:
+            str or bytes: CSV text chunks, or zip archive bytes
+        """
+        if len(reports) == 1:
+            return FinancialExportService.stream_report(reports[0], start, end)
+        if FinancialExportService.processes > 0:
+            return FinancialExportService._zip_from_processes(reports, start, end)
+        return FinancialExportService._zip_chunks(
+            (FinancialExportService.filename([report], start, end),
+             (chunk.encode('utf-8') for chunk in FinancialExportService.stream_report(report, start, end)))
+            for report in reports
+        )
+    
+    @staticmethod
+    def stream_report(report, start, end):
+        """
+        Stream one report as CSV text chunks.
+        
+        Args:
+            report (str): summary, revenue, labor or work-orders
+            start (date): First day
+            end (date): Last day (inclusive)
+        
+        Yields:
+            str: Chunks of roughly ExportService.CHUNK_SIZE characters
+        """
+        if report == 'summary':
+            rows = FinancialExportService._summary_rows(start, end)
+        else:
+            rows = FinancialExportService._workorder_rows(report, start, end)
+        return ExportService.csv_chunks(rows)
+    
+    @staticmethod
+    def _money(value):
+        return f"{value:.2f}"
+    
+    @staticmethod
+    def _margin(revenue, profit):
+        return f"{profit / revenue * 100:.1f}" if revenue else '0.0'
+    
+    @staticmethod
+    def _summary_rows(start, end):
+        money = FinancialExportService._money
+        margin = FinancialExportService._margin
+        yield ['Service Type', 'Orders', 'Revenue', 'Labor Cost', 'Material Cost', 'Net Profit', 'Margin %']
+        
+        for row in FinancialRepository.totals_by_service_type(start, end):
+            profit = row['revenue'] - row['labor_cost'] - row['material_cost']
+            yield [row['service_type_name'] or 'Unknown', row['orders'], money(row['revenue']),
+                   money(row['labor_cost']), money(row['material_cost']), money(profit),
+                   margin(row['revenue'], profit)]
+        
+        totals = FinancialRepository.get_totals(start, end)
+        profit = totals['revenue'] - totals['labor_cost'] - totals['material_cost']
+        yield []
+        yield ['TOTAL', totals['orders'], money(totals['revenue']), money(totals['labor_cost']),
+               money(totals['material_cost']), money(profit), margin(totals['revenue'], profit)]
+    
+    @staticmethod
+    def _workorder_rows(report, start, end):
+        money = FinancialExportService._money
+        rows = FinancialRepository.stream_workorders(start, end)
+        next(rows)  # Column names
+        revenue_total = hours_total = labor_total = cost_total = Decimal(0)
+        
+        if report == 'revenue':
+            yield ['Date', 'Work Order ID', 'Customer', 'Service', 'Revenue', 'Status']
+        elif report == 'labor':
+            yield ['Date', 'Work Order ID', 'Service', 'Duration (hrs)', 'Labor Cost', 'Hourly Rate']
+        else:
+            yield ['Work Order ID', 'Date', 'Customer', 'Service', 'Revenue', 'Total Cost', 'Profit', 'Status']
+        
+        for workorderid, work_date, customer, service, revenue, hours, labor, material in rows:
+            order_id = f"WO-{workorderid}"
+            if report == 'revenue':
+                yield [work_date, order_id, customer, service, money(revenue), 'completed']
+            elif report == 'labor':
+                rate = money(labor / hours) if hours else '0.00'
+                yield [work_date, order_id, service, hours, money(labor), rate]
+            else:
+                cost = labor + material
+                yield [order_id, work_date, customer, service, money(revenue), money(cost),
+                       money(revenue - cost), 'completed']
+            revenue_total += revenue
+            hours_total += hours
+            labor_total += labor
+            cost_total += labor + material
+        
+        yield []
+        if report == 'revenue':
+            yield ['', '', '', 'TOTAL REVENUE', money(revenue_total), '']
+        elif report == 'labor':
+            rate = money(labor_total / hours_total) if hours_total else '0.00'
+            yield ['', '', 'TOTAL', f"{hours_total:.2f}", money(labor_total), rate]
+        else:
+            yield ['', '', '', 'TOTAL', money(revenue_total), money(cost_total),
+                   money(revenue_total - cost_total), '']
+    
+    @staticmethod
+    def _zip_chunks(entries):
+        """
+        Stream a zip archive without seeking.
+        
+        Args:
+            entries (iterable): (filename, iterable of bytes) per archive member
+        
+        Yields:
+            bytes: Archive data as it is produced
+        """
+        buffer = _ZipBuffer()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, chunks in entries:
+                with archive.open(name, 'w') as member:
+                    for chunk in chunks:
+                        member.write(chunk)
+                        data = buffer.drain()
+                        if data:
+                            yield data
+        yield buffer.drain()
+    
+    @staticmethod
+    def _get_executor():
+        with FinancialExportService._executor_lock:
+            if FinancialExportService._executor is None:
+                # Spawned (not forked) so workers don't inherit the server's
+                # pooled connections or background threads
+                FinancialExportService._executor = ProcessPoolExecutor(
+                    max_workers=FinancialExportService.processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            return FinancialExportService._executor
+    
+    @staticmethod
+    def _zip_from_processes(reports, start, end):
+        """
+        Render every report in a worker process, then stream them as one zip.
+        
+        Reports are rendered to temporary files in parallel; each is copied
+        into the archive as soon as it and the ones before it are done.
+        """
+        executor = FinancialExportService._get_executor()
+        workdir = tempfile.mkdtemp(prefix='financial_export_')
+        futures = []
+        try:
+            for report in reports:
+                name = FinancialExportService.filename([report], start, end)
+                futures.append((name, executor.submit(
+                    _render_report, report, start, end, os.path.join(workdir, name)
+                )))
+            yield from FinancialExportService._zip_chunks(
+                (name, FinancialExportService._file_chunks(future.result()))
+                for name, future in futures
+            )
+        finally:
+            for _, future in futures:
+                future.cancel()
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    @staticmethod
+    def _file_chunks(path):
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(FinancialExportService.FILE_CHUNK_SIZE)
+                if not data:
+                    return
+                yield data
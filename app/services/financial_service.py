@@ -0,0 +1,392 @@
+"""
+Service layer for the admin financial reports.
+Handles validation and orchestrates repository calls.
+"""
+from datetime import date, datetime, timedelta
+from repositories.financial_repository import FinancialRepository
+from utils import report_engine
+import numpy as np
+import psycopg2
+
+
+class FinancialService:
+    """
+    Service for revenue, labor and work-order reports.
+    
+    Totals come from daily rollups maintained as workorders are completed,
+    so a report costs a handful of rows per day in the range regardless of
+    how many workorders exist.
+    """
+    
+    # Report dimensions: groupBy name -> fact column and optional bucketing
+    GROUP_BY = {
+        'technician': ('employee_id', None),
+        'serviceType': ('service_type_id', None),
+        'week': ('day', report_engine.week_start),
+        'month': ('day', report_engine.month_start),
+        'day': ('day', None),
+    }
+    MAX_GROUP_BY = 3
+    
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 1000
+    MAX_RANGE_DAYS = 3660
+    
+    @staticmethod
+    def parse_range(params):
+        """
+        Read the report date range from query parameters.
+        
+        Args:
+            params (dict): from and to (YYYY-MM-DD); both default to the current month
+        
+        Returns:
+            tuple: ((start, end), None) or (None, error_message)
+        """
+        today = date.today()
+        month_start = today.replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        
+        try:
+            start = params.get('from')
+            start = datetime.strptime(start, '%Y-%m-%d').date() if start else month_start
+            end = params.get('to')
+            end = datetime.strptime(end, '%Y-%m-%d').date() if end else next_month - timedelta(days=1)
+        except ValueError:
+            return None, "from and to must be in 'YYYY-MM-DD' format"
+        
+        if end < start:
+            return None, 'to must not be before from'
+        if (end - start).days >= FinancialService.MAX_RANGE_DAYS:
+            return None, f'The date range can span at most {FinancialService.MAX_RANGE_DAYS} days'
+        return (start, end), None
+    
+    @staticmethod
+    def _format_totals(row):
+        """Convert summed rollup columns to report numbers, with profit and margin."""
+        revenue = float(row['revenue'])
+        labor = float(row['labor_cost'])
+        material = float(row['material_cost'])
+        profit = revenue - labor - material
+        return {
+            'orders': int(row['orders']),
+            'revenue': round(revenue, 2),
+            'laborHours': round(float(row['labor_hours']), 2),
+            'laborCost': round(labor, 2),
+            'materialCost': round(material, 2),
+            'netProfit': round(profit, 2),
+            'marginPercent': round(profit / revenue * 100, 1) if revenue else None
+        }
+    
+    @staticmethod
+    def _percent_change(current, previous):
+        if not previous:
+            return None
+        return round((current - previous) / abs(previous) * 100, 1)
+    
+    @staticmethod
+    def get_summary(params=None):
+        """
+        Totals for a date range, compared with the period of equal length just before it.
+        
+        Args:
+            params (dict, optional): from, to (YYYY-MM-DD)
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        date_range, error = FinancialService.parse_range(params or {})
+        if error:
+            return {'error': error, 'success': False}, 400
+        start, end = date_range
+        previous_end = start - timedelta(days=1)
+        previous_start = previous_end - (end - start)
+        
+        try:
+            current = FinancialService._format_totals(FinancialRepository.get_totals(start, end))
+            previous = FinancialService._format_totals(
+                FinancialRepository.get_totals(previous_start, previous_end)
+            )
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        return {
+            'success': True,
+            'from': start,
+            'to': end,
+            'totals': current,
+            'previous': {'from': previous_start, 'to': previous_end, 'totals': previous},
+            'change': {
+                'revenuePercent': FinancialService._percent_change(current['revenue'], previous['revenue']),
+                'laborPercent': FinancialService._percent_change(current['laborCost'], previous['laborCost']),
+                'profitPercent': FinancialService._percent_change(current['netProfit'], previous['netProfit']),
+                'orders': current['orders'] - previous['orders']
+            }
+        }, 200
+    
+    @staticmethod
+    def get_by_service_type(params=None):
+        """
+        Totals per service type for a date range.
+        
+        Args:
+            params (dict, optional): from, to (YYYY-MM-DD)
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        date_range, error = FinancialService.parse_range(params or {})
+        if error:
+            return {'error': error, 'success': False}, 400
+        start, end = date_range
+        
+        try:
+            rows = FinancialRepository.totals_by_service_type(start, end)
+            totals = FinancialRepository.get_totals(start, end)
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        return {
+            'success': True,
+            'from': start,
+            'to': end,
+            'serviceTypes': [
+                dict(serviceTypeId=row['service_type_id'], serviceType=row['service_type_name'],
+                     **FinancialService._format_totals(row))
+                for row in rows
+            ],
+            'totals': FinancialService._format_totals(totals)
+        }, 200
+    
+    @staticmethod
+    def get_by_technician(params=None):
+        """
+        Totals per assigned technician for a date range.
+        
+        Args:
+            params (dict, optional): from, to (YYYY-MM-DD)
+        
+        Returns:
+            tuple: (response_dict, status_code). unassigned holds workorders
+            completed without a technician on record.
+        """
+        date_range, error = FinancialService.parse_range(params or {})
+        if error:
+            return {'error': error, 'success': False}, 400
+        start, end = date_range
+        
+        try:
+            rows = FinancialRepository.totals_by_technician(start, end)
+            unassigned = FinancialRepository.totals_unassigned(start, end)
+            totals = FinancialRepository.get_totals(start, end)
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        return {
+            'success': True,
+            'from': start,
+            'to': end,
+            'technicians': [
+                dict(employeeId=row['employeeid'],
+                     name=f"{row['firstname'] or ''} {row['lastname'] or ''}".strip(),
+                     **FinancialService._format_totals(row))
+                for row in rows
+            ],
+            'unassigned': FinancialService._format_totals(unassigned),
+            'totals': FinancialService._format_totals(totals)
+        }, 200
+    
+    @staticmethod
+    def list_workorders(params=None):
+        """
+        Completed workorders in a date range with their amounts, newest first.
+        
+        Args:
+            params (dict, optional): Query parameters:
+                - from, to (str): YYYY-MM-DD
+                - limit (int): Page size (default 100, max 1000)
+                - after (str): Cursor from the previous page's nextCursor
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        params = params or {}
+        date_range, error = FinancialService.parse_range(params)
+        if error:
+            return {'error': error, 'success': False}, 400
+        start, end = date_range
+        
+        try:
+            limit = int(params.get('limit', FinancialService.DEFAULT_PAGE_SIZE))
+        except (TypeError, ValueError):
+            return {'error': 'limit must be an integer', 'success': False}, 400
+        if not 1 <= limit <= FinancialService.MAX_PAGE_SIZE:
+            return {'error': f'limit must be between 1 and {FinancialService.MAX_PAGE_SIZE}', 'success': False}, 400
+        
+        after = params.get('after')
+        if after:
+            try:
+                after_date, after_id = after.split(':')
+                after = (datetime.strptime(after_date, '%Y-%m-%d').date(), int(after_id))
+            except ValueError:
+                return {'error': 'Invalid cursor', 'success': False}, 400
+        else:
+            after = None
+        
+        try:
+            rows = FinancialRepository.list_workorders(start, end, limit=limit, after=after)
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        workorders = []
+        for row in rows:
+            revenue = float(row['revenue'])
+            labor = float(row['labor_cost'])
+            material = float(row['material_cost'])
+            workorders.append({
+                'id': row['workorderid'],
+                'date': row['work_date'],
+                'customer': f"{row['customer_firstname'] or ''} {row['customer_lastname'] or ''}".strip(),
+                'service': row['service_name'],
+                'serviceType': row['service_type_name'],
+                'technician': f"{row['technician_firstname'] or ''} {row['technician_lastname'] or ''}".strip() or None,
+                'revenue': revenue,
+                'laborHours': float(row['labor_hours']),
+                'laborCost': labor,
+                'materialCost': material,
+                'netProfit': round(revenue - labor - material, 2),
+                'status': 'completed'
+            })
+        
+        last = rows[-1] if len(rows) == limit else None
+        return {
+            'success': True,
+            'from': start,
+            'to': end,
+            'count': len(workorders),
+            'workorders': workorders,
+            'nextCursor': f"{last['work_date']}:{last['workorderid']}" if last else None
+        }, 200
+    
+    @staticmethod
+    def get_report(params=None):
+        """
+        Group completed workorders in a date range by technician, service type
+        and/or time bucket.
+        
+        The range's (day, technician, service type) cells are loaded as NumPy
+        columns and re-aggregated with vectorized group-bys, so the cost
+        grows with the number of days in the range, not with workorders.
+        
+        Args:
+            params (dict, optional): Query parameters:
+                - from, to (str): YYYY-MM-DD
+                - groupBy (str): Comma-separated dimensions: technician,
+                  serviceType, week, month, day (default technician)
+                  
+        Returns:
+            tuple: (response_dict, status_code). Each group holds its key
+            values, orders, revenue, laborHours, laborCost, materialCost,
+            netProfit, marginPercent, averageRevenue and revenuePerLaborHour.
+        """
+        params = params or {}
+        date_range, error = FinancialService.parse_range(params)
+        if error:
+            return {'error': error, 'success': False}, 400
+        start, end = date_range
+        
+        group_by = [g.strip() for g in (params.get('groupBy') or 'technician').split(',') if g.strip()]
+        unknown = [g for g in group_by if g not in FinancialService.GROUP_BY]
+        if unknown or not group_by:
+            return {
+                'error': f"groupBy must be a comma-separated list of: {', '.join(FinancialService.GROUP_BY)}",
+                'success': False
+            }, 400
+        if len(group_by) > FinancialService.MAX_GROUP_BY or len(set(group_by)) != len(group_by):
+            return {
+                'error': f'groupBy takes up to {FinancialService.MAX_GROUP_BY} distinct dimensions',
+                'success': False
+            }, 400
+        
+        try:
+            columns = FinancialRepository.load_cell_columns(start, end)
+            technicians, service_types = FinancialRepository.get_dimension_labels()
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+        
+        keys = []
+        for name in group_by:
+            column, bucket = FinancialService.GROUP_BY[name]
+            keys.append(bucket(columns[column]) if bucket else columns[column])
+        
+        group_keys, sums = report_engine.group_sums(keys, {
+            'orders': columns['orders'],
+            'revenue': columns['revenue'],
+            'laborHours': columns['labor_hours'],
+            'laborCost': columns['labor_cost'],
+            'materialCost': columns['material_cost'],
+        })
+        
+        counts = sums['orders']
+        revenue = sums['revenue']
+        profit = revenue - sums['laborCost'] - sums['materialCost']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margin = np.where(revenue != 0, profit / revenue * 100, np.nan)
+            per_hour = np.where(sums['laborHours'] != 0, revenue / sums['laborHours'], np.nan)
+            average = np.where(counts != 0, revenue / counts, np.nan)
+        
+        def labels(name, values):
+            if name == 'technician':
+                return [{'employeeId': v or None, 'technician': technicians.get(v, 'Unassigned')}
+                        for v in values.tolist()]
+            if name == 'serviceType':
+                return [{'serviceTypeId': v or None, 'serviceType': service_types.get(v, 'Unknown')}
+                        for v in values.tolist()]
+            dates = (report_engine.EPOCH + values.astype('timedelta64[D]')).tolist()
+            return [{name: d} for d in dates]
+        
+        def numbers(array, digits=2):
+            # NaN (e.g. margin without revenue) becomes null
+            rounded = np.round(array, digits)
+            return [None if v != v else v for v in rounded.tolist()]
+        
+        metrics = {
+            'orders': counts.astype(np.int64).tolist(),
+            'revenue': numbers(revenue),
+            'laborHours': numbers(sums['laborHours']),
+            'laborCost': numbers(sums['laborCost']),
+            'materialCost': numbers(sums['materialCost']),
+            'netProfit': numbers(profit),
+            'marginPercent': numbers(margin, 1),
+            'averageRevenue': numbers(average),
+            'revenuePerLaborHour': numbers(per_hour)
+        }
+        key_labels = [labels(name, values) for name, values in zip(group_by, group_keys)]
+        
+        groups = []
+        for i in range(len(metrics['orders'])):
+            group = {}
+            for column in key_labels:
+                group.update(column[i])
+            for metric, values in metrics.items():
+                group[metric] = values[i]
+            groups.append(group)
+        
+        return {
+            'success': True,
+            'from': start,
+            'to': end,
+            'groupBy': group_by,
+            'orders': int(counts.sum()),
+            'groups': groups
+        }, 200
+    
+    @staticmethod
+    def rebuild():
+        """
+        Recompute the rollups from workorders.
+        
+        Returns:
+            int: Number of completed workorders processed
+        """
+        return FinancialRepository.rebuild()
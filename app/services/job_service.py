@@ -0,0 +1,196 @@
+"""
+Service layer for the background job queue.
+Enqueues jobs inside the caller's transaction and runs them on a pool of
+worker threads (or a dedicated `python cli.py jobs work` process).
+"""
+import os
+import random
+import logging
+import threading
+from collections import defaultdict
+from repositories.base_repository import BaseRepository
+from repositories.job_repository import JobRepository
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """
+    DB-backed job queue with batched handlers and exponential backoff.
+    
+    A handler receives the payloads of a batch of jobs of its kind and
+    returns one error (or None on success) per payload; raising, or
+    returning the wrong number of results, fails the whole batch. Failed jobs are retried after retry_base * 2^(attempt-1)
+    seconds (with jitter, capped at retry_max) until max_attempts.
+    """
+    
+    handlers = {}
+    batch_size = 50
+    lease_seconds = 300
+    max_attempts = 5
+    retry_base = 30
+    retry_max = 3600
+    poll_interval = 2.0
+    
+    _wake = threading.Event()
+    _lock = threading.Lock()
+    _threads = []
+    _stop = None
+    _pid = None
+    _fork_hook_installed = False
+    
+    @staticmethod
+    def register_handler(kind, handler):
+        """
+        Set the function that runs jobs of a kind.
+        
+        Args:
+            kind (str): Job type
+            handler (callable): handler(list[payload]) -> list[error or None]
+        """
+        JobService.handlers[kind] = handler
+    
+    @staticmethod
+    def enqueue(kind, payloads):
+        """
+        Queue jobs in the current transaction; local workers are woken once it commits.
+        
+        Args:
+            kind (str): Job type
+            payloads (list[dict]): One payload per job
+            
+        Returns:
+            int: Number of jobs queued
+        """
+        count = JobRepository.enqueue_many(kind, payloads, max_attempts=JobService.max_attempts)
+        if count:
+            BaseRepository.on_commit(JobService._wake.set)
+        return count
+    
+    @staticmethod
+    def backoff(attempts):
+        """Seconds to wait before retrying a job that has failed attempts times."""
+        delay = min(JobService.retry_max, JobService.retry_base * 2 ** max(attempts - 1, 0))
+        return delay * random.uniform(0.8, 1.2)
+    
+    @staticmethod
+    def run_once(limit=None):
+        """
+        Claim one batch of ready jobs and run it.
+        
+        Args:
+            limit (int, optional): Batch size (default batch_size)
+            
+        Returns:
+            dict: Counts of jobs done, retried and failed in this batch
+        """
+        with BaseRepository.unit_of_work():
+            JobRepository.requeue_expired()
+            jobs = JobRepository.claim_batch(limit or JobService.batch_size, JobService.lease_seconds)
+        
+        by_kind = defaultdict(list)
+        for job in jobs:
+            by_kind[job['kind']].append(job)
+        
+        done, retried, failed = [], 0, 0
+        outcomes = []
+        for kind, batch in by_kind.items():
+            handler = JobService.handlers.get(kind)
+            if handler is None:
+                outcomes.extend((job, f"No handler for job kind '{kind}'") for job in batch)
+                continue
+            try:
+                errors = list(handler([job['payload'] for job in batch]))
+                if len(errors) != len(batch):
+                    # Can't tell which jobs the results belong to
+                    raise ValueError(f"Handler for '{kind}' returned {len(errors)} results "
+                                     f"for {len(batch)} jobs")
+            except Exception as e:
+                errors = [f"{type(e).__name__}: {e}"] * len(batch)
+            outcomes.extend(zip(batch, errors))
+        
+        with BaseRepository.unit_of_work():
+            for job, error in outcomes:
+                if error is None:
+                    done.append(job['job_id'])
+                elif job['attempts'] >= job['max_attempts']:
+                    JobRepository.mark_failed(job['job_id'], error)
+                    failed += 1
+                else:
+                    JobRepository.mark_retry(job['job_id'], error, JobService.backoff(job['attempts']))
+                    retried += 1
+            JobRepository.mark_done(done)
+        
+        return {'done': len(done), 'retried': retried, 'failed': failed}
+    
+    @staticmethod
+    def get_counts():
+        """
+        Count jobs per status.
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        try:
+            return {'success': True, 'counts': JobRepository.count_by_status()}, 200
+        except Exception as e:
+            return {'success': False, 'error': str(e)}, 500
+    
+    @staticmethod
+    def start_workers(count):
+        """
+        Start count worker threads in this process (no-op if running).
+        
+        Args:
+            count (int): Number of threads
+        """
+        with JobService._lock:
+            if JobService._threads and JobService._pid == os.getpid():
+                return
+            JobService._pid = os.getpid()
+            JobService._stop = threading.Event()
+            JobService._threads = [
+                threading.Thread(target=JobService._work, args=(JobService._stop,),
+                                 name=f'job-worker-{i}', daemon=True)
+                for i in range(count)
+            ]
+            for thread in JobService._threads:
+                thread.start()
+            
+            if not JobService._fork_hook_installed and hasattr(os, 'register_at_fork'):
+                # Threads don't survive fork(); restart in pre-forked workers
+                os.register_at_fork(after_in_child=JobService._restart_after_fork)
+                JobService._fork_hook_installed = True
+    
+    @staticmethod
+    def stop_workers():
+        """Stop the worker threads after their current batch."""
+        with JobService._lock:
+            if JobService._stop is not None:
+                JobService._stop.set()
+                JobService._wake.set()
+            JobService._threads = []
+    
+    @staticmethod
+    def _restart_after_fork():
+        if not JobService._threads:
+            return
+        count = len(JobService._threads)
+        JobService._lock = threading.Lock()
+        JobService._wake = threading.Event()
+        JobService._threads = []
+        JobService.start_workers(count)
+    
+    @staticmethod
+    def _work(stop):
+        """Worker loop: run batches back to back, sleep when the queue is empty."""
+        while not stop.is_set():
+            try:
+                result = JobService.run_once()
+                busy = any(result.values())
+            except Exception:
+                logger.exception("Job worker error")
+                busy = False
+            if not busy:
+                JobService._wake.wait(JobService.poll_interval)
+                JobService._wake.clear()
@@ -0,0 +1,131 @@
+"""
+Service layer for outbound customer and technician notifications.
+Messages are queued as 'email' jobs in the caller's transaction, so they are
+only sent if the booking (or other change) that triggered them commits.
+"""
+from services.job_service import JobService
+
+
+class NotificationService:
+    """Builds notification emails and queues them for the job workers."""
+    
+    EMAIL = 'email'
+    transport = None
+    
+    @staticmethod
+    def configure(transport):
+        """
+        Set the mail transport and register the email job handler.
+        
+        Args:
+            transport: Object with send_batch(messages) -> list of errors (see utils.mail)
+        """
+        NotificationService.transport = transport
+        JobService.register_handler(NotificationService.EMAIL, NotificationService.deliver)
+    
+    @staticmethod
+    def deliver(messages):
+        """
+        Job handler for 'email' jobs: send a batch through the transport.
+        
+        Args:
+            messages (list[dict]): to, subject, body
+            
+        Returns:
+            list: One error string (or None on success) per message
+        """
+        if NotificationService.transport is None:
+            raise RuntimeError("Mail transport is not configured")
+        return NotificationService.transport.send_batch(messages)
+    
+    @staticmethod
+    def booking_messages(prepared, result, service):
+        """
+        Build the confirmation for the customer and the assignment notice for the technician.
+        
+        Args:
+            prepared (dict): Output of WorkorderService.prepare_expanded_data
+            result (dict): Created request, with 'technician' (or None)
+            service (dict): Booked service (job_name), or None
+            
+        Returns:
+            list[dict]: Messages to queue
+        """
+        customer = prepared['customer_data']
+        address = prepared['address_data']
+        when = prepared['preferred_datetime'].strftime('%A, %B %d, %Y at %I:%M %p')
+        where = f"{address['address']}, {address['city']}, {address['state']} {address['zip_code']}"
+        service_name = service['job_name'] if service else 'Home service'
+        technician = result.get('technician')
+        
+        if technician:
+            assigned = f"Your technician will be {technician['firstname']} {technician['lastname']}."
+        else:
+            assigned = "We will contact you shortly to confirm a technician for this time."
+        
+        messages = [{
+            'to': customer['email'],
+            'subject': f"Service request #{result['request_id']} received",
+            'body': (
+                f"Hi {customer['firstname']},\n\n"
+                f"Thank you for booking with Vargas Home Services.\n\n"
+                f"Service: {service_name}\n"
+                f"When: {when}\n"
+                f"Where: {where}\n\n"
+                f"{assigned}\n"
+            )
+        }]
+        
+        if technician and technician.get('email'):
+            messages.append({
+                'to': technician['email'],
+                'subject': f"New assignment: request #{result['request_id']}",
+                'body': (
+                    f"Hi {technician['firstname']},\n\n"
+                    f"You have been assigned a new job.\n\n"
+                    f"Service: {service_name}\n"
+                    f"When: {when}\n"
+                    f"Where: {where}\n"
+                    f"Customer: {customer['firstname']} {customer['lastname']}, {customer['phone']}\n"
+                    f"Notes: {prepared['request_data']['description'] or '-'}\n"
+                )
+            })
+        return messages
+    
+    @staticmethod
+    def warranty_message(warranty):
+        """
+        Build the warranty details email for the customer on file.
+        
+        Args:
+            warranty (dict): Warranty summary (see WarrantyRepository.get_summary)
+            
+        Returns:
+            dict: Message to queue
+        """
+        return {
+            'to': warranty['customerEmail'],
+            'subject': f"Your warranty for work order #{warranty['workOrderId']}",
+            'body': (
+                f"Hi {warranty['customerName']},\n\n"
+                f"Here are the details of your warranty.\n\n"
+                f"Service: {warranty['serviceName'] or '-'}\n"
+                f"Work order: #{warranty['workOrderId']}\n"
+                f"Coverage: {warranty['coverage'] or '-'}\n"
+                f"Valid: {warranty['startDate']} to {warranty['endDate']}\n"
+                f"Status: {warranty['status']}\n"
+            )
+        }
+    
+    @staticmethod
+    def queue(messages):
+        """
+        Queue messages for delivery once the current transaction commits.
+        
+        Args:
+            messages (list[dict]): to, subject, body
+            
+        Returns:
+            int: Number of messages queued
+        """
+        return JobService.enqueue(NotificationService.EMAIL, [m for m in messages if m.get('to')])
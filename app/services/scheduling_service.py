@@ -0,0 +1,222 @@
+"""
+Service layer for technician scheduling.
+Picks technicians by time-slot availability and daily load.
+"""
+from datetime import datetime, timedelta, time
+from repositories.schedule_repository import ScheduleRepository
+from repositories.service_repository import ServiceRepository
+
+
+class SchedulingService:
+    """Duration-aware technician assignment and slot search."""
+    
+    # Used when a service has no duration_hours
+    DEFAULT_JOB_HOURS = 1.0
+    
+    # Bookable start times offered by find_available_slots
+    DAY_START = time(9, 0)
+    DAY_END = time(18, 0)
+    SLOT_MINUTES = 30
+    
+    # Candidates fetched per round when racing other bookings
+    CANDIDATE_BATCH = 5
+    MAX_ROUNDS = 3
+    
+    @staticmethod
+    def job_minutes(service_id):
+        """
+        Get the length of a service in minutes.
+        
+        Args:
+            service_id (int): Service ID
+            
+        Returns:
+            int: Duration from services.duration_hours, or DEFAULT_JOB_HOURS
+        """
+        service = ServiceRepository.get_service_by_id(service_id)
+        hours = service.get('duration_hours') if service else None
+        return int(round(float(hours or SchedulingService.DEFAULT_JOB_HOURS) * 60))
+    
+    @staticmethod
+    def assign_technician(request_id, service_id, start):
+        """
+        Book the least-loaded technician who is free for the whole job.
+        
+        Must run inside the transaction that created the request, so the
+        booking commits or rolls back with it.
+        
+        Args:
+            request_id (int): Newly created service request
+            service_id (int): Requested service (determines duration)
+            start (datetime): Preferred start time
+            
+        Returns:
+            dict or None: Technician {employee_id, firstname, lastname, phone,
+            email, scheduled_start, scheduled_end}, or None if nobody is free
+        """
+        end = start + timedelta(minutes=SchedulingService.job_minutes(service_id))
+        
+        for _ in range(SchedulingService.MAX_ROUNDS):
+            candidates = ScheduleRepository.find_free_technicians(
+                start, end, limit=SchedulingService.CANDIDATE_BATCH)
+            if not candidates:
+                return None
+            for candidate in candidates:
+                if ScheduleRepository.reserve(candidate['employeeid'], request_id, start, end):
+                    return {
+                        'employee_id': candidate['employeeid'],
+                        'firstname': candidate['firstname'],
+                        'lastname': candidate['lastname'],
+                        'phone': candidate['phone'],
+                        'email': candidate['email'],
+                        'scheduled_start': start,
+                        'scheduled_end': end,
+                    }
+        return None
+    
+    @staticmethod
+    def assign_technicians(jobs):
+        """
+        Book technicians for many new requests in a single planning pass.
+        
+        Existing bookings and daily loads for the whole batch window are read
+        once, jobs are placed greedily (earliest first, least-loaded free
+        technician), and all reservations are written together. Jobs whose
+        slot was taken concurrently fall back to assign_technician.
+        
+        Args:
+            jobs (list[tuple]): (request_id, service_id, start)
+            
+        Returns:
+            dict: request_id -> technician dict (as from assign_technician) or None
+        """
+        if not jobs:
+            return {}
+        
+        minutes = {}
+        planned = []
+        for request_id, service_id, start in jobs:
+            if service_id not in minutes:
+                minutes[service_id] = SchedulingService.job_minutes(service_id)
+            planned.append((request_id, service_id, start,
+                            start + timedelta(minutes=minutes[service_id])))
+        planned.sort(key=lambda job: (job[2], job[0]))
+        
+        technicians, bookings, loads = ScheduleRepository.get_planning_snapshot(
+            planned[0][2], max(job[3] for job in planned))
+        busy = {}
+        for employee_id, slot_start, slot_end in bookings:
+            busy.setdefault(employee_id, []).append((slot_start, slot_end))
+        
+        chosen = {}
+        for request_id, service_id, start, end in planned:
+            best = None
+            for tech in technicians:
+                employee_id = tech['employeeid']
+                if any(s < end and start < e for s, e in busy.get(employee_id, ())):
+                    continue
+                key = (loads.get((employee_id, start.date()), 0), employee_id)
+                if best is None or key < best[0]:
+                    best = (key, tech)
+            if best is None:
+                continue
+            tech = best[1]
+            busy.setdefault(tech['employeeid'], []).append((start, end))
+            loads[(tech['employeeid'], start.date())] = best[0][0] + 1
+            chosen[request_id] = (tech, start, end)
+        
+        booked = ScheduleRepository.reserve_many([
+            (tech['employeeid'], request_id, start, end)
+            for request_id, (tech, start, end) in chosen.items()
+        ])
+        
+        assigned = {}
+        for request_id, service_id, start, end in planned:
+            if request_id in booked:
+                tech, start, end = chosen[request_id]
+                assigned[request_id] = {
+                    'employee_id': tech['employeeid'],
+                    'firstname': tech['firstname'],
+                    'lastname': tech['lastname'],
+                    'phone': tech['phone'],
+                    'email': tech['email'],
+                    'scheduled_start': start,
+                    'scheduled_end': end,
+                }
+            elif request_id in chosen:
+                # Lost the race for the planned slot; retry individually
+                assigned[request_id] = SchedulingService.assign_technician(request_id, service_id, start)
+            else:
+                assigned[request_id] = None
+        return assigned
+    
+    @staticmethod
+    def find_available_slots(service_id, from_date, days=7, limit=20, now=None):
+        """
+        Find the next start times at which at least one technician is free
+        for the full duration of a service.
+        
+        Args:
+            service_id (int): Service to book
+            from_date (date): First day to search
+            days (int): Number of days to search
+            limit (int): Maximum number of slots to return
+            now (datetime, optional): Exclude start times before this
+            
+        Returns:
+            list[dict]: slot_start, slot_end, technicians
+        """
+        now = now or datetime.now()
+        minutes = SchedulingService.job_minutes(service_id)
+        step = timedelta(minutes=SchedulingService.SLOT_MINUTES)
+        
+        starts = []
+        for offset in range(days):
+            day = from_date + timedelta(days=offset)
+            slot = datetime.combine(day, SchedulingService.DAY_START)
+            last = datetime.combine(day, SchedulingService.DAY_END)
+            while slot <= last:
+                if slot >= now:
+                    starts.append(slot)
+                slot += step
+        
+        return ScheduleRepository.find_available_slots(starts, minutes, limit=limit)
+    
+    @staticmethod
+    def available_slots(params=None):
+        """
+        Validate query parameters and list bookable start times for a service.
+        
+        Args:
+            params (dict, optional): serviceId (required), from (YYYY-MM-DD,
+                default today), days (1-31, default 7), limit (1-100, default 20)
+                
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        params = params or {}
+        
+        try:
+            service_id = int(params.get('serviceId'))
+        except (ValueError, TypeError):
+            return {"ok": False, "error": "serviceId must be a valid integer"}, 400
+        
+        try:
+            from_date = (datetime.strptime(params['from'], "%Y-%m-%d").date()
+                         if params.get('from') else datetime.now().date())
+        except ValueError:
+            return {"ok": False, "error": "from must be in YYYY-MM-DD format"}, 400
+        
+        try:
+            days = int(params.get('days', 7))
+            limit = int(params.get('limit', 20))
+        except (ValueError, TypeError):
+            return {"ok": False, "error": "days and limit must be integers"}, 400
+        if not 1 <= days <= 31 or not 1 <= limit <= 100:
+            return {"ok": False, "error": "days must be 1-31 and limit 1-100"}, 400
+        
+        try:
+            slots = SchedulingService.find_available_slots(service_id, from_date, days, limit)
+            return {"ok": True, "count": len(slots), "slots": slots}, 200
+        except Exception as e:
+            return {"ok": False, "error": str(e)}, 500
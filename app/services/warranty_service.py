@@ -2,12 +2,41 @@
 Service layer for warranty business logic.
 Handles validation and orchestrates repository calls.
 """
+from datetime import date
+from repositories.base_repository import BaseRepository
 from repositories.warranty_repository import WarrantyRepository
+from services.notification_service import NotificationService
+from utils.cache import TTLCache
+from utils.contact_keys import normalize_email, normalize_phone
+from utils.rate_limit import RateLimiter
+import logging
 import psycopg2
 
+logger = logging.getLogger(__name__)
+
 
 class WarrantyService:
-    """Service for warranty business logic."""
+    """
+    Service for warranty business logic.
+    
+    Public lookups are rate limited per client and answered from an
+    in-process cache; searches that found nothing are cached for a shorter
+    time so new warranties show up quickly. The cache is cleared whenever
+    warranties or users change (see register_change_feed).
+    """
+    
+    lookup_cache = TTLCache('warranty_lookup', maxsize=10000, ttl=300)
+    lookup_negative_ttl = 30
+    lookup_limiter = RateLimiter('warranty_lookup', rate=0.2, burst=10)
+    
+    # Each detail request emails the customer
+    details_limiter = RateLimiter('warranty_details', rate=0.002, burst=3)
+    
+    # Admin warranty page
+    STATUSES = ('pending', 'active', 'expired')
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+    expiring_days = 30
     
     @staticmethod
     def lookup_warranty(data):
@@ -38,8 +67,21 @@ class WarrantyService:
                 'success': False
             }, 400
         
+        email_key = normalize_email(email)
+        phone_key = normalize_phone(phone)
+        if phone and not phone_key:
+            return {
+                'error': 'Phone number must have at least 7 digits',
+                'success': False
+            }, 400
+        
         try:
-            warranties = WarrantyRepository.lookup_by_email_or_phone(email, phone)
+            warranties = WarrantyService.lookup_cache.get_or_set(
+                (email_key, phone_key),
+                lambda: WarrantyRepository.lookup_by_email_or_phone(email_key, phone_key),
+                ttl=lambda found: None if found else WarrantyService.lookup_negative_ttl,
+                defer=BaseRepository.on_commit
+            )
             return {
                 'success': True,
                 'warranties': warranties,
@@ -59,14 +101,12 @@ class WarrantyService:
     @staticmethod
     def request_warranty_details(data):
         """
-        Request warranty details to be sent to customer.
+        Queue an email with warranty details to the customer's email on file.
         
         Args:
             data (dict): Request data containing:
                 - warrantyId (int): Warranty ID
                 - workOrderId (int): Work order ID
-                - email (str): Customer email
-                - phone (str): Customer phone
                 
         Returns:
             tuple: (response_dict, status_code)
@@ -79,8 +119,6 @@ class WarrantyService:
         
         warranty_id = data.get('warrantyId')
         work_order_id = data.get('workOrderId')
-        email = data.get('email', '').strip()
-        phone = data.get('phone', '').strip()
         
         if not warranty_id or not work_order_id:
             return {
@@ -88,19 +126,40 @@ class WarrantyService:
                 'success': False
             }, 400
         
-        # TODO: Implement email sending logic
-        # 1. Fetch full warranty details from database
-        # 2. Format email with warranty information
-        # 3. Send email using SMTP or email service (SendGrid, etc.)
-        
-        # For now, log the request
-        print(f"Warranty details requested for Work Order: {work_order_id}")
-        print(f"Send to - Email: {email}, Phone: {phone}")
+        try:
+            warranty_id = int(warranty_id)
+            work_order_id = int(work_order_id)
+        except (TypeError, ValueError):
+            return {
+                'error': 'Warranty ID and Work Order ID must be integers',
+                'success': False
+            }, 400
         
-        return {
-            'success': True,
-            'message': 'Warranty details will be sent to your email shortly'
-        }, 200
+        try:
+            # Details only ever go to the email on file, never to an address from the request
+            with BaseRepository.unit_of_work():
+                warranty = WarrantyRepository.get_summary(warranty_id)
+                if warranty is None or warranty['workOrderId'] != work_order_id:
+                    return {
+                        'error': 'Warranty not found',
+                        'success': False
+                    }, 404
+                if not warranty['customerEmail']:
+                    return {
+                        'error': 'No email address on file for this warranty',
+                        'success': False
+                    }, 409
+                NotificationService.queue([NotificationService.warranty_message(warranty)])
+            
+            return {
+                'success': True,
+                'message': 'Warranty details will be sent to your email shortly'
+            }, 200
+        except Exception as e:
+            return {
+                'error': f'Server error: {str(e)}',
+                'success': False
+            }, 500
     
     @staticmethod
     def request_warranty_service(data):
@@ -186,3 +245,121 @@ class WarrantyService:
                 'error': f'Unexpected error: {str(e)}',
                 'success': False
             }, 500
+    
+    @staticmethod
+    def list_admin_warranties(params=None):
+        """
+        List warranties for the admin page from the maintained summary.
+        
+        Args:
+            params (dict, optional): Query parameters:
+                - status (str): pending, active, expired or all (default all)
+                - q (str): Start of the customer's name or email
+                - hasRequest (bool): Only warranties with/without a service request
+                - limit (int): Page size (default 50, max 200)
+                - after (int): Cursor from the previous page's nextCursor
+                
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        params = params or {}
+        
+        status = (params.get('status') or 'all').strip().lower()
+        if status != 'all' and status not in WarrantyService.STATUSES:
+            return {
+                'error': f"status must be one of: all, {', '.join(WarrantyService.STATUSES)}",
+                'success': False
+            }, 400
+        
+        try:
+            limit = int(params.get('limit', WarrantyService.DEFAULT_PAGE_SIZE))
+            after = int(params['after']) if params.get('after') else None
+        except (ValueError, TypeError):
+            return {'error': 'limit and after must be integers', 'success': False}, 400
+        if not 1 <= limit <= WarrantyService.MAX_PAGE_SIZE:
+            return {
+                'error': f'limit must be between 1 and {WarrantyService.MAX_PAGE_SIZE}',
+                'success': False
+            }, 400
+        
+        has_request = params.get('hasRequest')
+        if has_request is not None:
+            has_request = str(has_request).strip().lower() in ('1', 'true', 't', 'yes', 'y')
+        
+        try:
+            # Fetch one extra row to know whether another page exists
+            warranties = WarrantyRepository.list_summaries(
+                status=None if status == 'all' else status,
+                search=(params.get('q') or '').strip() or None,
+                has_request=has_request, limit=limit + 1, after=after
+            )
+            has_more = len(warranties) > limit
+            warranties = warranties[:limit]
+            return {
+                'success': True,
+                'warranties': warranties,
+                'count': len(warranties),
+                'nextCursor': warranties[-1]['id'] if has_more else None
+            }, 200
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+    
+    @staticmethod
+    def get_admin_warranty_counts():
+        """
+        Count warranties per status for the admin page tabs.
+        
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        try:
+            return {'success': True, 'counts': WarrantyRepository.count_summaries_by_status()}, 200
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+    
+    @staticmethod
+    def list_expiring_warranties(params=None):
+        """
+        List unexpired warranties ending within the next N days.
+        
+        Args:
+            params (dict, optional): days (1-365, default expiring_days)
+            
+        Returns:
+            tuple: (response_dict, status_code)
+        """
+        params = params or {}
+        try:
+            days = int(params.get('days', WarrantyService.expiring_days))
+        except (ValueError, TypeError):
+            return {'error': 'days must be an integer', 'success': False}, 400
+        if not 1 <= days <= 365:
+            return {'error': 'days must be between 1 and 365', 'success': False}, 400
+        
+        try:
+            warranties = WarrantyRepository.list_expiring(date.today(), days)
+            return {'success': True, 'days': days, 'warranties': warranties, 'count': len(warranties)}, 200
+        except psycopg2.Error as db_error:
+            return {'error': f'Database error: {str(db_error)}', 'success': False}, 500
+    
+    @staticmethod
+    def sweep_warranties(days=None, today=None):
+        """
+        Expire and activate warranties whose dates have been reached, and list
+        those expiring soon. Safe to run from several workers or cron at once.
+        
+        Args:
+            days (int, optional): "Expiring soon" window (default expiring_days)
+            today (date, optional): Reference date (default today)
+            
+        Returns:
+            dict or None: {'expired', 'activated', 'expiring'} lists, or None
+            if another sweep was already running
+        """
+        days = WarrantyService.expiring_days if days is None else days
+        with BaseRepository.unit_of_work():
+            result = WarrantyRepository.sweep_summaries(today or date.today(), days)
+        if result is not None:
+            logger.info("Warranty sweep: %d expired, %d activated, %d expiring within %d days",
+                        len(result['expired']), len(result['activated']), len(result['expiring']), days)
+        return result
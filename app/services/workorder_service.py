@@ -3,13 +3,24 @@ Service layer for workorder business logic.
 Handles validation and orchestrates repository calls.
 """
 from datetime import datetime
+from repositories.base_repository import BaseRepository
 from repositories.workorder_repository import WorkorderRepository
+from repositories.service_repository import ServiceRepository
+from services.scheduling_service import SchedulingService
+from services.notification_service import NotificationService
+import logging
 import psycopg2
 
+logger = logging.getLogger(__name__)
+
 
 class WorkorderService:
     """Service for workorder business logic."""
     
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 500
+    MAX_BATCH_SIZE = 500
+    
     @staticmethod
     def parse_bool(val, default=False):
         """Parse a value to boolean."""
@@ -117,22 +128,67 @@ class WorkorderService:
             return {"ok": False, "error": f"Database error: {e.pgerror or str(e)}"}, 500
     
     @staticmethod
-    def list_workorders(limit=100):
+    def list_workorders(params=None):
         """
-        List all workorders.
+        List workorders newest first, one page at a time.
         
         Args:
-            limit (int): Maximum number of records to return
+            params (dict, optional): Query parameters:
+                - limit (int): Page size, 1-500 (default 100)
+                - after (int): Cursor from a previous page's nextCursor
+                - isCompleted (bool): Filter by completion status
+                - customerId (int): Filter by customer
+                - scheduledFrom (str): Earliest scheduled date, YYYY-MM-DD
+                - scheduledTo (str): Latest scheduled date, YYYY-MM-DD
             
         Returns:
-            tuple: (response_dict, status_code)
+            tuple: (response_dict, status_code). nextCursor is null on the last page.
         """
+        params = params or {}
+        
         try:
-            rows = WorkorderRepository.list_all(limit=limit)
+            limit = int(params.get("limit", WorkorderService.DEFAULT_PAGE_SIZE))
+            after = params.get("after")
+            after = int(after) if after not in (None, "") else None
+            customer_id = params.get("customerId")
+            customer_id = int(customer_id) if customer_id not in (None, "") else None
+        except (TypeError, ValueError):
+            return {"ok": False, "error": "limit, after and customerId must be integers"}, 400
+        
+        if not 1 <= limit <= WorkorderService.MAX_PAGE_SIZE:
+            return {
+                "ok": False,
+                "error": f"limit must be between 1 and {WorkorderService.MAX_PAGE_SIZE}"
+            }, 400
+        
+        is_completed = params.get("isCompleted")
+        if is_completed not in (None, ""):
+            is_completed = WorkorderService.parse_bool(is_completed)
+        else:
+            is_completed = None
+        
+        try:
+            scheduled_from = params.get("scheduledFrom")
+            scheduled_from = WorkorderService.parse_date(scheduled_from) if scheduled_from else None
+            scheduled_to = params.get("scheduledTo")
+            scheduled_to = WorkorderService.parse_date(scheduled_to) if scheduled_to else None
+        except ValueError:
+            return {"ok": False, "error": "scheduledFrom and scheduledTo must be in 'YYYY-MM-DD' format"}, 400
+        
+        try:
+            # Fetch one extra row to know whether another page exists
+            rows = WorkorderRepository.list_page(
+                limit=limit + 1, after=after, is_completed=is_completed,
+                customer_id=customer_id, scheduled_from=scheduled_from,
+                scheduled_to=scheduled_to
+            )
+            has_more = len(rows) > limit
+            rows = rows[:limit]
             return {
                 "ok": True,
                 "count": len(rows),
-                "workorders": rows
+                "workorders": rows,
+                "nextCursor": rows[-1]["workorderid"] if has_more else None
             }, 200
         except Exception as e:
             return {"ok": False, "error": str(e)}, 500
@@ -158,28 +214,22 @@ class WorkorderService:
             return {"ok": False, "error": str(e)}, 500
     
     @staticmethod
-    def create_workorder_with_expanded_data(data):
+    def prepare_expanded_data(data):
         """
-        Create a new workorder with all related data (customer, address, service, request).
+        Validate an expanded service request payload and convert it to
+        repository input.
         
         Args:
-            data (dict): Complete workorder data containing:
-                Customer info:
-                - firstName, lastName, phone, email
-                Address info:
-                - address, city, state, zipCode
-                Service info:
-                - serviceId (int): ID of existing service in services table
-                Request info:
-                - requestDate (str): Date in YYYY-MM-DD format
-                Workorder info:
-                - scheduledDate (str): Date in YYYY-MM-DD format
-                - isCompleted (bool): Completion status
-                - workorderId (int, optional): Specific workorder ID
-                
+            data (dict): Payload as accepted by create_workorder_with_expanded_data
+            
         Returns:
-            tuple: (success_dict, status_code) or (error_dict, status_code)
+            tuple: (prepared_dict, None) or (None, error_message). prepared_dict
+            holds customer_data, address_data, service_data, request_data,
+            workorder_data, service_id and preferred_datetime.
         """
+        if not isinstance(data, dict):
+            return None, "Each request must be a JSON object"
+        
         # Validate required customer fields
         customer_fields = ['firstName', 'lastName', 'phone', 'email']
         missing_customer = [f for f in customer_fields if not data.get(f)]
@@ -198,10 +248,7 @@ class WorkorderService:
         
         missing_all = missing_customer + missing_address + missing_service + missing_other
         if missing_all:
-            return {
-                "ok": False,
-                "error": f"Missing required fields: {', '.join(missing_all)}"
-            }, 400
+            return None, f"Missing required fields: {', '.join(missing_all)}"
         
         # Parse and validate dates
         try:
@@ -214,7 +261,6 @@ class WorkorderService:
                 # Parse time like "2:30 PM" and combine with date
                 try:
                     # Convert "2:30 PM" format to 24-hour format
-                    from datetime import datetime
                     time_obj = datetime.strptime(scheduled_time, "%I:%M %p")
                     preferred_datetime = datetime.combine(scheduled_date, time_obj.time())
                 except ValueError:
@@ -225,7 +271,7 @@ class WorkorderService:
                 preferred_datetime = datetime.combine(scheduled_date, datetime.strptime("12:00", "%H:%M").time())
             
         except ValueError as ve:
-            return {"ok": False, "error": str(ve)}, 400
+            return None, str(ve)
         
         # Parse boolean
         is_completed = WorkorderService.parse_bool(data['isCompleted'], default=False)
@@ -234,32 +280,7 @@ class WorkorderService:
         try:
             service_id = int(data['serviceId'])
         except (ValueError, TypeError):
-            return {"ok": False, "error": "serviceId must be a valid integer"}, 400
-        
-        # Prepare data for repository
-        customer_data = {
-            'firstname': data['firstName'],
-            'lastname': data['lastName'],
-            'phone': data['phone'],
-            'email': data['email']
-        }
-        
-        address_data = {
-            'address': data['address'],
-            'city': data['city'],
-            'state': data['state'],
-            'zip_code': data['zipCode']
-        }
-        
-        service_data = {
-            'service_id': service_id
-        }
-        
-        request_data = {
-            'description': data.get('description', ''),
-            'preferred_datetime': preferred_datetime,
-            'photo_path': data.get('photo_path')  # Will be None if not provided
-        }
+            return None, "serviceId must be a valid integer"
         
         workorder_data = {
             'scheduleddate': scheduled_date,
@@ -271,13 +292,82 @@ class WorkorderService:
             try:
                 workorder_data['workorderid'] = int(data['workorderId'])
             except ValueError:
-                return {"ok": False, "error": "workorderId must be an integer"}, 400
+                return None, "workorderId must be an integer"
         
-        # Create all records in database transaction
+        return {
+            'customer_data': {
+                'firstname': data['firstName'],
+                'lastname': data['lastName'],
+                'phone': data['phone'],
+                'email': data['email']
+            },
+            'address_data': {
+                'address': data['address'],
+                'city': data['city'],
+                'state': data['state'],
+                'zip_code': data['zipCode']
+            },
+            'service_data': {
+                'service_id': service_id
+            },
+            'request_data': {
+                'description': data.get('description', ''),
+                'preferred_datetime': preferred_datetime,
+                'photo_path': data.get('photo_path')  # Will be None if not provided
+            },
+            'workorder_data': workorder_data,
+            'service_id': service_id,
+            'preferred_datetime': preferred_datetime
+        }, None
+    
+    @staticmethod
+    def create_workorder_with_expanded_data(data):
+        """
+        Create a new workorder with all related data (customer, address, service, request).
+        
+        Args:
+            data (dict): Complete workorder data containing:
+                Customer info:
+                - firstName, lastName, phone, email
+                Address info:
+                - address, city, state, zipCode
+                Service info:
+                - serviceId (int): ID of existing service in services table
+                Request info:
+                - requestDate (str): Date in YYYY-MM-DD format
+                Workorder info:
+                - scheduledDate (str): Date in YYYY-MM-DD format
+                - isCompleted (bool): Completion status
+                - workorderId (int, optional): Specific workorder ID
+                
+        Returns:
+            tuple: (success_dict, status_code) or (error_dict, status_code)
+        """
+        prepared, error = WorkorderService.prepare_expanded_data(data)
+        if error:
+            return {"ok": False, "error": error}, 400
+        
+        # Create all records and book a technician in one transaction
         try:
-            result = WorkorderRepository.create_with_expanded_data(
-                customer_data, address_data, service_data, request_data, workorder_data
-            )
+            with BaseRepository.unit_of_work():
+                result = WorkorderRepository.create_with_expanded_data(
+                    prepared['customer_data'], prepared['address_data'], prepared['service_data'],
+                    prepared['request_data'], prepared['workorder_data']
+                )
+                result['technician'] = SchedulingService.assign_technician(
+                    result['request_id'], prepared['service_id'], prepared['preferred_datetime']
+                )
+                NotificationService.queue(NotificationService.booking_messages(
+                    prepared, result, ServiceRepository.get_service_by_id(prepared['service_id'])
+                ))
+            
+            if result['technician']:
+                logger.debug("Request %s assigned to technician %s",
+                             result['request_id'], result['technician']['employee_id'])
+            else:
+                logger.debug("Request %s: no technician available for the requested time",
+                             result['request_id'])
+            
             return {
                 "ok": True,
                 "message": "Service request created successfully",
@@ -291,3 +381,111 @@ class WorkorderService:
             return {"ok": False, "error": f"Database error: {e.pgerror or str(e)}"}, 500
         except Exception as e:
             return {"ok": False, "error": f"Unexpected error: {str(e)}"}, 500
+    
+    @staticmethod
+    def _create_batch(valid):
+        """
+        Insert prepared items, book their technicians and queue their notifications.
+        
+        Args:
+            valid (list[tuple]): (index, prepared) pairs
+            
+        Returns:
+            dict: index -> created row, with its technician
+        """
+        created = WorkorderRepository.create_many_with_expanded_data(
+            [prepared for _, prepared in valid]
+        )
+        technicians = SchedulingService.assign_technicians([
+            (row['request_id'], prepared['service_id'], prepared['preferred_datetime'])
+            for row, (_, prepared) in zip(created, valid)
+        ])
+        messages = []
+        for row, (_, prepared) in zip(created, valid):
+            row['technician'] = technicians.get(row['request_id'])
+            messages.extend(NotificationService.booking_messages(
+                prepared, row, ServiceRepository.get_service_by_id(prepared['service_id'])
+            ))
+        NotificationService.queue(messages)
+        return {index: row for row, (index, _) in zip(created, valid)}
+    
+    @staticmethod
+    def create_workorders_with_expanded_data_batch(items):
+        """
+        Create many expanded service requests in one transaction.
+        
+        Every item is validated like create_workorder_with_expanded_data.
+        Valid items are inserted with a few set-based statements and their
+        technicians are assigned in a single pass; invalid items are reported
+        individually and do not block the rest. If the set-based insert hits
+        a database error, the items are retried one by one, each under its
+        own savepoint, so only the failing ones are reported.
+        
+        Args:
+            items (list[dict]): Expanded service request payloads
+            
+        Returns:
+            tuple: (response_dict, status_code). Status is 201 when every item
+            was created, 207 when some failed validation or could not be
+            inserted and 400 when none were valid. response_dict["results"]
+            has one entry per item, in input order: {index, ok, result} or
+            {index, ok, error}.
+        """
+        if not isinstance(items, list) or not items:
+            return {"ok": False, "error": "Request body must be a non-empty array of service requests"}, 400
+        if len(items) > WorkorderService.MAX_BATCH_SIZE:
+            return {"ok": False, "error": f"At most {WorkorderService.MAX_BATCH_SIZE} service requests per batch"}, 400
+        
+        results = [None] * len(items)
+        valid = []
+        for index, data in enumerate(items):
+            prepared, error = WorkorderService.prepare_expanded_data(data)
+            if not error and ServiceRepository.get_service_by_id(prepared['service_id']) is None:
+                error = f"Service {prepared['service_id']} not found"
+            if error:
+                results[index] = {"index": index, "ok": False, "error": error}
+            else:
+                valid.append((index, prepared))
+        
+        created = {}
+        if valid:
+            try:
+                try:
+                    with BaseRepository.unit_of_work():
+                        created = WorkorderService._create_batch(valid)
+                except psycopg2.Error:
+                    # Retry one item at a time so a bad row fails alone
+                    with BaseRepository.unit_of_work():
+                        for index, prepared in valid:
+                            try:
+                                with BaseRepository.unit_of_work():
+                                    created.update(WorkorderService._create_batch([(index, prepared)]))
+                            except psycopg2.Error as e:
+                                results[index] = {
+                                    "index": index,
+                                    "ok": False,
+                                    "error": f"Database error: {e.pgerror or str(e)}"
+                                }
+            except psycopg2.Error as e:
+                return {"ok": False, "error": f"Database error: {e.pgerror or str(e)}"}, 500
+            except Exception as e:
+                return {"ok": False, "error": f"Unexpected error: {str(e)}"}, 500
+            
+            for index, row in created.items():
+                results[index] = {"index": index, "ok": True, "result": row}
+        
+        failed = len(items) - len(created)
+        if not valid:
+            status_code = 400
+        elif failed:
+            status_code = 207
+        else:
+            status_code = 201
+        
+        logger.debug("Batch intake: %d created, %d failed", len(created), failed)
+        return {
+            "ok": failed == 0,
+            "created": len(created),
+            "failed": failed,
+            "results": results
+        }, status_code
@@ -1,130 +1,20 @@
-// Sample financial data
+// Report data for the selected date range, loaded from /api/admin/financial/*
 const financialData = {
-    workOrders: [
-        {
-            id: "WO-2025-001",
-            date: "2025-10-01",
-            customer: "John Smith",
-            service: "HVAC Repair",
-            revenue: 450.00,
-            laborCost: 180.00,
-            materialCost: 120.00,
-            status: "completed",
-            duration: 3.5
-        },
-        {
-            id: "WO-2025-002",
-            date: "2025-10-03",
-            customer: "Sarah Johnson",
-            service: "Plumbing Installation",
-            revenue: 650.00,
-            laborCost: 280.00,
-            materialCost: 200.00,
-            status: "completed",
-            duration: 5.0
-        },
-        {
-            id: "WO-2025-003",
-            date: "2025-10-05",
-            customer: "Michael Brown",
-            service: "Electrical Repair",
-            revenue: 320.00,
-            laborCost: 150.00,
-            materialCost: 80.00,
-            status: "completed",
-            duration: 2.5
-        },
-        {
-            id: "WO-2025-004",
-            date: "2025-10-07",
-            customer: "Emily Davis",
-            service: "Kitchen Remodel",
-            revenue: 3500.00,
-            laborCost: 1800.00,
-            materialCost: 1200.00,
-            status: "completed",
-            duration: 40.0
-        },
-        {
-            id: "WO-2025-005",
-            date: "2025-10-08",
-            customer: "Robert Wilson",
-            service: "Roof Repair",
-            revenue: 2800.00,
-            laborCost: 1200.00,
-            materialCost: 1000.00,
-            status: "completed",
-            duration: 30.0
-        },
-        {
-            id: "WO-2025-006",
-            date: "2025-10-10",
-            customer: "Jennifer Martinez",
-            service: "Water Heater Installation",
-            revenue: 890.00,
-            laborCost: 320.00,
-            materialCost: 400.00,
-            status: "completed",
-            duration: 4.0
-        },
-        {
-            id: "WO-2025-007",
-            date: "2025-10-11",
-            customer: "David Anderson",
-            service: "Deck Repair",
-            revenue: 1250.00,
-            laborCost: 600.00,
-            materialCost: 450.00,
-            status: "completed",
-            duration: 12.0
-        },
-        {
-            id: "WO-2025-008",
-            date: "2025-10-12",
-            customer: "Lisa White",
-            service: "Bathroom Renovation",
-            revenue: 4200.00,
-            laborCost: 2100.00,
-            materialCost: 1500.00,
-            status: "completed",
-            duration: 45.0
-        },
-        {
-            id: "WO-2025-009",
-            date: "2025-10-13",
-            customer: "James Taylor",
-            service: "Gutter Installation",
-            revenue: 780.00,
-            laborCost: 350.00,
-            materialCost: 250.00,
-            status: "completed",
-            duration: 6.0
-        },
-        {
-            id: "WO-2025-010",
-            date: "2025-10-14",
-            customer: "Maria Garcia",
-            service: "Drywall Repair",
-            revenue: 420.00,
-            laborCost: 200.00,
-            materialCost: 100.00,
-            status: "completed",
-            duration: 4.0
-        },
-        {
-            id: "WO-2025-011",
-            date: "2025-10-15",
-            customer: "Thomas Moore",
-            service: "Painting Service",
-            revenue: 1650.00,
-            laborCost: 900.00,
-            materialCost: 400.00,
-            status: "completed",
-            duration: 20.0
-        }
-    ]
+    summary: null,
+    serviceTypes: [],
+    groups: [],
+    workOrders: []
+};
+
+// Reports aggregated on the server by /api/admin/financial/report
+const REPORT_GROUP_BY = {
+    revenue: 'day',
+    labor: 'technician'
 };
 
+// Largest page the work order report loads at once
+const WORK_ORDER_PAGE_SIZE = 1000;
+
 let currentReportType = 'summary';
 let currentDateRange = 'current-month';
 
@@ -148,22 +38,84 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 
 // Update report based on filters
-function updateReport() {
+async function updateReport() {
     currentReportType = document.getElementById('reportType').value;
     currentDateRange = document.getElementById('dateRange').value;
     
-    // Filter data based on date range
-    const filteredData = filterDataByDateRange(financialData.workOrders);
+    const range = getDateRange();
+    if (!range) {
+        return; // Wait until both custom dates are set
+    }
+    const query = `from=${range.from}&to=${range.to}`;
+    
+    try {
+        const groupBy = REPORT_GROUP_BY[currentReportType];
+        const [summary, byType, report, orders] = await Promise.all([
+            fetchJSON(`/api/admin/financial/summary?${query}`),
+            fetchJSON(`/api/admin/financial/by-service-type?${query}`),
+            groupBy
+                ? fetchJSON(`/api/admin/financial/report?${query}&groupBy=${groupBy}`)
+                : Promise.resolve(null),
+            currentReportType === 'work-orders'
+                ? fetchJSON(`/api/admin/financial/workorders?${query}&limit=${WORK_ORDER_PAGE_SIZE}`)
+                : Promise.resolve(null)
+        ]);
+        
+        financialData.summary = summary;
+        financialData.serviceTypes = byType.serviceTypes;
+        financialData.groups = report ? report.groups : [];
+        financialData.workOrders = orders ? orders.workorders.map(toReportRow) : [];
+        
+        if (orders && orders.nextCursor) {
+            showNotification(`Showing the latest ${WORK_ORDER_PAGE_SIZE} work orders; totals cover the whole range`, 'info');
+        }
+    } catch (error) {
+        console.error('Error loading financial report:', error);
+        showNotification('Could not load financial data', 'error');
+        return;
+    }
     
     // Update summary cards
-    updateSummaryCards(filteredData);
+    updateSummaryCards(financialData.summary);
     
     // Update detailed report table
-    updateReportTable(filteredData);
+    updateReportTable(REPORT_GROUP_BY[currentReportType] ? financialData.groups : financialData.workOrders);
+}
+
+// Fetch a JSON API response, throwing on errors
+async function fetchJSON(url) {
+    const response = await fetch(url);
+    const result = await response.json();
+    if (!response.ok || !result.success) {
+        throw new Error(result.error || `Request failed (${response.status})`);
+    }
+    return result;
+}
+
+// Shape an API work order like the rows the report tables expect
+function toReportRow(workOrder) {
+    return {
+        id: `WO-${workOrder.id}`,
+        date: workOrder.date,
+        customer: workOrder.customer,
+        service: workOrder.service || workOrder.serviceType || 'Unknown',
+        revenue: workOrder.revenue,
+        laborCost: workOrder.laborCost,
+        materialCost: workOrder.materialCost,
+        status: workOrder.status,
+        duration: workOrder.laborHours
+    };
+}
+
+// Format a Date as YYYY-MM-DD (local time)
+function toISODate(date) {
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${date.getFullYear()}-${month}-${day}`;
 }
 
-// Filter data by date range
-function filterDataByDateRange(data) {
+// Get the selected date range as {from, to} (YYYY-MM-DD), or null if incomplete
+function getDateRange() {
     const now = new Date();
     let startDate, endDate;
     
@@ -188,41 +140,35 @@ function filterDataByDateRange(data) {
         case 'custom':
             const startInput = document.getElementById('startDate').value;
             const endInput = document.getElementById('endDate').value;
-            if (startInput && endInput) {
-                startDate = new Date(startInput);
-                endDate = new Date(endInput);
-            } else {
-                return data; // Return all data if custom dates not set
-            }
-            break;
+            return startInput && endInput ? { from: startInput, to: endInput } : null;
         default:
-            return data;
+            startDate = new Date(now.getFullYear(), now.getMonth(), 1);
+            endDate = new Date(now.getFullYear(), now.getMonth() + 1, 0);
     }
     
-    return data.filter(item => {
-        const itemDate = new Date(item.date);
-        return itemDate >= startDate && itemDate <= endDate;
-    });
+    return { from: toISODate(startDate), to: toISODate(endDate) };
 }
 
 // Update summary cards
-function updateSummaryCards(data) {
-    const totalRevenue = data.reduce((sum, item) => sum + item.revenue, 0);
-    const totalLabor = data.reduce((sum, item) => sum + item.laborCost, 0);
-    const totalMaterial = data.reduce((sum, item) => sum + item.materialCost, 0);
-    const netProfit = totalRevenue - totalLabor - totalMaterial;
-    const completedOrders = data.filter(item => item.status === 'completed').length;
-    
-    document.getElementById('totalRevenue').textContent = `$${totalRevenue.toFixed(2)}`;
-    document.getElementById('totalLabor').textContent = `$${totalLabor.toFixed(2)}`;
-    document.getElementById('netProfit').textContent = `$${netProfit.toFixed(2)}`;
-    document.getElementById('completedOrders').textContent = completedOrders;
-    
-    // Calculate percentage changes (mock data for demo)
-    document.getElementById('revenueChange').textContent = '+15.2%';
-    document.getElementById('laborChange').textContent = '+8.5%';
-    document.getElementById('profitChange').textContent = '+22.3%';
-    document.getElementById('ordersChange').textContent = '+12';
+function updateSummaryCards(summary) {
+    const totals = summary.totals;
+    
+    document.getElementById('totalRevenue').textContent = `$${totals.revenue.toFixed(2)}`;
+    document.getElementById('totalLabor').textContent = `$${totals.laborCost.toFixed(2)}`;
+    document.getElementById('netProfit').textContent = `$${totals.netProfit.toFixed(2)}`;
+    document.getElementById('completedOrders').textContent = totals.orders;
+    
+    // Change from the previous period of the same length
+    setChange('revenueChange', summary.change.revenuePercent);
+    setChange('laborChange', summary.change.laborPercent);
+    setChange('profitChange', summary.change.profitPercent);
+    const orders = summary.change.orders;
+    document.getElementById('ordersChange').textContent = orders >= 0 ? `+${orders}` : `${orders}`;
+}
+
+function setChange(elementId, percent) {
+    const element = document.getElementById(elementId);
+    element.textContent = percent === null ? '—' : `${percent >= 0 ? '+' : ''}${percent}%`;
 }
 
 // Update report table
@@ -271,32 +217,16 @@ function generateSummaryReport(data, thead, tbody, tfoot) {
         </tr>
     `;
     
-    // Group by service type
-    const serviceGroups = {};
-    data.forEach(item => {
-        if (!serviceGroups[item.service]) {
-            serviceGroups[item.service] = {
-                count: 0,
-                revenue: 0,
-                labor: 0,
-                material: 0
-            };
-        }
-        serviceGroups[item.service].count++;
-        serviceGroups[item.service].revenue += item.revenue;
-        serviceGroups[item.service].labor += item.laborCost;
-        serviceGroups[item.service].material += item.materialCost;
-    });
-    
-    let totalRevenue = 0, totalLabor = 0, totalMaterial = 0, totalOrders = 0;
+    // Totals per service type, summed on the server
+    const serviceGroups = groupByServiceType(financialData.serviceTypes);
     
     Object.entries(serviceGroups).forEach(([service, stats]) => {
         const profit = stats.revenue - stats.labor - stats.material;
-        const margin = (profit / stats.revenue * 100).toFixed(1);
+        const margin = stats.revenue ? (profit / stats.revenue * 100).toFixed(1) : '0.0';
         
         tbody.innerHTML += `
             <tr>
-                <td>${service}</td>
+                <td>${escapeHtml(service)}</td>
                 <td>${stats.count}</td>
                 <td class="amount-positive">$${stats.revenue.toFixed(2)}</td>
                 <td>$${stats.labor.toFixed(2)}</td>
@@ -305,106 +235,112 @@ function generateSummaryReport(data, thead, tbody, tfoot) {
                 <td>${margin}%</td>
             </tr>
         `;
-        
-        totalRevenue += stats.revenue;
-        totalLabor += stats.labor;
-        totalMaterial += stats.material;
-        totalOrders += stats.count;
     });
     
-    const totalProfit = totalRevenue - totalLabor - totalMaterial;
-    const totalMargin = (totalProfit / totalRevenue * 100).toFixed(1);
-    
+    const totals = financialData.summary.totals;
     tfoot.innerHTML = `
         <tr>
             <td><strong>TOTAL</strong></td>
-            <td><strong>${totalOrders}</strong></td>
-            <td><strong>$${totalRevenue.toFixed(2)}</strong></td>
-            <td><strong>$${totalLabor.toFixed(2)}</strong></td>
-            <td><strong>$${totalMaterial.toFixed(2)}</strong></td>
-            <td><strong>$${totalProfit.toFixed(2)}</strong></td>
-            <td><strong>${totalMargin}%</strong></td>
+            <td><strong>${totals.orders}</strong></td>
+            <td><strong>$${totals.revenue.toFixed(2)}</strong></td>
+            <td><strong>$${totals.laborCost.toFixed(2)}</strong></td>
+            <td><strong>$${totals.materialCost.toFixed(2)}</strong></td>
+            <td><strong>$${totals.netProfit.toFixed(2)}</strong></td>
+            <td><strong>${totals.marginPercent === null ? '0.0' : totals.marginPercent.toFixed(1)}%</strong></td>
         </tr>
     `;
 }
 
-// Generate revenue report
+// Convert per-service-type API totals to {name: {count, revenue, labor, material}}
+function groupByServiceType(serviceTypes) {
+    const serviceGroups = {};
+    serviceTypes.forEach(row => {
+        serviceGroups[row.serviceType || 'Unknown'] = {
+            count: row.orders,
+            revenue: row.revenue,
+            labor: row.laborCost,
+            material: row.materialCost
+        };
+    });
+    return serviceGroups;
+}
+
+// Generate revenue report (one row per day, summed on the server)
 function generateRevenueReport(data, thead, tbody, tfoot) {
     thead.innerHTML = `
         <tr>
             <th>Date</th>
-            <th>Work Order ID</th>
-            <th>Customer</th>
-            <th>Service</th>
+            <th>Orders</th>
             <th>Revenue</th>
-            <th>Status</th>
+            <th>Avg per Order</th>
+            <th>Net Profit</th>
         </tr>
     `;
     
-    let totalRevenue = 0;
-    
-    data.forEach(item => {
+    data.forEach(day => {
         tbody.innerHTML += `
             <tr>
-                <td>${formatDate(item.date)}</td>
-                <td>${item.id}</td>
-                <td>${item.customer}</td>
-                <td>${item.service}</td>
-                <td class="amount-positive">$${item.revenue.toFixed(2)}</td>
-                <td><span class="status-badge ${item.status}">${item.status}</span></td>
+                <td>${formatDate(day.day)}</td>
+                <td>${day.orders}</td>
+                <td class="amount-positive">$${day.revenue.toFixed(2)}</td>
+                <td>$${(day.averageRevenue || 0).toFixed(2)}</td>
+                <td class="amount-positive">$${day.netProfit.toFixed(2)}</td>
             </tr>
         `;
-        totalRevenue += item.revenue;
     });
     
+    const totals = financialData.summary.totals;
+    const average = totals.orders ? (totals.revenue / totals.orders).toFixed(2) : '0.00';
     tfoot.innerHTML = `
         <tr>
-            <td colspan="4"><strong>TOTAL REVENUE</strong></td>
-            <td colspan="2"><strong>$${totalRevenue.toFixed(2)}</strong></td>
+            <td><strong>TOTAL REVENUE</strong></td>
+            <td><strong>${totals.orders}</strong></td>
+            <td><strong>$${totals.revenue.toFixed(2)}</strong></td>
+            <td><strong>$${average}</strong></td>
+            <td><strong>$${totals.netProfit.toFixed(2)}</strong></td>
         </tr>
     `;
 }
 
-// Generate labor report
+// Generate labor report (one row per technician, summed on the server)
 function generateLaborReport(data, thead, tbody, tfoot) {
     thead.innerHTML = `
         <tr>
-            <th>Date</th>
-            <th>Work Order ID</th>
-            <th>Service</th>
-            <th>Duration (hrs)</th>
+            <th>Technician</th>
+            <th>Orders</th>
+            <th>Hours</th>
             <th>Labor Cost</th>
             <th>Hourly Rate</th>
+            <th>Revenue per Hour</th>
         </tr>
     `;
     
-    let totalLabor = 0;
-    let totalHours = 0;
-    
-    data.forEach(item => {
-        const hourlyRate = (item.laborCost / item.duration).toFixed(2);
+    data.forEach(technician => {
+        const hourlyRate = technician.laborHours ? (technician.laborCost / technician.laborHours).toFixed(2) : '0.00';
         tbody.innerHTML += `
             <tr>
-                <td>${formatDate(item.date)}</td>
-                <td>${item.id}</td>
-                <td>${item.service}</td>
-                <td>${item.duration}</td>
-                <td>$${item.laborCost.toFixed(2)}</td>
+                <td>${escapeHtml(technician.technician)}</td>
+                <td>${technician.orders}</td>
+                <td>${technician.laborHours.toFixed(1)}</td>
+                <td>$${technician.laborCost.toFixed(2)}</td>
                 <td>$${hourlyRate}/hr</td>
+                <td>$${(technician.revenuePerLaborHour || 0).toFixed(2)}/hr</td>
             </tr>
         `;
-        totalLabor += item.laborCost;
-        totalHours += item.duration;
     });
     
-    const avgRate = (totalLabor / totalHours).toFixed(2);
+    const totals = financialData.summary.totals;
+    const avgRate = totals.laborHours ? (totals.laborCost / totals.laborHours).toFixed(2) : '0.00';
+    const revenuePerHour = totals.laborHours ? (totals.revenue / totals.laborHours).toFixed(2) : '0.00';
     
     tfoot.innerHTML = `
         <tr>
-            <td colspan="3"><strong>TOTAL</strong></td>
-            <td><strong>${totalHours.toFixed(1)} hrs</strong></td>
-            <td><strong>$${totalLabor.toFixed(2)}</strong></td>
+            <td><strong>TOTAL</strong></td>
+            <td><strong>${totals.orders}</strong></td>
+            <td><strong>${totals.laborHours.toFixed(1)} hrs</strong></td>
+            <td><strong>$${totals.laborCost.toFixed(2)}</strong></td>
             <td><strong>$${avgRate}/hr avg</strong></td>
+            <td><strong>$${revenuePerHour}/hr</strong></td>
         </tr>
     `;
 }
@@ -424,172 +360,55 @@ function generateWorkOrdersReport(data, thead, tbody, tfoot) {
         </tr>
     `;
     
-    let totalRevenue = 0, totalCost = 0, totalProfit = 0;
-    
     data.forEach(item => {
         const cost = item.laborCost + item.materialCost;
         const profit = item.revenue - cost;
         
         tbody.innerHTML += `
             <tr>
-                <td>${item.id}</td>
+                <td>${escapeHtml(item.id)}</td>
                 <td>${formatDate(item.date)}</td>
-                <td>${item.customer}</td>
-                <td>${item.service}</td>
+                <td>${escapeHtml(item.customer)}</td>
+                <td>${escapeHtml(item.service)}</td>
                 <td class="amount-positive">$${item.revenue.toFixed(2)}</td>
                 <td>$${cost.toFixed(2)}</td>
                 <td class="amount-positive">$${profit.toFixed(2)}</td>
-                <td><span class="status-badge ${item.status}">${item.status}</span></td>
+                <td><span class="status-badge ${escapeHtml(item.status)}">${escapeHtml(item.status)}</span></td>
             </tr>
         `;
-        
-        totalRevenue += item.revenue;
-        totalCost += cost;
-        totalProfit += profit;
     });
     
+    const totals = financialData.summary.totals;
     tfoot.innerHTML = `
         <tr>
             <td colspan="4"><strong>TOTAL</strong></td>
-            <td><strong>$${totalRevenue.toFixed(2)}</strong></td>
-            <td><strong>$${totalCost.toFixed(2)}</strong></td>
-            <td colspan="2"><strong>$${totalProfit.toFixed(2)}</strong></td>
+            <td><strong>$${totals.revenue.toFixed(2)}</strong></td>
+            <td><strong>$${(totals.laborCost + totals.materialCost).toFixed(2)}</strong></td>
+            <td colspan="2"><strong>$${totals.netProfit.toFixed(2)}</strong></td>
         </tr>
     `;
 }
 
-// Export to CSV
+// Export to CSV (streamed by the server, so large ranges download without loading into the page)
 function exportToCSV() {
-    const reportType = document.getElementById('reportType').value;
-    const dateRange = document.getElementById('dateRange').value;
-    const filteredData = filterDataByDateRange(financialData.workOrders);
+    // Export the report currently shown
+    const range = getDateRange();
     
-    if (filteredData.length === 0) {
-        showNotification('No data to export', 'error');
+    if (!range) {
+        showNotification('Choose a start and end date to export', 'error');
         return;
     }
     
-    let csv = '';
-    let filename = '';
-    
-    // Generate CSV based on report type
-    switch (reportType) {
-        case 'summary':
-            csv = generateSummaryCSV(filteredData);
-            filename = `summary_report_${dateRange}_${getCurrentDate()}.csv`;
-            break;
-        case 'revenue':
-            csv = generateRevenueCSV(filteredData);
-            filename = `revenue_report_${dateRange}_${getCurrentDate()}.csv`;
-            break;
-        case 'labor':
-            csv = generateLaborCSV(filteredData);
-            filename = `labor_report_${dateRange}_${getCurrentDate()}.csv`;
-            break;
-        case 'work-orders':
-            csv = generateWorkOrdersCSV(filteredData);
-            filename = `work_orders_report_${dateRange}_${getCurrentDate()}.csv`;
-            break;
-    }
-    
-    // Create download link
-    const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+    // The browser saves the chunked response straight to disk
     const link = document.createElement('a');
-    const url = URL.createObjectURL(blob);
-    
-    link.setAttribute('href', url);
-    link.setAttribute('download', filename);
+    link.setAttribute('href', `/api/admin/financial/export?type=${currentReportType}&from=${range.from}&to=${range.to}`);
+    link.setAttribute('download', '');
     link.style.visibility = 'hidden';
     document.body.appendChild(link);
     link.click();
     document.body.removeChild(link);
     
-    showNotification('Report exported successfully!', 'success');
-}
-
-// Generate CSV for different report types
-function generateSummaryCSV(data) {
-    let csv = 'Service Type,Orders,Revenue,Labor Cost,Material Cost,Net Profit,Margin %\n';
-    
-    const serviceGroups = {};
-    data.forEach(item => {
-        if (!serviceGroups[item.service]) {
-            serviceGroups[item.service] = { count: 0, revenue: 0, labor: 0, material: 0 };
-        }
-        serviceGroups[item.service].count++;
-        serviceGroups[item.service].revenue += item.revenue;
-        serviceGroups[item.service].labor += item.laborCost;
-        serviceGroups[item.service].material += item.materialCost;
-    });
-    
-    let totalRevenue = 0, totalLabor = 0, totalMaterial = 0, totalOrders = 0;
-    
-    Object.entries(serviceGroups).forEach(([service, stats]) => {
-        const profit = stats.revenue - stats.labor - stats.material;
-        const margin = (profit / stats.revenue * 100).toFixed(1);
-        
-        csv += `"${service}",${stats.count},${stats.revenue.toFixed(2)},${stats.labor.toFixed(2)},${stats.material.toFixed(2)},${profit.toFixed(2)},${margin}\n`;
-        
-        totalRevenue += stats.revenue;
-        totalLabor += stats.labor;
-        totalMaterial += stats.material;
-        totalOrders += stats.count;
-    });
-    
-    const totalProfit = totalRevenue - totalLabor - totalMaterial;
-    const totalMargin = (totalProfit / totalRevenue * 100).toFixed(1);
-    
-    csv += `\nTOTAL,${totalOrders},${totalRevenue.toFixed(2)},${totalLabor.toFixed(2)},${totalMaterial.toFixed(2)},${totalProfit.toFixed(2)},${totalMargin}\n`;
-    
-    return csv;
-}
-
-function generateRevenueCSV(data) {
-    let csv = 'Date,Work Order ID,Customer,Service,Revenue,Status\n';
-    let totalRevenue = 0;
-    
-    data.forEach(item => {
-        csv += `${item.date},"${item.id}","${item.customer}","${item.service}",${item.revenue.toFixed(2)},${item.status}\n`;
-        totalRevenue += item.revenue;
-    });
-    
-    csv += `\n,,,TOTAL REVENUE,${totalRevenue.toFixed(2)},\n`;
-    return csv;
-}
-
-function generateLaborCSV(data) {
-    let csv = 'Date,Work Order ID,Service,Duration (hrs),Labor Cost,Hourly Rate\n';
-    let totalLabor = 0, totalHours = 0;
-    
-    data.forEach(item => {
-        const hourlyRate = (item.laborCost / item.duration).toFixed(2);
-        csv += `${item.date},"${item.id}","${item.service}",${item.duration},${item.laborCost.toFixed(2)},${hourlyRate}\n`;
-        totalLabor += item.laborCost;
-        totalHours += item.duration;
-    });
-    
-    const avgRate = (totalLabor / totalHours).toFixed(2);
-    csv += `\n,,TOTAL,${totalHours.toFixed(1)},${totalLabor.toFixed(2)},${avgRate}\n`;
-    return csv;
-}
-
-function generateWorkOrdersCSV(data) {
-    let csv = 'Work Order ID,Date,Customer,Service,Revenue,Total Cost,Profit,Status\n';
-    let totalRevenue = 0, totalCost = 0, totalProfit = 0;
-    
-    data.forEach(item => {
-        const cost = item.laborCost + item.materialCost;
-        const profit = item.revenue - cost;
-        
-        csv += `"${item.id}",${item.date},"${item.customer}","${item.service}",${item.revenue.toFixed(2)},${cost.toFixed(2)},${profit.toFixed(2)},${item.status}\n`;
-        
-        totalRevenue += item.revenue;
-        totalCost += cost;
-        totalProfit += profit;
-    });
-    
-    csv += `\n,,,TOTAL,${totalRevenue.toFixed(2)},${totalCost.toFixed(2)},${totalProfit.toFixed(2)},\n`;
-    return csv;
+    showNotification('Export started', 'success');
 }
 
 // Helper functions
@@ -598,10 +417,23 @@ function formatDate(dateString) {
     return date.toLocaleDateString('en-US', { year: 'numeric', month: 'short', day: 'numeric' });
 }
 
-function getCurrentDate() {
-    return new Date().toISOString().split('T')[0];
+// Escape a value for use inside HTML markup
+function escapeHtml(value) {
+    if (value === null || value === undefined) return '';
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
 }
 
+const NOTIFICATION_COLORS = {
+    success: 'linear-gradient(135deg, #4CAF50, #45a049)',
+    info: 'linear-gradient(135deg, #607D8B, #546E7A)',
+    error: 'linear-gradient(135deg, #f44336, #d32f2f)'
+};
+
 function showNotification(message, type = 'success') {
     const notification = document.createElement('div');
     notification.textContent = message;
@@ -609,7 +441,7 @@ function showNotification(message, type = 'success') {
         position: fixed;
         top: 100px;
         right: 20px;
-        background: ${type === 'success' ? 'linear-gradient(135deg, #4CAF50, #45a049)' : 'linear-gradient(135deg, #f44336, #d32f2f)'};
+        background: ${NOTIFICATION_COLORS[type] || NOTIFICATION_COLORS.error};
         color: white;
         padding: 16px 24px;
         border-radius: 12px;
@@ -3,459 +3,11 @@ let currentPeriodStart = new Date();
 currentPeriodStart.setDate(currentPeriodStart.getDate() - currentPeriodStart.getDay()); // Start from Sunday
 currentPeriodStart.setHours(0, 0, 0, 0);
 
-// Sample technician data (matching from adminEmployee.js)
-const technicians = [
-    {
-        id: 1,
-        name: "Michael Thompson",
-        role: "Senior Technician",
-        status: "active"
-    },
-    {
-        id: 2,
-        name: "Sarah Martinez",
-        role: "Technician",
-        status: "active"
-    },
-    {
-        id: 3,
-        name: "Jessica Williams",
-        role: "Technician",
-        status: "active"
-    },
-    {
-        id: 4,
-        name: "Robert Johnson",
-        role: "Senior Technician",
-        status: "on-leave"
-    }
-];
-
-// Sample employee availability requests
-/*
-let availabilityRequests = [
-    {
-        id: 1,
-        employeeId: 1,
-        employeeName: "Michael Thompson",
-        employeeRole: "Senior Technician",
-        requestType: "time-off",
-        startDate: "2025-11-05",
-        endDate: "2025-11-08",
-        fullDay: true,
-        startTime: null,
-        endTime: null,
-        reason: "Family vacation planned for Thanksgiving week. Need time to travel and spend time with family out of state.",
-        status: "pending",
-        requestDate: "2025-10-12T10:30:00",
-        reviewedBy: null,
-        reviewedDate: null
-    },
-    {
-        id: 2,
-        employeeId: 2,
-        employeeName: "Sarah Martinez",
-        employeeRole: "Technician",
-        requestType: "personal-day",
-        startDate: "2025-10-29",
-        endDate: "2025-10-29",
-        fullDay: false,
-        startTime: "08:00",
-        endTime: "12:00",
-        reason: "Doctor's appointment in the morning. Should be back by early afternoon.",
-        status: "pending",
-        requestDate: "2025-10-14T14:20:00",
-        reviewedBy: null,
-        reviewedDate: null
-    },
-    {
-        id: 3,
-        employeeId: 3,
-        employeeName: "Jessica Williams",
-        employeeRole: "Technician",
-        requestType: "availability-change",
-        startDate: "2025-10-25",
-        endDate: "2025-10-25",
-        fullDay: true,
-        startTime: null,
-        endTime: null,
-        reason: "Need to attend a professional certification training course. Will be unavailable for the entire day.",
-        status: "pending",
-        requestDate: "2025-10-13T09:15:00",
-        reviewedBy: null,
-        reviewedDate: null
-    },
-    {
-        id: 4,
-        employeeId: 1,
-        employeeName: "Michael Thompson",
-        employeeRole: "Senior Technician",
-        requestType: "sick-leave",
-        startDate: "2025-10-18",
-        endDate: "2025-10-18",
-        fullDay: true,
-        startTime: null,
-        endTime: null,
-        reason: "Not feeling well, need to rest and recover.",
-        status: "approved",
-        requestDate: "2025-10-17T07:30:00",
-        reviewedBy: "Admin",
-        reviewedDate: "2025-10-17T08:00:00"
-    },
-    {
-        id: 5,
-        employeeId: 2,
-        employeeName: "Sarah Martinez",
-        employeeRole: "Technician",
-        requestType: "time-off",
-        startDate: "2025-11-15",
-        endDate: "2025-11-17",
-        fullDay: true,
-        startTime: null,
-        endTime: null,
-        reason: "Weekend getaway with family. Requesting Friday off.",
-        status: "pending",
-        requestDate: "2025-10-15T16:45:00",
-        reviewedBy: null,
-        reviewedDate: null
-    }
-];
-*/
-
-// Sample availability data for biweekly period
-let availabilityData = [
-    // Week 1 - Michael Thompson
-    {
-        id: 1,
-        technicianId: 1,
-        technicianName: "Michael Thompson",
-        date: "2025-10-20",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "assigned",
-        workOrderId: "WO-2025-101",
-        customer: "John Smith",
-        service: "HVAC Repair"
-    },
-    {
-        id: 2,
-        technicianId: 1,
-        technicianName: "Michael Thompson",
-        date: "2025-10-21",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "available"
-    },
-    {
-        id: 3,
-        technicianId: 1,
-        technicianName: "Michael Thompson",
-        date: "2025-10-22",
-        startTime: "13:00",
-        endTime: "17:00",
-        status: "assigned",
-        workOrderId: "WO-2025-102",
-        customer: "Sarah Johnson",
-        service: "Plumbing Installation"
-    },
-    {
-        id: 4,
-        technicianId: 1,
-        technicianName: "Michael Thompson",
-        date: "2025-10-23",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "available"
-    },
-    {
-        id: 5,
-        technicianId: 1,
-        technicianName: "Michael Thompson",
-        date: "2025-10-24",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "available"
-    },
+// Technicians for the filter, loaded from /api/technicians
+let technicians = [];
 
-    // Week 2 - Michael Thompson
-    {
-        id: 6,
-        technicianId: 1,
-        technicianName: "Michael Thompson",
-        date: "2025-10-27",
-        startTime: "09:00",
-        endTime: "12:00",
-        status: "assigned",
-        workOrderId: "WO-2025-110",
-        customer: "David Chen",
-        service: "Electrical Inspection"
-    },
-    {
-        id: 7,
-        technicianId: 1,
-        technicianName: "Michael Thompson",
-        date: "2025-10-28",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "available"
-    },
-    {
-        id: 8,
-        technicianId: 1,
-        technicianName: "Michael Thompson",
-        date: "2025-10-29",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "available"
-    },
-
-    // Week 1 - Sarah Martinez
-    {
-        id: 9,
-        technicianId: 2,
-        technicianName: "Sarah Martinez",
-        date: "2025-10-20",
-        startTime: "08:00",
-        endTime: "16:00",
-        status: "available"
-    },
-    {
-        id: 10,
-        technicianId: 2,
-        technicianName: "Sarah Martinez",
-        date: "2025-10-21",
-        startTime: "08:00",
-        endTime: "16:00",
-        status: "assigned",
-        workOrderId: "WO-2025-105",
-        customer: "Emily Davis",
-        service: "Interior Painting"
-    },
-    {
-        id: 11,
-        technicianId: 2,
-        technicianName: "Sarah Martinez",
-        date: "2025-10-22",
-        startTime: "08:00",
-        endTime: "16:00",
-        status: "assigned",
-        workOrderId: "WO-2025-105",
-        customer: "Emily Davis",
-        service: "Interior Painting"
-    },
-    {
-        id: 12,
-        technicianId: 2,
-        technicianName: "Sarah Martinez",
-        date: "2025-10-23",
-        startTime: "08:00",
-        endTime: "16:00",
-        status: "available"
-    },
-    {
-        id: 13,
-        technicianId: 2,
-        technicianName: "Sarah Martinez",
-        date: "2025-10-24",
-        startTime: "08:00",
-        endTime: "16:00",
-        status: "available"
-    },
-
-    // Week 2 - Sarah Martinez
-    {
-        id: 14,
-        technicianId: 2,
-        technicianName: "Sarah Martinez",
-        date: "2025-10-27",
-        startTime: "08:00",
-        endTime: "16:00",
-        status: "available"
-    },
-    {
-        id: 15,
-        technicianId: 2,
-        technicianName: "Sarah Martinez",
-        date: "2025-10-28",
-        startTime: "08:00",
-        endTime: "16:00",
-        status: "assigned",
-        workOrderId: "WO-2025-112",
-        customer: "Robert Lee",
-        service: "Deck Repair"
-    },
-    {
-        id: 16,
-        technicianId: 2,
-        technicianName: "Sarah Martinez",
-        date: "2025-10-29",
-        startTime: "08:00",
-        endTime: "12:00",
-        status: "unavailable",
-        unavailableType: "Personal Day",
-        reason: "Doctor's appointment"
-    },
-    {
-        id: 17,
-        technicianId: 2,
-        technicianName: "Sarah Martinez",
-        date: "2025-10-30",
-        startTime: "08:00",
-        endTime: "16:00",
-        status: "available"
-    },
-
-    // Week 1 - Jessica Williams
-    {
-        id: 18,
-        technicianId: 3,
-        technicianName: "Jessica Williams",
-        date: "2025-10-20",
-        startTime: "10:00",
-        endTime: "18:00",
-        status: "assigned",
-        workOrderId: "WO-2025-108",
-        customer: "Patricia Wilson",
-        service: "Bathroom Renovation"
-    },
-    {
-        id: 19,
-        technicianId: 3,
-        technicianName: "Jessica Williams",
-        date: "2025-10-21",
-        startTime: "10:00",
-        endTime: "18:00",
-        status: "available"
-    },
-    {
-        id: 20,
-        technicianId: 3,
-        technicianName: "Jessica Williams",
-        date: "2025-10-22",
-        startTime: "10:00",
-        endTime: "18:00",
-        status: "available"
-    },
-    {
-        id: 21,
-        technicianId: 3,
-        technicianName: "Jessica Williams",
-        date: "2025-10-23",
-        startTime: "10:00",
-        endTime: "18:00",
-        status: "assigned",
-        workOrderId: "WO-2025-109",
-        customer: "Mark Anderson",
-        service: "HVAC Installation"
-    },
-    {
-        id: 22,
-        technicianId: 3,
-        technicianName: "Jessica Williams",
-        date: "2025-10-24",
-        startTime: "10:00",
-        endTime: "18:00",
-        status: "available"
-    },
-
-    // Week 2 - Jessica Williams
-    {
-        id: 23,
-        technicianId: 3,
-        technicianName: "Jessica Williams",
-        date: "2025-10-27",
-        startTime: "10:00",
-        endTime: "18:00",
-        status: "available"
-    },
-    {
-        id: 24,
-        technicianId: 3,
-        technicianName: "Jessica Williams",
-        date: "2025-10-28",
-        startTime: "10:00",
-        endTime: "18:00",
-        status: "available"
-    },
-    {
-        id: 25,
-        technicianId: 3,
-        technicianName: "Jessica Williams",
-        date: "2025-10-29",
-        startTime: "10:00",
-        endTime: "18:00",
-        status: "available"
-    },
-    {
-        id: 26,
-        technicianId: 3,
-        technicianName: "Jessica Williams",
-        date: "2025-10-30",
-        startTime: "10:00",
-        endTime: "18:00",
-        status: "assigned",
-        workOrderId: "WO-2025-115",
-        customer: "Linda Martinez",
-        service: "Kitchen Plumbing"
-    },
-
-    // Robert Johnson - On Leave entire period
-    {
-        id: 27,
-        technicianId: 4,
-        technicianName: "Robert Johnson",
-        date: "2025-10-20",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "unavailable",
-        unavailableType: "Sick Leave",
-        reason: "Medical leave"
-    },
-    {
-        id: 28,
-        technicianId: 4,
-        technicianName: "Robert Johnson",
-        date: "2025-10-21",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "unavailable",
-        unavailableType: "Sick Leave",
-        reason: "Medical leave"
-    },
-    {
-        id: 29,
-        technicianId: 4,
-        technicianName: "Robert Johnson",
-        date: "2025-10-22",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "unavailable",
-        unavailableType: "Sick Leave",
-        reason: "Medical leave"
-    },
-    {
-        id: 30,
-        technicianId: 4,
-        technicianName: "Robert Johnson",
-        date: "2025-10-23",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "unavailable",
-        unavailableType: "Sick Leave",
-        reason: "Medical leave"
-    },
-    {
-        id: 31,
-        technicianId: 4,
-        technicianName: "Robert Johnson",
-        date: "2025-10-24",
-        startTime: "09:00",
-        endTime: "17:00",
-        status: "unavailable",
-        unavailableType: "Sick Leave",
-        reason: "Medical leave"
-    }
-];
+// Pending time-off and availability requests, loaded from /api/availability-requests
+let availabilityRequests = [];
 
 let calendar;
 let currentFilter = { technician: 'all', status: 'all' };
@@ -465,8 +17,9 @@ document.addEventListener('DOMContentLoaded', function() {
     initializeCalendar();
     updatePeriodDisplay();
     populateTechnicianFilter();
+    connectAssignmentEvents();
     // updateSummaryCards(); // Removed - summary cards no longer displayed
-    // displayAvailabilityRequests(); // Removed - availability requests section removed
+    loadAvailabilityRequests();
 });
 
 // Initialize FullCalendar
@@ -495,7 +48,7 @@ function initializeCalendar() {
             right: ''
         },
         height: 'auto',
-        events: getFilteredEvents(),
+        events: fetchCalendarEvents,
         eventClick: function(info) {
             showAvailabilityDetails(info.event);
         },
@@ -512,45 +65,63 @@ function initializeCalendar() {
     calendar.render();
 }
 
-// Get filtered events based on current filters
-function getFilteredEvents() {
-    let filteredData = availabilityData;
-    
-    // Filter out unavailable/time-off entries
-    filteredData = filteredData.filter(item => item.status !== 'unavailable');
-    
-    // Filter by technician
+// Load the events for the visible window only (FullCalendar calls this on every view change)
+async function fetchCalendarEvents(fetchInfo, successCallback, failureCallback) {
+    const params = new URLSearchParams({
+        start: toISODate(fetchInfo.start),
+        end: toISODate(fetchInfo.end),
+        // Time off is not shown on the timesheet
+        status: currentFilter.status === 'all' ? 'available,assigned' : currentFilter.status
+    });
     if (currentFilter.technician !== 'all') {
-        filteredData = filteredData.filter(item => 
-            item.technicianId === parseInt(currentFilter.technician)
-        );
+        params.set('employeeId', currentFilter.technician);
     }
     
-    // Filter by status
-    if (currentFilter.status !== 'all') {
-        filteredData = filteredData.filter(item => 
-            item.status === currentFilter.status
-        );
+    try {
+        const response = await fetch(`/api/employee-availability?${params}`);
+        const result = await response.json();
+        if (!response.ok || !result.success) {
+            throw new Error(result.error || `Request failed (${response.status})`);
+        }
+        successCallback(result.events.map(toCalendarEvent));
+    } catch (error) {
+        console.error('Error loading timesheet:', error);
+        showNotification('Could not load the timesheet', 'error');
+        failureCallback(error);
     }
+}
+
+// Convert an API event to a FullCalendar event
+function toCalendarEvent(item) {
+    const timeRange = item.allDay
+        ? 'All Day'
+        : `${formatTime(item.start.slice(11, 16))} - ${formatTime(item.end.slice(11, 16))}`;
     
-    // Convert to FullCalendar events
-    return filteredData.map(item => ({
+    return {
         id: item.id,
         title: item.technicianName,
-        start: `${item.date}T${item.startTime}`,
-        end: `${item.date}T${item.endTime}`,
+        start: item.start,
+        end: item.end,
+        allDay: item.allDay,
         classNames: [item.status],
         extendedProps: {
             technicianId: item.technicianId,
             status: item.status,
-            timeRange: `${formatTime(item.startTime)} - ${formatTime(item.endTime)}`,
-            workOrderId: item.workOrderId,
+            timeRange: timeRange,
+            workOrderId: item.workOrderId ? `WO-${item.workOrderId}` : null,
             customer: item.customer,
             service: item.service,
             unavailableType: item.unavailableType,
             reason: item.reason
         }
-    }));
+    };
+}
+
+// Format a Date as YYYY-MM-DD (local time)
+function toISODate(date) {
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${date.getFullYear()}-${month}-${day}`;
 }
 
 // Format time to 12-hour format
@@ -601,13 +172,26 @@ function changePeriod(direction) {
 }
 
 // Populate technician filter dropdown
-function populateTechnicianFilter() {
+async function populateTechnicianFilter() {
     const select = document.getElementById('technicianFilter');
     
+    try {
+        const response = await fetch('/api/technicians');
+        const result = await response.json();
+        if (!response.ok || !result.success) {
+            throw new Error(result.error || `Request failed (${response.status})`);
+        }
+        technicians = result.technicians;
+    } catch (error) {
+        console.error('Error loading technicians:', error);
+        showNotification('Could not load technicians', 'error');
+        return;
+    }
+    
     technicians.forEach(tech => {
         const option = document.createElement('option');
         option.value = tech.id;
-        option.textContent = `${tech.name} (${tech.role})`;
+        option.textContent = tech.name;
         select.appendChild(option);
     });
 }
@@ -629,11 +213,38 @@ function filterByStatus() {
 // Refresh calendar events
 function refreshCalendarEvents() {
     if (calendar) {
-        calendar.removeAllEvents();
-        calendar.addEventSource(getFilteredEvents());
+        calendar.refetchEvents();
     }
 }
 
+// Live updates: reload the visible window when any job is assigned or changes status
+const ASSIGNMENT_EVENTS = ['assignment.created', 'assignment.reassigned', 'assignment.status',
+                           'assignment.updated', 'assignment.removed', 'resync'];
+let assignmentRefreshTimer = null;
+
+function connectAssignmentEvents() {
+    if (!window.EventSource) return;
+    
+    const source = new EventSource('/api/events?view=admin');
+    let connectedBefore = false;
+    
+    // Catch up on anything missed while the stream was down
+    source.addEventListener('open', () => {
+        if (connectedBefore) {
+            scheduleAssignmentRefresh();
+        }
+        connectedBefore = true;
+    });
+    
+    ASSIGNMENT_EVENTS.forEach(type => source.addEventListener(type, scheduleAssignmentRefresh));
+}
+
+// A batch of bookings arrives as many events; refetch once for all of them
+function scheduleAssignmentRefresh() {
+    clearTimeout(assignmentRefreshTimer);
+    assignmentRefreshTimer = setTimeout(refreshCalendarEvents, 500);
+}
+
 // Refresh entire timesheet
 function refreshTimesheet() {
     currentFilter = { technician: 'all', status: 'all' };
@@ -800,10 +411,47 @@ style.textContent = `
 `;
 document.head.appendChild(style);
 
-// ===== Availability Requests Management - REMOVED =====
+// ===== Availability Requests Management =====
+
+// Escape a value for use inside HTML markup
+function escapeHtml(value) {
+    if (value === null || value === undefined) return '';
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
 
-/*
-// Display availability requests - REMOVED
+// Load pending requests from the server and show them
+async function loadAvailabilityRequests() {
+    try {
+        const response = await fetch('/api/availability-requests?status=pending');
+        const result = await response.json();
+        if (!response.ok || !result.success) {
+            throw new Error(result.error || `Request failed (${response.status})`);
+        }
+        availabilityRequests = result.requests;
+    } catch (error) {
+        console.error('Error loading availability requests:', error);
+        showNotification('Could not load availability requests', 'error');
+        return;
+    }
+    displayAvailabilityRequests();
+}
+
+// Format a YYYY-MM-DD date for a request card
+function formatRequestDate(date) {
+    return new Date(`${date}T00:00:00`).toLocaleDateString('en-US', {
+        weekday: 'short',
+        month: 'short',
+        day: 'numeric',
+        year: 'numeric'
+    });
+}
+
+// Display availability requests
 function displayAvailabilityRequests() {
     const requestsContainer = document.getElementById('availabilityRequests');
     const pendingRequests = availabilityRequests.filter(req => req.status === 'pending');
@@ -824,19 +472,17 @@ function displayAvailabilityRequests() {
     let html = '';
     
     pendingRequests.forEach(request => {
-        const startDate = new Date(request.startDate).toLocaleDateString('en-US', {
-            weekday: 'short',
-            month: 'short',
-            day: 'numeric',
-            year: 'numeric'
-        });
+        // Periods are in date order, one per selected date, with the same hours on each
+        const first = request.periods[0];
+        const last = request.periods[request.periods.length - 1];
+        const startDate = formatRequestDate(first.start.slice(0, 10));
+        const endDate = formatRequestDate(last.start.slice(0, 10));
+        const days = request.periods.length;
+        const dateRange = days === 1 ? startDate : `${startDate} - ${endDate} (${days} days)`;
         
-        const endDate = new Date(request.endDate).toLocaleDateString('en-US', {
-            weekday: 'short',
-            month: 'short',
-            day: 'numeric',
-            year: 'numeric'
-        });
+        const timeRange = request.fullDay
+            ? 'Full Day'
+            : `${formatTime(first.start.slice(11, 16))} - ${formatTime(first.end.slice(11, 16))}`;
         
         const requestedDate = new Date(request.requestDate).toLocaleDateString('en-US', {
             month: 'short',
@@ -846,35 +492,19 @@ function displayAvailabilityRequests() {
             minute: '2-digit'
         });
         
-        const isSameDay = request.startDate === request.endDate;
-        const dateRange = isSameDay ? startDate : `${startDate} - ${endDate}`;
-        
-        const timeRange = request.fullDay 
-            ? 'Full Day' 
-            : `${formatTime(request.startTime)} - ${formatTime(request.endTime)}`;
-        
-        const requestTypeLabel = {
-            'time-off': 'Time Off / Vacation',
-            'sick-leave': 'Sick Leave',
-            'personal-day': 'Personal Day',
-            'availability-change': 'Availability Change',
-            'other': 'Other'
-        }[request.requestType] || request.requestType;
-        
         html += `
-            <div class="request-card ${request.status}" data-request-id="${request.id}">
+            <div class="request-card ${escapeHtml(request.status)}" data-request-id="${request.id}">
                 <div class="request-header-section">
                     <div class="request-employee">
-                        <h4>${request.employeeName}</h4>
-                        <span class="employee-role">${request.employeeRole}</span>
+                        <h4>${escapeHtml(request.employeeName)}</h4>
                     </div>
-                    <span class="request-status-badge ${request.status}">${request.status}</span>
+                    <span class="request-status-badge ${escapeHtml(request.status)}">${escapeHtml(request.status)}</span>
                 </div>
                 
                 <div class="request-details">
                     <div class="request-detail-row">
                         <span class="request-label">Request Type:</span>
-                        <span class="request-value">${requestTypeLabel}</span>
+                        <span class="request-value">${escapeHtml(request.requestTypeLabel)}</span>
                     </div>
                     <div class="request-detail-row">
                         <span class="request-label">Date(s):</span>
@@ -892,7 +522,7 @@ function displayAvailabilityRequests() {
                 
                 <div class="request-reason">
                     <strong>Reason:</strong>
-                    <p>${request.reason}</p>
+                    <p>${escapeHtml(request.reason)}</p>
                 </div>
                 
                 <div class="request-actions">
@@ -910,8 +540,36 @@ function displayAvailabilityRequests() {
     requestsContainer.innerHTML = html;
 }
 
+// Send a review to the server; returns true if it was applied
+async function reviewRequest(requestId, action, body) {
+    const card = document.querySelector(`.request-card[data-request-id="${requestId}"]`);
+    const buttons = card ? card.querySelectorAll('button') : [];
+    buttons.forEach(button => { button.disabled = true; });
+    
+    try {
+        const response = await fetch(`/api/availability-requests/${action}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ requestId: requestId, reviewedBy: 'Admin', ...body })
+        });
+        const result = await response.json();
+        if (!response.ok || !result.success) {
+            throw new Error(result.error || `Request failed (${response.status})`);
+        }
+        return true;
+    } catch (error) {
+        console.error(`Error trying to ${action} availability request:`, error);
+        showNotification(error.message, 'error');
+        buttons.forEach(button => { button.disabled = false; });
+        return false;
+    } finally {
+        // Already reviewed elsewhere (409) or not: show the current list either way
+        loadAvailabilityRequests();
+    }
+}
+
 // Approve availability request
-function approveRequest(requestId) {
+async function approveRequest(requestId) {
     const request = availabilityRequests.find(req => req.id === requestId);
     
     if (!request) {
@@ -919,37 +577,18 @@ function approveRequest(requestId) {
         return;
     }
     
-    const confirmed = confirm(
-        `Approve ${request.employeeName}'s ${request.requestType} request from ${new Date(request.startDate).toLocaleDateString()} to ${new Date(request.endDate).toLocaleDateString()}?`
-    );
-    
+    const confirmed = confirm(`Approve ${request.employeeName}'s ${request.requestTypeLabel} request?`);
     if (!confirmed) return;
     
-    // Update request status
-    request.status = 'approved';
-    request.reviewedBy = 'Admin';
-    request.reviewedDate = new Date().toISOString();
-    
-    // Add unavailable periods to availability data
-    addUnavailablePeriod(request);
-    
-    // Refresh displays
-    displayAvailabilityRequests();
-    refreshCalendarEvents();
-    // updateSummaryCards(); // Removed - summary cards no longer displayed
-    
-    showNotification(`${request.employeeName}'s request has been approved!`, 'success');
-    
-    // TODO: Send to backend API
-    // fetch('/api/availability-requests/approve', {
-    //     method: 'POST',
-    //     headers: { 'Content-Type': 'application/json' },
-    //     body: JSON.stringify({ requestId: requestId, reviewedBy: 'Admin' })
-    // })
+    if (await reviewRequest(requestId, 'approve', {})) {
+        // An approved availability change replaces the technician's offered hours
+        refreshCalendarEvents();
+        showNotification(`${request.employeeName}'s request has been approved!`, 'success');
+    }
 }
 
 // Reject availability request
-function rejectRequest(requestId) {
+async function rejectRequest(requestId) {
     const request = availabilityRequests.find(req => req.id === requestId);
     
     if (!request) {
@@ -958,70 +597,12 @@ function rejectRequest(requestId) {
     }
     
     const reason = prompt(
-        `Reject ${request.employeeName}'s ${request.requestType} request?\n\nOptional: Enter reason for rejection:`
+        `Reject ${request.employeeName}'s ${request.requestTypeLabel} request?\n\nOptional: Enter reason for rejection:`
     );
     
     if (reason === null) return; // User cancelled
     
-    // Update request status
-    request.status = 'rejected';
-    request.reviewedBy = 'Admin';
-    request.reviewedDate = new Date().toISOString();
-    request.rejectionReason = reason || 'No reason provided';
-    
-    // Refresh display
-    displayAvailabilityRequests();
-    
-    showNotification(`${request.employeeName}'s request has been rejected`, 'success');
-    
-    // TODO: Send to backend API
-    // fetch('/api/availability-requests/reject', {
-    //     method: 'POST',
-    //     headers: { 'Content-Type': 'application/json' },
-    //     body: JSON.stringify({ 
-    //         requestId: requestId, 
-    //         reviewedBy: 'Admin',
-    //         reason: reason 
-    //     })
-    // })
-}
-*/
-
-/*
-// Add unavailable period to availability data after approval - REMOVED
-function addUnavailablePeriod(request) {
-    const startDate = new Date(request.startDate);
-    const endDate = new Date(request.endDate);
-    
-    // Generate unavailable entries for each day in the range
-    for (let date = new Date(startDate); date <= endDate; date.setDate(date.getDate() + 1)) {
-        const dateStr = date.toISOString().split('T')[0];
-        
-        // Check if there's already an entry for this date
-        const existingIndex = availabilityData.findIndex(
-            item => item.technicianId === request.employeeId && item.date === dateStr
-        );
-        
-        // Create new unavailable entry
-        const newEntry = {
-            id: availabilityData.length + 1,
-            technicianId: request.employeeId,
-            technicianName: request.employeeName,
-            date: dateStr,
-            startTime: request.fullDay ? "09:00" : request.startTime,
-            endTime: request.fullDay ? "17:00" : request.endTime,
-            status: "unavailable",
-            unavailableType: request.requestType,
-            reason: request.reason
-        };
-        
-        if (existingIndex >= 0) {
-            // Replace existing entry
-            availabilityData[existingIndex] = newEntry;
-        } else {
-            // Add new entry
-            availabilityData.push(newEntry);
-        }
+    if (await reviewRequest(requestId, 'reject', { reason: reason })) {
+        showNotification(`${request.employeeName}'s request has been rejected`, 'success');
     }
 }
-*/
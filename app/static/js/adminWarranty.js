@@ -1,142 +1,32 @@
-// Sample hardcoded warranty data including customer requests
-let warranties = [
-    {
-        id: 1,
-        customerId: 101,
-        customerName: "John Smith",
-        customerEmail: "john.smith@email.com",
-        customerPhone: "(555) 123-4567",
-        serviceName: "HVAC Installation",
-        serviceType: "Heating & Cooling",
-        workOrderId: "WO-2024-001",
-        startDate: "2024-06-15",
-        endDate: "2026-06-15",
-        coverage: "Full system coverage including parts and labor",
-        status: "active",
-        notes: "2-year warranty on new HVAC system installation",
-        serviceRequest: {
-            issueType: "Repair",
-            urgency: "High",
-            description: "AC unit not cooling properly. Making strange noises.",
-            requestDate: "2025-10-10"
-        }
-    },
-    {
-        id: 2,
-        customerId: 102,
-        customerName: "Sarah Johnson",
-        customerEmail: "sarah.j@email.com",
-        customerPhone: "(555) 234-5678",
-        serviceName: "Kitchen Remodel",
-        serviceType: "Carpentry & Installation",
-        workOrderId: "WO-2024-015",
-        startDate: "2025-03-20",
-        endDate: "2026-03-20",
-        coverage: "Cabinets, countertops, and installation workmanship",
-        status: "pending",
-        notes: "Pending customer approval for warranty terms",
-        serviceRequest: null
-    },
-    {
-        id: 3,
-        customerId: 103,
-        customerName: "Michael Brown",
-        customerEmail: "m.brown@email.com",
-        customerPhone: "(555) 345-6789",
-        serviceName: "Roof Repair",
-        serviceType: "Roofing",
-        workOrderId: "WO-2023-087",
-        startDate: "2023-09-10",
-        endDate: "2025-09-10",
-        coverage: "5-year warranty on materials and workmanship",
-        status: "active",
-        notes: "Comprehensive roof repair with extended warranty",
-        serviceRequest: null
-    },
-    {
-        id: 4,
-        customerId: 104,
-        customerName: "Emily Davis",
-        customerEmail: "emily.davis@email.com",
-        customerPhone: "(555) 456-7890",
-        serviceName: "Plumbing System Upgrade",
-        serviceType: "Plumbing",
-        workOrderId: "WO-2024-032",
-        startDate: "2024-11-05",
-        endDate: "2026-11-05",
-        coverage: "All pipes, fixtures, and installation labor",
-        status: "active",
-        notes: "Complete bathroom plumbing replacement",
-        serviceRequest: {
-            issueType: "Maintenance",
-            urgency: "Low",
-            description: "Routine inspection needed before warranty expires. Want to ensure everything is working properly.",
-            requestDate: "2025-10-12"
-        }
-    },
-    {
-        id: 5,
-        customerId: 105,
-        customerName: "Robert Wilson",
-        customerEmail: "r.wilson@email.com",
-        customerPhone: "(555) 567-8901",
-        serviceName: "Electrical Panel Upgrade",
-        serviceType: "Electrical",
-        workOrderId: "WO-2023-045",
-        startDate: "2023-05-15",
-        endDate: "2025-05-15",
-        coverage: "Panel, wiring, and installation",
-        status: "expired",
-        notes: "Warranty period has ended",
-        serviceRequest: null
-    },
-    {
-        id: 6,
-        customerId: 106,
-        customerName: "Jennifer Martinez",
-        customerEmail: "jen.martinez@email.com",
-        customerPhone: "(555) 678-9012",
-        serviceName: "Water Heater Installation",
-        serviceType: "Plumbing",
-        workOrderId: "WO-2024-078",
-        startDate: "2025-08-22",
-        endDate: "2027-08-22",
-        coverage: "Complete unit and installation warranty",
-        status: "pending",
-        notes: "Customer requesting warranty activation",
-        serviceRequest: null
-    },
-    {
-        id: 7,
-        customerId: 107,
-        customerName: "David Anderson",
-        customerEmail: "d.anderson@email.com",
-        customerPhone: "(555) 789-0123",
-        serviceName: "Deck Construction",
-        serviceType: "Carpentry",
-        workOrderId: "WO-2024-055",
-        startDate: "2024-07-10",
-        endDate: "2027-07-10",
-        coverage: "3-year structural warranty",
-        status: "active",
-        notes: "Outdoor deck with weather-resistant materials",
-        serviceRequest: {
-            issueType: "Repair",
-            urgency: "Medium",
-            description: "Some boards are starting to warp. Need inspection and possible replacement under warranty.",
-            requestDate: "2025-10-14"
-        }
-    }
-];
+// Warranties loaded from /api/admin/warranties (maintained warranty summary)
+let warranties = [];
 
 let currentFilter = 'all';
 let currentWarrantyId = null;
 
 // Load warranties on page load
 document.addEventListener('DOMContentLoaded', function() {
-    displayWarranties('all');
+    loadWarranties('all');
 });
 
+// Fetch warranties for a status filter from the server
+async function loadWarranties(filter) {
+    const params = new URLSearchParams({ status: filter, limit: 200 });
+    try {
+        const response = await fetch(`/api/admin/warranties?${params}`);
+        const data = await response.json();
+        if (!response.ok || !data.success) {
+            throw new Error(data.error || 'Failed to load warranties');
+        }
+        warranties = data.warranties;
+    } catch (error) {
+        console.error('Error loading warranties:', error);
+        warranties = [];
+        showNotification('Could not load warranties.', 'error');
+    }
+    displayWarranties(filter);
+}
+
 // Filter warranties by status
 function filterWarranties(status) {
     currentFilter = status;
@@ -147,7 +37,7 @@ function filterWarranties(status) {
     });
     event.target.classList.add('active');
     
-    displayWarranties(status);
+    loadWarranties(status);
 }
 
 // Display warranties based on filter
@@ -174,20 +64,20 @@ function displayWarranties(filter) {
         const hasRequest = warranty.serviceRequest !== null;
         
         return `
-            <div class="warranty-card ${warranty.status}">
-                <span class="warranty-status ${warranty.status}">${warranty.status}</span>
+            <div class="warranty-card ${escapeHtml(warranty.status)}">
+                <span class="warranty-status ${escapeHtml(warranty.status)}">${escapeHtml(warranty.status)}</span>
                 ${hasRequest ? '<span class="warranty-request-badge">Service Request</span>' : ''}
-                <h3>${warranty.customerName}</h3>
-                <div class="warranty-service-type">${warranty.serviceType}</div>
+                <h3>${escapeHtml(warranty.customerName)}</h3>
+                <div class="warranty-service-type">${escapeHtml(warranty.serviceType)}</div>
                 
                 <div class="warranty-info">
                     <div class="warranty-info-item">
                         <span class="warranty-info-label">Service:</span>
-                        <span class="warranty-info-value">${warranty.serviceName}</span>
+                        <span class="warranty-info-value">${escapeHtml(warranty.serviceName)}</span>
                     </div>
                     <div class="warranty-info-item">
                         <span class="warranty-info-label">Work Order:</span>
-                        <span class="warranty-info-value">${warranty.workOrderId}</span>
+                        <span class="warranty-info-value">${escapeHtml(warranty.workOrderId)}</span>
                     </div>
                     <div class="warranty-info-item">
                         <span class="warranty-info-label">Start Date:</span>
@@ -199,11 +89,11 @@ function displayWarranties(filter) {
                     </div>
                     <div class="warranty-info-item">
                         <span class="warranty-info-label">Email:</span>
-                        <span class="warranty-info-value">${warranty.customerEmail}</span>
+                        <span class="warranty-info-value">${escapeHtml(warranty.customerEmail)}</span>
                     </div>
                     <div class="warranty-info-item">
                         <span class="warranty-info-label">Phone:</span>
-                        <span class="warranty-info-value">${warranty.customerPhone}</span>
+                        <span class="warranty-info-value">${escapeHtml(warranty.customerPhone)}</span>
                     </div>
                 </div>
                 
@@ -228,15 +118,15 @@ function viewWarrantyDetails(id) {
             <h3>Customer Information</h3>
             <div class="detail-row">
                 <div class="detail-label">Name:</div>
-                <div class="detail-value">${warranty.customerName}</div>
+                <div class="detail-value">${escapeHtml(warranty.customerName)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Email:</div>
-                <div class="detail-value">${warranty.customerEmail}</div>
+                <div class="detail-value">${escapeHtml(warranty.customerEmail)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Phone:</div>
-                <div class="detail-value">${warranty.customerPhone}</div>
+                <div class="detail-value">${escapeHtml(warranty.customerPhone)}</div>
             </div>
         </div>
         
@@ -244,19 +134,19 @@ function viewWarrantyDetails(id) {
             <h3>Warranty Information</h3>
             <div class="detail-row">
                 <div class="detail-label">Status:</div>
-                <div class="detail-value highlight">${warranty.status.toUpperCase()}</div>
+                <div class="detail-value highlight">${escapeHtml(warranty.status.toUpperCase())}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Service Name:</div>
-                <div class="detail-value">${warranty.serviceName}</div>
+                <div class="detail-value">${escapeHtml(warranty.serviceName)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Service Type:</div>
-                <div class="detail-value">${warranty.serviceType}</div>
+                <div class="detail-value">${escapeHtml(warranty.serviceType)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Work Order ID:</div>
-                <div class="detail-value">${warranty.workOrderId}</div>
+                <div class="detail-value">${escapeHtml(warranty.workOrderId)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Start Date:</div>
@@ -272,11 +162,11 @@ function viewWarrantyDetails(id) {
             <h3>Coverage Details</h3>
             <div class="detail-row">
                 <div class="detail-label">Coverage:</div>
-                <div class="detail-value">${warranty.coverage}</div>
+                <div class="detail-value">${escapeHtml(warranty.coverage)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Notes:</div>
-                <div class="detail-value">${warranty.notes}</div>
+                <div class="detail-value">${escapeHtml(warranty.notes)}</div>
             </div>
         </div>
     `;
@@ -311,15 +201,15 @@ function viewServiceRequest(id) {
             <h3>Customer Information</h3>
             <div class="detail-row">
                 <div class="detail-label">Name:</div>
-                <div class="detail-value">${warranty.customerName}</div>
+                <div class="detail-value">${escapeHtml(warranty.customerName)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Email:</div>
-                <div class="detail-value">${warranty.customerEmail}</div>
+                <div class="detail-value">${escapeHtml(warranty.customerEmail)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Phone:</div>
-                <div class="detail-value">${warranty.customerPhone}</div>
+                <div class="detail-value">${escapeHtml(warranty.customerPhone)}</div>
             </div>
         </div>
         
@@ -327,15 +217,15 @@ function viewServiceRequest(id) {
             <h3>Warranty Details</h3>
             <div class="detail-row">
                 <div class="detail-label">Service:</div>
-                <div class="detail-value">${warranty.serviceName}</div>
+                <div class="detail-value">${escapeHtml(warranty.serviceName)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Work Order:</div>
-                <div class="detail-value">${warranty.workOrderId}</div>
+                <div class="detail-value">${escapeHtml(warranty.workOrderId)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Coverage:</div>
-                <div class="detail-value">${warranty.coverage}</div>
+                <div class="detail-value">${escapeHtml(warranty.coverage)}</div>
             </div>
         </div>
         
@@ -347,17 +237,17 @@ function viewServiceRequest(id) {
             </div>
             <div class="detail-row">
                 <div class="detail-label">Issue Type:</div>
-                <div class="detail-value">${request.issueType}</div>
+                <div class="detail-value">${escapeHtml(request.issueType)}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Urgency:</div>
                 <div class="detail-value">
-                    <span class="urgency-badge ${request.urgency.toLowerCase()}">${request.urgency}</span>
+                    <span class="urgency-badge ${escapeHtml((request.urgency || '').toLowerCase())}">${escapeHtml(request.urgency || 'N/A')}</span>
                 </div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Description:</div>
-                <div class="detail-value">${request.description}</div>
+                <div class="detail-value">${escapeHtml(request.description)}</div>
             </div>
         </div>
     `;
@@ -371,7 +261,7 @@ function acceptWarranty() {
     const warranty = warranties.find(w => w.id === currentWarrantyId);
     if (!warranty) return;
     
-    if (confirm(`Accept warranty for ${warranty.customerName}?`)) {
+    if (confirm(`Accept warranty for ${escapeHtml(warranty.customerName)}?`)) {
         warranty.status = 'active';
         warranty.notes = 'Warranty activated by admin';
         
@@ -450,6 +340,7 @@ window.onclick = function(event) {
 
 // Format date helper
 function formatDate(dateString) {
+    if (!dateString) return 'N/A';
     const date = new Date(dateString);
     return date.toLocaleDateString('en-US', { 
         year: 'numeric', 
@@ -458,6 +349,17 @@ function formatDate(dateString) {
     });
 }
 
+// Escape text from the server (customer-entered fields) before putting it in HTML
+function escapeHtml(value) {
+    if (value === null || value === undefined) return '';
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
 // Show notification
 function showNotification(message, type = 'success') {
     const notification = document.createElement('div');
@@ -2,6 +2,7 @@
 const monthYear = document.getElementById('monthYear');
 const calendarBody = document.getElementById('calendarBody');
 let currentDate = new Date();
+let lastBookableDate = null; // Set from the bootstrap payload's booking window
 
 function generateCalendar(date) {
   calendarBody.innerHTML = '';
@@ -30,8 +31,8 @@ function generateCalendar(date) {
     const cellDate = new Date(year, month, d);
     cellDate.setHours(0, 0, 0, 0);
     
-    // Check if date is in the past
-    if (cellDate < today) {
+    // Check if date is in the past or beyond the booking window
+    if (cellDate < today || (lastBookableDate && cellDate > lastBookableDate)) {
       cell.classList.add('past-date');
       cell.style.cursor = 'not-allowed';
       cell.style.opacity = '0.4';
@@ -176,6 +177,20 @@ let serviceTypes = [];
 let allServices = [];
 let servicesByType = {}; // Cached services organized by type
 
+// Read the bootstrap payload inlined by the server, or fetch it in one request
+async function loadBootstrap() {
+  const inline = document.getElementById('appointmentBootstrap');
+  if (inline) {
+    return JSON.parse(inline.textContent);
+  }
+  const response = await fetch('/api/appointment/bootstrap');
+  const result = await response.json();
+  if (!result.success) {
+    throw new Error(result.error || 'Failed to load service data');
+  }
+  return result.data;
+}
+
 // Preload all data once when page loads
 async function preloadAllData() {
   try {
@@ -187,42 +202,30 @@ async function preloadAllData() {
     jobSelect.disabled = true;
     serviceSelect.innerHTML = '<option value="">Loading...</option>';
 
-    // Fetch both service types and all services in parallel - ONLY ONCE!
-    const [typesResponse, servicesResponse] = await Promise.all([
-      fetch('/api/service-types'),
-      fetch('/api/services')
-    ]);
-
-    const typesResult = await typesResponse.json();
-    const servicesResult = await servicesResponse.json();
-
-    if (typesResult.success && servicesResult.success) {
-      serviceTypes = typesResult.data;
-      allServices = servicesResult.data;
-
-      // Organize services by type in memory for INSTANT lookup
-      servicesByType = {};
-      allServices.forEach(service => {
-        const typeName = service.category;
-        if (!servicesByType[typeName]) {
-          servicesByType[typeName] = [];
-        }
-        servicesByType[typeName].push(service);
-      });
-
-      // Populate service type dropdown
-      serviceSelect.innerHTML = '<option value="">--Select Service Type--</option>';
-      serviceTypes.forEach(type => {
-        const option = document.createElement('option');
-        option.value = type.service_type_name;
-        option.textContent = type.service_type_name;
-        serviceSelect.appendChild(option);
-      });
-
-      serviceSelect.disabled = false;
-    } else {
-      throw new Error('Failed to load service data');
+    // Service types, services by category and booking window - ONLY ONCE!
+    const bootstrap = await loadBootstrap();
+
+    serviceTypes = bootstrap.serviceTypes;
+    servicesByType = bootstrap.servicesByCategory;
+    allServices = Object.values(servicesByType).flat();
+
+    // Limit the calendar to the bookable range
+    if (bootstrap.booking && bootstrap.booking.lastDate) {
+      const [y, m, d] = bootstrap.booking.lastDate.split('-').map(Number);
+      lastBookableDate = new Date(y, m - 1, d);
+      generateCalendar(currentDate);
     }
+
+    // Populate service type dropdown
+    serviceSelect.innerHTML = '<option value="">--Select Service Type--</option>';
+    serviceTypes.forEach(type => {
+      const option = document.createElement('option');
+      option.value = type.service_type_name;
+      option.textContent = type.service_type_name;
+      serviceSelect.appendChild(option);
+    });
+
+    serviceSelect.disabled = false;
   } catch (error) {
     console.error('Error preloading data:', error);
     const serviceSelect = document.getElementById('service');
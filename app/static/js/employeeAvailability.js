@@ -177,83 +177,31 @@ function setupFormSubmission() {
       // Build availability data
       const formData = {
         employeeId: currentEmployee.id,
-        employeeName: `${currentEmployee.firstName} ${currentEmployee.lastName}`,
-        employeeRole: currentEmployee.role,
         selectedDates: selectedDates,
-        startDate: selectedDates[0],
-        endDate: selectedDates[selectedDates.length - 1],
         startTime: availableStartTime,
         endTime: availableEndTime,
-        notes: notes || '',
-        status: 'available',
-        submittedDate: new Date().toISOString()
+        notes: notes || ''
       };
       
-      console.log('Availability Submitted:', formData);
-      
-      // Save availability data to localStorage
-      saveAvailabilityToStorage(formData);
-      
-      // TODO: Send to backend API in production
-      // fetch('/api/employee-availability', {
-      //     method: 'POST',
-      //     headers: { 'Content-Type': 'application/json' },
-      //     body: JSON.stringify(formData)
-      // })
-      // .then(response => response.json())
-      // .then(data => {
-      //     alert('Success! Your availability has been submitted and will appear on the admin timesheet.');
-      //     window.location.href = 'employeeView.html';
-      // })
-      // .catch(error => {
-      //     alert('Failed to submit availability. Please try again.');
-      // });
-      
-      // Success notification
-      alert(`Success! Your availability has been submitted.\n\n${selectedDates.length} date(s) selected\nTime: ${availableStartTime} - ${availableEndTime}\n\nYour availability will now appear on the admin timesheet.`);
-      
-      // Redirect to dashboard
-      window.location.href = 'employeeView.html';
+      fetch('/api/employee-availability', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(formData)
+      })
+      .then(response => response.json().then(data => ({ ok: response.ok, data })))
+      .then(({ ok, data }) => {
+        if (!ok || !data.success) {
+          throw new Error(data.error || 'Request failed');
+        }
+        alert(`Success! Your availability has been submitted.\n\n${selectedDates.length} date(s) selected\nTime: ${availableStartTime} - ${availableEndTime}\n\nYour availability will now appear on the admin timesheet.`);
+        
+        // Redirect to dashboard
+        window.location.href = '/employee/view';
+      })
+      .catch(error => {
+        console.error('Error submitting availability:', error);
+        alert(`Failed to submit availability: ${error.message}`);
+      });
     });
   }
 }
-
-// Save availability to localStorage for admin timesheet
-function saveAvailabilityToStorage(availabilityData) {
-  // Get existing availability records from localStorage
-  let availabilityRecords = JSON.parse(localStorage.getItem('employeeAvailability')) || [];
-  
-  // Create individual records for each selected date
-  availabilityData.selectedDates.forEach(date => {
-    // Check if this employee already has availability for this date
-    const existingIndex = availabilityRecords.findIndex(
-      record => record.employeeId === availabilityData.employeeId && record.date === date
-    );
-    
-    const record = {
-      id: existingIndex >= 0 ? availabilityRecords[existingIndex].id : Date.now() + Math.random(),
-      employeeId: availabilityData.employeeId,
-      employeeName: availabilityData.employeeName,
-      employeeRole: availabilityData.employeeRole,
-      date: date,
-      startTime: availabilityData.startTime,
-      endTime: availabilityData.endTime,
-      notes: availabilityData.notes,
-      status: 'available',
-      submittedDate: availabilityData.submittedDate
-    };
-    
-    if (existingIndex >= 0) {
-      // Update existing record
-      availabilityRecords[existingIndex] = record;
-    } else {
-      // Add new record
-      availabilityRecords.push(record);
-    }
-  });
-  
-  // Save back to localStorage
-  localStorage.setItem('employeeAvailability', JSON.stringify(availabilityRecords));
-  
-  console.log('Saved to localStorage:', availabilityRecords);
-}
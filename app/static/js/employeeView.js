@@ -7,122 +7,180 @@ const currentEmployee = {
     email: "m.thompson@vargas.com"
 };
 
-// Sample jobs assigned to this employee
-let employeeJobs = [
-    {
-        id: 1,
-        workOrderId: "WO-2025-101",
-        title: "HVAC Repair",
-        customer: "John Smith",
-        customerPhone: "(555) 123-4567",
-        customerEmail: "john.smith@email.com",
-        address: "123 Oak Street, Springfield, IL",
-        date: "2025-10-17",
-        startTime: "09:00",
-        endTime: "12:00",
-        status: "pending",
-        description: "AC unit not cooling properly. Customer reports strange noises.",
-        estimatedCost: 450.00,
-        notes: ""
-    },
-    {
-        id: 2,
-        workOrderId: "WO-2025-102",
-        title: "Plumbing Installation",
-        customer: "Sarah Johnson",
-        customerPhone: "(555) 234-5678",
-        customerEmail: "sarah.j@email.com",
-        address: "456 Pine Avenue, Springfield, IL",
-        date: "2025-10-18",
-        startTime: "13:00",
-        endTime: "17:00",
-        status: "in-progress",
-        description: "Install new kitchen faucet and garbage disposal.",
-        estimatedCost: 650.00,
-        notes: "Started installation. Faucet installed, working on disposal."
-    },
-    {
-        id: 3,
-        workOrderId: "WO-2025-103",
-        title: "Electrical Inspection",
-        customer: "Michael Brown",
-        customerPhone: "(555) 345-6789",
-        customerEmail: "m.brown@email.com",
-        address: "789 Maple Drive, Springfield, IL",
-        date: "2025-10-19",
-        startTime: "10:00",
-        endTime: "11:30",
-        status: "pending",
-        description: "Annual electrical system inspection for home warranty.",
-        estimatedCost: 200.00,
-        notes: ""
-    },
-    {
-        id: 4,
-        workOrderId: "WO-2025-104",
-        title: "Water Heater Maintenance",
-        customer: "Emily Davis",
-        customerPhone: "(555) 456-7890",
-        customerEmail: "emily.davis@email.com",
-        address: "321 Elm Street, Springfield, IL",
-        date: "2025-10-20",
-        startTime: "08:00",
-        endTime: "10:00",
-        status: "pending",
-        description: "Routine water heater maintenance and inspection.",
-        estimatedCost: 150.00,
-        notes: ""
-    },
-    {
-        id: 5,
-        workOrderId: "WO-2025-105",
-        title: "HVAC System Upgrade",
-        customer: "Robert Wilson",
-        customerPhone: "(555) 567-8901",
-        customerEmail: "r.wilson@email.com",
-        address: "654 Cedar Lane, Springfield, IL",
-        date: "2025-10-15",
-        startTime: "09:00",
-        endTime: "16:00",
-        status: "completed",
-        description: "Complete HVAC system upgrade with new thermostat.",
-        estimatedCost: 3500.00,
-        notes: "Completed installation. System tested and running perfectly. Customer satisfied."
-    },
-    {
-        id: 6,
-        workOrderId: "WO-2025-106",
-        title: "Emergency Plumbing Repair",
-        customer: "Jennifer Martinez",
-        customerPhone: "(555) 678-9012",
-        customerEmail: "jen.martinez@email.com",
-        address: "987 Birch Road, Springfield, IL",
-        date: "2025-10-14",
-        startTime: "14:00",
-        endTime: "16:00",
-        status: "completed",
-        description: "Emergency call - burst pipe in basement.",
-        estimatedCost: 850.00,
-        notes: "Fixed burst pipe. Replaced damaged section. Tested for leaks. All clear."
-    }
-];
+// Jobs assigned to this employee, kept in sync with /api/employee/jobs
+let employeeJobs = [];
+let jobsSyncToken = null;
+let jobsSyncInFlight = null;
+let jobsSyncQueued = false;
 
 let calendar;
 let currentJobId = null;
 
+// Jobs and the sync token are cached so a page refresh only downloads changes
+const JOBS_CACHE_KEY = `employeeJobs:${currentEmployee.id}`;
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
     // Set employee name and role
     document.getElementById('employeeName').textContent = `${currentEmployee.firstName} ${currentEmployee.lastName}`;
     document.getElementById('employeeRole').textContent = currentEmployee.role;
     
+    // Show cached jobs right away, then fetch what changed since
+    loadCachedJobs();
+    
     // Update stats
     updateStats();
     
     // Initialize calendar
     initializeCalendar();
+    
+    syncJobs();
+    connectJobEvents();
+    
+    // Catch up when the technician comes back to the page
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'visible') {
+            syncJobs();
+        }
+    });
 });
 
+// Restore jobs and sync token from the last visit
+function loadCachedJobs() {
+    try {
+        const cached = JSON.parse(localStorage.getItem(JOBS_CACHE_KEY));
+        if (cached && Array.isArray(cached.jobs)) {
+            employeeJobs = cached.jobs;
+            jobsSyncToken = cached.token || null;
+        }
+    } catch (error) {
+        localStorage.removeItem(JOBS_CACHE_KEY);
+    }
+}
+
+function saveCachedJobs() {
+    try {
+        localStorage.setItem(JOBS_CACHE_KEY, JSON.stringify({ token: jobsSyncToken, jobs: employeeJobs }));
+    } catch (error) {
+        console.warn('Could not cache jobs:', error);
+    }
+}
+
+// Download jobs changed since the last sync (everything on the first visit)
+function syncJobs() {
+    if (jobsSyncInFlight) {
+        // Something changed mid-sync; fetch again once this sync finishes
+        jobsSyncQueued = true;
+        return jobsSyncInFlight;
+    }
+    
+    const params = new URLSearchParams({ employeeId: currentEmployee.id });
+    if (jobsSyncToken) {
+        params.set('since', jobsSyncToken);
+    }
+    
+    jobsSyncInFlight = fetch(`/api/employee/jobs?${params}`)
+        .then(response => response.json().then(data => ({ ok: response.ok, data })))
+        .then(({ ok, data }) => {
+            if (!ok || !data.success) {
+                throw new Error(data.error || 'Request failed');
+            }
+            
+            if (data.full) {
+                employeeJobs = data.jobs;
+            } else {
+                const removed = new Set(data.removed);
+                employeeJobs = employeeJobs.filter(job => !removed.has(job.id));
+                data.jobs.forEach(mergeJob);
+            }
+            jobsSyncToken = data.token;
+            saveCachedJobs();
+            
+            if (data.full || data.jobs.length > 0 || data.removed.length > 0) {
+                refreshJobViews();
+            }
+        })
+        .catch(error => {
+            console.error('Error syncing jobs:', error);
+            if (employeeJobs.length === 0) {
+                showNotification('Could not load your jobs. Please try again.', 'error');
+            }
+        })
+        .finally(() => {
+            jobsSyncInFlight = null;
+            if (jobsSyncQueued) {
+                jobsSyncQueued = false;
+                syncJobs();
+            }
+        });
+    
+    return jobsSyncInFlight;
+}
+
+// Live updates: the server pushes a note whenever one of this technician's jobs changes
+const JOB_EVENTS = ['assignment.created', 'assignment.reassigned', 'assignment.status',
+                    'assignment.updated', 'assignment.removed', 'resync'];
+
+function connectJobEvents() {
+    if (!window.EventSource) return;
+    
+    const source = new EventSource(`/api/events?employeeId=${currentEmployee.id}`);
+    let connectedBefore = false;
+    
+    // Catch up on anything missed while the stream was down
+    source.addEventListener('open', () => {
+        if (connectedBefore) {
+            syncJobs();
+        }
+        connectedBefore = true;
+    });
+    
+    JOB_EVENTS.forEach(type => source.addEventListener(type, event => {
+        const data = event.data ? JSON.parse(event.data) : {};
+        const assignedToMe = type === 'assignment.created' ||
+            (type === 'assignment.reassigned' && data.employeeId === currentEmployee.id);
+        
+        syncJobs().then(() => {
+            if (assignedToMe) {
+                showNotification('A new job has been assigned to you!');
+            }
+        });
+    }));
+}
+
+// Add a job or replace the copy with the same id
+function mergeJob(job) {
+    const index = employeeJobs.findIndex(j => j.id === job.id);
+    if (index > -1) {
+        employeeJobs[index] = job;
+    } else {
+        employeeJobs.push(job);
+    }
+}
+
+function refreshJobViews() {
+    updateStats();
+    if (calendar) {
+        calendar.refetchEvents();
+    }
+}
+
+// Send a job change and apply the updated job the server returns
+function sendJobUpdate(jobId, action, method, body) {
+    return fetch(`/api/employee/jobs/${jobId}/${action}`, {
+        method: method,
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ...body, employeeId: currentEmployee.id })
+    })
+    .then(response => response.json().then(data => ({ ok: response.ok, data })))
+    .then(({ ok, data }) => {
+        if (!ok || !data.success) {
+            throw new Error(data.error || 'Request failed');
+        }
+        return data.job;
+    });
+}
+
 // Update statistics cards
 function updateStats() {
     const pending = employeeJobs.filter(job => job.status === 'pending').length;
@@ -135,6 +193,7 @@ function updateStats() {
     const weekEnd = new Date(now.setDate(now.getDate() - now.getDay() + 6));
     
     const hoursThisWeek = employeeJobs.filter(job => {
+        if (!job.date) return false;
         const jobDate = new Date(job.date);
         return jobDate >= weekStart && jobDate <= weekEnd;
     }).reduce((total, job) => {
@@ -154,20 +213,6 @@ function updateStats() {
 function initializeCalendar() {
     const calendarEl = document.getElementById('calendar');
     
-    // Convert jobs to calendar events
-    const events = employeeJobs.map(job => ({
-        id: job.id,
-        title: job.title,
-        start: `${job.date}T${job.startTime}`,
-        end: `${job.date}T${job.endTime}`,
-        extendedProps: {
-            workOrderId: job.workOrderId,
-            customer: job.customer,
-            status: job.status
-        },
-        className: job.status
-    }));
-    
     calendar = new FullCalendar.Calendar(calendarEl, {
         initialView: 'dayGridMonth',
         headerToolbar: {
@@ -175,7 +220,9 @@ function initializeCalendar() {
             center: 'title',
             right: 'dayGridMonth,timeGridWeek,timeGridDay'
         },
-        events: events,
+        events: function(fetchInfo, successCallback) {
+            successCallback(getCalendarEvents());
+        },
         eventClick: function(info) {
             const jobId = parseInt(info.event.id);
             openJobModal(jobId);
@@ -196,6 +243,22 @@ function initializeCalendar() {
     }
 }
 
+// Convert jobs to calendar events
+function getCalendarEvents() {
+    return employeeJobs.filter(job => job.date).map(job => ({
+        id: job.id,
+        title: job.title,
+        start: `${job.date}T${job.startTime}`,
+        end: `${job.date}T${job.endTime}`,
+        extendedProps: {
+            workOrderId: job.workOrderId,
+            customer: job.customer,
+            status: job.status
+        },
+        className: job.status
+    }));
+}
+
 // Open job details modal
 function openJobModal(jobId) {
     const job = employeeJobs.find(j => j.id === jobId);
@@ -208,7 +271,7 @@ function openJobModal(jobId) {
             <h3>Work Order Information</h3>
             <div class="detail-row">
                 <div class="detail-label">Work Order ID:</div>
-                <div class="detail-value highlight">${job.workOrderId}</div>
+                <div class="detail-value highlight">${job.workOrderId || 'Not issued'}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Status:</div>
@@ -222,15 +285,15 @@ function openJobModal(jobId) {
             </div>
             <div class="detail-row">
                 <div class="detail-label">Date:</div>
-                <div class="detail-value">${formatDate(job.date)}</div>
+                <div class="detail-value">${job.date ? formatDate(job.date) : 'Not scheduled'}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Time:</div>
-                <div class="detail-value">${formatTime(job.startTime)} - ${formatTime(job.endTime)}</div>
+                <div class="detail-value">${job.startTime ? `${formatTime(job.startTime)} - ${formatTime(job.endTime)}` : 'N/A'}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Estimated Cost:</div>
-                <div class="detail-value">$${job.estimatedCost.toFixed(2)}</div>
+                <div class="detail-value">${job.estimatedCost != null ? `$${job.estimatedCost.toFixed(2)}` : 'N/A'}</div>
             </div>
         </div>
         
@@ -238,26 +301,26 @@ function openJobModal(jobId) {
             <h3>Customer Information</h3>
             <div class="detail-row">
                 <div class="detail-label">Name:</div>
-                <div class="detail-value">${job.customer}</div>
+                <div class="detail-value">${job.customer || 'N/A'}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Phone:</div>
-                <div class="detail-value">${job.customerPhone}</div>
+                <div class="detail-value">${job.customerPhone || 'N/A'}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Email:</div>
-                <div class="detail-value">${job.customerEmail}</div>
+                <div class="detail-value">${job.customerEmail || 'N/A'}</div>
             </div>
             <div class="detail-row">
                 <div class="detail-label">Address:</div>
-                <div class="detail-value">${job.address}</div>
+                <div class="detail-value">${job.address || 'N/A'}</div>
             </div>
         </div>
         
         <div class="detail-section">
             <h3>Job Description</h3>
             <div class="detail-row">
-                <div class="detail-value">${job.description}</div>
+                <div class="detail-value">${job.description || 'No description provided.'}</div>
             </div>
         </div>
         
@@ -344,29 +407,27 @@ function updateJobStatus(newStatus) {
     const statusText = newStatus.replace('-', ' ');
     
     if (confirm(`Update job status to "${statusText}"?`)) {
-        job.status = newStatus;
-        
-        // Update calendar event color immediately
-        const event = calendar.getEventById(currentJobId);
-        if (event) {
-            // Remove old status class and add new one
-            event.setProp('classNames', [newStatus]);
-        }
-        
-        // Update stats
-        updateStats();
-        
-        // Update modal display
-        openJobModal(currentJobId);
-        
-        showNotification(`Job status updated to ${statusText}!`, 'success');
+        const jobId = currentJobId;
         
-        // TODO: Send status update to backend
-        // fetch(`/api/employee/jobs/${currentJobId}/status`, {
-        //     method: 'PUT',
-        //     headers: { 'Content-Type': 'application/json' },
-        //     body: JSON.stringify({ status: newStatus, employeeId: currentEmployee.id })
-        // });
+        sendJobUpdate(jobId, 'status', 'PUT', { status: newStatus })
+            .then(updated => {
+                mergeJob(updated);
+                saveCachedJobs();
+                
+                // Update calendar event color and stats
+                refreshJobViews();
+                
+                // Update modal display
+                if (currentJobId === jobId) {
+                    openJobModal(jobId);
+                }
+                
+                showNotification(`Job status updated to ${statusText}!`, 'success');
+            })
+            .catch(error => {
+                console.error('Error updating job status:', error);
+                showNotification(`Failed to update job status: ${error.message}`, 'error');
+            });
     }
 }
 
@@ -378,16 +439,17 @@ function saveWorkNotes() {
     if (!job) return;
     
     const notes = document.getElementById('workNotes').value;
-    job.notes = notes;
-    
-    showNotification('Work notes saved successfully!', 'success');
     
-    // TODO: Send notes to backend
-    // fetch(`/api/employee/jobs/${currentJobId}/notes`, {
-    //     method: 'PUT',
-    //     headers: { 'Content-Type': 'application/json' },
-    //     body: JSON.stringify({ notes: notes, employeeId: currentEmployee.id })
-    // });
+    sendJobUpdate(job.id, 'notes', 'PUT', { notes: notes })
+        .then(updated => {
+            mergeJob(updated);
+            saveCachedJobs();
+            showNotification('Work notes saved successfully!', 'success');
+        })
+        .catch(error => {
+            console.error('Error saving work notes:', error);
+            showNotification(`Failed to save work notes: ${error.message}`, 'error');
+        });
 }
 
 // Close modal
@@ -435,39 +497,23 @@ document.getElementById('cancelForm').addEventListener('submit', function(e) {
         return;
     }
     
-    // Update job status to cancelled
-    job.status = 'cancelled';
-    job.cancellationReason = reason;
-    job.cancellationDescription = description;
-    job.cancelledBy = `${currentEmployee.firstName} ${currentEmployee.lastName}`;
-    job.cancelledDate = new Date().toISOString();
-    
-    // Remove event from calendar
-    const event = calendar.getEventById(currentJobId);
-    if (event) {
-        event.remove();
-    }
-    
-    // Update stats
-    updateStats();
-    
-    // Close both modals
-    closeCancelModal();
-    closeJobModal();
-    
-    showNotification(`Job ${job.workOrderId} has been cancelled`, 'success');
-    
-    // TODO: Send cancellation to backend
-    // fetch(`/api/employee/jobs/${currentJobId}/cancel`, {
-    //     method: 'POST',
-    //     headers: { 'Content-Type': 'application/json' },
-    //     body: JSON.stringify({
-    //         reason: reason,
-    //         description: description,
-    //         employeeId: currentEmployee.id,
-    //         cancelledBy: job.cancelledBy
-    //     })
-    // });
+    sendJobUpdate(job.id, 'cancel', 'POST', { reason: reason, description: description })
+        .then(() => {
+            // Cancelled jobs leave the schedule
+            employeeJobs = employeeJobs.filter(j => j.id !== job.id);
+            saveCachedJobs();
+            refreshJobViews();
+            
+            // Close both modals
+            closeCancelModal();
+            closeJobModal();
+            
+            showNotification(`Job ${job.workOrderId || job.title} has been cancelled`, 'success');
+        })
+        .catch(error => {
+            console.error('Error cancelling job:', error);
+            showNotification(`Failed to cancel job: ${error.message}`, 'error');
+        });
 });
 
 // Close modal when clicking outside
@@ -832,7 +878,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     selectedDates: selectedDates,
                     startDate: selectedDates[0],
                     endDate: selectedDates[selectedDates.length - 1],
-                    fullDay: true,
+                    fullDay: false,
                     startTime: availableStartTime,
                     endTime: availableEndTime,
                     reason: notes || 'Updating available work hours for selected dates',
@@ -841,27 +887,25 @@ document.addEventListener('DOMContentLoaded', () => {
                 };
             }
             
-            console.log('Availability Request Submitted:', formData);
-            
-            // TODO: Send to backend API
-            // fetch('/api/availability-requests', {
-            //     method: 'POST',
-            //     headers: { 'Content-Type': 'application/json' },
-            //     body: JSON.stringify(formData)
-            // })
-            // .then(response => response.json())
-            // .then(data => {
-            //     showNotification('Request submitted successfully! Admin will review your request.');
-            //     closeAvailabilityModal();
-            // })
-            // .catch(error => {
-            //     showNotification('Failed to submit request. Please try again.', 'error');
-            // });
-            
-            // Simulated success
             const requestTypeText = currentAvailabilityTab === 'time-off' ? 'time-off request' : 'availability update';
-            showNotification(`Your ${requestTypeText} has been submitted to admin for review!`);
-            closeAvailabilityModal();
+            
+            fetch('/api/availability-requests', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(formData)
+            })
+            .then(response => response.json().then(data => ({ ok: response.ok, data })))
+            .then(({ ok, data }) => {
+                if (!ok || !data.success) {
+                    throw new Error(data.error || 'Request failed');
+                }
+                showNotification(`Your ${requestTypeText} has been submitted to admin for review!`);
+                closeAvailabilityModal();
+            })
+            .catch(error => {
+                console.error('Error submitting availability request:', error);
+                showNotification('Failed to submit request. Please try again.', 'error');
+            });
         });
     }
 });
@@ -0,0 +1,8 @@
+"""
+Make the app's top-level packages (repositories, services, utils)
+importable the way the app imports them.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+"""
+Tests for TTLCache.get_or_set: values loaded inside a transaction are only
+cached once it commits, and never after an invalidation that happened
+while they were being read.
+"""
+from utils.cache import TTLCache
+
+
+def test_deferred_store_waits_for_commit():
+    cache = TTLCache('test_deferred_commit')
+    pending = []
+
+    value = cache.get_or_set('key', lambda: 'loaded', defer=pending.append)
+
+    assert value == 'loaded'
+    assert cache.get('key') is None
+    pending.pop()()
+    assert cache.get('key') == 'loaded'
+
+
+def test_invalidation_before_deferred_store_caches_nothing():
+    cache = TTLCache('test_deferred_invalidate')
+    pending = []
+
+    cache.get_or_set('key', lambda: 'stale', defer=pending.append)
+    # A writer commits a change to the same data before the reader commits
+    cache.invalidate('key')
+    pending.pop()()
+
+    assert cache.get('key') is None
+    assert cache.get_or_set('key', lambda: 'fresh') == 'fresh'
+    assert cache.get('key') == 'fresh'
+
+
+def test_clear_before_deferred_store_caches_nothing():
+    cache = TTLCache('test_deferred_clear')
+    pending = []
+
+    cache.get_or_set('a', lambda: 1, defer=pending.append)
+    cache.get_or_set('b', lambda: 2, defer=pending.append)
+    cache.clear()
+    for store in pending:
+        store()
+
+    assert cache.stats()['size'] == 0
+
+
+def test_rolled_back_store_is_never_run():
+    cache = TTLCache('test_deferred_rollback')
+    pending = []
+
+    cache.get_or_set('key', lambda: 'uncommitted', defer=pending.append)
+    pending.clear()  # the transaction rolled back and dropped its callbacks
+
+    assert cache.get('key') is None
+
+
+def test_invalidation_during_load_skips_store():
+    cache = TTLCache('test_load_invalidate')
+
+    def loader():
+        cache.invalidate('key')
+        return 'stale'
+
+    assert cache.get_or_set('key', loader) == 'stale'
+    assert cache.get('key') is None
+
+
+def test_ttl_callable_gets_loaded_value():
+    cache = TTLCache('test_ttl_callable', ttl=300)
+
+    cache.get_or_set('empty', lambda: [], ttl=lambda found: None if found else 0)
+    cache.get_or_set('found', lambda: [1], ttl=lambda found: None if found else 0)
+
+    assert cache.get('empty') is None
+    assert cache.get('found') == [1]
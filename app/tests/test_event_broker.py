@@ -0,0 +1,94 @@
+"""
+Tests for the in-process event broker: topic routing, queue overflow,
+the subscriber cap and closing subscriptions.
+"""
+import threading
+
+from utils.event_broker import EventBroker
+
+RESYNC = {'type': 'resync'}
+
+
+def test_publish_routes_by_topic():
+    broker = EventBroker()
+    admin = broker.subscribe(['admin'])
+    tech_3 = broker.subscribe(['technician:3'])
+    tech_4 = broker.subscribe(['technician:4'])
+
+    assert broker.publish(['admin', 'technician:3'], 'assigned') == 2
+
+    assert admin.get(timeout=0) == ['assigned']
+    assert tech_3.get(timeout=0) == ['assigned']
+    assert tech_4.get(timeout=0) == []
+
+
+def test_publish_delivers_once_per_subscriber():
+    broker = EventBroker()
+    both = broker.subscribe(['admin', 'technician:3'])
+
+    assert broker.publish(['admin', 'technician:3'], 'assigned') == 1
+    assert both.get(timeout=0) == ['assigned']
+
+
+def test_publish_all_reaches_every_subscriber():
+    broker = EventBroker()
+    admin = broker.subscribe(['admin'])
+    tech = broker.subscribe(['technician:3'])
+
+    assert broker.publish_all('reload') == 2
+    assert admin.get(timeout=0) == ['reload']
+    assert tech.get(timeout=0) == ['reload']
+
+
+def test_overflow_collapses_queue_to_one_resync_event():
+    broker = EventBroker(queue_size=3, overflow_event=RESYNC)
+    subscription = broker.subscribe(['admin'])
+
+    for n in range(3):
+        broker.publish(['admin'], n)
+    broker.publish(['admin'], 3)
+
+    assert subscription.get(timeout=0) == [RESYNC]
+    assert broker.stats()['overflows'] == 1
+
+    broker.publish(['admin'], 4)
+    assert subscription.get(timeout=0) == [4]
+
+
+def test_subscribe_rejected_at_max_subscribers():
+    broker = EventBroker(max_subscribers=2)
+    first = broker.subscribe(['admin'])
+    assert broker.subscribe(['admin']) is not None
+
+    assert broker.subscribe(['admin']) is None
+    assert broker.stats()['rejected'] == 1
+
+    first.close()
+    assert broker.subscribe(['admin']) is not None
+
+
+def test_close_unsubscribes():
+    broker = EventBroker()
+    subscription = broker.subscribe(['technician:3'])
+
+    subscription.close()
+    subscription.close()
+
+    assert broker.publish(['technician:3'], 'assigned') == 0
+    stats = broker.stats()
+    assert stats['subscribers'] == 0
+    assert stats['topics'] == 0
+
+
+def test_close_wakes_blocked_get():
+    broker = EventBroker()
+    subscription = broker.subscribe(['admin'])
+    result = []
+    waiting = threading.Thread(target=lambda: result.append(subscription.get(timeout=10)))
+    waiting.start()
+
+    subscription.close()
+    waiting.join(timeout=2)
+
+    assert not waiting.is_alive()
+    assert result == [[]]
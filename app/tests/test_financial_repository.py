@@ -0,0 +1,70 @@
+"""
+Tests for FinancialRepository._decode_array, the parser for PostgreSQL's
+binary array format (array_send) behind the financial report.
+"""
+import struct
+
+import numpy as np
+
+from repositories.financial_repository import FinancialRepository
+
+# pg_type OIDs of the element types
+INT4_OID = 23
+FLOAT8_OID = 701
+
+
+def array_send(values, element_oid, element_format):
+    """Encode a one-dimensional, NULL-free array the way array_send does."""
+    size = struct.calcsize('>' + element_format)
+    data = struct.pack('>iiI', 1, 0, element_oid)
+    data += struct.pack('>ii', len(values), 1)
+    for value in values:
+        data += struct.pack('>i' + element_format, size, value)
+    return data
+
+
+def test_decode_int4_array():
+    data = array_send([0, 1, -7, 2 ** 31 - 1], INT4_OID, 'i')
+
+    values = FinancialRepository._decode_array(data, 'int4')
+
+    assert values.dtype == np.int64
+    assert values.tolist() == [0, 1, -7, 2 ** 31 - 1]
+
+
+def test_decode_float8_array():
+    data = array_send([0.0, 12.5, -3.25, 1e12], FLOAT8_OID, 'd')
+
+    values = FinancialRepository._decode_array(data, 'float8')
+
+    assert values.dtype == np.float64
+    assert values.tolist() == [0.0, 12.5, -3.25, 1e12]
+
+
+def test_decode_array_accepts_memoryview():
+    # psycopg2 returns bytea columns as memoryview
+    data = memoryview(array_send([4, 5], INT4_OID, 'i'))
+
+    assert FinancialRepository._decode_array(data, 'int4').tolist() == [4, 5]
+
+
+def test_decode_array_with_lower_bound_other_than_one():
+    data = struct.pack('>iiIii', 1, 0, INT4_OID, 2, 0) + struct.pack('>iiii', 4, 10, 4, 20)
+
+    assert FinancialRepository._decode_array(data, 'int4').tolist() == [10, 20]
+
+
+def test_decode_empty_array():
+    # An empty array is sent with no dimensions and no elements
+    data = struct.pack('>iiI', 0, 0, FLOAT8_OID)
+
+    values = FinancialRepository._decode_array(data, 'float8')
+
+    assert values.dtype == np.float64
+    assert values.size == 0
+
+
+def test_decode_single_element_array():
+    data = array_send([42], INT4_OID, 'i')
+
+    assert FinancialRepository._decode_array(data, 'int4').tolist() == [42]
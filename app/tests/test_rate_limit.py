@@ -0,0 +1,159 @@
+"""
+Tests for the token-bucket rate limiter: MemoryBucketBackend, RateLimiter
+and the rate_limited view decorator.
+"""
+import pytest
+from flask import Flask
+
+from utils import rate_limit
+from utils.rate_limit import MemoryBucketBackend, RateLimiter, rate_limited
+
+
+class FakeClock:
+    """Stands in for time.monotonic so refills don't depend on real time."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, 'monotonic', clock)
+    return clock
+
+
+def make_app(limiter, enabled=True):
+    app = Flask(__name__)
+    app.config['RATE_LIMIT_ENABLED'] = enabled
+
+    @app.get('/limited')
+    @rate_limited(limiter, key_func=lambda: 'client')
+    def limited():
+        return {'success': True}
+
+    return app
+
+
+def test_burst_is_exhausted(clock):
+    backend = MemoryBucketBackend()
+
+    results = [backend.consume('client', rate=1.0, burst=3)[0] for _ in range(4)]
+
+    assert results == [True, True, True, False]
+
+
+def test_clients_have_separate_buckets(clock):
+    backend = MemoryBucketBackend()
+
+    assert backend.consume('a', rate=1.0, burst=1)[0]
+    assert not backend.consume('a', rate=1.0, burst=1)[0]
+    assert backend.consume('b', rate=1.0, burst=1)[0]
+
+
+def test_bucket_refills_over_time(clock):
+    backend = MemoryBucketBackend()
+    for _ in range(2):
+        backend.consume('client', rate=0.5, burst=2)
+    assert not backend.consume('client', rate=0.5, burst=2)[0]
+
+    clock.now += 2  # one token at 0.5/s
+    assert backend.consume('client', rate=0.5, burst=2)[0]
+    assert not backend.consume('client', rate=0.5, burst=2)[0]
+
+    clock.now += 3600  # refills only up to burst
+    assert [backend.consume('client', rate=0.5, burst=2)[0] for _ in range(3)] == [True, True, False]
+
+
+def test_retry_after_is_time_until_next_token(clock):
+    backend = MemoryBucketBackend()
+    backend.consume('client', rate=0.25, burst=1)
+
+    allowed, retry_after = backend.consume('client', rate=0.25, burst=1)
+    assert not allowed
+    assert retry_after == pytest.approx(4.0)
+
+    clock.now += 1
+    allowed, retry_after = backend.consume('client', rate=0.25, burst=1)
+    assert not allowed
+    assert retry_after == pytest.approx(3.0)
+
+
+def test_least_recently_seen_client_is_evicted(clock):
+    backend = MemoryBucketBackend(maxsize=2)
+    backend.consume('a', rate=1.0, burst=1)
+    backend.consume('b', rate=1.0, burst=1)
+    backend.consume('a', rate=1.0, burst=1)  # a is now the most recently seen
+
+    backend.consume('c', rate=1.0, burst=1)
+
+    assert backend.size() == 2
+    # a is still tracked with an empty bucket; b was evicted and starts full
+    assert not backend.consume('a', rate=1.0, burst=1)[0]
+    assert backend.consume('b', rate=1.0, burst=1)[0]
+
+
+def test_evicted_client_starts_with_full_bucket(clock):
+    backend = MemoryBucketBackend(maxsize=1)
+    backend.consume('a', rate=1.0, burst=1)
+    assert not backend.consume('a', rate=1.0, burst=1)[0]
+
+    backend.consume('b', rate=1.0, burst=1)
+
+    assert backend.consume('a', rate=1.0, burst=1)[0]
+
+
+def test_limiter_counts_and_prefixes_keys(clock):
+    backend = MemoryBucketBackend()
+    first = RateLimiter('test_prefix_first', rate=1.0, burst=1, backend=backend)
+    second = RateLimiter('test_prefix_second', rate=1.0, burst=1, backend=backend)
+
+    assert first.hit('client')[0]
+    assert not first.hit('client')[0]
+    assert second.hit('client')[0]
+    assert first.stats()['allowed'] == 1
+    assert first.stats()['limited'] == 1
+
+
+@pytest.mark.parametrize('rate, burst', [(0, 1), (-1, 1), (1, 0)])
+def test_invalid_limits_are_rejected(rate, burst):
+    with pytest.raises(ValueError):
+        RateLimiter('test_invalid', rate=rate, burst=burst)
+    limiter = RateLimiter('test_invalid_configure')
+    with pytest.raises(ValueError):
+        limiter.configure(rate=rate, burst=burst)
+
+
+def test_decorator_returns_429_with_retry_after(clock):
+    limiter = RateLimiter('test_decorator', rate=0.1, burst=2)
+    client = make_app(limiter).test_client()
+
+    assert [client.get('/limited').status_code for _ in range(2)] == [200, 200]
+    response = client.get('/limited')
+
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '10'
+    assert response.get_json()['success'] is False
+
+
+def test_retry_after_is_at_least_one_second(clock):
+    limiter = RateLimiter('test_retry_minimum', rate=100.0, burst=1)
+    client = make_app(limiter).test_client()
+    client.get('/limited')
+
+    response = client.get('/limited')
+
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_disabled_rate_limiting_bypasses_limiter(clock):
+    limiter = RateLimiter('test_disabled', rate=0.1, burst=1)
+    client = make_app(limiter, enabled=False).test_client()
+
+    assert [client.get('/limited').status_code for _ in range(5)] == [200] * 5
+    assert limiter.stats()['allowed'] == 0
+    assert limiter.stats()['limited'] == 0
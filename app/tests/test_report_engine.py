@@ -0,0 +1,63 @@
+"""
+Tests for the vectorized report helpers: week_start, month_start and
+group_sums.
+"""
+import numpy as np
+
+from utils.report_engine import EPOCH, group_sums, month_start, week_start
+
+
+def day(iso):
+    return int((np.datetime64(iso, 'D') - EPOCH).astype(np.int64))
+
+
+def test_week_start_maps_to_monday():
+    # 1970-01-05 was the first Monday after the epoch
+    days = np.array([day('1970-01-05'), day('1970-01-08'), day('1970-01-11'), day('1970-01-12')])
+    assert week_start(days).tolist() == [4, 4, 4, 11]
+
+
+def test_week_start_before_first_monday():
+    # 1970-01-01..04 (Thu..Sun) and 1969-12-29 (Mon) share the week starting 1969-12-29
+    days = np.array([0, 1, 2, 3, day('1969-12-29'), day('1969-12-28')])
+    assert week_start(days).tolist() == [-3, -3, -3, -3, -3, day('1969-12-22')]
+
+
+def test_month_start():
+    days = np.array([day('1970-01-01'), day('2024-02-29'), day('2024-03-01'), day('1969-12-31')])
+    expected = [day('1970-01-01'), day('2024-02-01'), day('2024-03-01'), day('1969-12-01')]
+    assert month_start(days).tolist() == expected
+
+
+def test_group_sums_single_key():
+    keys = [np.array([3, 1, 3, 2])]
+    values = {'total': np.array([1.0, 2.0, 3.0, 4.0])}
+
+    group_keys, sums = group_sums(keys, values)
+
+    assert group_keys[0].tolist() == [1, 2, 3]
+    assert sums['total'].tolist() == [2.0, 4.0, 4.0]
+
+
+def test_group_sums_multi_key_ordered_by_key_values():
+    keys = [np.array([2, 1, 2, 1, 2]), np.array([10, 20, 5, 20, 10])]
+    values = {
+        'revenue': np.array([1.0, 2.0, 3.0, 4.0, 5.0]),
+        'count': np.ones(5),
+    }
+
+    group_keys, sums = group_sums(keys, values)
+
+    assert list(zip(group_keys[0].tolist(), group_keys[1].tolist())) == [(1, 20), (2, 5), (2, 10)]
+    assert sums['revenue'].tolist() == [6.0, 3.0, 6.0]
+    assert sums['count'].tolist() == [2.0, 1.0, 2.0]
+
+
+def test_group_sums_empty_input():
+    keys = [np.array([], dtype=np.int64), np.array([], dtype=np.int64)]
+
+    group_keys, sums = group_sums(keys, {'revenue': np.array([])})
+
+    assert len(group_keys) == 2
+    assert all(len(column) == 0 for column in group_keys)
+    assert sums['revenue'].shape == (0,)
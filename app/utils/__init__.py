@@ -0,0 +1,11 @@
+"""
+Make utils package importable.
+"""
+from .cache import TTLCache, cache_stats
+from .http_cache import conditional_json
+from .json_provider import FastJSONProvider
+from .contact_keys import normalize_email, normalize_phone
+from .rate_limit import RateLimiter, MemoryBucketBackend, rate_limited, rate_limit_stats
+
+__all__ = ['TTLCache', 'cache_stats', 'conditional_json', 'FastJSONProvider', 'normalize_email', 'normalize_phone',
+           'RateLimiter', 'MemoryBucketBackend', 'rate_limited', 'rate_limit_stats']
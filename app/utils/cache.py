@@ -0,0 +1,176 @@
+"""
+In-process caching utilities.
+Provides a thread-safe TTL + LRU cache with hit/miss counters.
+"""
+import time
+import threading
+import weakref
+from collections import OrderedDict
+
+# Named caches, so their counters can be reported together
+_registry = weakref.WeakValueDictionary()
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded, thread-safe cache with per-entry expiry and LRU eviction.
+
+    Values (including None) are stored as-is and shared between callers, so
+    cached objects must be treated as read-only.
+    """
+
+    def __init__(self, name, maxsize=256, ttl=300):
+        """
+        Args:
+            name (str): Name reported by cache_stats()
+            maxsize (int): Maximum number of entries before LRU eviction
+            ttl (float): Seconds an entry stays valid
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        _registry[name] = self
+
+    def configure(self, maxsize=None, ttl=None):
+        """Change size and TTL; existing entries are dropped."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            self._data.clear()
+            self._generation += 1
+
+    def get(self, key, default=None):
+        """Get a cached value, or default if missing or expired."""
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl (float, optional): Seconds this entry stays valid (default: the cache TTL)
+        """
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def get_or_set(self, key, loader, ttl=None, defer=None):
+        """
+        Get a cached value, calling loader() to fill the entry on a miss.
+
+        A value loaded while the cache was being invalidated is returned but
+        not stored, so a slow read can't reinstate data a writer just replaced.
+
+        Args:
+            key: Cache key
+            loader (callable): Produces the value on a miss
+            ttl (float or callable, optional): Entry TTL, or a function of the
+                loaded value returning one (e.g. shorter for empty results)
+            defer (callable, optional): Called with the store step instead of
+                storing right away, e.g. BaseRepository.on_commit so a value
+                read inside a transaction is only cached once it commits
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        generation = self._generation
+        value = loader()
+        if callable(ttl):
+            ttl = ttl(value)
+
+        def store():
+            with self._lock:
+                if generation == self._generation:
+                    self._store(key, value, ttl)
+
+        if defer is None:
+            store()
+        else:
+            defer(store)
+        return value
+
+    def invalidate(self, key):
+        """Remove a single entry."""
+        with self._lock:
+            self._generation += 1
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_where(self, predicate):
+        """Remove every entry whose key satisfies predicate(key)."""
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+                self.invalidations += 1
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: size, limits, hits, misses, hit ratio, evictions and invalidations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return _MISSING
+
+    def _store(self, key, value, ttl=None):
+        """Insert an entry. Caller must hold the lock."""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+def cache_stats():
+    """
+    Get counters for every named cache in this process.
+
+    Returns:
+        dict: Cache name -> stats dict
+    """
+    return {name: cache.stats() for name, cache in sorted(_registry.items())}
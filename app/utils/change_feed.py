@@ -0,0 +1,143 @@
+"""
+Cross-worker change feed over PostgreSQL LISTEN/NOTIFY.
+Triggers (see migrations/001_change_feed.sql) publish row changes; a
+background thread in each worker process receives them and calls the
+handlers subscribed for that table, e.g. to evict cache entries.
+"""
+import os
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+import psycopg2
+from psycopg2 import extensions
+from repositories.base_repository import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'table_changes'
+
+# Sent to every handler after (re)connecting, since events may have been missed
+RESYNC = 'RESYNC'
+
+
+class ChangeFeed:
+    """
+    Per-process listener for table change notifications.
+
+    Handlers receive an event dict {'table', 'op', 'id'} where 'op' is
+    INSERT, UPDATE, DELETE or RESYNC. A RESYNC event (id None) is delivered
+    whenever the listener (re)connects and means "anything may have changed".
+    Handlers run on the listener thread and should be quick.
+    """
+
+    _handlers = defaultdict(list)
+    _lock = threading.Lock()
+    _thread = None
+    _stop = None
+    _pid = None
+    _fork_hook_installed = False
+    poll_interval = 5.0
+    reconnect_delay = 2.0
+
+    @staticmethod
+    def subscribe(table, handler):
+        """
+        Call handler(event) for every change to table.
+
+        Args:
+            table (str): Table name as reported by the trigger (e.g. 'services')
+            handler (callable): Receives the event dict
+        """
+        with ChangeFeed._lock:
+            ChangeFeed._handlers[table].append(handler)
+
+    @staticmethod
+    def dispatch(event):
+        """Deliver an event to the handlers of its table (all tables for RESYNC)."""
+        if event.get('op') == RESYNC:
+            handlers = [h for hs in list(ChangeFeed._handlers.values()) for h in hs]
+        else:
+            handlers = list(ChangeFeed._handlers.get(event.get('table'), ()))
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Change feed handler error for %s", event)
+
+    @staticmethod
+    def start():
+        """Start the listener thread for this process (no-op if running)."""
+        with ChangeFeed._lock:
+            if ChangeFeed._thread is not None and ChangeFeed._pid == os.getpid():
+                return
+            ChangeFeed._pid = os.getpid()
+            ChangeFeed._stop = threading.Event()
+            ChangeFeed._thread = threading.Thread(
+                target=ChangeFeed._run, args=(ChangeFeed._stop,),
+                name='change-feed-listener', daemon=True)
+            ChangeFeed._thread.start()
+
+            if not ChangeFeed._fork_hook_installed and hasattr(os, 'register_at_fork'):
+                # Threads don't survive fork(); restart in pre-forked workers
+                os.register_at_fork(after_in_child=ChangeFeed._restart_after_fork)
+                ChangeFeed._fork_hook_installed = True
+
+    @staticmethod
+    def stop():
+        """Stop the listener thread."""
+        with ChangeFeed._lock:
+            if ChangeFeed._stop is not None:
+                ChangeFeed._stop.set()
+            ChangeFeed._thread = None
+
+    @staticmethod
+    def is_running():
+        """Check whether this process has a live listener thread."""
+        thread = ChangeFeed._thread
+        return thread is not None and thread.is_alive() and ChangeFeed._pid == os.getpid()
+
+    @staticmethod
+    def _restart_after_fork():
+        if ChangeFeed._thread is None:
+            return
+        ChangeFeed._lock = threading.Lock()
+        ChangeFeed._thread = None
+        ChangeFeed.start()
+
+    @staticmethod
+    def _run(stop):
+        """Listener loop: connect, LISTEN, dispatch notifications, reconnect on failure."""
+        while not stop.is_set():
+            conn = None
+            try:
+                # Dedicated connection: LISTEN must stay on one session, outside the pool
+                conn = BaseRepository.get_db_connection()
+                conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CHANNEL};")
+
+                ChangeFeed.dispatch({'table': None, 'op': RESYNC, 'id': None})
+
+                while not stop.is_set():
+                    readable, _, _ = select.select([conn], [], [], ChangeFeed.poll_interval)
+                    if not readable:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            event = json.loads(notify.payload)
+                        except ValueError:
+                            continue
+                        ChangeFeed.dispatch(event)
+            except (psycopg2.Error, OSError, ValueError):
+                logger.exception("Change feed listener error, reconnecting")
+                stop.wait(ChangeFeed.reconnect_delay)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
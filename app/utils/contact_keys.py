@@ -0,0 +1,45 @@
+"""
+Contact normalization for lookups.
+Mirrors normalize_email()/normalize_phone() in migrations/007_user_contact_keys.sql,
+so search input can be compared directly with the indexed key columns.
+"""
+import re
+
+_NON_DIGITS = re.compile(r'[^0-9]')
+
+
+def normalize_email(email):
+    """
+    Normalize an email for comparison.
+    
+    Args:
+        email (str): Raw email
+        
+    Returns:
+        str or None: Lower-cased email with surrounding spaces removed, or
+        None if empty
+    """
+    # btrim() in SQL only strips spaces, so tabs/newlines must survive here too
+    key = (email or '').strip(' ').lower()
+    return key or None
+
+
+def normalize_phone(phone):
+    """
+    Normalize a phone number to E.164 ("+" and digits).
+    
+    Ten-digit numbers are taken as North American (country code 1).
+    
+    Args:
+        phone (str): Raw phone number, e.g. "(555) 123-4567"
+        
+    Returns:
+        str or None: E.164 number, e.g. "+15551234567", or None if it has
+        fewer than 7 digits
+    """
+    digits = _NON_DIGITS.sub('', phone or '')
+    if len(digits) < 7:
+        return None
+    if len(digits) == 10:
+        return '+1' + digits
+    return '+' + digits
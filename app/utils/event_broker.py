@@ -0,0 +1,180 @@
+"""
+In-process publish/subscribe for pushing events to open browser connections.
+Each subscriber (e.g. one Server-Sent Events stream) listens on a few
+topics and gets its own bounded queue; publishing touches only the
+subscribers of the event's topics, not every open stream. Events reach
+subscribers in the same worker process only; bridge from the change feed
+to reach every worker.
+"""
+import threading
+from collections import defaultdict, deque
+
+
+class Subscription:
+    """
+    One subscriber's queue of pending events.
+
+    A subscriber that falls more than maxsize events behind (a stalled
+    connection) has its queue replaced by a single overflow event, so a
+    slow client can't grow memory without bound; it should reload its data.
+    """
+
+    def __init__(self, broker, topics, maxsize, overflow_event):
+        self.broker = broker
+        self.topics = frozenset(topics)
+        self.maxsize = maxsize
+        self.overflow_event = overflow_event
+        self.closed = False
+        self._events = deque()
+        self._cond = threading.Condition(threading.Lock())
+
+    def put(self, event):
+        """
+        Queue an event.
+
+        Returns:
+            bool: False if the queue overflowed and was reset
+        """
+        with self._cond:
+            if self.closed:
+                return True
+            overflowed = len(self._events) >= self.maxsize
+            if overflowed:
+                self._events.clear()
+                self._events.append(self.overflow_event)
+            else:
+                self._events.append(event)
+            self._cond.notify()
+        return not overflowed
+
+    def get(self, timeout=None):
+        """
+        Wait for events.
+
+        Args:
+            timeout (float, optional): Seconds to wait
+
+        Returns:
+            list: Pending events, oldest first; empty on timeout or once closed
+        """
+        with self._cond:
+            if not self._events and not self.closed:
+                self._cond.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+            return events
+
+    def close(self):
+        """Stop receiving events and wake a waiting reader. Safe to call more than once."""
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+            self._cond.notify_all()
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Topic-based fan-out to Subscriptions, with a cap on concurrent subscribers."""
+
+    def __init__(self, max_subscribers=50, queue_size=100, overflow_event=None):
+        """
+        Args:
+            max_subscribers (int): Subscribers allowed at once in this process
+            queue_size (int): Pending events kept per subscriber
+            overflow_event: Event that replaces an overflowing queue
+        """
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.overflow_event = overflow_event
+        self._lock = threading.Lock()
+        self._topics = defaultdict(set)
+        self._subscribers = set()
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+        self.rejected = 0
+
+    def configure(self, max_subscribers=None, queue_size=None):
+        """Change limits; existing subscribers keep their queue size."""
+        with self._lock:
+            if max_subscribers is not None:
+                self.max_subscribers = max_subscribers
+            if queue_size is not None:
+                self.queue_size = queue_size
+
+    def subscribe(self, topics):
+        """
+        Start listening on topics.
+
+        Args:
+            topics (iterable): Topic names, e.g. 'admin' or 'technician:3'
+
+        Returns:
+            Subscription or None: None if max_subscribers are already listening
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self.rejected += 1
+                return None
+            subscription = Subscription(self, topics, self.queue_size, self.overflow_event)
+            self._subscribers.add(subscription)
+            for topic in subscription.topics:
+                self._topics[topic].add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        """Stop delivering to subscription."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+
+    def publish(self, topics, event):
+        """
+        Deliver event once to every subscriber of any of topics.
+
+        Args:
+            topics (iterable): Topic names
+            event: Any object; subscribers receive it as-is
+
+        Returns:
+            int: Number of subscribers it was delivered to
+        """
+        with self._lock:
+            targets = set()
+            for topic in topics:
+                targets.update(self._topics.get(topic, ()))
+            self.published += 1
+        return self._deliver(targets, event)
+
+    def publish_all(self, event):
+        """Deliver event to every subscriber, e.g. after missed notifications."""
+        with self._lock:
+            targets = set(self._subscribers)
+            self.published += 1
+        return self._deliver(targets, event)
+
+    def _deliver(self, targets, event):
+        overflows = sum(1 for subscription in targets if not subscription.put(event))
+        with self._lock:
+            self.delivered += len(targets)
+            self.overflows += overflows
+        return len(targets)
+
+    def stats(self):
+        """Report subscriber and event counters for this process."""
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'maxSubscribers': self.max_subscribers,
+                'topics': len(self._topics),
+                'published': self.published,
+                'delivered': self.delivered,
+                'overflows': self.overflows,
+                'rejected': self.rejected
+            }
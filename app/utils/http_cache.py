@@ -0,0 +1,30 @@
+"""
+HTTP caching helpers for read-only JSON endpoints.
+Builds responses with strong ETags and Cache-Control, answering
+If-None-Match with 304 before the body is serialized.
+"""
+from flask import request, current_app, Response
+
+
+def conditional_json(etag, build_body, status_code=200):
+    """
+    Build a JSON response validated by a precomputed strong ETag.
+
+    Args:
+        etag (str): Strong validator for the representation (without quotes)
+        build_body (callable): Returns the response dict; only called when the
+            client's cached copy is stale
+        status_code (int): Status for a full response
+
+    Returns:
+        flask.Response: 304 with no body, or the full JSON response
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = current_app.json.response(build_body())
+        response.status_code = status_code
+    response.set_etag(etag)
+    max_age = current_app.config.get('CATALOG_HTTP_MAX_AGE', 0)
+    response.headers['Cache-Control'] = f"public, max-age={max_age}, must-revalidate"
+    return response
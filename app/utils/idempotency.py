@@ -0,0 +1,93 @@
+"""
+Idempotency-Key support for POST endpoints.
+A retried request carrying the same key gets the original response replayed
+instead of running its transaction (and creating its rows) a second time.
+"""
+import hashlib
+import functools
+from flask import request, make_response, current_app
+from werkzeug.exceptions import HTTPException
+from repositories.base_repository import BaseRepository
+from repositories.idempotency_repository import IdempotencyRepository
+from .cache import TTLCache
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# Completed responses, so retries that reach the same worker skip the database
+replay_cache = TTLCache('idempotency', maxsize=1024, ttl=300)
+
+
+def idempotent(scope):
+    """
+    Make a POST view idempotent per Idempotency-Key header.
+    
+    Requests without the header run normally. The first request with a key
+    claims it inside the request's unit of work and stores its response when
+    that commits; server errors, rolled-back requests and aborted or
+    streamed responses store nothing, so they can be retried. A repeat with
+    the same key and body replays the stored response with an
+    Idempotent-Replayed header; the same key with a different body is
+    rejected with 422.
+    
+    Args:
+        scope (str): Name of the endpoint, so keys don't collide across endpoints
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get(HEADER)
+            if key is None:
+                return view(*args, **kwargs)
+            
+            key = key.strip()
+            if not key or len(key) > MAX_KEY_LENGTH:
+                return {"ok": False, "error": f"{HEADER} must be 1-{MAX_KEY_LENGTH} characters"}, 400
+            
+            key_hash = hashlib.sha256(key.encode('utf-8')).digest()
+            request_hash = hashlib.sha256(request.get_data()).digest()
+            cache_key = (scope, key_hash)
+            
+            stored = replay_cache.get(cache_key)
+            if stored is None:
+                ttl = current_app.config['IDEMPOTENCY_KEY_TTL']
+                if IdempotencyRepository.claim(scope, key_hash, request_hash, ttl):
+                    return _run_and_store(view, args, kwargs, scope, key_hash, request_hash)
+                stored = IdempotencyRepository.get(scope, key_hash)
+                if stored is None or stored['status_code'] is None:
+                    return {"ok": False, "error": f"A request with this {HEADER} is still in progress"}, 409
+                replay_cache.set(cache_key, stored)
+            
+            if stored['request_hash'] != request_hash:
+                return {"ok": False, "error": f"{HEADER} was already used with a different request body"}, 422
+            
+            response = current_app.response_class(stored['body'], status=stored['status_code'],
+                                                  content_type=stored['content_type'])
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+        return wrapper
+    return decorator
+
+
+def _run_and_store(view, args, kwargs, scope, key_hash, request_hash):
+    """Run the view for a freshly claimed key and record its response."""
+    try:
+        response = make_response(view(*args, **kwargs))
+    except HTTPException:
+        # abort() or an unreadable body: the request may commit, so free the key
+        IdempotencyRepository.release(scope, key_hash)
+        raise
+    unit = BaseRepository.current_unit_of_work()
+    if response.status_code >= 500 or (unit and unit.rollback_only):
+        return response
+    if response.is_streamed:
+        # A streamed body can't be stored for replay
+        IdempotencyRepository.release(scope, key_hash)
+        return response
+    
+    body = response.get_data()
+    if IdempotencyRepository.complete(scope, key_hash, response.status_code, body, response.content_type):
+        entry = {'request_hash': request_hash, 'status_code': response.status_code, 'body': body,
+                 'content_type': response.content_type}
+        BaseRepository.on_commit(lambda: replay_cache.set((scope, key_hash), entry))
+    return response
@@ -0,0 +1,85 @@
+"""
+Fast JSON provider for the Flask app.
+Serializes with orjson when it is installed, and handles dates, datetimes
+and Decimals natively so repositories can return rows as-is.
+"""
+import json
+import uuid
+import decimal
+import dataclasses
+from datetime import date, datetime, time
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the standard library
+    orjson = None
+
+
+def _default(o):
+    """Convert types neither encoder handles natively."""
+    if isinstance(o, decimal.Decimal):
+        # Keep Flask's representation: exact string, no float rounding
+        return str(o)
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """
+    Serialize to a compact JSON string outside of an app context
+    (e.g. inside streamed responses or CLI commands).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, default=_default, separators=(',', ':'))
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson.
+
+    Dates and datetimes are written in ISO 8601 (e.g. "2025-10-03",
+    "2025-10-03T14:30:00"), Decimals as exact strings. Calls that pass
+    encoder options orjson doesn't support (e.g. from extensions) go
+    through the standard library with the same type handling.
+    """
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=_default, option=self._options()).decode('utf-8')
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is not None:
+            option = self._options() | (orjson.OPT_INDENT_2 if pretty else 0) | orjson.OPT_APPEND_NEWLINE
+            body = orjson.dumps(obj, default=_default, option=option)
+        else:
+            dump_args = {'indent': 2} if pretty else {'separators': (',', ':')}
+            body = f"{self.dumps(obj, **dump_args)}\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _options(self):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
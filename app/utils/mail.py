@@ -0,0 +1,142 @@
+"""
+Outbound email transports.
+A transport delivers a batch of messages at once (one SMTP session per
+batch) and reports per-message failures, so the job queue can retry only
+the messages that failed.
+"""
+import smtplib
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+
+
+def build_message(message, sender):
+    """
+    Build a MIME message from a job payload.
+    
+    Args:
+        message (dict): to, subject, body, and optional reply_to
+        sender (str): From address
+        
+    Returns:
+        EmailMessage: Ready to send
+    """
+    email = EmailMessage()
+    email['From'] = sender
+    email['To'] = message['to']
+    email['Subject'] = message['subject']
+    email['Date'] = formatdate(localtime=True)
+    email['Message-ID'] = make_msgid()
+    if message.get('reply_to'):
+        email['Reply-To'] = message['reply_to']
+    email.set_content(message['body'])
+    return email
+
+
+class ConsoleTransport:
+    """Prints messages instead of sending them (development default)."""
+    
+    def __init__(self, sender):
+        self.sender = sender
+    
+    def send_batch(self, messages):
+        """
+        Print every message.
+        
+        Args:
+            messages (list[dict]): to, subject, body
+            
+        Returns:
+            list: One error string (or None on success) per message
+        """
+        for message in messages:
+            print(f"--- Email to {message['to']} from {self.sender} ---")
+            print(f"Subject: {message['subject']}")
+            print(message['body'])
+        return [None] * len(messages)
+
+
+class SMTPTransport:
+    """
+    Sends messages over one SMTP session per batch.
+    
+    Connection and authentication errors raise, so the whole batch is
+    retried; a message refused by the server fails on its own.
+    """
+    
+    def __init__(self, sender, host='localhost', port=25, username=None, password=None,
+                 use_tls=False, use_ssl=False, timeout=10):
+        """
+        Args:
+            sender (str): From address
+            host (str): SMTP server
+            port (int): SMTP port
+            username (str, optional): Login user
+            password (str, optional): Login password
+            use_tls (bool): Upgrade with STARTTLS
+            use_ssl (bool): Connect with implicit TLS
+            timeout (float): Socket timeout in seconds
+        """
+        self.sender = sender
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+    
+    def send_batch(self, messages):
+        """
+        Send every message in one SMTP session.
+        
+        Args:
+            messages (list[dict]): to, subject, body
+            
+        Returns:
+            list: One error string (or None on success) per message
+            
+        Raises:
+            smtplib.SMTPException, OSError: If the session cannot be established
+        """
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        errors = []
+        with smtp_class(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.use_tls and not self.use_ssl:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or '')
+            for message in messages:
+                try:
+                    smtp.send_message(build_message(message, self.sender))
+                    errors.append(None)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError,
+                        smtplib.SMTPSenderRefused, ValueError) as e:
+                    errors.append(str(e))
+        return errors
+
+
+def create_transport(config):
+    """
+    Create the transport named by config['MAIL_TRANSPORT'].
+    
+    Args:
+        config (dict): App config
+        
+    Returns:
+        ConsoleTransport or SMTPTransport
+    """
+    sender = config['MAIL_DEFAULT_SENDER']
+    name = config['MAIL_TRANSPORT']
+    if name == 'console':
+        return ConsoleTransport(sender)
+    if name == 'smtp':
+        return SMTPTransport(
+            sender,
+            host=config['MAIL_SERVER'],
+            port=config['MAIL_PORT'],
+            username=config['MAIL_USERNAME'],
+            password=config['MAIL_PASSWORD'],
+            use_tls=config['MAIL_USE_TLS'],
+            use_ssl=config['MAIL_USE_SSL'],
+        )
+    raise ValueError(f"Unknown MAIL_TRANSPORT: {name}")
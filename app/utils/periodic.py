@@ -0,0 +1,81 @@
+"""
+Background periodic tasks.
+Runs a function every N seconds on a daemon thread in each worker process,
+e.g. the warranty sweep. Tasks that must run once per cluster should guard
+themselves (e.g. with a PostgreSQL advisory lock).
+"""
+import os
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Calls func() every interval seconds until stopped.
+
+    Errors are logged and the task keeps its schedule. The thread is
+    restarted in forked worker processes.
+    """
+
+    def __init__(self, name, interval, func, initial_delay=None):
+        """
+        Args:
+            name (str): Thread name
+            interval (float): Seconds between runs
+            func (callable): Work to run
+            initial_delay (float, optional): Seconds before the first run (default: interval)
+        """
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.initial_delay = initial_delay
+        self._thread = None
+        self._stop = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._restart_after_fork)
+
+    def start(self):
+        """Start the thread for this process (no-op if running)."""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,),
+                                            name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the thread after its current run."""
+        with self._lock:
+            if self._stop is not None:
+                self._stop.set()
+            self._thread = None
+
+    def is_running(self):
+        """Check whether this process has a live thread."""
+        thread = self._thread
+        return thread is not None and thread.is_alive() and self._pid == os.getpid()
+
+    def _restart_after_fork(self):
+        if self._thread is None:
+            return
+        self._lock = threading.Lock()
+        self._thread = None
+        self.start()
+
+    def _run(self, stop):
+        delay = self.interval if self.initial_delay is None else self.initial_delay
+        if stop.wait(delay):
+            return
+        while not stop.is_set():
+            try:
+                self.func()
+            except Exception:
+                logger.exception("Periodic task %s failed", self.name)
+            if stop.wait(self.interval):
+                return
@@ -0,0 +1,192 @@
+"""
+Per-client token-bucket rate limiting.
+Buckets live in a bounded in-process LRU by default; a shared backend (e.g.
+one backed by Redis) can be plugged in so limits hold across workers.
+"""
+import time
+import math
+import threading
+import weakref
+import functools
+from collections import OrderedDict
+from flask import request, current_app
+
+# Named limiters, so their counters can be reported together
+_registry = weakref.WeakValueDictionary()
+
+
+class MemoryBucketBackend:
+    """
+    Token buckets in a bounded, thread-safe LRU.
+
+    When full, the least recently seen client is dropped; a dropped client
+    simply starts again with a full bucket. Limits are per worker process.
+    """
+
+    def __init__(self, maxsize=10000):
+        """
+        Args:
+            maxsize (int): Maximum number of clients tracked
+        """
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+
+    def consume(self, key, rate, burst, cost=1):
+        """
+        Take cost tokens from key's bucket.
+
+        Args:
+            key (str): Client identifier
+            rate (float): Tokens added per second
+            burst (int): Bucket capacity
+            cost (float): Tokens this request needs
+
+        Returns:
+            tuple: (allowed, retry_after_seconds)
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        retry_after = 0.0 if allowed else (cost - tokens) / rate
+        return allowed, retry_after
+
+    def size(self):
+        """Number of clients currently tracked."""
+        with self._lock:
+            return len(self._buckets)
+
+
+def _check_limits(rate, burst):
+    # A zero rate would never refill the bucket (and divide by zero in Retry-After)
+    if not rate > 0:
+        raise ValueError(f"rate must be positive, got {rate!r}")
+    if not burst >= 1:
+        raise ValueError(f"burst must be at least 1, got {burst!r}")
+
+
+class RateLimiter:
+    """
+    Named token-bucket limiter.
+
+    Each client may make ``burst`` requests at once and ``rate`` requests
+    per second on average. Any object with the MemoryBucketBackend.consume
+    signature can be passed as the backend to share buckets between workers.
+    """
+
+    def __init__(self, name, rate=1.0, burst=10, backend=None):
+        """
+        Args:
+            name (str): Prefix for bucket keys, so limiters can share a backend
+            rate (float): Tokens added per second
+            burst (int): Bucket capacity
+            backend (optional): Bucket store (default: MemoryBucketBackend)
+
+        Raises:
+            ValueError: If rate isn't positive or burst is below 1
+        """
+        _check_limits(rate, burst)
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.backend = backend or MemoryBucketBackend()
+        self.allowed = 0
+        self.limited = 0
+        _registry[name] = self
+
+    def configure(self, rate=None, burst=None, backend=None):
+        """Change limits and/or the bucket store; invalid limits raise ValueError."""
+        _check_limits(self.rate if rate is None else rate, self.burst if burst is None else burst)
+        if rate is not None:
+            self.rate = rate
+        if burst is not None:
+            self.burst = burst
+        if backend is not None:
+            self.backend = backend
+
+    def hit(self, client):
+        """
+        Count one request from client.
+
+        Args:
+            client (str): Client identifier (e.g. remote address)
+
+        Returns:
+            tuple: (allowed, retry_after_seconds)
+        """
+        allowed, retry_after = self.backend.consume(f"{self.name}:{client}", self.rate, self.burst)
+        if allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        return allowed, retry_after
+
+    def stats(self):
+        """
+        Get limiter counters.
+
+        Returns:
+            dict: limits, allowed and limited request counts
+        """
+        return {
+            'rate': self.rate,
+            'burst': self.burst,
+            'allowed': self.allowed,
+            'limited': self.limited,
+        }
+
+
+def rate_limit_stats():
+    """
+    Get counters for every named limiter in this process.
+
+    Returns:
+        dict: Limiter name -> stats dict
+    """
+    return {name: limiter.stats() for name, limiter in sorted(_registry.items())}
+
+
+def client_address():
+    """
+    Identify the caller by remote address.
+
+    Behind a reverse proxy, wrap the app in werkzeug's ProxyFix so this is
+    the real client rather than the proxy.
+    """
+    return request.remote_addr or 'unknown'
+
+
+def rate_limited(limiter, key_func=client_address):
+    """
+    Reject requests over limiter's budget with 429 and a Retry-After header.
+
+    Disabled when the app config has RATE_LIMIT_ENABLED = False.
+
+    Args:
+        limiter (RateLimiter): Limiter to charge
+        key_func (callable): Returns the client identifier for the current request
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if current_app.config.get('RATE_LIMIT_ENABLED', True):
+                allowed, retry_after = limiter.hit(key_func())
+                if not allowed:
+                    response = current_app.json.response({
+                        'error': 'Too many requests, please try again later',
+                        'success': False
+                    })
+                    response.status_code = 429
+                    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+                    return response
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
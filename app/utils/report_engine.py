@@ -0,0 +1,80 @@
+"""
+Vectorized group-by aggregation over columnar report data.
+Rows arrive as parallel NumPy arrays (one per column), so grouping and
+summing a year of workorders is a handful of array operations instead of a
+Python loop per record.
+"""
+import numpy as np
+
+
+# Days since 1970-01-01 (a Thursday) -> index of the Monday-based week
+_EPOCH_WEEKDAY_OFFSET = 3
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def week_start(days):
+    """
+    Map day numbers to the day number of their week's Monday.
+
+    Args:
+        days (np.ndarray): Days since 1970-01-01
+
+    Returns:
+        np.ndarray: Days since 1970-01-01 of each week's Monday
+    """
+    return (days + _EPOCH_WEEKDAY_OFFSET) // 7 * 7 - _EPOCH_WEEKDAY_OFFSET
+
+
+def month_start(days):
+    """
+    Map day numbers to the day number of the first of their month.
+
+    Args:
+        days (np.ndarray): Days since 1970-01-01
+
+    Returns:
+        np.ndarray: Days since 1970-01-01 of each month's first day
+    """
+    dates = EPOCH + days.astype('timedelta64[D]')
+    return (dates.astype('datetime64[M]').astype('datetime64[D]') - EPOCH).astype(np.int64)
+
+
+def group_sums(keys, values):
+    """
+    Sum value columns per distinct combination of key columns.
+
+    Each key column is factorized with np.unique, the per-column codes are
+    combined into one flat group code, and every value column is summed with
+    a single np.bincount pass.
+
+    Args:
+        keys (list[np.ndarray]): Integer key columns, all the same length
+        values (dict): {name: np.ndarray} value columns to sum
+
+    Returns:
+        tuple: (group_keys, sums) where group_keys is a list of arrays (one
+        per key column) holding each group's key values and sums is
+        {name: np.ndarray} per group. Groups are ordered by their key values.
+    """
+    if len(keys[0]) == 0:
+        return [np.empty(0, dtype=np.int64) for _ in keys], {name: np.empty(0) for name in values}
+
+    uniques, codes = [], []
+    for column in keys:
+        unique, inverse = np.unique(column, return_inverse=True)
+        uniques.append(unique)
+        codes.append(inverse.ravel())
+
+    shape = [len(unique) for unique in uniques]
+    flat = np.ravel_multi_index(codes, shape) if len(codes) > 1 else codes[0]
+    groups, inverse = np.unique(flat, return_inverse=True)
+    inverse = inverse.ravel()
+
+    group_codes = np.unravel_index(groups, shape) if len(codes) > 1 else [groups]
+    group_keys = [unique[code] for unique, code in zip(uniques, group_codes)]
+
+    sums = {
+        name: np.bincount(inverse, weights=column, minlength=len(groups))
+        for name, column in values.items()
+    }
+    return group_keys, sums
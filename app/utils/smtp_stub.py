@@ -0,0 +1,118 @@
+"""
+Local SMTP stub for development and testing.
+Accepts every message, prints it and keeps it in memory; nothing is relayed.
+Run with `python cli.py mail stub` and set MAIL_TRANSPORT=smtp, MAIL_PORT=1025.
+"""
+import threading
+import socketserver
+from email import message_from_bytes, policy
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT."""
+    
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode('ascii'))
+    
+    def handle(self):
+        self.reply("220 localhost SMTP stub ready")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command[:4].upper()
+            if verb == 'EHLO':
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif verb == 'HELO':
+                self.reply("250 localhost")
+            elif verb == 'MAIL':
+                sender, recipients = command[10:].strip(' <>'), []
+                self.reply("250 OK")
+            elif verb == 'RCPT':
+                recipients.append(command[8:].strip(' <>'))
+                self.reply("250 OK")
+            elif verb == 'DATA':
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                self.server.stub.receive(sender, recipients, b"".join(data))
+                sender, recipients = None, []
+                self.reply("250 OK: queued")
+            elif verb == 'RSET':
+                sender, recipients = None, []
+                self.reply("250 OK")
+            elif verb == 'NOOP':
+                self.reply("250 OK")
+            elif verb == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPStub:
+    """
+    In-process SMTP sink.
+    
+    Usage:
+        stub = SMTPStub(port=1025).start()
+        ...
+        stub.messages  # list of email.message.EmailMessage
+        stub.stop()
+    """
+    
+    def __init__(self, host='127.0.0.1', port=1025, quiet=False):
+        self.host = host
+        self.port = port
+        self.quiet = quiet
+        self.messages = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+    
+    def receive(self, sender, recipients, data):
+        """Store (and print) one delivered message."""
+        message = message_from_bytes(data, policy=policy.default)
+        with self._lock:
+            self.messages.append(message)
+        if not self.quiet:
+            print(f"--- SMTP stub: {sender} -> {', '.join(recipients)} ---")
+            print(f"Subject: {message['Subject']}")
+            print(message.get_body(('plain',)).get_content() if message.get_body(('plain',)) else '')
+    
+    def start(self):
+        """Start serving on a background thread."""
+        self._server = _Server((self.host, self.port), _SMTPHandler)
+        self._server.stub = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='smtp-stub', daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self):
+        """Serve in the foreground until interrupted."""
+        self._server = _Server((self.host, self.port), _SMTPHandler)
+        self._server.stub = self
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+    
+    def stop(self):
+        """Stop the background server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None